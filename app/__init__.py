@@ -12,6 +12,14 @@ from datetime import datetime
 from flask import Flask, got_request_exception
 from app.config import load_config
 from app.extensions import db, mail, login_manager, migrate  # Import migrate
+from app.services.user_directory import user_directory
+from app.services import task_queue
+from app.services.mail_delivery import mail_dispatcher
+from app.services.ticket_sla import sla_scanner
+from app.services.event_bus import event_bus
+from app.services.assignment_scheduler import scheduler as assignment_scheduler
+from app.services.archive_index import archive_index
+from app.services.page_tiles import page_tiles
 
 # Import blueprints
 from app.routes import (
@@ -25,6 +33,7 @@ from app.routes import (
 )
 from app.auth.routes import auth_bp
 from app.document_control.api.documents import bp as doc_api_bp
+from app.document_control.api.audit import bp as audit_api_bp
 
 # Import all models.
 # Although they are not directly used in this file, they must be imported
@@ -77,6 +86,14 @@ def create_app() -> Flask:
     migrate.init_app(app, db)  # Initialize Flask-Migrate
     mail.init_app(app)
     login_manager.init_app(app)
+    user_directory.init_app(app)
+    task_queue.init_app(app)
+    mail_dispatcher.init_app(app)
+    sla_scanner.init_app(app)
+    event_bus.init_app(app)
+    assignment_scheduler.init_app(app)
+    archive_index.init_app(app)
+    page_tiles.init_app(app)
 
     # Setup logging and error handling
     setup_logging(app)
@@ -85,7 +102,7 @@ def create_app() -> Flask:
     # Register a global Jinja helper to get the current time
     @app.context_processor
     def inject_now():
-        return {"now": datetime.utcnow()}
+        return {"now": datetime.utcnow}
 
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix="/auth")
@@ -99,6 +116,7 @@ def create_app() -> Flask:
 
     # Register API blueprints
     app.register_blueprint(doc_api_bp, url_prefix="/api/documents")
+    app.register_blueprint(audit_api_bp, url_prefix="/api/audit")
 
     app.logger.info("Application factory setup complete.")
     return app
@@ -4,19 +4,20 @@ Handles user authentication: login, logout,
 and session management with secure redirect logic.
 """
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
 from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.urls import url_parse
 from app.extensions import db, login_manager
 from app.auth.forms import LoginForm
 from app.models.user import User
+from app.models.enums import NotificationFrequency
 
 auth_bp = Blueprint("auth", __name__)
 
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return db.session.get(User, int(user_id))
 
 
 @auth_bp.route("/login", methods=["GET", "POST"])
@@ -69,3 +70,30 @@ def logout():
     logout_user()
     flash("You have been logged out successfully.", "info")
     return redirect(url_for("auth.login"))
+
+
+@auth_bp.route("/notifications", methods=["GET", "POST"])
+@login_required
+def notification_preferences():
+    """
+    GET: the current user's email frequency as JSON.
+    POST: set it from a form or JSON ``frequency`` (immediate, hourly, daily).
+    """
+    if request.method == "POST":
+        data = request.get_json(silent=True) or request.form
+        try:
+            frequency = NotificationFrequency(data.get("frequency"))
+        except ValueError:
+            if request.is_json:
+                return jsonify(error="Invalid frequency"), 400
+            flash("Invalid notification frequency.", "danger")
+            return redirect(request.referrer or url_for("dashboard.index"))
+        current_user.notification_frequency = frequency
+        db.session.commit()
+        if not request.is_json:
+            flash(f"Notification emails set to {frequency.value}.", "info")
+            return redirect(request.referrer or url_for("dashboard.index"))
+    return jsonify(
+        frequency=current_user.notification_frequency.value,
+        choices=[f.value for f in NotificationFrequency],
+    )
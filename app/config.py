@@ -43,6 +43,97 @@ class Config:
     MAIL_DEFAULT_SENDER = os.environ.get("MAIL_DEFAULT_SENDER")
     MAILING_ADDRESS = os.environ.get("MAILING_ADDRESS")
 
+    # Mail delivery (outbox workers, see app/services/mail_delivery.py)
+    MAIL_WORKERS = int(os.environ.get("MAIL_WORKERS", 2))
+    MAIL_BATCH_SIZE = int(os.environ.get("MAIL_BATCH_SIZE", 50))
+    MAIL_MAX_ATTEMPTS = int(os.environ.get("MAIL_MAX_ATTEMPTS", 6))
+    MAIL_RETRY_BASE = int(os.environ.get("MAIL_RETRY_BASE", 60))       # seconds, doubled per attempt
+    MAIL_POLL_INTERVAL = int(os.environ.get("MAIL_POLL_INTERVAL", 30))
+    MAIL_IDLE_TIMEOUT = int(os.environ.get("MAIL_IDLE_TIMEOUT", 60))   # close idle SMTP connections
+    MAIL_SEND_TIMEOUT = int(os.environ.get("MAIL_SEND_TIMEOUT", 300))  # reclaim rows stuck in "sending"
+
+    # Automatic drafter assignment (app/services/assignment_scheduler.py)
+    ASSIGN_MAX_OPEN = int(os.environ.get("ASSIGN_MAX_OPEN", 8))            # open tickets per drafter
+    ASSIGN_UNIT_WEIGHT = float(os.environ.get("ASSIGN_UNIT_WEIGHT", 1.5))  # preference for familiar units
+    ASSIGN_QUEUE_TTL = int(os.environ.get("ASSIGN_QUEUE_TTL", 300))        # reload to see other processes' tickets
+
+    # Ticket SLAs (app/services/ticket_sla.py; the web server runs the breach scan)
+    SLA_SCAN_INTERVAL = int(os.environ.get("SLA_SCAN_INTERVAL", 300))  # seconds; 0 disables
+    SLA_STATUS_HOURS = {  # time a ticket may sit in each status
+        "Pending": int(os.environ.get("SLA_PENDING_HOURS", 24)),
+        "In Progress": int(os.environ.get("SLA_IN_PROGRESS_HOURS", 72)),
+        "In-Review": int(os.environ.get("SLA_IN_REVIEW_HOURS", 48)),
+        "Revise": int(os.environ.get("SLA_REVISE_HOURS", 48)),
+    }
+
+    # Live updates (Server-Sent Events at /events)
+    # e.g. redis://localhost:6379/1 to share across nodes (and processes)
+    EVENT_BUS_URL = os.environ.get("EVENT_BUS_URL")
+    EVENT_BUS_CHANNEL = os.environ.get("EVENT_BUS_CHANNEL", "nexus-events")
+    SSE_HEARTBEAT = int(os.environ.get("SSE_HEARTBEAT", 15))    # seconds between keep-alive comments
+    SSE_MAX_AGE = int(os.environ.get("SSE_MAX_AGE", 1800))      # close streams so clients reconnect
+    SSE_QUEUE_SIZE = int(os.environ.get("SSE_QUEUE_SIZE", 100))  # per-client backlog before resync
+    # Each stream holds a server thread for up to SSE_MAX_AGE; run.py serves with
+    # W_THREADS + SSE_MAX_STREAMS threads so streams never take request threads.
+    SSE_MAX_STREAMS = int(os.environ.get("SSE_MAX_STREAMS", 32))     # open streams per process
+    SSE_POLL_INTERVAL = int(os.environ.get("SSE_POLL_INTERVAL", 30))  # /events/poll fallback, seconds
+    SSE_BACKLOG = int(os.environ.get("SSE_BACKLOG", 500))             # recent messages kept for polls
+
+    # Notification digests (scripts/send_digests.py, run every few minutes)
+    DIGEST_DAILY_HOUR = int(os.environ.get("DIGEST_DAILY_HOUR", 13))  # UTC hour daily digests go out
+    DIGEST_BATCH_SIZE = int(os.environ.get("DIGEST_BATCH_SIZE", 200))  # users per commit
+
+    # Ticket archive browser listings (app/services/archive_index.py)
+    ARCHIVE_CACHE_TTL = int(os.environ.get("ARCHIVE_CACHE_TTL", 60))      # catches files rewritten in place
+    ARCHIVE_CACHE_SIZE = int(os.environ.get("ARCHIVE_CACHE_SIZE", 2048))  # directories kept
+    ARCHIVE_MAX_DEPTH = int(os.environ.get("ARCHIVE_MAX_DEPTH", 6))       # cap on ?depth=
+
+    # Per-user drive home folders, created with the user (app/services/file_manager.py)
+    USER_HOME_ROOT = os.environ.get("USER_HOME_ROOT")  # defaults to app/static/users
+
+    # Review viewer page tiles (app/services/page_tiles.py)
+    PAGE_TILE_CACHE_DIR = os.environ.get("PAGE_TILE_CACHE_DIR", str(basedir / "var" / "cache" / "page_tiles"))
+    PAGE_TILE_CACHE_MB = int(os.environ.get("PAGE_TILE_CACHE_MB", 2048))  # LRU levels evicted above this
+    PAGE_TILE_SIZE = 512        # tile edge in pixels
+    PAGE_TILE_BASE_DIM = 1024   # longest side at zoom level 0; doubles per level
+    PAGE_TILE_LEVELS = 4
+    PAGE_TILE_WORKERS = int(os.environ.get("PAGE_TILE_WORKERS", 2))  # render processes; 0 renders inline
+    ANNOTATION_EXPORT_TIMEOUT = int(os.environ.get("ANNOTATION_EXPORT_TIMEOUT", 300))  # retake a stuck flatten
+
+    # Cycle-time and throughput metrics (app/services/cycle_analytics.py)
+    CYCLE_ANALYTICS_TTL = int(os.environ.get("CYCLE_ANALYTICS_TTL", 300))  # seconds results are reused
+    CYCLE_ANALYTICS_BATCH = 5000  # rows fetched per batch
+
+    # User directory cache (id -> username/name/email/role)
+    USER_CACHE_TTL = int(os.environ.get("USER_CACHE_TTL", 300))
+    USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", 5000))
+
+    # Ticket numbers reserved per worker process in one counter update
+    TICKET_NUMBER_BLOCK = int(os.environ.get("TICKET_NUMBER_BLOCK", 5))
+
+    # Document retention engine
+    COLD_STORAGE_ROOT = Path(os.environ.get(
+        "COLD_STORAGE_ROOT", basedir / "var" / "cold" / STORAGE_DIR_NAME))
+    REVIEW_NOTICE_DAYS = int(os.environ.get("REVIEW_NOTICE_DAYS", 30))
+    RETENTION_BATCH_SIZE = int(os.environ.get("RETENTION_BATCH_SIZE", 500))
+    RETENTION_ARCHIVE_FILES = os.environ.get("RETENTION_ARCHIVE_FILES", "true").lower() in ["true", "1"]
+
+    # Revision visual diffs (app/document_control/visual_diff.py)
+    REVISION_DIFF_TIMEOUT = int(os.environ.get("REVISION_DIFF_TIMEOUT", 900))  # re-run diffs stuck "running"
+
+    # Background Jobs
+    BACKGROUND_WORKERS = int(os.environ.get("BACKGROUND_WORKERS", 2))
+    BACKGROUND_JOBS_EAGER = False
+    # Queued jobs go to Celery when a broker is configured, else run in-process
+    CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL")
+    CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND")
+
+    # Ticket submission pipeline
+    PIPELINE_MAX_ATTEMPTS = int(os.environ.get("PIPELINE_MAX_ATTEMPTS", 4))
+    PIPELINE_RETRY_BASE = int(os.environ.get("PIPELINE_RETRY_BASE", 30))  # seconds, doubled per attempt
+    PIPELINE_STEP_LEASE = int(os.environ.get("PIPELINE_STEP_LEASE", 600))  # reclaim steps stuck "running"
+    PREVIEW_MAX_DIM = int(os.environ.get("PREVIEW_MAX_DIM", 400))
+
 class ProductionConfig(Config):
     """Production-specific configuration."""
     DEBUG = False
@@ -68,6 +159,9 @@ class TestingConfig(Config):
     SECRET_KEY = "test-secret-key"
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"  # Use in-memory SQLite database for tests
     WTF_CSRF_ENABLED = False  # Disable CSRF forms for testing
+    BACKGROUND_JOBS_EAGER = True  # Run background jobs inline
+    MAIL_WORKERS = 0  # Tests deliver the outbox explicitly
+    PAGE_TILE_WORKERS = 0  # Render tiles inline
     DEBUG = True
 
 def load_config():
@@ -0,0 +1,100 @@
+# app/document_control/api/audit.py
+"""
+Audit trail search and export API.
+
+GET /api/audit          → keyset-paginated JSON search
+GET /api/audit/export   → streaming CSV / NDJSON export of the same filters
+"""
+
+from datetime import datetime, timezone
+
+from flask import (
+    Blueprint, request, jsonify, current_app, Response, stream_with_context
+)
+from flask_login import login_required, current_user
+
+from app.extensions import db
+from app.services.audit_query import (
+    AUDIT_COLUMNS, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE,
+    parse_audit_filters, audit_select, encode_cursor, parse_details,
+)
+from app.services.streaming_export import EXPORT_FORMATS, serialize_value, stream_rows
+
+bp = Blueprint("audit_api", __name__, url_prefix="/api/audit")
+
+AUDIT_ROLES = ("admin", "doc_control_admin")
+EXPORT_YIELD_PER = 1000
+
+
+def _can_read_audit() -> bool:
+    return any(current_user.has_role(r) for r in AUDIT_ROLES)
+
+
+@bp.route("", methods=["GET"])
+@login_required
+def search_audit():
+    """
+    Search the audit trail.
+    Query params: entity_type, entity_id, user_id, action, since, until
+    (ISO-8601), limit (default 100, max 1000), cursor (from next_cursor).
+    """
+    if not _can_read_audit():
+        return jsonify(error="Unauthorized"), 403
+    try:
+        filters = parse_audit_filters(request.args)
+        limit = min(int(request.args.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        stmt = audit_select(filters, request.args.get("cursor")).limit(limit + 1)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+    rows = db.session.execute(stmt).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    entries = [
+        parse_details({k: serialize_value(v) for k, v in row._mapping.items()})
+        for row in rows
+    ]
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.timestamp, last.id)
+    return jsonify(entries=entries, next_cursor=next_cursor)
+
+
+@bp.route("/export", methods=["GET"])
+@login_required
+def export_audit():
+    """
+    Stream every audit row matching the filters as CSV or NDJSON.
+    Query params: the search filters plus format=csv|ndjson (default ndjson).
+    """
+    if not _can_read_audit():
+        return jsonify(error="Unauthorized"), 403
+    fmt = request.args.get("format", "ndjson").lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify(error=f"Invalid format. Valid formats: {', '.join(EXPORT_FORMATS)}"), 400
+    try:
+        filters = parse_audit_filters(request.args)
+        stmt = audit_select(filters)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+    current_app.logger.info(
+        f"Audit export by user {current_user.id}: format={fmt}, filters={filters}"
+    )
+    transform = parse_details if fmt == "ndjson" else None
+
+    def generate():
+        result = db.session.execute(
+            stmt.execution_options(stream_results=True, yield_per=EXPORT_YIELD_PER)
+        )
+        yield from stream_rows(fmt, result, AUDIT_COLUMNS, transform)
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return Response(
+        stream_with_context(generate()),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename=audit_{stamp}.{fmt}"},
+    )
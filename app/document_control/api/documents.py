@@ -23,6 +23,10 @@ from app.document_control.models import (
 )
 # Import User model correctly
 from app.models import User
+from app.document_control.search import search_documents, DEFAULT_LIMIT as SEARCH_DEFAULT_LIMIT
+from app.document_control.visual_diff import schedule_revision_diff
+from app.document_control.retention import COLD_TIER
+from app.services.user_directory import user_directory
 
 
 # Ensure blueprint name matches registration, e.g., url_prefix="/api/documents"
@@ -222,6 +226,22 @@ def list_documents():
         })
     return jsonify(documents=result)
 
+@bp.route("/search", methods=["GET"])
+@login_required
+def search():
+    """
+    Typeahead search over document number, title, unit, discipline and
+    responsible engineer. Query params: q (required), limit (default 10).
+    """
+    q = request.args.get("q", "").strip()
+    if not q:
+        return jsonify(results=[])
+    try:
+        limit = int(request.args.get("limit", SEARCH_DEFAULT_LIMIT))
+    except ValueError:
+        return jsonify(error="limit must be an integer"), 400
+    return jsonify(results=search_documents(q, limit))
+
 # --- upload_revision needs significant rework ---
 # Option 1: Frontend uploads new file via /files/upload, then calls this with new file_key.
 # Option 2: This endpoint still takes a file, but how does it determine the path?
@@ -257,7 +277,7 @@ def upload_revision(doc_id):
             returned_at=None
         ).first()
         if active_checkout:
-            checked_out_user = User.query.get(active_checkout.user_id)
+            checked_out_user = user_directory.get(active_checkout.user_id)
             username = checked_out_user.username if checked_out_user else "Unknown User"
             return jsonify(error=f"Cannot upload new revision. Latest revision (Rev {latest_revision.revision_code.value}) is checked out by {username}."), 409
 
@@ -332,6 +352,13 @@ def upload_revision(doc_id):
         current_app.logger.error(f"Error committing new revision: {e}", exc_info=True)
         return jsonify(error="Database commit failed."), 500
 
+    # --- Precompute the visual diff against the previous revision ---
+    if latest_revision:
+        try:
+            schedule_revision_diff(latest_revision, rev)
+        except Exception as e:
+            current_app.logger.error(f"Failed to schedule revision diff for {rev.id}: {e}", exc_info=True)
+
     return jsonify(
         message="New revision registered successfully.",
         revision_id=str(rev.id),
@@ -354,12 +381,58 @@ def download_revision(doc_id, rev_id):
     if not rev.file_key:
          current_app.logger.error(f"Revision {rev_id} has no associated file key.")
          return jsonify(error="File key missing for this revision"), 500
+    if rev.storage_tier == COLD_TIER:
+        return jsonify(error="Revision file has been moved to archive storage; "
+                             "contact document control to restore it",
+                       storage_tier=rev.storage_tier), 409
     # file_key is now the direct relative path from MEDIA_ROOT
     download_url = f"{media_url.rstrip('/')}/{rev.file_key.lstrip('/')}"
     # Log audit for download
     # ... (audit log code as before) ...
     return jsonify(url=download_url), 200 # 200 OK, frontend handles redirect/download
 
+@bp.route("/<uuid:doc_id>/revisions/<uuid:rev_id>/diff", methods=["GET"])
+@login_required
+def revision_diff(doc_id, rev_id):
+    """
+    Page-level visual diff of a revision against the previous one, or against
+    ?against=<revision id>. Returns 202 while the diff is still being computed.
+    """
+    rev = DocumentRevision.query.filter_by(id=rev_id, master_id=doc_id).first_or_404()
+    against = request.args.get("against")
+    if against:
+        try:
+            against_id = UUID(against)
+        except ValueError:
+            return jsonify(error="Invalid 'against' revision id"), 400
+        base = DocumentRevision.query.filter_by(id=against_id, master_id=doc_id).first_or_404()
+    else:
+        base = (
+            DocumentRevision.query
+            .filter(DocumentRevision.master_id == doc_id,
+                    DocumentRevision.created_at < rev.created_at)
+            .order_by(DocumentRevision.created_at.desc())
+            .first()
+        )
+        if not base:
+            return jsonify(error="No earlier revision to compare against"), 404
+
+    diff = schedule_revision_diff(base, rev)
+    payload = {
+        "base_revision_id": str(base.id),
+        "base_revision_code": base.revision_code.value,
+        "revision_id": str(rev.id),
+        "revision_code": rev.revision_code.value,
+        "status": diff.status,
+    }
+    if diff.status == "done":
+        payload.update(json.loads(diff.result))
+        return jsonify(payload), 200
+    if diff.status == "failed":
+        payload["error"] = diff.error
+        return jsonify(payload), 422
+    return jsonify(payload), 202
+
 # Checkout and Checkin logic would remain largely the same,
 # as they operate on revision IDs, not directly on file paths for their core logic.
 # Make sure they are included and tested.
@@ -371,7 +444,7 @@ def checkout_revision(doc_id, rev_id):
     rev = DocumentRevision.query.filter_by(id=rev_id, master_id=doc_id).first_or_404()
     active_checkout = CheckoutLog.query.filter_by(revision_id=rev.id, returned_at=None).first()
     if active_checkout:
-        checked_out_user = User.query.get(active_checkout.user_id)
+        checked_out_user = user_directory.get(active_checkout.user_id)
         username = checked_out_user.username if checked_out_user else "Unknown User"
         return jsonify(error=f"Revision already checked out by {username}"), 409
     data = request.get_json(force=True) or {}
@@ -394,7 +467,7 @@ def checkin_revision(doc_id, rev_id):
     if not chk:
         any_checkout = CheckoutLog.query.filter_by(revision_id=rev.id, returned_at=None).first()
         if any_checkout:
-             checked_out_user = User.query.get(any_checkout.user_id)
+             checked_out_user = user_directory.get(any_checkout.user_id)
              username = checked_out_user.username if checked_out_user else "Unknown User"
              return jsonify(error=f"Cannot check in. Revision is checked out by {username}."), 403
         else: return jsonify(error="Revision is not currently checked out by you."), 404
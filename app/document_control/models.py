@@ -5,11 +5,12 @@ import uuid
 
 from sqlalchemy import (
     Column, String, Integer, DateTime, Boolean, ForeignKey, Text,
-    Enum as PgEnum, func
+    Index, Enum as PgEnum, func
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from app.extensions import db
+from app.services.search_index import compact
 from app.models.folder import Folder
 from app.document_control.enums import (
     RevisionCode, StatusCode, SensitivityClass, ComplianceTag
@@ -17,11 +18,21 @@ from app.document_control.enums import (
 
 class DocumentMaster(db.Model):
     __tablename__ = "document_masters"
+    # Retention engine scans: active masters (retired_at IS NULL) by expiry
+    # date, and un-notified active masters by review date, in index order.
+    __table_args__ = (
+        Index("ix_document_masters_retention_due",
+              "retired_at", "retention_expires_at", "id"),
+        Index("ix_document_masters_review_due",
+              "retired_at", "review_notified_at", "review_due", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True,
                 default=uuid.uuid4)
     document_number = Column(String(50), unique=True,
                              nullable=False, index=True)
+    # compact(document_number), e.g. "6300e1"; indexed for prefix typeahead
+    number_key      = Column(String(50), nullable=True, index=True)
     title           = Column(String(255), nullable=False)
     unit            = Column(String(50), nullable=False)
     sheet_number    = Column(String(20), nullable=False)
@@ -45,6 +56,9 @@ class DocumentMaster(db.Model):
 
     is_master      = Column(Boolean, default=True)
     retention_rule = Column(String(100), nullable=True)
+    # Derived from retention_rule + effective_date, see document_control.retention
+    retention_expires_at = Column(DateTime(timezone=True), nullable=True)
+    review_notified_at   = Column(DateTime(timezone=True), nullable=True)
 
     revisions = relationship(
         "DocumentRevision",
@@ -53,9 +67,33 @@ class DocumentMaster(db.Model):
         order_by="DocumentRevision.created_at.desc()"
     )
 
+    @validates("document_number")
+    def _set_number_key(self, key, value):
+        self.number_key = compact(value)
+        return value
+
     def __repr__(self):
         return f"<DocMaster {self.document_number} – {self.title}>"
 
+class DocumentSearchTrigram(db.Model):
+    """
+    Trigram index over DocumentMaster metadata for server-side typeahead.
+    Derived data: maintained by app.document_control.search on every flush
+    and rebuildable from document_masters at any time.
+    """
+    __tablename__ = "document_search_trigrams"
+    __table_args__ = (
+        Index("ix_document_search_trigrams_master_id", "master_id"),
+        {"sqlite_with_rowid": False},
+    )
+
+    trigram   = Column(String(3), primary_key=True)
+    master_id = Column(UUID(as_uuid=True), primary_key=True)
+    weight    = Column(Integer, nullable=False, default=1)
+
+    def __repr__(self):
+        return f"<DocTrigram {self.trigram!r} {self.master_id}>"
+
 class DocumentRevision(db.Model):
     __tablename__ = "document_revisions"
 
@@ -75,6 +113,8 @@ class DocumentRevision(db.Model):
     uploaded_by_id = Column(Integer, ForeignKey("users.id"),
                             nullable=False)
     comments       = Column(Text, nullable=True)
+    # "hot" files live under MEDIA_ROOT, "cold" under COLD_STORAGE_ROOT
+    storage_tier   = Column(String(20), nullable=False, default="hot")
 
     master      = relationship("DocumentMaster",
                                back_populates="revisions")
@@ -91,6 +131,32 @@ class DocumentRevision(db.Model):
         code = self.revision_code.value
         return f"<DocRev {num}-{code}>"
 
+class RevisionDiff(db.Model):
+    """
+    Cached page-level visual diff between two revision files, keyed by the
+    checksum pair so identical file pairs are only ever compared once.
+    """
+    __tablename__ = "revision_diffs"
+    __table_args__ = (
+        Index("ix_revision_diffs_checksums",
+              "base_checksum", "target_checksum", unique=True),
+    )
+
+    id              = Column(Integer, primary_key=True)
+    base_checksum   = Column(String(128), nullable=False)
+    target_checksum = Column(String(128), nullable=False)
+    status          = Column(String(20), nullable=False, default="pending")
+    result          = Column(Text, nullable=True)   # JSON, see visual_diff
+    error           = Column(Text, nullable=True)
+    created_at      = Column(DateTime(timezone=True),
+                             default=lambda: datetime.now(timezone.utc))
+    started_at      = Column(DateTime(timezone=True), nullable=True)  # claim time while "running"
+    completed_at    = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return (f"<RevDiff {self.base_checksum[:8]}..{self.target_checksum[:8]} "
+                f"{self.status}>")
+
 class CheckoutLog(db.Model):
     __tablename__ = "checkout_logs"
 
@@ -145,6 +211,17 @@ class ChangeRequest(db.Model):
 
 class AuditLog(db.Model):
     __tablename__ = "audit_logs"
+    # Composite indexes back the audit search API: every filter combination
+    # ends in (timestamp, id) so keyset pagination is an index range scan.
+    __table_args__ = (
+        Index("ix_audit_logs_entity_timestamp",
+              "entity_type", "entity_id", "timestamp", "id"),
+        Index("ix_audit_logs_user_timestamp",
+              "user_id", "timestamp", "id"),
+        Index("ix_audit_logs_action_timestamp",
+              "action", "timestamp", "id"),
+        Index("ix_audit_logs_timestamp", "timestamp", "id"),
+    )
 
     id         = Column(Integer, primary_key=True)
     user_id    = Column(Integer, ForeignKey("users.id"),
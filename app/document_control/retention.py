@@ -0,0 +1,276 @@
+# app/document_control/retention.py
+"""
+Scheduled retention and review-due engine for DocumentMaster.
+
+``retention_expires_at`` is computed from ``retention_rule`` and
+``effective_date`` whenever a master is written, so the periodic job only
+needs index range scans over active masters:
+
+- review notices: un-notified masters whose ``review_due`` falls inside the
+  notice window; owners (``responsible_engineer``) get one email per run.
+- retention: masters whose ``retention_expires_at`` has passed are retired,
+  audited, and their revision files moved to COLD_STORAGE_ROOT.
+
+Both scans walk the composite indexes declared on DocumentMaster in keyset
+batches and commit per batch. Run from cron via scripts/run_retention.py.
+"""
+
+import json
+import logging
+import re
+import shutil
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from dateutil.relativedelta import relativedelta
+from flask import current_app
+from sqlalchemy import event, select, and_, or_
+from sqlalchemy.orm import attributes
+
+from app.extensions import db
+from app.document_control.models import DocumentMaster, DocumentRevision, AuditLog
+from app.models.enums import Role
+from app.models.user import User
+from app.services.email_service import send_email
+from app.services.storage_adapter import LocalFSAdapter
+
+logger = logging.getLogger(__name__)
+
+HOT_TIER = "hot"
+COLD_TIER = "cold"
+
+# Rules that never expire.
+PERMANENT_RULES = {"permanent", "indefinite", "life of plant", "none"}
+
+_UNITS = {
+    "y": "years", "yr": "years", "yrs": "years", "year": "years", "years": "years",
+    "m": "months", "mo": "months", "month": "months", "months": "months",
+    "w": "weeks", "wk": "weeks", "week": "weeks", "weeks": "weeks",
+    "d": "days", "day": "days", "days": "days",
+}
+_SIMPLE_RULE = re.compile(r"^(\d+)\s*([a-z]+)$")
+_ISO_RULE = re.compile(r"^p(?:(\d+)y)?(?:(\d+)m)?(?:(\d+)w)?(?:(\d+)d)?$")
+
+
+def retention_period(rule: str | None) -> relativedelta | None:
+    """
+    Parse a retention rule such as "7 years", "18m", "90 days" or "P7Y6M".
+    Returns None for permanent, empty or unrecognised rules.
+    """
+    text = (rule or "").strip().lower()
+    if not text or text in PERMANENT_RULES:
+        return None
+    match = _SIMPLE_RULE.match(text)
+    if match and match.group(2) in _UNITS:
+        return relativedelta(**{_UNITS[match.group(2)]: int(match.group(1))})
+    match = _ISO_RULE.match(text)
+    if match and any(match.groups()):
+        years, months, weeks, days = (int(g or 0) for g in match.groups())
+        return relativedelta(years=years, months=months, weeks=weeks, days=days)
+    logger.warning(f"Unrecognised retention rule {rule!r}; treating as permanent")
+    return None
+
+
+def retention_expiry(master) -> datetime | None:
+    period = retention_period(master.retention_rule)
+    if period is None:
+        return None
+    start = master.effective_date or master.created_at or datetime.now(timezone.utc)
+    return start + period
+
+
+@event.listens_for(DocumentMaster, "before_insert")
+@event.listens_for(DocumentMaster, "before_update")
+def _compute_retention_fields(mapper, connection, target):
+    target.retention_expires_at = retention_expiry(target)
+    # A new review date needs a new notice.
+    if attributes.get_history(target, "review_due").has_changes():
+        target.review_notified_at = None
+
+
+def _keyset_batches(criteria, sort_col, batch_size):
+    """Yield batches of masters ordered by (sort_col, id), one range scan each."""
+    last = None
+    while True:
+        stmt = select(DocumentMaster).where(*criteria)
+        if last is not None:
+            stmt = stmt.where(or_(
+                sort_col > last[0],
+                and_(sort_col == last[0], DocumentMaster.id > last[1]),
+            ))
+        batch = db.session.execute(
+            stmt.order_by(sort_col, DocumentMaster.id).limit(batch_size)
+        ).scalars().all()
+        if not batch:
+            return
+        last = (getattr(batch[-1], sort_col.key), batch[-1].id)
+        yield batch
+
+
+def _owner_emails(masters) -> dict[str, str]:
+    """responsible_engineer (username or full name) → user email."""
+    names = {m.responsible_engineer for m in masters if m.responsible_engineer}
+    if not names:
+        return {}
+    rows = db.session.execute(
+        select(User.username, User.actual_name, User.email)
+        .where(or_(User.username.in_(names), User.actual_name.in_(names)))
+    ).all()
+    emails = {}
+    for row in rows:
+        emails[row.username] = row.email
+        emails.setdefault(row.actual_name, row.email)
+    return emails
+
+
+def _send_review_notice(recipient: str, lines: list[str]) -> None:
+    send_email(
+        subject=f"[Kern Energy Nexus] {len(lines)} document(s) due for review",
+        recipients=[recipient],
+        body="The following controlled documents are due for periodic review:\n\n"
+             + "\n".join(lines),
+    )
+
+
+def notify_upcoming_reviews(now: datetime = None, window_days: int = None,
+                            batch_size: int = None) -> int:
+    """Email owners of active masters whose review falls due within the window."""
+    now = now or datetime.now(timezone.utc)
+    window_days = window_days or current_app.config.get("REVIEW_NOTICE_DAYS", 30)
+    batch_size = batch_size or current_app.config.get("RETENTION_BATCH_SIZE", 500)
+    fallback = current_app.config.get("MAILING_ADDRESS")
+    criteria = (
+        DocumentMaster.retired_at.is_(None),
+        DocumentMaster.review_notified_at.is_(None),
+        DocumentMaster.review_due <= now + timedelta(days=window_days),
+    )
+    notified = 0
+    for batch in _keyset_batches(criteria, DocumentMaster.review_due, batch_size):
+        emails = _owner_emails(batch)
+        by_recipient = defaultdict(list)
+        for master in batch:
+            recipient = emails.get(master.responsible_engineer) or fallback
+            if recipient:
+                by_recipient[recipient].append(
+                    f"- {master.document_number} – {master.title} "
+                    f"(review due {master.review_due:%Y-%m-%d})"
+                )
+            master.review_notified_at = now
+        # Notices go to the outbox, so they commit atomically with the
+        # review_notified_at stamps.
+        for recipient, lines in by_recipient.items():
+            _send_review_notice(recipient, lines)
+        db.session.commit()
+        notified += len(batch)
+    return notified
+
+
+def _archive_files(revisions) -> int:
+    """Copy hot revision files to cold storage and flag them; returns files copied."""
+    hot, cold = LocalFSAdapter(), LocalFSAdapter(current_app.config["COLD_STORAGE_ROOT"])
+    moved = 0
+    for rev in revisions:
+        src, dst = hot._resolve(rev.file_key), cold._resolve(rev.file_key)
+        if not src.is_file() and not dst.is_file():
+            logger.warning(f"Revision {rev.id} file {rev.file_key!r} missing; left in hot tier")
+            continue
+        if src.is_file():
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(src, dst)
+            moved += 1
+        rev.storage_tier = COLD_TIER
+    return moved
+
+
+def _release_hot_files(file_keys) -> None:
+    """Delete hot copies no longer referenced by any hot-tier revision."""
+    if not file_keys:
+        return
+    still_hot = set(db.session.execute(
+        select(DocumentRevision.file_key)
+        .where(DocumentRevision.file_key.in_(file_keys),
+               DocumentRevision.storage_tier == HOT_TIER)
+    ).scalars())
+    hot = LocalFSAdapter()
+    for key in set(file_keys) - still_hot:
+        path = hot._resolve(key)
+        if path.is_file():
+            path.unlink()
+
+
+def _retention_actor_id() -> int | None:
+    """Audit entries for automatic retirement are attributed to the first admin."""
+    return db.session.execute(
+        select(User.id).where(User.role == Role.ADMIN).order_by(User.id).limit(1)
+    ).scalar()
+
+
+def retire_expired_documents(now: datetime = None, batch_size: int = None,
+                             actor_id: int = None) -> dict:
+    """Retire active masters past their retention date and archive their files."""
+    now = now or datetime.now(timezone.utc)
+    batch_size = batch_size or current_app.config.get("RETENTION_BATCH_SIZE", 500)
+    archive = current_app.config.get("RETENTION_ARCHIVE_FILES", True)
+    actor_id = actor_id or _retention_actor_id()
+    if actor_id is None:
+        logger.warning("No admin user found; automatic retirements will not be audited")
+    criteria = (
+        DocumentMaster.retired_at.is_(None),
+        DocumentMaster.retention_expires_at <= now,
+    )
+    summary = {"retired": 0, "files_archived": 0}
+    for batch in _keyset_batches(criteria, DocumentMaster.retention_expires_at, batch_size):
+        revisions = []
+        if archive:
+            revisions = db.session.execute(
+                select(DocumentRevision)
+                .where(DocumentRevision.master_id.in_([m.id for m in batch]),
+                       DocumentRevision.storage_tier == HOT_TIER)
+            ).scalars().all()
+            summary["files_archived"] += _archive_files(revisions)
+        for master in batch:
+            master.retired_at = now
+            if actor_id is not None:
+                db.session.add(AuditLog(
+                    user_id=actor_id,
+                    action="auto_retire",
+                    entity_type="DocumentMaster",
+                    entity_id=str(master.id),
+                    details=json.dumps({
+                        "retention_rule": master.retention_rule,
+                        "retention_expires_at": master.retention_expires_at.isoformat(),
+                    }),
+                ))
+        archived_keys = [r.file_key for r in revisions if r.storage_tier == COLD_TIER]
+        db.session.commit()
+        # Hot copies are only removed once the cold tier is committed.
+        _release_hot_files(archived_keys)
+        summary["retired"] += len(batch)
+    return summary
+
+
+def run_retention_cycle(now: datetime = None) -> dict:
+    """One scheduler tick: review notices, then retention."""
+    now = now or datetime.now(timezone.utc)
+    summary = {"review_notices": notify_upcoming_reviews(now)}
+    summary.update(retire_expired_documents(now))
+    return summary
+
+
+def backfill_retention_expiry(batch_size: int = 1000) -> int:
+    """Compute retention_expires_at for masters written before it existed."""
+    count = 0
+    last_id = None
+    while True:
+        stmt = select(DocumentMaster).order_by(DocumentMaster.id).limit(batch_size)
+        if last_id is not None:
+            stmt = stmt.where(DocumentMaster.id > last_id)
+        batch = db.session.execute(stmt).scalars().all()
+        if not batch:
+            break
+        for master in batch:
+            master.retention_expires_at = retention_expiry(master)
+        last_id = batch[-1].id
+        count += len(batch)
+        db.session.commit()
+    return count
@@ -0,0 +1,187 @@
+# app/document_control/search.py
+"""
+Typeahead search over DocumentMaster metadata.
+
+The trigram table is kept in sync by a session ``after_flush`` hook, so
+every ORM write to a DocumentMaster (create, edit, delete) updates the
+index in the same transaction. Bulk ``query.update()`` calls bypass the
+hook; run ``rebuild_document_index()`` after those.
+"""
+
+import math
+
+from sqlalchemy import event, inspect, select, delete, insert, func
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.document_control.models import DocumentMaster, DocumentSearchTrigram
+from app.services.search_index import trigrams, query_trigrams, compact
+
+# Field → weight. Document numbers dominate ranking, then titles.
+INDEXED_FIELDS = {
+    "document_number": 4,
+    "title": 2,
+    "unit": 1,
+    "discipline": 1,
+    "responsible_engineer": 1,
+}
+
+# Fraction of query trigrams a document must contain to be a hit.
+MIN_MATCH_RATIO = 0.7
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+def _document_trigrams(master) -> dict[str, int]:
+    """Trigram → highest field weight for one master."""
+    grams = {}
+    for field, weight in INDEXED_FIELDS.items():
+        value = getattr(master, field, None)
+        field_grams = trigrams(value)
+        if field == "document_number":
+            field_grams |= trigrams(compact(value))
+        for g in field_grams:
+            if grams.get(g, 0) < weight:
+                grams[g] = weight
+    return grams
+
+
+def index_documents(connection, masters) -> None:
+    """Replace the index rows for the given masters."""
+    masters = [m for m in masters if m.id is not None]
+    if not masters:
+        return
+    connection.execute(
+        delete(DocumentSearchTrigram)
+        .where(DocumentSearchTrigram.master_id.in_([m.id for m in masters]))
+    )
+    rows = [
+        {"trigram": g, "master_id": m.id, "weight": w}
+        for m in masters
+        for g, w in _document_trigrams(m).items()
+    ]
+    if rows:
+        connection.execute(insert(DocumentSearchTrigram), rows)
+
+
+def unindex_documents(connection, master_ids) -> None:
+    if master_ids:
+        connection.execute(
+            delete(DocumentSearchTrigram)
+            .where(DocumentSearchTrigram.master_id.in_(list(master_ids)))
+        )
+
+
+def _indexed_fields_changed(master) -> bool:
+    state = inspect(master)
+    return any(state.attrs[f].history.has_changes() for f in INDEXED_FIELDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_document_search_index(session, flush_context):
+    changed = [
+        o for o in session.new if isinstance(o, DocumentMaster)
+    ] + [
+        o for o in session.dirty
+        if isinstance(o, DocumentMaster) and _indexed_fields_changed(o)
+    ]
+    removed = [o.id for o in session.deleted if isinstance(o, DocumentMaster)]
+    if not (changed or removed):
+        return
+    connection = session.connection()
+    index_documents(connection, changed)
+    unindex_documents(connection, removed)
+
+
+def rebuild_document_index(batch_size: int = 1000) -> int:
+    """Rebuild the whole trigram table from document_masters. Returns rows indexed."""
+    db.session.execute(delete(DocumentSearchTrigram))
+    count = 0
+    last_number = None
+    while True:
+        stmt = select(DocumentMaster).order_by(DocumentMaster.document_number).limit(batch_size)
+        if last_number is not None:
+            stmt = stmt.where(DocumentMaster.document_number > last_number)
+        batch = db.session.execute(stmt).scalars().all()
+        if not batch:
+            break
+        index_documents(db.session.connection(), batch)
+        count += len(batch)
+        last_number = batch[-1].document_number
+        db.session.expunge_all()
+    db.session.commit()
+    return count
+
+
+_RESULT_COLUMNS = (
+    DocumentMaster.id, DocumentMaster.document_number, DocumentMaster.title,
+    DocumentMaster.unit, DocumentMaster.discipline,
+    DocumentMaster.responsible_engineer, DocumentMaster.status,
+)
+
+
+def _number_prefix_matches(needle: str, limit: int):
+    """Index range scan on number_key: "6300e1" → 6300-E-1, 6300-E-12, ..."""
+    upper = needle[:-1] + chr(ord(needle[-1]) + 1)
+    return db.session.execute(
+        select(*_RESULT_COLUMNS)
+        .where(DocumentMaster.number_key >= needle,
+               DocumentMaster.number_key < upper)
+        .order_by(DocumentMaster.number_key)
+        .limit(limit)
+    ).all()
+
+
+def _trigram_matches(query: str, limit: int, exclude):
+    """One grouped index lookup, ranked by trigram coverage then field weight."""
+    grams = query_trigrams(query) | query_trigrams(compact(query))
+    if not grams:
+        return []
+    min_hits = max(1, math.ceil(len(grams) * MIN_MATCH_RATIO))
+    hits = func.count().label("hits")
+    score = func.sum(DocumentSearchTrigram.weight).label("score")
+    candidates = db.session.execute(
+        select(DocumentSearchTrigram.master_id, hits, score)
+        .where(DocumentSearchTrigram.trigram.in_(grams))
+        .group_by(DocumentSearchTrigram.master_id)
+        .having(func.count() >= min_hits)
+        .order_by(hits.desc(), score.desc())
+        .limit(limit + len(exclude))
+    ).all()
+    ranks = {row.master_id: (row.hits, row.score) for row in candidates
+             if row.master_id not in exclude}
+    if not ranks:
+        return []
+    masters = db.session.execute(
+        select(*_RESULT_COLUMNS).where(DocumentMaster.id.in_(list(ranks)))
+    ).all()
+    masters.sort(key=lambda m: (-ranks[m.id][0], -ranks[m.id][1], m.document_number))
+    return masters[:limit]
+
+
+def search_documents(query: str, limit: int = DEFAULT_LIMIT) -> list[dict]:
+    """
+    Ranked typeahead search. Document-number prefix hits come first (exact
+    match first, then in number order) from the number_key index; remaining
+    slots are filled from the trigram index over all metadata fields.
+    """
+    limit = max(1, min(limit, MAX_LIMIT))
+    needle = compact(query)
+    if not needle:
+        return []
+    matches = _number_prefix_matches(needle, limit)
+    if len(matches) < limit:
+        seen = {m.id for m in matches}
+        matches += _trigram_matches(query, limit - len(matches), seen)
+    return [
+        {
+            "id": str(m.id),
+            "document_number": m.document_number,
+            "title": m.title,
+            "unit": m.unit,
+            "discipline": m.discipline,
+            "responsible_engineer": m.responsible_engineer,
+            "status": m.status.value,
+        }
+        for m in matches
+    ]
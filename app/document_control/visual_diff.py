@@ -0,0 +1,229 @@
+# app/document_control/visual_diff.py
+"""
+Page-level visual diffs between document revisions.
+
+When a new DocumentRevision is registered, the previous and new files are
+rasterized page by page, compared pixel-wise, and the changed regions are
+stored as normalized bounding boxes ([x0, y0, x1, y1] in 0..1 page units)
+in a RevisionDiff row keyed by the two file checksums.
+
+Comparisons run through app.services.task_queue (Celery when configured).
+A diff left "running" for REVISION_DIFF_TIMEOUT seconds (its worker died)
+can be claimed again. Asking for it re-queues the comparison, and
+``sweep_revision_diffs()`` re-queues every pending or abandoned diff; the
+server runs it at boot and scripts/sweep_pipeline.py runs it from cron.
+"""
+
+import json
+import math
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from itertools import zip_longest
+
+from flask import current_app
+from PIL import Image, ImageChops, ImageFilter
+from sqlalchemy import select, update, or_, and_
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.document_control.models import DocumentRevision, RevisionDiff
+from app.services.page_renderer import render_pages, is_renderable
+from app.services.storage_adapter import LocalFSAdapter
+from app.services.task_queue import task, enqueue
+
+# Longest side pages are compared at; large enough for drawing annotations.
+DIFF_MAX_DIM = 2000
+# Grey-level difference treated as a real change (filters scan noise).
+PIXEL_THRESHOLD = 48
+# Changed pixels are grouped into CELL x CELL blocks before region labelling.
+CELL = 16
+
+
+def _changed_regions(mask: Image.Image) -> list[list[float]]:
+    """Label connected blocks of changed pixels and return their bounding boxes."""
+    width, height = mask.size
+    gw, gh = math.ceil(width / CELL), math.ceil(height / CELL)
+    # Any changed pixel in a block makes the block non-zero; dilating by one
+    # block merges marks that sit next to each other into one region.
+    grid = mask.resize((gw, gh), Image.BOX).point(lambda v: 255 if v else 0)
+    grid = grid.filter(ImageFilter.MaxFilter(3))
+    cells = grid.tobytes()
+
+    seen = bytearray(gw * gh)
+    regions = []
+    for start in range(gw * gh):
+        if not cells[start] or seen[start]:
+            continue
+        seen[start] = 1
+        queue = deque([start])
+        x0 = x1 = start % gw
+        y0 = y1 = start // gw
+        while queue:
+            idx = queue.popleft()
+            x, y = idx % gw, idx // gw
+            x0, x1, y0, y1 = min(x0, x), max(x1, x), min(y0, y), max(y1, y)
+            for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if 0 <= nx < gw and 0 <= ny < gh:
+                    n = ny * gw + nx
+                    if cells[n] and not seen[n]:
+                        seen[n] = 1
+                        queue.append(n)
+        regions.append([
+            round(x0 * CELL / width, 4),
+            round(y0 * CELL / height, 4),
+            round(min((x1 + 1) * CELL, width) / width, 4),
+            round(min((y1 + 1) * CELL, height) / height, 4),
+        ])
+    return regions
+
+
+def compare_pages(base: Image.Image, target: Image.Image) -> dict:
+    """Pixel-diff two greyscale page images of possibly different sizes."""
+    if target.size != base.size:
+        target = target.resize(base.size, Image.BILINEAR)
+    mask = ImageChops.difference(base, target).point(
+        lambda v: 255 if v > PIXEL_THRESHOLD else 0
+    )
+    mask = mask.filter(ImageFilter.MedianFilter(3))
+    changed = mask.histogram()[255]
+    if not changed:
+        return {"status": "unchanged", "changed_ratio": 0.0, "regions": []}
+    return {
+        "status": "changed",
+        "changed_ratio": round(changed / (base.size[0] * base.size[1]), 6),
+        "regions": _changed_regions(mask),
+    }
+
+
+def compute_diff(base_path, target_path) -> dict:
+    """Compare two files page by page, holding only one page pair in memory."""
+    pages = []
+    counts = {"base": 0, "target": 0}
+    pairs = zip_longest(
+        render_pages(base_path, DIFF_MAX_DIM), render_pages(target_path, DIFF_MAX_DIM),
+        fillvalue=False,
+    )
+    for number, (base, target) in enumerate(pairs, start=1):
+        if base is not False:
+            counts["base"] += 1
+        if target is not False:
+            counts["target"] += 1
+        if base is False:
+            page = {"status": "added", "changed_ratio": 1.0, "regions": [[0, 0, 1, 1]]}
+        elif target is False:
+            page = {"status": "removed", "changed_ratio": 1.0, "regions": [[0, 0, 1, 1]]}
+        elif base is None or target is None:
+            page = {"status": "unrenderable", "changed_ratio": None, "regions": []}
+        else:
+            page = compare_pages(base, target)
+        pages.append({"page": number, **page})
+    return {"page_count": counts, "pages": pages}
+
+
+def _stale_before(now: datetime) -> datetime:
+    return now - timedelta(seconds=current_app.config.get("REVISION_DIFF_TIMEOUT", 900))
+
+
+def _claimable(now: datetime):
+    """Pending diffs, and running ones whose worker has been gone too long."""
+    return or_(
+        RevisionDiff.status == "pending",
+        and_(RevisionDiff.status == "running",
+             or_(RevisionDiff.started_at.is_(None), RevisionDiff.started_at < _stale_before(now))),
+    )
+
+
+@task
+def run_revision_diff(diff_id: int, base_key: str, target_key: str) -> None:
+    """Background job: compute and store one RevisionDiff."""
+    now = datetime.now(timezone.utc)
+    claimed = db.session.execute(
+        update(RevisionDiff)
+        .where(RevisionDiff.id == diff_id, _claimable(now))
+        .values(status="running", started_at=now)
+        .execution_options(synchronize_session=False)  # committed (and expired) just below
+    ).rowcount
+    db.session.commit()
+    if not claimed:
+        return
+
+    diff = db.session.get(RevisionDiff, diff_id)
+    try:
+        adapter = LocalFSAdapter()
+        result = compute_diff(adapter._resolve(base_key), adapter._resolve(target_key))
+        diff.result = json.dumps(result, separators=(",", ":"))
+        diff.status = "done"
+    except Exception as e:
+        current_app.logger.error(f"Revision diff {diff_id} failed: {e}", exc_info=True)
+        diff.status = "failed"
+        diff.error = str(e)
+    diff.completed_at = datetime.now(timezone.utc)
+    db.session.commit()
+
+
+def schedule_revision_diff(base_rev, target_rev) -> RevisionDiff:
+    """
+    Return the cached diff for the revision pair, creating and queueing it if
+    needed. Identical checksums resolve immediately without rendering.
+    """
+    diff = RevisionDiff.query.filter_by(
+        base_checksum=base_rev.checksum, target_checksum=target_rev.checksum
+    ).first()
+    if diff is None:
+        diff = RevisionDiff(base_checksum=base_rev.checksum,
+                            target_checksum=target_rev.checksum, status="pending")
+        if base_rev.checksum == target_rev.checksum:
+            diff.status = "done"
+            diff.result = json.dumps({"page_count": None, "pages": []})
+            diff.completed_at = datetime.now(timezone.utc)
+        elif not (is_renderable(base_rev.file_key) and is_renderable(target_rev.file_key)):
+            diff.status = "failed"
+            diff.error = "Unsupported file type for visual diff"
+        db.session.add(diff)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another request registered the same pair first.
+            db.session.rollback()
+            return RevisionDiff.query.filter_by(
+                base_checksum=base_rev.checksum, target_checksum=target_rev.checksum
+            ).one()
+    if diff.status == "pending" or (diff.status == "running" and _abandoned(diff)):
+        enqueue(run_revision_diff, diff.id, base_rev.file_key, target_rev.file_key)
+    return diff
+
+
+def _abandoned(diff) -> bool:
+    started = diff.started_at
+    if started is None:
+        return True
+    if started.tzinfo is None:  # SQLite drops the zone
+        started = started.replace(tzinfo=timezone.utc)
+    return started < _stale_before(datetime.now(timezone.utc))
+
+
+def _file_key(checksum: str) -> str | None:
+    return db.session.execute(
+        select(DocumentRevision.file_key).where(DocumentRevision.checksum == checksum).limit(1)
+    ).scalar()
+
+
+def sweep_revision_diffs(inline: bool = False) -> int:
+    """
+    Queue every pending or abandoned diff (or, with ``inline``, run them on
+    the calling thread). Returns diffs found.
+    """
+    diffs = db.session.execute(
+        select(RevisionDiff.id, RevisionDiff.base_checksum, RevisionDiff.target_checksum)
+        .where(_claimable(datetime.now(timezone.utc)))
+        .order_by(RevisionDiff.id)
+    ).all()
+    for diff_id, base_checksum, target_checksum in diffs:
+        base_key, target_key = _file_key(base_checksum), _file_key(target_checksum)
+        if base_key is None or target_key is None:
+            continue  # revisions gone; nothing left to compare
+        if inline:
+            run_revision_diff(diff_id, base_key, target_key)
+        else:
+            enqueue(run_revision_diff, diff_id, base_key, target_key)
+    return len(diffs)
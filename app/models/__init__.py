@@ -4,18 +4,30 @@ Initialize all models for the Kern-Energy-Nexus platform.
 """
 
 from app.models.user import User
+from app.models.outbound_email import OutboundEmail
+from app.models.pending_notification import PendingNotification
 from app.models.ticket import DraftingTicket
+from app.models.ticket_sequence import TicketSequence
+from app.models.ticket_counter import TicketCounter
+from app.models.ticket_daily_rollup import TicketDailyRollup
+from app.models.ticket_status_transition import TicketStatusTransition
+from app.models.ticket_event import TicketEvent
+from app.models.ticket_search_term import TicketSearchTerm
 from app.models.project import Project
 from app.models.revision_history import RevisionHistory
 from app.models.form_submission import QualityForm
 from app.models.ticket_attachment import TicketAttachment
+from app.models.ticket_processing_task import TicketProcessingTask
 from app.models.review_comment import ReviewComment
 from app.models.review_comment_read_status import ReviewCommentReadStatus
+from app.models.review_annotation import ReviewAnnotation
 
 
 from app.document_control.models import (
     DocumentMaster,
     DocumentRevision,
+    DocumentSearchTrigram,
+    RevisionDiff,
     CheckoutLog,
     ChangeRequest,
     AuditLog
@@ -20,3 +20,8 @@ class SensitivityClass(Enum):
     CONFIDENTIAL    = "confidential"
     INTERNAL    = "internal"
     PUBLIC    = "public"
+
+class NotificationFrequency(Enum):
+    IMMEDIATE   = "immediate"
+    HOURLY      = "hourly"
+    DAILY       = "daily"
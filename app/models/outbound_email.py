@@ -0,0 +1,33 @@
+from datetime import datetime
+from app.extensions import db
+
+
+class OutboundEmail(db.Model):
+    """
+    Persistent mail outbox. Rows are written by send_email in the caller's
+    transaction and delivered by app.services.mail_delivery workers.
+    """
+    __tablename__ = 'outbound_emails'
+    # Workers claim due rows in (status, next_attempt_at, id) order.
+    __table_args__ = (
+        db.Index('ix_outbound_emails_due', 'status', 'next_attempt_at', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    recipients = db.Column(db.Text, nullable=False)   # JSON list
+    cc = db.Column(db.Text, nullable=True)            # JSON list
+    body = db.Column(db.Text, nullable=True)
+    html = db.Column(db.Text, nullable=True)
+    attachments = db.Column(db.Text, nullable=True)   # JSON list of file paths
+
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, sending, sent, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<OutboundEmail {self.id} {self.subject!r} ({self.status})>"
@@ -0,0 +1,26 @@
+from datetime import datetime
+from app.extensions import db
+
+
+class PendingNotification(db.Model):
+    """
+    A ticket notification held for a user's hourly or daily digest.
+    Rows are removed by app.notifications.digest once the digest is queued.
+    """
+    __tablename__ = 'pending_notifications'
+    # The digest run scans due rows by (deliver_after, user_id).
+    __table_args__ = (
+        db.Index('ix_pending_notifications_due', 'deliver_after', 'user_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    category = db.Column(db.String(30), nullable=False)  # assignment, review, new_ticket, completion
+    ticket_number = db.Column(db.String(50), nullable=True)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    deliver_after = db.Column(db.DateTime, nullable=False)  # end of the digest window
+
+    def __repr__(self):
+        return f"<PendingNotification {self.category} user={self.user_id} {self.ticket_number}>"
@@ -0,0 +1,34 @@
+from datetime import datetime
+from app.extensions import db
+
+
+class ReviewAnnotation(db.Model):
+    """
+    An engineer's markup on one page of a review attachment, stored as a
+    JSON list of shapes in page-relative (0-1) coordinates. Validated and
+    flattened into PDFs by app.services.review_annotations.
+    """
+    __tablename__ = 'review_annotations'
+    __table_args__ = (
+        db.UniqueConstraint('attachment_id', 'page_number', name='uq_review_annotations_attachment_page'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    attachment_id = db.Column(db.Integer, db.ForeignKey('ticket_attachments.id', ondelete='CASCADE'), nullable=False)
+    page_number = db.Column(db.Integer, nullable=False)
+    shapes = db.Column(db.JSON, nullable=False, default=list)
+    updated_by_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    attachment = db.relationship('TicketAttachment')
+
+    def to_dict(self):
+        return {
+            "page_number": self.page_number,
+            "shapes": self.shapes,
+            "updated_by_id": self.updated_by_id,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+    def __repr__(self):
+        return f"<ReviewAnnotation attachment={self.attachment_id} page={self.page_number}>"
@@ -4,6 +4,10 @@ from app.extensions import db
 
 class ReviewCommentReadStatus(db.Model):
     __tablename__ = 'review_comment_read_status'
+    # One row per reader and comment; serves unread counts and bulk mark-read.
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'comment_id', name='uq_review_comment_read_status_user_comment'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     comment_id = db.Column(db.Integer, db.ForeignKey('review_comments.id'), nullable=False)
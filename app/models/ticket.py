@@ -3,6 +3,17 @@ from app.extensions import db
 
 class DraftingTicket(db.Model):
     __tablename__ = 'drafting_tickets'
+    # Admin queue pages: status filter + keyset order on (sort key, id)
+    __table_args__ = (
+        db.Index('ix_drafting_tickets_status_created', 'status', 'created_at', 'id'),
+        db.Index('ix_drafting_tickets_status_priority', 'status', 'priority', 'id'),
+        # SLA breach scan (app/services/ticket_sla.py)
+        db.Index('ix_drafting_tickets_status_changed', 'status', 'status_changed_at'),
+    )
+
+    # Columns declared with active_history=True load their old value on
+    # assignment, so flush hooks see both sides of a change: ticket counters,
+    # daily rollups, SLA transitions and live events.
 
     id = db.Column(db.Integer, primary_key=True)
     ticket_number = db.Column(db.String(20), unique=True, nullable=False, index=True)
@@ -12,20 +23,29 @@ class DraftingTicket(db.Model):
     moc = db.Column(db.String(100), nullable=True)
     description = db.Column(db.Text, nullable=False)
     priority = db.Column(db.Integer, nullable=False, default=3)
-    unit = db.Column(db.String(50), nullable=True)
+    unit = db.mapped_column(db.String(50), nullable=True, active_history=True)
     request_type = db.Column(db.String(50), nullable=False)
 
     # Assignment Foreign Keys
-    review_engineer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
-    assigned_to_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
-    submitted_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
+    review_engineer_id = db.mapped_column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True,
+                                          active_history=True)
+    assigned_to_id = db.mapped_column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True,
+                                      active_history=True)
+    submitted_by_id = db.mapped_column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True,
+                                       active_history=True)
     project_engineer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
 
     # Status and timeline
-    status = db.Column(db.String(50), default='unassigned', index=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    due_date = db.Column(db.DateTime, nullable=True)
-    assigned_viewed = db.Column(db.Boolean, default=False)
+    status = db.mapped_column(db.String(50), default='unassigned', index=True, active_history=True)
+    created_at = db.mapped_column(db.DateTime, default=datetime.utcnow, active_history=True)
+    due_date = db.Column(db.DateTime, nullable=True, index=True)
+    status_changed_at = db.Column(db.DateTime, nullable=True)
+    sla_breached_at = db.Column(db.DateTime, nullable=True)  # current status past its SLA target
+    due_breached_at = db.Column(db.DateTime, nullable=True)  # open past due_date
+    assigned_viewed = db.mapped_column(db.Boolean, default=False, active_history=True)
+    # Last TicketEvent.seq handed out and review rounds so far (app/services/ticket_events.py)
+    event_seq = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    revision = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # --- Refactored Relationships ---
     review_engineer = db.relationship('User', foreign_keys=[review_engineer_id], back_populates='tickets_reviewing')
@@ -33,7 +53,8 @@ class DraftingTicket(db.Model):
     submitted_by = db.relationship('User', foreign_keys=[submitted_by_id], back_populates='tickets_submitted')
     project_engineer = db.relationship('User', foreign_keys=[project_engineer_id], back_populates='tickets_project_lead')
 
-    attachments = db.relationship('TicketAttachment', back_populates='ticket', lazy='joined', cascade='all, delete-orphan')
+    # Loaded on access only; list views opt in with selectinload (see ticket_queue.ticket_list_options)
+    attachments = db.relationship('TicketAttachment', back_populates='ticket', lazy='select', cascade='all, delete-orphan')
     review_comments = db.relationship('ReviewComment', back_populates='ticket', lazy='dynamic', cascade='all, delete-orphan')
 
     # Specs (isometric/as-built fields)
@@ -6,7 +6,7 @@ class TicketAttachment(db.Model):
     __tablename__ = 'ticket_attachments'
 
     id = db.Column(db.Integer, primary_key=True)
-    ticket_id = db.Column(db.Integer, db.ForeignKey('drafting_tickets.id'), nullable=False)
+    ticket_id = db.Column(db.Integer, db.ForeignKey('drafting_tickets.id'), nullable=False, index=True)
     uploaded_by_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
 
     file_path = db.Column(db.String(255), nullable=False)
@@ -18,6 +18,12 @@ class TicketAttachment(db.Model):
 
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Filled in by the post-submission pipeline (app.services.ticket_pipeline)
+    checksum = db.Column(db.String(128), nullable=True)
+    file_size = db.Column(db.Integer, nullable=True)
+    page_count = db.Column(db.Integer, nullable=True)
+    preview_path = db.Column(db.String(255), nullable=True)
+
     ticket = db.relationship("DraftingTicket", back_populates="attachments")
     uploader = db.relationship("User", back_populates="attachments_uploaded")
 
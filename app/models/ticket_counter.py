@@ -0,0 +1,18 @@
+from app.extensions import db
+
+
+class TicketCounter(db.Model):
+    """
+    Ticket count per (user, relationship, status), maintained by
+    app.services.ticket_counters in the same transaction as ticket changes.
+    user_id 0 with relation "all" holds the platform-wide totals.
+    """
+    __tablename__ = 'ticket_counters'
+
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    relation = db.Column(db.String(20), primary_key=True)  # all, assigned, assigned_unviewed, reviewing, submitted
+    status = db.Column(db.String(50), primary_key=True)   # '' for tickets without a status
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TicketCounter user={self.user_id} {self.relation}/{self.status}={self.count}>"
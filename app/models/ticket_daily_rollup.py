@@ -0,0 +1,21 @@
+from app.extensions import db
+
+
+class TicketDailyRollup(db.Model):
+    """
+    Tickets per creation day and current (unit, status, drafter, engineer),
+    maintained by app.services.ticket_rollups in the same transaction as
+    ticket changes. '' and 0 stand for a missing unit/status and user.
+    """
+    __tablename__ = 'ticket_daily_rollups'
+
+    day = db.Column(db.Date, primary_key=True)
+    unit = db.Column(db.String(50), primary_key=True)
+    status = db.Column(db.String(50), primary_key=True)
+    drafter_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    engineer_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return (f"<TicketDailyRollup {self.day} {self.unit}/{self.status} "
+                f"drafter={self.drafter_id} engineer={self.engineer_id}={self.count}>")
@@ -0,0 +1,39 @@
+from datetime import datetime
+from app.extensions import db
+
+
+class TicketEvent(db.Model):
+    """
+    Append-only workflow event on a ticket (submitted, assigned, approved,
+    revision_requested, commented). ``seq`` counts up from 1 per ticket and
+    is handed out by app.services.ticket_events from DraftingTicket.event_seq,
+    so a ticket's timeline is one range scan of (ticket_id, seq).
+    """
+    __tablename__ = 'ticket_events'
+    __table_args__ = (
+        db.UniqueConstraint('ticket_id', 'seq', name='uq_ticket_events_ticket_seq'),
+        # Analytics: events of one type over a date range.
+        db.Index('ix_ticket_events_type_created', 'event_type', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    ticket_id = db.Column(db.Integer, db.ForeignKey('drafting_tickets.id', ondelete='CASCADE'), nullable=False)
+    seq = db.Column(db.Integer, nullable=False)
+    event_type = db.Column(db.String(40), nullable=False)
+    actor_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+
+    ticket = db.relationship('DraftingTicket')
+
+    def to_dict(self):
+        return {
+            "seq": self.seq,
+            "event_type": self.event_type,
+            "actor_id": self.actor_id,
+            "created_at": self.created_at.isoformat(),
+            "payload": self.payload,
+        }
+
+    def __repr__(self):
+        return f"<TicketEvent ticket={self.ticket_id} #{self.seq} {self.event_type}>"
@@ -0,0 +1,26 @@
+from datetime import datetime
+from app.extensions import db
+
+
+class TicketProcessingTask(db.Model):
+    """
+    One post-submission pipeline step for a ticket (or one of its
+    attachments): checksum, metadata, preview or notify. Driven by
+    app.services.ticket_pipeline; rows double as the per-ticket status.
+    """
+    __tablename__ = 'ticket_processing_tasks'
+
+    id = db.Column(db.Integer, primary_key=True)
+    ticket_id = db.Column(db.Integer, db.ForeignKey('drafting_tickets.id'), nullable=False, index=True)
+    attachment_id = db.Column(db.Integer, db.ForeignKey('ticket_attachments.id'), nullable=True)
+    step = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    next_attempt_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    attachment = db.relationship("TicketAttachment")
+
+    def __repr__(self):
+        return f"<ProcessingTask {self.step} ticket={self.ticket_id} ({self.status})>"
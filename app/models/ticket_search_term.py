@@ -0,0 +1,21 @@
+from app.extensions import db
+
+
+class TicketSearchTerm(db.Model):
+    """
+    Inverted word index over DraftingTicket text and spec fields.
+    Derived data: maintained by app.services.ticket_search on every flush
+    and rebuildable from drafting_tickets at any time.
+    """
+    __tablename__ = 'ticket_search_terms'
+    __table_args__ = (
+        db.Index('ix_ticket_search_terms_ticket_id', 'ticket_id'),
+        {'sqlite_with_rowid': False},
+    )
+
+    term = db.Column(db.String(50), primary_key=True)
+    ticket_id = db.Column(db.Integer, primary_key=True)
+    weight = db.Column(db.Integer, nullable=False, default=1)
+
+    def __repr__(self):
+        return f"<TicketTerm {self.term!r} ticket={self.ticket_id}>"
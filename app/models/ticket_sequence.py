@@ -0,0 +1,15 @@
+from app.extensions import db
+
+
+class TicketSequence(db.Model):
+    """
+    Per-prefix ticket number counter (one row per year, e.g. "25DDDC").
+    next_value is the first number not yet handed out to any process.
+    """
+    __tablename__ = 'ticket_sequences'
+
+    prefix = db.Column(db.String(20), primary_key=True)
+    next_value = db.Column(db.Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<TicketSequence {self.prefix} next={self.next_value}>"
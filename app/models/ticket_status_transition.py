@@ -0,0 +1,40 @@
+from datetime import datetime
+from app.extensions import db
+
+
+class TicketStatusTransition(db.Model):
+    """
+    Append-only record of one ticket status change, written by the flush hook
+    in app.services.ticket_sla. ``seconds_in_previous`` is how long the ticket
+    sat in ``from_status``, so time-in-status is a sum over these rows.
+    """
+    __tablename__ = 'ticket_status_transitions'
+    __table_args__ = (
+        # Per-ticket history in order, and the SLA summary's window scan by status.
+        db.Index('ix_ticket_status_transitions_ticket', 'ticket_id', 'changed_at'),
+        db.Index('ix_ticket_status_transitions_from_status', 'from_status', 'changed_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    ticket_id = db.Column(db.Integer, db.ForeignKey('drafting_tickets.id', ondelete='CASCADE'), nullable=False)
+    from_status = db.Column(db.String(50), nullable=True)  # None when the ticket was created
+    to_status = db.Column(db.String(50), nullable=True)
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    changed_by_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    seconds_in_previous = db.Column(db.Integer, nullable=True)
+    breached = db.Column(db.Boolean, default=False, nullable=False)  # previous status ran past its SLA
+
+    ticket = db.relationship('DraftingTicket')
+
+    def to_dict(self):
+        return {
+            "from_status": self.from_status,
+            "to_status": self.to_status,
+            "changed_at": self.changed_at.isoformat(),
+            "changed_by_id": self.changed_by_id,
+            "seconds_in_previous": self.seconds_in_previous,
+            "breached": self.breached,
+        }
+
+    def __repr__(self):
+        return f"<TicketStatusTransition ticket={self.ticket_id} {self.from_status}->{self.to_status}>"
@@ -6,7 +6,7 @@ from app.extensions import db
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from sqlalchemy import Enum as SQLEnum
-from app.models.enums import Role
+from app.models.enums import Role, NotificationFrequency
 
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
@@ -23,6 +23,13 @@ class User(UserMixin, db.Model):
         index=True
     )
     last_login_at = db.Column(db.DateTime, nullable=True)
+    # Ticket notification emails: sent immediately or collected into digests
+    notification_frequency = db.Column(
+        SQLEnum(NotificationFrequency, name="notification_frequency_enum", native_enum=False),
+        nullable=False,
+        default=NotificationFrequency.IMMEDIATE,
+        server_default=NotificationFrequency.IMMEDIATE.name
+    )
     is_active = db.Column(db.Boolean, default=True)
 
     # --- Refactored Relationships ---
@@ -0,0 +1,121 @@
+# app/notifications/digest.py
+"""
+Per-user delivery of ticket notifications.
+
+Users with an immediate preference get each notification as its own email.
+Hourly and daily users have notifications held in ``pending_notifications``
+until the end of their current window (the next top of the hour, or the
+next DIGEST_DAILY_HOUR UTC); ``send_due_digests()`` then collapses each
+user's due rows into one templated email. Run it every few minutes via
+scripts/send_digests.py.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from flask import current_app, render_template
+from sqlalchemy import select, delete
+
+from app.extensions import db
+from app.models.enums import NotificationFrequency
+from app.models.pending_notification import PendingNotification
+from app.services.email_service import send_email
+from app.services.user_directory import user_directory
+
+
+def digest_window_end(frequency: NotificationFrequency, now: datetime) -> datetime:
+    """When a notification raised at ``now`` goes out for this frequency."""
+    if frequency is NotificationFrequency.HOURLY:
+        return now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    hour = current_app.config.get("DIGEST_DAILY_HOUR", 13)
+    send_at = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    return send_at if send_at > now else send_at + timedelta(days=1)
+
+
+def deliver_notification(users, category: str, subject: str, body: str,
+                         ticket_number: str = None, now: datetime = None) -> None:
+    """
+    Send or hold one notification for each user (User or UserEntry).
+
+    Immediate recipients share a single email, the first as To and the rest
+    as Cc; digest recipients get a pending row each. Like send_email, nothing
+    leaves until the caller commits.
+    """
+    now = now or datetime.utcnow()
+    immediate = []
+    for user in users:
+        if user is None or not user.email:
+            continue
+        frequency = user.notification_frequency or NotificationFrequency.IMMEDIATE
+        if frequency is NotificationFrequency.IMMEDIATE:
+            immediate.append(user.email)
+        else:
+            db.session.add(PendingNotification(
+                user_id=user.id, category=category, ticket_number=ticket_number,
+                subject=subject, body=body, created_at=now,
+                deliver_after=digest_window_end(frequency, now),
+            ))
+    if immediate:
+        send_email(subject, immediate[:1], body, cc=immediate[1:] or None)
+
+
+def _send_digest(user, items) -> None:
+    if len(items) == 1:
+        # Nothing to collapse; send the notification as written.
+        send_email(items[0].subject, [user.email], items[0].body)
+        return
+    by_ticket = defaultdict(list)
+    for item in items:
+        by_ticket[item.ticket_number or "General"].append(item)
+    context = {"user": user, "items": items, "by_ticket": by_ticket,
+               "frequency": user.notification_frequency.value}
+    send_email(
+        f"[Nexus Digest] {len(items)} notifications on {len(by_ticket)} tickets",
+        [user.email],
+        render_template("emails/notification_digest.txt", **context),
+        html=render_template("emails/notification_digest.html", **context),
+    )
+
+
+def send_due_digests(now: datetime = None, batch_size: int = None) -> dict:
+    """Queue one digest per user with due notifications. Returns counts."""
+    now = now or datetime.utcnow()
+    batch_size = batch_size or current_app.config.get("DIGEST_BATCH_SIZE", 200)
+    digests = notifications = 0
+    last_user_id = 0
+    while True:
+        user_ids = db.session.execute(
+            select(PendingNotification.user_id)
+            .where(PendingNotification.deliver_after <= now,
+                   PendingNotification.user_id > last_user_id)
+            .group_by(PendingNotification.user_id)
+            .order_by(PendingNotification.user_id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not user_ids:
+            break
+        last_user_id = user_ids[-1]
+        items = db.session.execute(
+            select(PendingNotification)
+            .where(PendingNotification.user_id.in_(user_ids),
+                   PendingNotification.deliver_after <= now)
+            .order_by(PendingNotification.user_id, PendingNotification.created_at,
+                      PendingNotification.id)
+        ).scalars().all()
+        by_user = defaultdict(list)
+        for item in items:
+            by_user[item.user_id].append(item)
+        users = user_directory.get_many(user_ids)
+        for user_id, user_items in by_user.items():
+            user = users.get(user_id)
+            if user is not None and user.email:
+                _send_digest(user, user_items)
+                digests += 1
+            notifications += len(user_items)
+        # Digest emails sit in the outbox in this same transaction.
+        db.session.execute(
+            delete(PendingNotification)
+            .where(PendingNotification.id.in_([i.id for i in items]))
+        )
+        db.session.commit()
+    return {"digests": digests, "notifications": notifications}
@@ -2,22 +2,22 @@
 """
 Handles outbound notification dispatching across channels.
 
+Emails honour each recipient's notification_frequency: immediate, or
+collected into an hourly / daily digest (see app.notifications.digest).
 To be extended with in-app alerts, Slack, SMS, or task queues later.
 """
 
-from app.services.email_service import send_email
-from flask import url_for
+from app.notifications.digest import deliver_notification
 
 
 def notify_ticket_assignment(ticket, drafter):
     subject = f"[Drafting Ticket Assigned] {ticket.ticket_number}"
-    recipients = [drafter.email]
     body = f"""
 Hello {drafter.actual_name},
 
 You have been assigned a new drafting ticket: {ticket.ticket_number}
 
-Title: {ticket.title}
+Request Type: {ticket.request_type}
 Priority: {ticket.priority}
 Unit: {ticket.unit}
 
@@ -25,12 +25,30 @@ Please log in to begin your work.
 """
 
     # Optionally: include a direct link if frontend routing evolves
-    send_email(subject, recipients, body)
+    deliver_notification([drafter], "assignment", subject, body, ticket.ticket_number)
+
+
+def notify_new_ticket(ticket, engineer, submitter=None):
+    subject = f"[New Drafting Request] {ticket.ticket_number} (Priority {ticket.priority})"
+    body = f"""
+Hello {engineer.actual_name},
+
+A new drafting request has been submitted with you as review engineer.
+
+Ticket: {ticket.ticket_number}
+Submitted by: {submitter.actual_name if submitter else "N/A"}
+Work Order / AFE: {ticket.work_order or ticket.moc or "—"}
+Request Type: {ticket.request_type}
+Unit: {ticket.unit}
+
+{ticket.description}
+"""
+
+    deliver_notification([engineer], "new_ticket", subject, body, ticket.ticket_number)
 
 
 def notify_engineer_review(ticket, engineer):
     subject = f"[Review Required] {ticket.ticket_number} needs approval"
-    recipients = [engineer.email]
     body = f"""
 Hello {engineer.actual_name},
 
@@ -39,18 +57,18 @@ A drafting package for {ticket.ticket_number} is ready for your review.
 Please log in to approve, request revisions, or comment.
 """
 
-    send_email(subject, recipients, body, cc=[ticket.submitted_by.email])
+    deliver_notification([engineer, ticket.submitted_by], "review", subject, body,
+                         ticket.ticket_number)
 
 
 def notify_ticket_completion(ticket, admin):
     subject = f"[Ticket Complete] {ticket.ticket_number}"
-    recipients = [admin.email]
     body = f"""
 The drafting ticket {ticket.ticket_number} has been marked complete.
 
-Submitted by: {ticket.submitted_by.username}
-Assigned to: {ticket.assigned_to.username}
+Submitted by: {ticket.submitted_by.username if ticket.submitted_by else "N/A"}
+Assigned to: {ticket.assigned_to.username if ticket.assigned_to else "N/A"}
 
 You may now archive or release the final project package.
 """
-    send_email(subject, recipients, body)
+    deliver_notification([admin], "completion", subject, body, ticket.ticket_number)
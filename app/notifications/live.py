@@ -0,0 +1,126 @@
+# app/notifications/live.py
+"""
+Live UI events for the SSE stream.
+
+A session ``after_flush`` hook notes ticket status / assignment changes,
+new review comments and document checkouts / check-ins; the events are
+published on the event bus only after the transaction commits (and
+discarded on rollback), so clients never see uncommitted state. Several
+flushes of one ticket in a transaction collapse into one event.
+
+Ticket and comment events go to the users involved in the ticket plus
+admins; checkout changes are broadcast.
+"""
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.document_control.models import CheckoutLog
+from app.models.review_comment import ReviewComment
+from app.models.ticket import DraftingTicket
+from app.services.event_bus import event_bus
+
+TICKET_AUDIENCE = ("submitted_by_id", "review_engineer_id", "assigned_to_id", "project_engineer_id")
+TICKET_ROLES = ("admin",)
+
+
+def _audience(row, extra=()) -> list[int]:
+    ids = {getattr(row, attr) for attr in TICKET_AUDIENCE} | set(extra)
+    return [i for i in ids if i is not None]
+
+
+def _ticket_events(session):
+    for ticket in session.new:
+        if isinstance(ticket, DraftingTicket):
+            yield ("ticket.created",
+                   {"ticket_number": ticket.ticket_number, "status": ticket.status},
+                   _audience(ticket))
+    for ticket in session.dirty:
+        if not isinstance(ticket, DraftingTicket):
+            continue
+        attrs = inspect(ticket).attrs
+        status, assignee = attrs.status.history, attrs.assigned_to_id.history
+        if not (status.has_changes() or assignee.has_changes()):
+            continue
+        yield ("ticket.updated",
+               {"ticket_number": ticket.ticket_number, "status": ticket.status,
+                "previous_status": status.deleted[0] if status.deleted else None,
+                "assigned_to_id": ticket.assigned_to_id},
+               # A previous assignee should see the ticket leave their list.
+               _audience(ticket, extra=assignee.deleted))
+
+
+def _comment_events(session):
+    comments = [o for o in session.new if isinstance(o, ReviewComment)]
+    if not comments:
+        return
+    tickets = {
+        row.id: row for row in session.connection().execute(
+            select(DraftingTicket.id, DraftingTicket.ticket_number,
+                   *[getattr(DraftingTicket, a) for a in TICKET_AUDIENCE])
+            .where(DraftingTicket.id.in_({c.ticket_id for c in comments}))
+        )
+    }
+    for comment in comments:
+        ticket = tickets.get(comment.ticket_id)
+        if ticket is None:
+            continue
+        data = comment.to_dict()
+        data["ticket_number"] = ticket.ticket_number
+        yield ("comment.created", data,
+               [i for i in _audience(ticket) if i != comment.user_id])
+
+
+def _checkout_events(session):
+    for log in session.new:
+        if isinstance(log, CheckoutLog):
+            yield ("checkout.changed",
+                   {"revision_id": str(log.revision_id), "user_id": log.user_id,
+                    "action": "checkout"}, None)
+    for log in session.dirty:
+        if isinstance(log, CheckoutLog) and inspect(log).attrs.returned_at.history.has_changes():
+            yield ("checkout.changed",
+                   {"revision_id": str(log.revision_id), "user_id": log.user_id,
+                    "action": "checkin"}, None)
+
+
+def _merge_ticket_event(pending, event_type, data, user_ids) -> bool:
+    """Fold repeat flushes of one ticket into a single event per transaction."""
+    for i, (seen_type, seen_data, seen_ids) in enumerate(pending):
+        if seen_type in ("ticket.created", "ticket.updated") and \
+                seen_data["ticket_number"] == data["ticket_number"]:
+            merged = {**seen_data, **data}
+            if "previous_status" in seen_data:
+                merged["previous_status"] = seen_data["previous_status"]
+            elif seen_type == "ticket.created":
+                merged.pop("previous_status", None)
+                merged.pop("assigned_to_id", None)
+            pending[i] = (seen_type, merged, sorted(set(seen_ids) | set(user_ids)))
+            return True
+    return False
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_live_events(session, flush_context):
+    pending = session.info.setdefault("live_events", [])
+    for event_type, data, user_ids in _ticket_events(session):
+        if not _merge_ticket_event(pending, event_type, data, user_ids):
+            pending.append((event_type, data, user_ids))
+    pending.extend(_comment_events(session))
+    pending.extend(_checkout_events(session))
+    if not pending:
+        session.info.pop("live_events")
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_live_events(session):
+    for event_type, data, user_ids in session.info.pop("live_events", ()):
+        if user_ids is None:
+            event_bus.publish(event_type, data)
+        else:
+            event_bus.publish(event_type, data, user_ids=user_ids, roles=TICKET_ROLES)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_live_events(session):
+    session.info.pop("live_events", None)
@@ -3,13 +3,144 @@
 Master analytics view – includes charts and data exports.
 """
 
-from flask import Blueprint, render_template
-from flask_login import login_required
+from datetime import datetime, timezone
+
+from flask import (
+    Blueprint, render_template, jsonify, request, current_app, Response, stream_with_context
+)
+from flask_login import login_required, current_user
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.notifications.live import TICKET_AUDIENCE
+from app.services.analytics_engine import get_ticket_stats, get_drafter_performance, get_kpis
+from app.services.cycle_analytics import cycle_metrics
+from app.services.data_export import get_dataset, parse_columns, parse_export_filters, export_select
+from app.services.mail_delivery import mail_dispatcher
+from app.services.streaming_export import EXPORT_FORMATS, stream_rows
+from app.services.ticket_rollups import daily_breakdown
+from app.services.ticket_sla import ticket_sla, sla_summary
 
 analytics_bp = Blueprint("analytics", __name__)
 
+EXPORT_YIELD_PER = 1000
+
 
 @analytics_bp.route("/")
 @login_required
 def insights():
-    return render_template("pages/analytics/insights.html")
+    stats = get_ticket_stats(days=30)
+    return render_template(
+        "pages/analytics/insights.html",
+        kpi=get_kpis(days=30),
+        trend={"labels": [s["date"] for s in stats], "values": [s["count"] for s in stats]},
+    )
+
+
+@analytics_bp.route("/daily")
+@login_required
+def daily_rollups():
+    """
+    Tickets created per day over the last ``days`` (default 30), split by
+    ``?by=`` unit, status, drafter_id or engineer_id, plus drafter totals.
+    """
+    if not current_user.has_role("admin"):
+        return jsonify(error="Unauthorized"), 403
+    days = max(1, min(request.args.get("days", 30, type=int), 365))
+    by = request.args.get("by")
+    try:
+        breakdown = daily_breakdown(days, by) if by else None
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(
+        days=get_ticket_stats(days),
+        breakdown=breakdown,
+        drafters=get_drafter_performance(),
+    )
+
+
+@analytics_bp.route("/cycle")
+@login_required
+def cycle_overview():
+    """
+    Time-to-assign and time-in-review percentiles, revision loops, weekly
+    throughput and backlog age over the last ``days`` (default 90).
+    """
+    days = max(7, min(request.args.get("days", 90, type=int), 365))
+    return jsonify(cycle_metrics(days))
+
+
+@analytics_bp.route("/mail-metrics")
+@login_required
+def mail_metrics():
+    """Outbox depth by status plus this process's delivery counters."""
+    if not current_user.has_role("admin"):
+        return jsonify(error="Unauthorized"), 403
+    return jsonify(mail_dispatcher.metrics())
+
+
+@analytics_bp.route("/sla")
+@login_required
+def sla_overview():
+    """Time in status and SLA breaches over the last ``days`` (default 30)."""
+    if not current_user.has_role("admin"):
+        return jsonify(error="Unauthorized"), 403
+    days = request.args.get("days", 30, type=int)
+    return jsonify(sla_summary(days=max(1, min(days, 365))))
+
+
+@analytics_bp.route("/sla/<ticket_number>")
+@login_required
+def ticket_sla_detail(ticket_number):
+    """SLA state and status history for one ticket (admins and people on the ticket)."""
+    ticket = DraftingTicket.query.filter_by(ticket_number=ticket_number).first()
+    if ticket is None:
+        return jsonify(error="Ticket not found"), 404
+    involved = current_user.id in {getattr(ticket, a) for a in TICKET_AUDIENCE}
+    if not (involved or current_user.has_role("admin")):
+        return jsonify(error="Unauthorized"), 403
+    return jsonify(ticket_sla(ticket))
+
+
+@analytics_bp.route("/export/<dataset>")
+@login_required
+def export_dataset(dataset):
+    """
+    Stream a whole dataset (tickets, attachments, documents or
+    document_revisions) as CSV or NDJSON.
+    Query params: format=csv|ndjson (default csv), columns=a,b (default all)
+    and the dataset's filters (see app.services.data_export).
+    """
+    try:
+        spec = get_dataset(dataset)
+    except LookupError as e:
+        return jsonify(error=str(e)), 404
+    if not any(current_user.has_role(r) for r in spec.roles):
+        return jsonify(error="Unauthorized"), 403
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify(error=f"Invalid format. Valid formats: {', '.join(EXPORT_FORMATS)}"), 400
+    try:
+        columns = parse_columns(spec, request.args.get("columns"))
+        filters = parse_export_filters(spec, request.args)
+        stmt = export_select(spec, columns, filters)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+    current_app.logger.info(
+        f"{dataset} export by user {current_user.id}: format={fmt}, "
+        f"columns={len(columns)}, filters={filters}"
+    )
+
+    def generate():
+        result = db.session.execute(
+            stmt.execution_options(stream_results=True, yield_per=EXPORT_YIELD_PER)
+        )
+        yield from stream_rows(fmt, result, columns)
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return Response(
+        stream_with_context(generate()),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename={dataset}_{stamp}.{fmt}"},
+    )
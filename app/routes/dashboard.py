@@ -2,16 +2,52 @@
 Landing view based on user role. Displays:
 - Admin, Engineering, QC, User dashboards unchanged.
 - Drafter dashboard with tickets tile + Drive‑style sidebar + file explorer.
+- /events: Server-Sent Events stream of live ticket / comment / checkout updates.
+- /events/poll: the same updates as a changes-since poll, for clients without a stream.
 """
 
 import logging
+import time
 from pathlib import Path
-from flask import Blueprint, render_template, current_app
+from flask import Blueprint, render_template, current_app, Response, request, jsonify
 from flask_login import login_required, current_user
 
+from app.extensions import db
+from app.notifications import live  # noqa: F401 - registers the publish hooks
+from app.services.archive_index import archive_index
+from app.services.event_bus import event_bus, format_sse
+from app.services.ticket_counters import user_ticket_counts
+from app.services.ticket_queue import archive_ticket_numbers
+
 dashboard_bp = Blueprint("dashboard", __name__)
 logger = logging.getLogger(__name__)
 
+SIDEBAR_HIDDEN = ("js", "css", "img", "users")
+
+
+def _drive_context() -> dict:
+    """
+    Archive ticket list and drive sidebar for the engineer / drafter dashboards.
+    Tickets come from the ticket_number index; the static/ listing is cached
+    (see archive_index). Home folders are created with the user
+    (file_manager.provision_user_home), not here.
+    """
+    user_home = f"users/{current_user.id}"
+    folder_list = [user_home]
+    try:
+        static_dir = Path(current_app.root_path) / "static"
+        folder_list += [
+            e.name for e in archive_index.listing(str(static_dir))
+            if e.is_dir and e.name not in SIDEBAR_HIDDEN
+        ]
+    except OSError as e:
+        logger.error(f"Failed to list sidebar folders: {e}", exc_info=True)
+    return {
+        "archive_tickets": archive_ticket_numbers(),
+        "folder_list": folder_list,
+        "user_home": user_home,
+    }
+
 
 @dashboard_bp.route("/")
 @login_required
@@ -30,85 +66,92 @@ def index():
             "pages/dashboard/index.html",
             user=current_user,
             folder_list=folder_list,
-            user_home=user_home
+            user_home=user_home,
+            live_updates=True,
         )
 
     elif current_user.has_role("engineer"):
-        # Replicate the "drafter" style approach for engineering
-        # so they have a drive sidebar, feed, etc.
-
-        # 1) Build an archive tickets list if you want them to see
-        archive_dir = Path(current_app.root_path) / \
-            "static" / "drafting_tickets"
-        archive_tickets = []
-        try:
-            archive_tickets = sorted([
-                p.name for p in archive_dir.iterdir() if p.is_dir()
-            ])
-        except Exception as e:
-            logger.error(f"Failed to list archive tickets: {e}", exc_info=True)
-
-        # 2) Build a user home folder under static/users/<id> (for the drive)
-        static_dir = Path(current_app.root_path) / "static"
-        user_home = f"users/{current_user.id}"
-        (static_dir / "users" / str(current_user.id)
-         ).mkdir(parents=True, exist_ok=True)
-
-        # 3) Build folder_list (the sidebar)
-        # - skip 'js','css','img','users' to avoid clutter
-        folder_list = [user_home] + [
-            p.name for p in sorted(static_dir.iterdir())
-            if p.is_dir() and p.name not in ("js", "css", "img", "users")
-        ]
-
-        # 4) Example feed items, if any
-        feed_items = []
-        # feed_items could be loaded from DB if you have a table for that
-        # e.g. feed_items = get_feed_for_user(current_user.id)
-
+        # Same drive sidebar + feed layout as the drafter dashboard
         return render_template(
             "pages/dashboard/engineering_index.html",
             user=current_user,
-            archive_tickets=archive_tickets,
-            feed_items=feed_items,
-            folder_list=folder_list,
-            user_home=user_home
+            ticket_counts=user_ticket_counts(current_user.id),
+            feed_items=[],  # could be loaded from DB, e.g. get_feed_for_user(current_user.id)
+            live_updates=True,
+            **_drive_context()
         )
 
     elif current_user.has_role("drafter"):
-        # Archive tickets
-        archive_dir = Path(current_app.root_path) / \
-            "static" / "drafting_tickets"
-        archive_tickets = []
-        try:
-            archive_tickets = sorted(
-                [p.name for p in archive_dir.iterdir() if p.is_dir()])
-        except Exception as e:
-            logger.error(f"Failed to list archive tickets: {e}", exc_info=True)
-
-        # Sidebar folders
-        static_dir = Path(current_app.root_path) / "static"
-        user_home = f"users/{current_user.id}"
-        (static_dir / "users" / str(current_user.id)
-         ).mkdir(parents=True, exist_ok=True)
-        folder_list = [user_home] + [
-            p.name for p in sorted(static_dir.iterdir())
-            if p.is_dir() and p.name not in ("js", "css", "img", "users")
-        ]
-
-        feed_items = []  # populate as needed
-
         return render_template(
             "pages/dashboard/drafter_index.html",
             user=current_user,
-            archive_tickets=archive_tickets,
-            feed_items=feed_items,
-            folder_list=folder_list,
-            user_home=user_home
+            ticket_counts=user_ticket_counts(current_user.id),
+            feed_items=[],  # populate as needed
+            live_updates=True,
+            **_drive_context()
         )
 
     elif current_user.has_role("qc"):
         return render_template("pages/dashboard/qc_index.html", user=current_user)
 
     else:
-        return render_template("pages/dashboard/user_index.html", user=current_user)
+        return render_template("pages/dashboard/user_index.html", user=current_user,
+                               ticket_counts=user_ticket_counts(current_user.id),
+                               live_updates=True)
+
+
+@dashboard_bp.route("/events")
+@login_required
+def event_stream():
+    """
+    Push live updates for the current user. The stream ends after
+    SSE_MAX_AGE seconds; EventSource reconnects on its own.
+
+    Each open stream holds a server thread. run.py adds SSE_MAX_STREAMS
+    threads on top of W_THREADS for them; beyond that a process answers
+    503 and live_updates.js falls back to polling /events/poll.
+    """
+    heartbeat = current_app.config.get("SSE_HEARTBEAT", 15)
+    subscription = event_bus.subscribe(current_user.id, current_user.role.value,
+                                       limit=current_app.config.get("SSE_MAX_STREAMS", 32))
+    if subscription is None:
+        retry = current_app.config.get("SSE_POLL_INTERVAL", 30)
+        return Response(f"retry: {retry * 1000}\n\n", status=503, mimetype="text/event-stream",
+                        headers={"Retry-After": str(retry), "Cache-Control": "no-cache"})
+    deadline = time.monotonic() + current_app.config.get("SSE_MAX_AGE", 1800)
+    # Don't pin a pooled connection for the life of the stream.
+    db.session.remove()
+
+    def generate():
+        try:
+            yield f"retry: {heartbeat * 1000}\n\n"
+            while time.monotonic() < deadline:
+                message = subscription.get(timeout=heartbeat)
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    yield "event: resync\ndata: {}\n\n"
+                if message is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield format_sse(message)
+        finally:
+            subscription.close()
+
+    return Response(generate(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@dashboard_bp.route("/events/poll")
+@login_required
+def event_poll():
+    """
+    Updates for the current user since ``?cursor=`` (from the previous poll;
+    omit it to start from now). ``resync`` means some were missed.
+    """
+    messages, cursor, resync = event_bus.since(request.args.get("cursor", ""),
+                                               current_user.id, current_user.role.value)
+    return jsonify({
+        "events": [{"id": m["id"], "type": m["type"], "data": m["data"]} for m in messages],
+        "cursor": cursor,
+        "resync": resync,
+    })
@@ -21,14 +21,28 @@ from app.models.ticket import DraftingTicket
 from app.models.user import User
 from app.models.ticket_attachment import TicketAttachment
 from app.services.ticket_manager import generate_ticket_number
+from app.services.ticket_queue import (
+    queue_page, queue_counts, ticket_list_options, DEFAULT_PAGE_SIZE as QUEUE_PAGE_SIZE
+)
+from app.services.ticket_search import (
+    search_tickets, parse_ticket_filters, DEFAULT_PAGE_SIZE as SEARCH_PAGE_SIZE
+)
+from app.services.ticket_pipeline import (
+    plan_ticket_processing, start_ticket_processing, processing_status, retry_failed_steps
+)
 from app.services.file_manager import save_uploaded_file
-from app.services.email_service import send_email
+from app.services.archive_index import archive_index
+from app.services.ticket_events import record_event, SUBMITTED, ASSIGNED
+from app.notifications.dispatch import notify_ticket_assignment, notify_engineer_review
+from app.services.assignment_scheduler import assign_pending, drafter_workloads, plan as plan_assignments
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 drafting_bp = Blueprint("drafting", __name__)
 
+TICKET_SEARCH_ROLES = ("admin", "engineer", "drafter")
+
 
 @drafting_bp.route("/submit", methods=["GET", "POST"])
 @login_required
@@ -95,14 +109,9 @@ def submit_request():
                 if not form_data.get(field):
                     raise ValueError(f"Missing required field: {field}")
 
-            # Generate unique ticket_number
-            ticket_number = generate_ticket_number()
-            while DraftingTicket.query.filter_by(ticket_number=ticket_number).first():
-                ticket_number = generate_ticket_number()
-
             # Construct ticket
             new_ticket = DraftingTicket(
-                ticket_number=ticket_number,
+                ticket_number=generate_ticket_number(),
                 status="Pending",
                 submitted_by_id=current_user.id,
                 **form_data
@@ -110,6 +119,7 @@ def submit_request():
 
             db.session.add(new_ticket)
             db.session.flush()
+            record_event(new_ticket, SUBMITTED, current_user.id)
 
             # Ensure directory structure
             ticket_base = Path(current_app.root_path) / "static" / \
@@ -117,19 +127,24 @@ def submit_request():
             for subdir in ("drafting", "revisions", "completed", "requesters_submissions", "review"):
                 (ticket_base / subdir).mkdir(parents=True, exist_ok=True)
 
-            # Save initial uploads
+            # Save initial uploads; checksums, metadata, previews and the
+            # engineer notification run in the background pipeline.
+            attachments = []
             for f in request.files.getlist("attachments"):
                 if f and f.filename:
                     rel = save_uploaded_file(f, new_ticket.ticket_number)
-                    db.session.add(TicketAttachment(
+                    attachments.append(TicketAttachment(
                         ticket_id=new_ticket.id,
                         file_path=rel,
                         filename=f.filename,
                         uploaded_by_id=current_user.id,
                         category="request"
                     ))
+            db.session.add_all(attachments)
+            plan_ticket_processing(new_ticket, attachments)
 
             db.session.commit()
+            start_ticket_processing(new_ticket.id)
             flash("Drafting request submitted successfully.", "success")
 
             if request.headers.get("X-Requested-With") == "XMLHttpRequest":
@@ -170,16 +185,52 @@ def view_tickets():
     return render_template("pages/drafting/ticket_view.html")
 
 
+@drafting_bp.route("/tickets/search")
+@login_required
+def search_ticket_history():
+    """
+    Ranked full-text search over ticket description and spec fields.
+    Query args: q, unit, status, engineer_id, since, until (ISO dates),
+    page, per_page.
+    """
+    if not any(current_user.has_role(r) for r in TICKET_SEARCH_ROLES):
+        return jsonify(error="Unauthorized"), 403
+    try:
+        filters = parse_ticket_filters(request.args)
+        page = int(request.args.get("page", 1))
+        per_page = int(request.args.get("per_page", SEARCH_PAGE_SIZE))
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(search_tickets(request.args.get("q", ""), filters, page, per_page))
+
+
+@drafting_bp.route("/ticket/<ticket_number>/processing")
+@login_required
+def ticket_processing_status(ticket_number):
+    """Post-submission pipeline status (checksums, previews, notification)."""
+    ticket = DraftingTicket.query.filter_by(ticket_number=ticket_number).first_or_404()
+    involved = {ticket.submitted_by_id, ticket.review_engineer_id, ticket.assigned_to_id}
+    if current_user.id not in involved and not current_user.has_role("admin"):
+        return jsonify(error="Unauthorized"), 403
+    return jsonify(ticket_number=ticket.ticket_number, **processing_status(ticket.id))
+
+
+@drafting_bp.route("/ticket/<ticket_number>/processing/retry", methods=["POST"])
+@login_required
+def retry_ticket_processing(ticket_number):
+    if not current_user.has_role("admin"):
+        return jsonify(error="Unauthorized"), 403
+    ticket = DraftingTicket.query.filter_by(ticket_number=ticket_number).first_or_404()
+    return jsonify(success=True, reset=retry_failed_steps(ticket.id))
+
+
 @drafting_bp.route("/my-requests-modal")
 @login_required
 def my_requests_modal():
     user_requests = (
         DraftingTicket.query.filter_by(submitted_by_id=current_user.id)
         .order_by(DraftingTicket.created_at.desc())
-        .options(
-            db.joinedload(DraftingTicket.review_engineer),
-            db.joinedload(DraftingTicket.attachments)
-        )
+        .options(*ticket_list_options(with_reviewer=True))
         .all()
     )
     return render_template("pages/requests/my_requests_modal.html", requests=user_requests)
@@ -192,24 +243,58 @@ def admin_tickets_modal():
         flash("Unauthorized access.", "danger")
         return redirect(url_for("dashboard.index"))
 
-    new_tickets = DraftingTicket.query.filter_by(status="Pending") \
-        .order_by(DraftingTicket.created_at.desc()).all()
-    assigned_tickets = DraftingTicket.query.filter(
-        DraftingTicket.status.notin_(["Pending", "Completed"])
-    ).order_by(DraftingTicket.created_at.desc()).all()
-    completed_tickets = DraftingTicket.query.filter_by(status="Completed") \
-        .order_by(DraftingTicket.created_at.desc()).all()
-    analytics_data = {}
-
+    # Rows are fetched page by page from admin_ticket_queue.
     return render_template(
         "pages/drafting/admin_ticket_modal.html",
-        new_tickets=new_tickets,
-        assigned_tickets=assigned_tickets,
-        completed_tickets=completed_tickets,
-        analytics_data=analytics_data
+        counts=queue_counts(),
+        page_size=QUEUE_PAGE_SIZE,
+        analytics_data={}
     )
 
 
+@drafting_bp.route("/admin/tickets/queue/<queue>")
+@login_required
+def admin_ticket_queue(queue):
+    """
+    One keyset page of an admin queue (new, assigned, completed).
+    Query args: limit, cursor, sort (created_at|priority), order (asc|desc).
+    """
+    if not current_user.has_role("admin"):
+        return jsonify(error="Unauthorized"), 403
+    try:
+        limit = int(request.args.get("limit", QUEUE_PAGE_SIZE))
+        tickets, next_cursor = queue_page(
+            queue,
+            sort=request.args.get("sort", "created_at"),
+            descending=request.args.get("order", "desc") != "asc",
+            limit=limit,
+            cursor=request.args.get("cursor") or None,
+        )
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    return jsonify(tickets=tickets, next_cursor=next_cursor, counts=queue_counts())
+
+
+@drafting_bp.route("/admin/tickets/<int:ticket_id>/attachments")
+@login_required
+def admin_ticket_attachments(ticket_id):
+    """Attachment list for one ticket, loaded when its Files cell is expanded."""
+    if not current_user.has_role("admin"):
+        return jsonify(error="Unauthorized"), 403
+    rows = db.session.execute(
+        db.select(TicketAttachment.file_path, TicketAttachment.filename)
+        .where(TicketAttachment.ticket_id == ticket_id)
+        .order_by(TicketAttachment.id)
+    ).all()
+    return jsonify(attachments=[
+        {
+            "name": r.file_path.split("/")[-1],
+            "url": url_for("static", filename=r.file_path),
+        }
+        for r in rows
+    ])
+
+
 @drafting_bp.route("/assign_modal")
 @login_required
 def assign_modal():
@@ -225,8 +310,11 @@ def assign_modal():
     if not ticket:
         return "Ticket not found", 404
 
-    drafters = User.query.filter_by(role="drafter").all()
-    return render_template("pages/drafting/assign_modal.html", ticket=ticket, drafters=drafters)
+    workloads = drafter_workloads()
+    suggested = next((p["drafter_id"] for p in plan_assignments()
+                      if p["ticket_id"] == ticket.id), None)
+    return render_template("pages/drafting/assign_modal.html", ticket=ticket,
+                           workloads=workloads, suggested=suggested)
 
 
 @drafting_bp.route("/assign", methods=["POST"])
@@ -243,9 +331,14 @@ def assign_ticket():
     ticket = DraftingTicket.query.get(ticket_id)
     if not ticket:
         return jsonify(success=False, error="Ticket not found"), 404
+    drafter = db.session.get(User, drafter_id)
+    if not drafter:
+        return jsonify(success=False, error="Drafter not found"), 404
 
-    ticket.assigned_to_id = drafter_id
+    ticket.assigned_to_id = drafter.id
     ticket.status = "In Progress"
+    record_event(ticket, ASSIGNED, current_user.id, drafter_id=drafter.id)
+    notify_ticket_assignment(ticket, drafter)
     try:
         db.session.commit()
         return jsonify(success=True)
@@ -254,6 +347,26 @@ def assign_ticket():
         return jsonify(success=False, error=str(e)), 500
 
 
+@drafting_bp.route("/admin/assignments", methods=["GET", "POST"])
+@login_required
+def auto_assign():
+    """
+    GET: dry run - proposed drafter for each queued ticket.
+    POST: apply the proposals. Optional ``limit`` caps tickets considered.
+    """
+    if not current_user.has_role("admin"):
+        return jsonify(error="Unauthorized"), 403
+    data = request.get_json(silent=True) or request.values
+    limit = data.get("limit")
+    try:
+        limit = int(limit) if limit not in (None, "") else None
+    except (TypeError, ValueError):
+        return jsonify(error="limit must be an integer"), 400
+    if request.method == "GET":
+        return jsonify(dry_run=True, assignments=plan_assignments(limit))
+    return jsonify(dry_run=False, assignments=assign_pending(limit))
+
+
 @drafting_bp.route("/drafter/tickets/modal")
 @login_required
 def drafter_tickets_modal():
@@ -264,6 +377,7 @@ def drafter_tickets_modal():
     assigned_tickets = (
         DraftingTicket.query.filter_by(assigned_to_id=current_user.id)
         .order_by(DraftingTicket.created_at.desc())
+        .options(*ticket_list_options(with_reviewer=True))
         .all()
     )
     return render_template("pages/drafting/drafter_ticket_modal.html", tickets=assigned_tickets)
@@ -329,6 +443,8 @@ def submit_ticket_review(ticket_number):
         return jsonify(success=False, error="Unauthorized"), 403
 
     ticket.status = "In-Review"
+    if ticket.review_engineer:
+        notify_engineer_review(ticket, ticket.review_engineer)
     try:
         db.session.commit()
         return jsonify(success=True)
@@ -343,7 +459,9 @@ def submit_ticket_review(ticket_number):
 def archive_browser(ticket, subpath):
     """
     Returns JSON listing of directories and files under
-    static/drafting_tickets/<ticket>/<subpath>.
+    static/drafting_tickets/<ticket>/<subpath>, with sizes and mtimes.
+    ``?depth=N`` nests up to N further levels under each directory's
+    ``children`` so a whole ticket tree comes back in one request.
     """
     base = Path(current_app.root_path) / "static" / "drafting_tickets" / ticket
     target = (base / subpath).resolve()
@@ -353,11 +471,6 @@ def archive_browser(ticket, subpath):
     if not target.is_dir():
         return jsonify(error="Not a directory"), 400
 
-    entries = []
-    for child in sorted(target.iterdir()):
-        entries.append({
-            "name": child.name,
-            "type": "directory" if child.is_dir() else "file",
-            "path": (subpath + "/" + child.name).lstrip("/")
-        })
-    return jsonify(entries)
+    depth = request.args.get("depth", 0, type=int)
+    depth = max(0, min(depth, current_app.config.get("ARCHIVE_MAX_DEPTH", 6)))
+    return jsonify(archive_index.tree(str(target), subpath.strip("/"), depth))
@@ -7,16 +7,28 @@ import logging
 from pathlib import Path
 from flask import (
     Blueprint, render_template, request, url_for,
-    flash, jsonify, abort, current_app
+    flash, jsonify, abort, send_file
 )
 from flask_login import login_required, current_user
+from sqlalchemy.orm import load_only
+from werkzeug.exceptions import HTTPException
 from werkzeug.utils import secure_filename
 from app.extensions import db
 from app.models.ticket import DraftingTicket
-from app.models.revision_history import RevisionHistory
 from app.models.review_comment import ReviewComment
 from app.models.ticket_attachment import TicketAttachment
 from app.models.user import User
+from app.services.page_renderer import is_renderable, page_count
+from app.services.page_tiles import page_tiles, PageUnrenderable
+from app.services.review_annotations import (
+    page_annotations, save_page, export_key, request_export, publish_markups, EXPORT_CATEGORY
+)
+from app.services.review_feed import comment_feed, unread_counts, mark_read
+from app.services.storage_adapter import LocalFSAdapter
+from app.services.ticket_events import (
+    record_event, timeline, APPROVED, REVISION_REQUESTED, COMMENTED
+)
+from app.services.ticket_queue import ticket_list_options
 
 engineering_bp = Blueprint("engineering", __name__)
 logger = logging.getLogger(__name__)
@@ -33,6 +45,7 @@ def review_queue():
         DraftingTicket.query
         .filter_by(status="In-Review", review_engineer_id=current_user.id)
         .order_by(DraftingTicket.created_at.desc())
+        .options(*ticket_list_options())
         .all()
     )
     return render_template("pages/engineering/review_queue.html", review_tickets=review_tickets)
@@ -42,28 +55,48 @@ def review_queue():
 def performance_dashboard():
     return render_template("pages/engineering/performance_dashboard.html")
 
-@engineering_bp.route("/ticket/<ticket_number>/preview-file/<filename>")
-@login_required
-def preview_pdf_file(ticket_number, filename):
+def _review_attachment(ticket_number, filename, allow_drafter=False):
+    """
+    The review-folder attachment named ``filename`` on a ticket the user
+    reviews (or, with ``allow_drafter``, is assigned to draft).
+    """
     ticket = DraftingTicket.query.filter_by(
         ticket_number=ticket_number
-    ).first_or_404()
+    ).options(load_only(DraftingTicket.review_engineer_id, DraftingTicket.assigned_to_id)).first_or_404()
 
-    if ticket.review_engineer_id != current_user.id:
-        flash("Unauthorized access.", "danger")
-        return "", 403
+    allowed = (ticket.review_engineer_id, ticket.assigned_to_id) if allow_drafter else (ticket.review_engineer_id,)
+    if current_user.id not in allowed:
+        abort(403)
 
+    candidates = (
+        TicketAttachment.query
+        .filter(TicketAttachment.ticket_id == ticket.id,
+                TicketAttachment.file_path.ilike("%review/%"),
+                # Published markup exports are outputs, not review sources.
+                TicketAttachment.category != EXPORT_CATEGORY)
+        .order_by(TicketAttachment.id)
+        .all()
+    )
     matching_attachment = next(
         (
-            a for a in ticket.attachments
+            a for a in candidates
             if a.file_path.lower().endswith(filename.lower())
-            and 'review/' in a.file_path.lower()
         ),
         None
     )
     if not matching_attachment:
-        flash("File not found.", "danger")
-        return "", 404
+        abort(404)
+    return matching_attachment
+
+
+@engineering_bp.route("/ticket/<ticket_number>/preview-file/<filename>")
+@login_required
+def preview_pdf_file(ticket_number, filename):
+    try:
+        matching_attachment = _review_attachment(ticket_number, filename)
+    except HTTPException as e:
+        flash("Unauthorized access." if e.code == 403 else "File not found.", "danger")
+        return "", e.code
 
     pdf_url = url_for("static", filename=Path(matching_attachment.file_path).as_posix())
     return render_template(
@@ -71,6 +104,52 @@ def preview_pdf_file(ticket_number, filename):
         pdf_url=pdf_url
     )
 
+
+@engineering_bp.route("/ticket/<ticket_number>/pages/<filename>")
+@login_required
+def page_tile_info(ticket_number, filename):
+    """Page count and zoom levels for the tiled viewer."""
+    attachment = _review_attachment(ticket_number, filename)
+    path = LocalFSAdapter()._resolve(attachment.file_path)
+    if not path.is_file() or not is_renderable(path):
+        return jsonify(error="File cannot be tiled"), 404
+    return jsonify(
+        pages=attachment.page_count or page_count(path),
+        tile_size=page_tiles.tile_size,
+        levels=page_tiles.level_dims(),
+    )
+
+
+@engineering_bp.route("/ticket/<ticket_number>/pages/<filename>/<int:page>/<int:level>")
+@login_required
+def page_tile_level(ticket_number, filename, page, level):
+    """Size and tile grid of one page at one zoom level (rendered on first request)."""
+    attachment = _review_attachment(ticket_number, filename)
+    path = LocalFSAdapter()._resolve(attachment.file_path)
+    try:
+        return jsonify(page_tiles.level(path, page, level, attachment.checksum))
+    except (IndexError, FileNotFoundError):
+        return jsonify(error="Page not found"), 404
+    except PageUnrenderable:
+        # Vector-only page: the viewer renders the PDF itself.
+        return jsonify(error="Page cannot be rasterized"), 422
+
+
+@engineering_bp.route("/ticket/<ticket_number>/pages/<filename>/<int:page>/<int:level>/<int:x>_<int:y>.png")
+@login_required
+def page_tile(ticket_number, filename, page, level, x, y):
+    attachment = _review_attachment(ticket_number, filename)
+    path = LocalFSAdapter()._resolve(attachment.file_path)
+    try:
+        tile = page_tiles.tile_path(path, page, level, x, y, attachment.checksum)
+    except (IndexError, FileNotFoundError):
+        abort(404)
+    except PageUnrenderable:
+        abort(422)
+    # Tiles are keyed by file checksum, so a given URL only changes if the file is replaced.
+    return send_file(tile, mimetype="image/png", max_age=3600, conditional=True)
+
+
 @engineering_bp.route("/tickets/modal", methods=["GET"])
 @login_required
 def engineer_tickets_modal():
@@ -78,12 +157,14 @@ def engineer_tickets_modal():
         DraftingTicket.query
         .filter_by(status="In-Review", review_engineer_id=current_user.id)
         .order_by(DraftingTicket.created_at.desc())
+        .options(*ticket_list_options())
         .all()
     )
     completed = (
         DraftingTicket.query
         .filter_by(status="Completed", review_engineer_id=current_user.id)
         .order_by(DraftingTicket.created_at.desc())
+        .options(*ticket_list_options())
         .all()
     )
     return render_template(
@@ -103,22 +184,7 @@ def approve_ticket(ticket_number):
 
     ticket.status = "Completed"
 
-    last_rev = (
-        RevisionHistory.query
-        .filter_by(ticket_id=ticket.id)
-        .order_by(RevisionHistory.revision_number.desc())
-        .first()
-    )
-    next_rev = last_rev.revision_number + 1 if last_rev else 1
-
-    rev = RevisionHistory(
-        ticket_id=ticket.id,
-        revision_number=next_rev,
-        status="approved",
-        message="Approved by engineer",
-        reviewed_by_id=current_user.id
-    )
-    db.session.add(rev)
+    record_event(ticket, APPROVED, current_user.id, message="Approved by engineer")
 
     try:
         db.session.commit()
@@ -132,7 +198,8 @@ def approve_ticket(ticket_number):
 @login_required
 def request_revision(ticket_number):
     """
-    Requests a revision: sets ticket to 'Revise' and records a revision entry.
+    Requests a revision: sets ticket to 'Revise', records a revision event and
+    publishes the flattened markups as review attachments for the drafter.
     """
     ticket = DraftingTicket.query.filter_by(
         ticket_number=ticket_number
@@ -142,75 +209,74 @@ def request_revision(ticket_number):
 
     ticket.status = "Revise"
 
-    last_rev = (
-        RevisionHistory.query
-        .filter_by(ticket_id=ticket.id)
-        .order_by(RevisionHistory.revision_number.desc())
-        .first()
-    )
-    next_rev = last_rev.revision_number + 1 if last_rev else 1
-
-    rev = RevisionHistory(
-        ticket_id=ticket.id,
-        revision_number=next_rev,
-        status="revise",
-        message="Revision requested by engineer",
-        reviewed_by_id=current_user.id
-    )
-    db.session.add(rev)
+    record_event(ticket, REVISION_REQUESTED, current_user.id, message="Revision requested by engineer")
 
     try:
         db.session.commit()
-        return jsonify(success=True)
     except Exception as e:
         db.session.rollback()
         logger.exception("Revision request failed")
         return jsonify(success=False, error=str(e)), 500
+    try:
+        publish_markups(ticket.id, current_user.id)
+    except Exception:
+        # The drafter can still open the markups in the review editor.
+        logger.exception(f"Publishing markups for {ticket_number} failed")
+    return jsonify(success=True)
 
-@engineering_bp.route("/ticket/<ticket_number>/upload-annotated", methods=["POST"])
+@engineering_bp.route("/ticket/<ticket_number>/annotations/<filename>", methods=["GET"])
 @login_required
-def upload_annotated_pdf(ticket_number):
+def get_annotations(ticket_number, filename):
+    """Every annotated page of a review file: {"pages": {page_number: shapes}}."""
+    attachment = _review_attachment(ticket_number, filename, allow_drafter=True)
+    return jsonify(pages=page_annotations(attachment.id))
+
+
+@engineering_bp.route("/ticket/<ticket_number>/annotations/<filename>/<int:page>", methods=["PUT"])
+@login_required
+def save_annotations(ticket_number, filename, page):
+    """Replace one page's markups with ``{"shapes": [...]}``; an empty list clears the page."""
+    attachment = _review_attachment(ticket_number, filename)
+    if page < 1 or (attachment.page_count and page > attachment.page_count):
+        return jsonify(success=False, error="Page not found"), 404
+    data = request.get_json(silent=True) or {}
+    try:
+        shapes = save_page(attachment.id, page, data.get("shapes"), current_user.id)
+    except ValueError as e:
+        return jsonify(success=False, error=str(e)), 400
+    return jsonify(success=True, page_number=page, shapes=shapes)
+
+
+@engineering_bp.route("/ticket/<ticket_number>/annotations/<filename>/export", methods=["POST"])
+@login_required
+def export_annotations(ticket_number, filename):
     """
-    Accepts an annotated PDF from the engineer and saves it as <file>_ENGINEER_REVISIONS.pdf in the review folder.
+    Flattened PDF of the file with its markups. Returns the download URL when
+    the export is cached, else queues it and answers 202 (poll again).
     """
-    ticket = DraftingTicket.query.filter_by(
-        ticket_number=ticket_number
-    ).first_or_404()
-    if ticket.review_engineer_id != current_user.id:
-        return jsonify(success=False, error="Unauthorized"), 403
+    attachment = _review_attachment(ticket_number, filename, allow_drafter=True)
+    try:
+        key = request_export(attachment)
+    except FileNotFoundError:
+        return jsonify(success=False, error="File not found"), 404
+    if key is None:
+        return jsonify(success=True, ready=False), 202
+    return jsonify(success=True, ready=True, filename=Path(key).name,
+                   url=url_for("engineering.download_annotated_export",
+                               ticket_number=ticket_number, filename=filename))
 
-    file = request.files.get("file")
-    orig_filename = request.form.get("original_filename", "annotated.pdf")
-    if not file or not file.filename:
-        return jsonify(success=False, error="No file provided"), 400
-
-    # Save as <originalfilename>_ENGINEER_REVISIONS.pdf
-    base_name = Path(orig_filename).stem
-    revision_filename = f"{base_name}_ENGINEER_REVISIONS.pdf"
-    review_dir = Path(current_app.root_path) / "static" / "drafting_tickets" / ticket_number / "review"
-    review_dir.mkdir(parents=True, exist_ok=True)
-    file_path = review_dir / revision_filename
-    file.save(str(file_path))
-
-    # Record in DB
-    rel_path = f"drafting_tickets/{ticket_number}/review/{revision_filename}"
-    attachment = TicketAttachment(
-        ticket_id=ticket.id,
-        uploaded_by_id=current_user.id,
-        file_path=rel_path,
-        filename=revision_filename,
-        category="review",
-        version=1,
-        is_latest=True
-    )
-    db.session.add(attachment)
+
+@engineering_bp.route("/ticket/<ticket_number>/annotations/<filename>/export.pdf", methods=["GET"])
+@login_required
+def download_annotated_export(ticket_number, filename):
+    attachment = _review_attachment(ticket_number, filename, allow_drafter=True)
     try:
-        db.session.commit()
-        return jsonify(success=True, filename=revision_filename)
-    except Exception as e:
-        db.session.rollback()
-        logger.exception("Failed to record annotated review attachment")
-        return jsonify(success=False, error=str(e)), 500
+        path = LocalFSAdapter()._resolve(export_key(attachment))
+    except FileNotFoundError:
+        abort(404)
+    if not path.is_file():
+        abort(404)  # not exported yet, or the markups changed since
+    return send_file(path, mimetype="application/pdf", as_attachment=True, download_name=path.name)
 
 @engineering_bp.route("/ticket/<ticket_number>/comment", methods=["POST"])
 @login_required
@@ -235,6 +301,7 @@ def post_review_comment(ticket_number):
         page_number=page_number
     )
     db.session.add(comment)
+    record_event(ticket, COMMENTED, current_user.id, page_number=page_number)
 
     try:
         db.session.commit()
@@ -244,25 +311,60 @@ def post_review_comment(ticket_number):
         logger.exception("Failed to post review comment")
         return jsonify(success=False, error=str(e)), 500
 
+def _comment_ticket(ticket_number):
+    """The ticket if the current user may read its review thread, else None."""
+    ticket = DraftingTicket.query.options(
+        load_only(DraftingTicket.id, DraftingTicket.review_engineer_id, DraftingTicket.assigned_to_id)
+    ).filter_by(ticket_number=ticket_number).first_or_404()
+    if current_user.id not in (ticket.review_engineer_id, ticket.assigned_to_id):
+        return None
+    return ticket
+
+
 @engineering_bp.route("/ticket/<ticket_number>/comments", methods=["GET"])
 @login_required
 def get_review_comments(ticket_number):
-    ticket = DraftingTicket.query.filter_by(
-        ticket_number=ticket_number
-    ).first_or_404()
-    if ticket.review_engineer_id != current_user.id and ticket.assigned_to_id != current_user.id:
+    """
+    Comments in posting order with author_name and the caller's read flag.
+    ``?since=<comment id>`` returns only newer comments; ``?page=N`` filters
+    to one PDF page.
+    """
+    ticket = _comment_ticket(ticket_number)
+    if ticket is None:
         return jsonify(success=False, error="Unauthorized"), 403
-
-    comments = (
-        ticket.review_comments
-        .order_by(ReviewComment.created_at.asc())
-        .all()
+    comments = comment_feed(
+        ticket.id, current_user.id,
+        since=request.args.get("since", type=int),
+        page=request.args.get("page", type=int),
     )
-    result = []
-    for c in comments:
-        author = User.query.get(c.user_id)
-        result.append({
-            **c.to_dict(),
-            "author_name": author.actual_name if author else "User"
-        })
-    return jsonify(result)
+    return jsonify(comments)
+
+
+@engineering_bp.route("/ticket/<ticket_number>/comments/read", methods=["POST"])
+@login_required
+def mark_review_comments_read(ticket_number):
+    """Mark the thread read, or only through comment id ``upto`` if given."""
+    ticket = _comment_ticket(ticket_number)
+    if ticket is None:
+        return jsonify(success=False, error="Unauthorized"), 403
+    upto = (request.get_json(silent=True) or {}).get("upto")
+    if upto is not None and not isinstance(upto, int):
+        return jsonify(success=False, error="upto must be a comment id"), 400
+    return jsonify(success=True, marked=mark_read(ticket.id, current_user.id, upto))
+
+
+@engineering_bp.route("/ticket/<ticket_number>/events", methods=["GET"])
+@login_required
+def ticket_timeline(ticket_number):
+    """The ticket's event log in order; ``?after=<seq>`` returns only newer events."""
+    ticket = _comment_ticket(ticket_number)
+    if ticket is None:
+        return jsonify(success=False, error="Unauthorized"), 403
+    return jsonify(timeline(ticket.id, after=request.args.get("after", 0, type=int)))
+
+
+@engineering_bp.route("/comments/unread", methods=["GET"])
+@login_required
+def unread_review_comments():
+    """ticket_number -> unread comment count for the current user."""
+    return jsonify(unread_counts(current_user.id))
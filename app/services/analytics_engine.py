@@ -1,39 +1,51 @@
 # app/services/analytics_engine.py
 """
 Crunches data for dashboard charts.
+
+Reads the pre-aggregated tables (app.services.ticket_rollups and
+ticket_counters), so each call touches a bounded number of rows however
+many tickets exist.
 """
 
+from datetime import datetime, timedelta
+
 from app.extensions import db
 from app.models.ticket import DraftingTicket
-from sqlalchemy import func
-from datetime import datetime, timedelta
+from app.models.ticket_event import TicketEvent
+from app.services.ticket_counters import status_totals
+from app.services.ticket_events import APPROVED
+from app.services.ticket_rollups import daily_totals, drafter_totals
 
 
 def get_ticket_stats(days=30):
-    since = datetime.utcnow() - timedelta(days=days)
-    data = (
-        db.session.query(
-            func.date(DraftingTicket.created_at).label("day"),
-            func.count(DraftingTicket.id)
-        )
-        .filter(DraftingTicket.created_at >= since)
-        .group_by(func.date(DraftingTicket.created_at))
-        .order_by("day")
-        .all()
-    )
-
-    return [{"date": str(row[0]), "count": row[1]} for row in data]
+    """Tickets created per day over the last ``days`` days, including empty days."""
+    totals = daily_totals(days)
+    today = datetime.utcnow().date()
+    return [
+        {"date": str(day), "count": totals.get(day, 0)}
+        for day in (today - timedelta(days=n) for n in range(days - 1, -1, -1))
+    ]
 
 
 def get_drafter_performance():
-    from app.models.user import User
+    return [{"drafter": name, "count": int(count)} for name, count in drafter_totals()]
 
-    drafters = (
-        db.session.query(User.username, func.count(DraftingTicket.id))
-        .join(DraftingTicket, DraftingTicket.assigned_to_id == User.id)
-        .filter(User.role == "drafter")
-        .group_by(User.username)
-        .all()
-    )
 
-    return [{"drafter": name, "count": count} for name, count in drafters]
+def get_kpis(days=30):
+    """Headline numbers for the insights page."""
+    totals = status_totals()
+    since = datetime.utcnow() - timedelta(days=days)
+    # Approvals in the window only: one range scan of (event_type, created_at).
+    durations = [
+        (approved - created).total_seconds()
+        for approved, created in db.session.query(TicketEvent.created_at, DraftingTicket.created_at)
+        .join(DraftingTicket, DraftingTicket.id == TicketEvent.ticket_id)
+        .filter(TicketEvent.event_type == APPROVED, TicketEvent.created_at >= since,
+                DraftingTicket.created_at.isnot(None))
+    ]
+    return {
+        "total_tickets": sum(totals.values()),
+        "total_approved": totals.get("Completed", 0),
+        "in_progress": totals.get("In Progress", 0),
+        "avg_completion_days": round(sum(durations) / len(durations) / 86400, 1) if durations else 0,
+    }
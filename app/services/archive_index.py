@@ -0,0 +1,109 @@
+# app/services/archive_index.py
+"""
+Cached directory listings for the ticket archive browser and dashboard sidebars.
+
+Each directory is read with one ``os.scandir`` pass (names, types, sizes
+and mtimes) and cached under its path together with the directory's own
+mtime. A later request re-stats the directory only; the listing is reused
+while that mtime is unchanged, so returning a whole ticket tree costs one
+stat per directory. Adding, removing or renaming an entry bumps the
+directory mtime; rewriting a file in place does not, so entries also
+expire after ARCHIVE_CACHE_TTL seconds. LocalFSAdapter writes invalidate
+the directories they touch directly.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime
+
+DirEntry = namedtuple("DirEntry", "name is_dir is_symlink size mtime")
+
+
+class ArchiveIndex:
+    """Thread-safe LRU of directory listings validated by directory mtime."""
+
+    def __init__(self, ttl: float = 60, max_size: int = 2048):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._dirs = OrderedDict()  # path -> (mtime_ns, loaded_at, [DirEntry])
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        self.ttl = app.config.get("ARCHIVE_CACHE_TTL", self.ttl)
+        self.max_size = app.config.get("ARCHIVE_CACHE_SIZE", self.max_size)
+        self.invalidate()
+
+    def invalidate(self, path: str = None):
+        """Drop one directory's listing (and its parent's), or everything."""
+        with self._lock:
+            if path is None:
+                self._dirs.clear()
+                return
+            path = os.path.abspath(path)
+            self._dirs.pop(path, None)
+            self._dirs.pop(os.path.dirname(path), None)
+
+    def _scan(self, path: str) -> list[DirEntry]:
+        entries = []
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    st = entry.stat()
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue  # removed mid-scan or a dangling link
+                entries.append(DirEntry(entry.name, is_dir, entry.is_symlink(),
+                                        None if is_dir else st.st_size, st.st_mtime))
+        entries.sort(key=lambda e: e.name)
+        return entries
+
+    def listing(self, path: str) -> list[DirEntry]:
+        """Entries of one directory, sorted by name."""
+        path = os.path.abspath(path)
+        mtime_ns = os.stat(path).st_mtime_ns
+        now = time.monotonic()
+        with self._lock:
+            cached = self._dirs.get(path)
+            if cached and cached[0] == mtime_ns and now - cached[1] < self.ttl:
+                self._dirs.move_to_end(path)
+                self.hits += 1
+                return cached[2]
+        entries = self._scan(path)
+        with self._lock:
+            self.misses += 1
+            self._dirs[path] = (mtime_ns, now, entries)
+            self._dirs.move_to_end(path)
+            while len(self._dirs) > self.max_size:
+                self._dirs.popitem(last=False)
+        return entries
+
+    def tree(self, path: str, rel: str = "", depth: int = 0) -> list[dict]:
+        """
+        JSON-ready listing of ``path``. Directories carry ``children`` down to
+        ``depth`` further levels; symlinked directories are never descended.
+        ``rel`` is the listing's path relative to the archive root.
+        """
+        nodes = []
+        for entry in self.listing(path):
+            node = {
+                "name": entry.name,
+                "type": "directory" if entry.is_dir else "file",
+                "path": (rel + "/" + entry.name).lstrip("/"),
+                "size": entry.size,
+                "modified": datetime.utcfromtimestamp(entry.mtime).isoformat(),
+            }
+            if entry.is_dir and depth > 0 and not entry.is_symlink:
+                try:
+                    node["children"] = self.tree(os.path.join(path, entry.name),
+                                                 node["path"], depth - 1)
+                except OSError:
+                    pass  # removed since the parent was listed
+            nodes.append(node)
+        return nodes
+
+
+archive_index = ArchiveIndex()
@@ -0,0 +1,267 @@
+# app/services/assignment_scheduler.py
+"""
+Workload-aware drafter assignment.
+
+The scheduler keeps a process-wide min-heap of Pending, unassigned tickets
+ordered by (priority, due_date, created_at): priority 1 first, then the
+earliest due date (tickets without one after those with), then the oldest.
+It is loaded from the ``status, priority`` index once and then maintained
+by session commit hooks: tickets entering the queue are pushed, tickets
+leaving it or changing key are invalidated lazily (stale heap entries are
+skipped when popped). Commits made by other processes are picked up when
+the heap is reloaded after ASSIGN_QUEUE_TTL seconds, and every ticket is
+re-checked in the database before it is assigned.
+
+Each ticket goes to the active drafter with the lowest cost:
+
+    open tickets (from ticket_counters) - ASSIGN_UNIT_WEIGHT * log(1 + tickets done in that unit)
+
+skipping drafters with ASSIGN_MAX_OPEN or more open tickets. ``plan()`` is
+the dry run; ``assign_pending()`` applies the plan.
+"""
+
+import heapq
+import math
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import event, inspect, select, func
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models.enums import Role
+from app.models.ticket import DraftingTicket
+from app.models.ticket_counter import TicketCounter
+from app.models.user import User
+from app.notifications.dispatch import notify_ticket_assignment
+from app.services.ticket_events import record_event, ASSIGNED
+
+QUEUE_STATUS = "Pending"
+KEY_FIELDS = ("status", "assigned_to_id", "priority", "due_date", "unit")
+
+
+def _is_queued(status, assigned_to_id) -> bool:
+    return status == QUEUE_STATUS and assigned_to_id is None
+
+
+def queue_key(priority, due_date, created_at, ticket_id) -> tuple:
+    return (
+        priority if priority is not None else 3,
+        due_date or datetime.max,
+        created_at or datetime.max,
+        ticket_id,
+    )
+
+
+class AssignmentScheduler:
+    """Incrementally maintained priority queue of unassigned tickets."""
+
+    def __init__(self):
+        self._heap = []      # (key, ticket_id)
+        self._entries = {}   # ticket_id -> {"key", "ticket_number", "unit"}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._heap, self._entries, self._loaded_at = [], {}, None
+
+    def _load(self):
+        rows = db.session.execute(
+            select(DraftingTicket.id, DraftingTicket.ticket_number, DraftingTicket.priority,
+                   DraftingTicket.due_date, DraftingTicket.created_at, DraftingTicket.unit)
+            .where(DraftingTicket.status == QUEUE_STATUS, DraftingTicket.assigned_to_id.is_(None))
+        ).all()
+        entries = {
+            r.id: {"key": queue_key(r.priority, r.due_date, r.created_at, r.id),
+                   "ticket_number": r.ticket_number, "unit": r.unit}
+            for r in rows
+        }
+        heap = [(e["key"], ticket_id) for ticket_id, e in entries.items()]
+        heapq.heapify(heap)
+        self._heap, self._entries = heap, entries
+        self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        ttl = current_app.config.get("ASSIGN_QUEUE_TTL", 300)
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > ttl:
+            self._load()
+
+    def apply(self, changes):
+        """Apply committed (ticket_id, entry-or-None) changes from the session hook."""
+        with self._lock:
+            if self._loaded_at is None:
+                return  # Not loaded yet; the first load reads current state.
+            for ticket_id, entry in changes:
+                if entry is None:
+                    self._entries.pop(ticket_id, None)
+                else:
+                    self._entries[ticket_id] = entry
+                    heapq.heappush(self._heap, (entry["key"], ticket_id))
+            # Drop stale entries once they outnumber live ones.
+            if len(self._heap) > 2 * len(self._entries) + 64:
+                self._heap = [(e["key"], i) for i, e in self._entries.items()]
+                heapq.heapify(self._heap)
+
+    def queued(self, limit: int = None) -> list[dict]:
+        """Queued tickets in assignment order."""
+        with self._lock:
+            self._ensure_loaded()
+            heap, entries = list(self._heap), dict(self._entries)
+        ordered, seen = [], set()
+        while heap and (limit is None or len(ordered) < limit):
+            key, ticket_id = heapq.heappop(heap)
+            entry = entries.get(ticket_id)
+            if entry is None or entry["key"] != key or ticket_id in seen:
+                continue  # stale
+            seen.add(ticket_id)
+            ordered.append({"ticket_id": ticket_id, "ticket_number": entry["ticket_number"],
+                            "unit": entry["unit"], "priority": key[0],
+                            "due_date": None if key[1] == datetime.max else key[1]})
+        return ordered
+
+    def __len__(self):
+        return len(self._entries)
+
+
+scheduler = AssignmentScheduler()
+
+
+# --- session hooks ------------------------------------------------------------
+
+def _entry(ticket):
+    if not _is_queued(ticket.status, ticket.assigned_to_id):
+        return None
+    return {"key": queue_key(ticket.priority, ticket.due_date, ticket.created_at, ticket.id),
+            "ticket_number": ticket.ticket_number, "unit": ticket.unit}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_queue_changes(session, flush_context):
+    changes = session.info.setdefault("assignment_queue", [])
+    for ticket in session.new:
+        if isinstance(ticket, DraftingTicket):
+            changes.append((ticket.id, _entry(ticket)))
+    for ticket in session.dirty:
+        if isinstance(ticket, DraftingTicket):
+            state = inspect(ticket)
+            if any(state.attrs[f].history.has_changes() for f in KEY_FIELDS):
+                changes.append((ticket.id, _entry(ticket)))
+    for ticket in session.deleted:
+        if isinstance(ticket, DraftingTicket):
+            changes.append((ticket.id, None))
+    if not changes:
+        session.info.pop("assignment_queue")
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_queue_changes(session):
+    changes = session.info.pop("assignment_queue", None)
+    if changes:
+        scheduler.apply(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_queue_changes(session):
+    session.info.pop("assignment_queue", None)
+
+
+# --- planning -----------------------------------------------------------------
+
+def drafter_workloads() -> list[dict]:
+    """Active drafters with their open (not Completed) ticket counts."""
+    drafters = db.session.execute(
+        select(User).where(User.role == Role.DRAFTER, User.is_active.isnot(False))
+        .order_by(User.id)
+    ).scalars().all()
+    loads = dict(db.session.execute(
+        select(TicketCounter.user_id, func.sum(TicketCounter.count))
+        .where(TicketCounter.relation == "assigned",
+               TicketCounter.user_id.in_([d.id for d in drafters]),
+               TicketCounter.status != "Completed")
+        .group_by(TicketCounter.user_id)
+    ).all()) if drafters else {}
+    return [{"user": d, "open": int(loads.get(d.id) or 0)} for d in drafters]
+
+
+def _unit_experience(drafter_ids, units) -> dict:
+    """(drafter_id, unit) -> tickets that drafter has had in that unit."""
+    if not drafter_ids or not units:
+        return {}
+    rows = db.session.execute(
+        select(DraftingTicket.assigned_to_id, DraftingTicket.unit, func.count())
+        .where(DraftingTicket.assigned_to_id.in_(drafter_ids),
+               DraftingTicket.unit.in_(units))
+        .group_by(DraftingTicket.assigned_to_id, DraftingTicket.unit)
+    ).all()
+    return {(d, u): n for d, u, n in rows}
+
+
+def plan(limit: int = None) -> list[dict]:
+    """Proposed assignments in queue order, without changing anything."""
+    cfg = current_app.config
+    max_open = cfg.get("ASSIGN_MAX_OPEN", 8)
+    unit_weight = cfg.get("ASSIGN_UNIT_WEIGHT", 1.5)
+    workloads = [w for w in drafter_workloads() if w["open"] < max_open]
+    if not workloads:
+        return []
+    capacity = sum(max_open - w["open"] for w in workloads)
+    queued = scheduler.queued(min(limit, capacity) if limit else capacity)
+    experience = _unit_experience([w["user"].id for w in workloads],
+                                  {t["unit"] for t in queued if t["unit"]})
+
+    proposals = []
+    for ticket in queued:
+        best, best_cost = None, None
+        for w in workloads:
+            if w["open"] >= max_open:
+                continue
+            done = experience.get((w["user"].id, ticket["unit"]), 0)
+            cost = w["open"] - unit_weight * math.log1p(done)
+            if best is None or (cost, w["open"], w["user"].id) < (best_cost, best["open"], best["user"].id):
+                best, best_cost = w, cost
+        if best is None:
+            break
+        proposals.append({
+            **ticket,
+            "due_date": ticket["due_date"].isoformat() if ticket["due_date"] else None,
+            "drafter_id": best["user"].id,
+            "drafter": best["user"].actual_name,
+            "drafter_open": best["open"],
+            "unit_experience": experience.get((best["user"].id, ticket["unit"]), 0),
+        })
+        best["open"] += 1
+        if ticket["unit"]:
+            key = (best["user"].id, ticket["unit"])
+            experience[key] = experience.get(key, 0) + 1
+    return proposals
+
+
+def assign_pending(limit: int = None, dry_run: bool = False) -> list[dict]:
+    """Assign queued tickets per ``plan()``; returns the assignments made (or proposed)."""
+    proposals = plan(limit)
+    if dry_run:
+        return proposals
+    drafters = {p["drafter_id"]: db.session.get(User, p["drafter_id"]) for p in proposals}
+    assigned, gone = [], []
+    for proposal in proposals:
+        ticket = db.session.get(DraftingTicket, proposal["ticket_id"], with_for_update=True)
+        if ticket is None or not _is_queued(ticket.status, ticket.assigned_to_id):
+            # Taken or changed elsewhere since the queue was loaded.
+            gone.append((proposal["ticket_id"], None))
+            continue
+        drafter = drafters[proposal["drafter_id"]]
+        ticket.assigned_to_id = drafter.id
+        ticket.status = "In Progress"
+        record_event(ticket, ASSIGNED, drafter_id=drafter.id, auto=True)
+        notify_ticket_assignment(ticket, drafter)
+        assigned.append(proposal)
+    db.session.commit()
+    if gone:
+        scheduler.apply(gone)
+    return assigned
@@ -0,0 +1,120 @@
+# app/services/audit_query.py
+"""
+Filtered, keyset-paginated queries over the audit trail.
+
+All queries order by (timestamp DESC, id DESC) so they are served by the
+composite ``audit_logs`` indexes declared on ``AuditLog``.
+"""
+
+import base64
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import select, and_, or_
+
+from app.document_control.models import AuditLog
+from app.models.user import User
+
+AUDIT_COLUMNS = [
+    "id", "timestamp", "user_id", "username", "action",
+    "entity_type", "entity_id", "details",
+]
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _parse_datetime(raw: str, field: str) -> datetime:
+    try:
+        value = datetime.fromisoformat(raw.strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid ISO-8601 datetime for '{field}': {raw}")
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def parse_audit_filters(args) -> dict:
+    """
+    Build a filter dict from request args.
+    Supported keys: entity_type, entity_id, user_id, action, since, until.
+    Raises ValueError for malformed values.
+    """
+    filters = {}
+    for key in ("entity_type", "entity_id", "action"):
+        value = (args.get(key) or "").strip()
+        if value:
+            filters[key] = value
+    user_id = (args.get("user_id") or "").strip()
+    if user_id:
+        if not user_id.isdigit():
+            raise ValueError("user_id must be an integer")
+        filters["user_id"] = int(user_id)
+    for key in ("since", "until"):
+        value = args.get(key)
+        if value:
+            filters[key] = _parse_datetime(value, key)
+    if "entity_id" in filters and "entity_type" not in filters:
+        raise ValueError("entity_id requires entity_type")
+    return filters
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    raw = json.dumps([timestamp.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(ts), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def audit_select(filters: dict, cursor: str = None):
+    """Return a column-projected SELECT for the given filters, newest first."""
+    stmt = (
+        select(
+            AuditLog.id,
+            AuditLog.timestamp,
+            AuditLog.user_id,
+            User.username,
+            AuditLog.action,
+            AuditLog.entity_type,
+            AuditLog.entity_id,
+            AuditLog.details,
+        )
+        .outerjoin(User, User.id == AuditLog.user_id)
+    )
+    if "entity_type" in filters:
+        stmt = stmt.where(AuditLog.entity_type == filters["entity_type"])
+    if "entity_id" in filters:
+        stmt = stmt.where(AuditLog.entity_id == filters["entity_id"])
+    if "user_id" in filters:
+        stmt = stmt.where(AuditLog.user_id == filters["user_id"])
+    if "action" in filters:
+        stmt = stmt.where(AuditLog.action == filters["action"])
+    if "since" in filters:
+        stmt = stmt.where(AuditLog.timestamp >= filters["since"])
+    if "until" in filters:
+        stmt = stmt.where(AuditLog.timestamp < filters["until"])
+    if cursor:
+        ts, row_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            AuditLog.timestamp < ts,
+            and_(AuditLog.timestamp == ts, AuditLog.id < row_id),
+        ))
+    return stmt.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())
+
+
+def parse_details(record: dict) -> dict:
+    """Decode the JSON ``details`` column in place when it is valid JSON."""
+    details = record.get("details")
+    if isinstance(details, str):
+        try:
+            record["details"] = json.loads(details)
+        except ValueError:
+            pass
+    return record
@@ -0,0 +1,57 @@
+# app/services/background.py
+"""
+In-process background job runner.
+
+Jobs run on a small bounded thread pool inside an application context.
+Set BACKGROUND_JOBS_EAGER to run jobs inline (used by the test config).
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from flask import current_app
+
+from app.extensions import db
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(app) -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get("BACKGROUND_WORKERS", 2),
+                thread_name_prefix="nexus-bg",
+            )
+    return _executor
+
+
+def submit(fn, *args, **kwargs) -> Future:
+    """
+    Run ``fn(*args, **kwargs)`` in the background with an app context and a
+    fresh DB session. Exceptions are logged, not raised.
+    """
+    app = current_app._get_current_object()
+
+    def _run():
+        with app.app_context():
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                app.logger.exception(f"Background job {fn.__name__} failed")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+    if app.config.get("BACKGROUND_JOBS_EAGER"):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as exc:
+            app.logger.exception(f"Background job {fn.__name__} failed")
+            db.session.rollback()
+            future.set_exception(exc)
+        return future
+    return _get_executor(app).submit(_run)
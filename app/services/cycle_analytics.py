@@ -0,0 +1,175 @@
+# app/services/cycle_analytics.py
+"""
+Cycle-time, throughput and backlog metrics for the insights page.
+
+Per-ticket values are aggregated in SQL (one row per ticket) and pulled in
+batches of CYCLE_ANALYTICS_BATCH rows into typed ``array`` columns; the
+percentiles, histograms and weekly buckets are then computed over whole
+columns at once. Sources:
+
+- time to assign / time in review: a ticket's summed Pending / In-Review
+  stretches in ticket_status_transitions
+- revision loops: DraftingTicket.revision of tickets approved in the window
+  (review rounds minus the approving one)
+- weekly throughput: "approved" events in the ticket event log
+- backlog age: open tickets' created_at
+
+Results are cached per window for CYCLE_ANALYTICS_TTL seconds.
+"""
+
+import math
+import threading
+import time
+from array import array
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select, func
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.ticket_event import TicketEvent
+from app.models.ticket_status_transition import TicketStatusTransition
+from app.services.ticket_events import APPROVED
+
+CLOSED_STATUS = "Completed"
+BACKLOG_BUCKETS = ((7, "<7d"), (30, "7-30d"), (90, "30-90d"), (math.inf, ">90d"))
+EPOCH = datetime(1970, 1, 1)
+WEEK = 7 * 86400
+
+_cache = {}  # days -> (computed at, metrics)
+_cache_lock = threading.Lock()
+
+
+# --- column helpers ------------------------------------------------------------
+
+def _seconds(value: datetime) -> float:
+    return (value - EPOCH).total_seconds()
+
+
+def _column(stmt, typecode: str = "d", convert=None) -> array:
+    """First column of ``stmt``, fetched in batches into a typed array (NULLs dropped)."""
+    batch = current_app.config.get("CYCLE_ANALYTICS_BATCH", 5000)
+    values = array(typecode)
+    result = db.session.execute(stmt.execution_options(yield_per=batch))
+    for rows in result.partitions():
+        column = [row[0] for row in rows if row[0] is not None]
+        values.extend(map(convert, column) if convert else column)
+    return values
+
+
+def _percentile(ordered, q: float):
+    """Linear-interpolated percentile of an ascending sequence (numpy's default method)."""
+    if not ordered:
+        return None
+    k = (len(ordered) - 1) * q
+    lo = math.floor(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(values, scale: float = 1.0) -> dict:
+    """count, mean, p50 and p90 of a column, divided by ``scale`` and rounded."""
+    ordered = sorted(v / scale for v in values)
+    if not ordered:
+        return {"count": 0, "mean": None, "p50": None, "p90": None}
+    return {
+        "count": len(ordered),
+        "mean": round(math.fsum(ordered) / len(ordered), 2),
+        "p50": round(_percentile(ordered, 0.5), 2),
+        "p90": round(_percentile(ordered, 0.9), 2),
+    }
+
+
+# --- metrics ---------------------------------------------------------------
+
+def _stretches(from_status: str, since: datetime) -> array:
+    """Seconds per ticket spent in ``from_status``, over stretches ending in the window."""
+    return _column(
+        select(func.sum(TicketStatusTransition.seconds_in_previous))
+        .where(TicketStatusTransition.from_status == from_status,
+               TicketStatusTransition.changed_at >= since)
+        .group_by(TicketStatusTransition.ticket_id)
+    )
+
+
+def _approved(since: datetime):
+    return (TicketEvent.event_type == APPROVED, TicketEvent.created_at >= since)
+
+
+def revision_loops(since: datetime) -> dict:
+    rounds = _column(
+        select(DraftingTicket.revision)
+        .where(DraftingTicket.id.in_(select(TicketEvent.ticket_id).where(*_approved(since)))),
+        "l",
+    )
+    loops = array("l", (max(r - 1, 0) for r in rounds))
+    summary = summarize(loops)
+    histogram = {}
+    for n in loops:
+        histogram[str(n)] = histogram.get(str(n), 0) + 1
+    summary["max"] = max(loops, default=None)
+    summary["distribution"] = dict(sorted(histogram.items(), key=lambda kv: int(kv[0])))
+    return summary
+
+
+def weekly_throughput(since: datetime, now: datetime) -> list[dict]:
+    """Tickets approved per ISO week (weeks starting Monday), zero-filled."""
+    first_week = (since - timedelta(days=since.weekday())).date()
+    origin = _seconds(datetime.combine(first_week, datetime.min.time()))
+    stamps = _column(select(TicketEvent.created_at).where(*_approved(since)), convert=_seconds)
+    weeks = (now.date() - first_week).days // 7 + 1
+    counts = [0] * weeks
+    for week in (int((stamp - origin) // WEEK) for stamp in stamps):
+        counts[min(max(week, 0), weeks - 1)] += 1
+    return [
+        {"week": (first_week + timedelta(weeks=i)).isoformat(), "completed": n}
+        for i, n in enumerate(counts)
+    ]
+
+
+def backlog_age(now: datetime) -> dict:
+    created = _column(
+        select(DraftingTicket.created_at)
+        .where(func.coalesce(DraftingTicket.status, "") != CLOSED_STATUS),
+        convert=_seconds,
+    )
+    now_ts = _seconds(now)
+    ages = array("d", ((now_ts - c) / 86400 for c in created))
+    buckets = {label: 0 for _, label in BACKLOG_BUCKETS}
+    for age in ages:
+        buckets[next(label for limit, label in BACKLOG_BUCKETS if age < limit)] += 1
+    return {"open": len(ages), "age_days": summarize(ages), "buckets": buckets}
+
+
+def compute_cycle_metrics(days: int = 90, now: datetime = None) -> dict:
+    now = now or datetime.utcnow()
+    since = now - timedelta(days=days)
+    return {
+        "days": days,
+        "generated_at": now.isoformat(),
+        "time_to_assign_hours": summarize(_stretches("Pending", since), 3600),
+        "time_in_review_hours": summarize(_stretches("In-Review", since), 3600),
+        "revision_loops": revision_loops(since),
+        "weekly_throughput": weekly_throughput(since, now),
+        "backlog": backlog_age(now),
+    }
+
+
+def cycle_metrics(days: int = 90) -> dict:
+    """``compute_cycle_metrics`` reused for CYCLE_ANALYTICS_TTL seconds per window."""
+    ttl = current_app.config.get("CYCLE_ANALYTICS_TTL", 300)
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _cache.get(days)
+        if cached and now - cached[0] < ttl:
+            return cached[1]
+    metrics = compute_cycle_metrics(days)
+    with _cache_lock:
+        _cache[days] = (now, metrics)
+    return metrics
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,232 @@
+# app/services/data_export.py
+"""
+Column-projected SELECTs for the bulk data exports.
+
+Each dataset whitelists the columns it can export (``?columns=`` picks a
+subset, in the requested order) and the filters it accepts. The SELECT only
+projects the chosen columns and is ordered by primary key, so the route can
+stream it with ``yield_per`` through app.services.streaming_export.
+
+Datasets: tickets (including the piping spec fields), attachments,
+documents and document_revisions.
+"""
+
+from enum import Enum
+
+from sqlalchemy import select
+
+from app.document_control.enums import StatusCode, SensitivityClass, RevisionCode
+from app.document_control.models import DocumentMaster, DocumentRevision
+from app.models.ticket import DraftingTicket
+from app.models.ticket_attachment import TicketAttachment
+from app.models.user import User
+from app.services.audit_query import _parse_datetime
+
+# Table (not ORM) aliases, so importing this module doesn't configure mappers.
+_users = User.__table__
+_reviewer = _users.alias("reviewer")
+_drafter = _users.alias("drafter")
+_submitter = _users.alias("submitter")
+_uploader = _users.alias("uploader")
+
+SPEC_FIELDS = (
+    "service", "pipe_spec", "operating_psig", "operating_temp", "design_psig",
+    "design_temp", "nde_rt", "nde_pt", "pressure_test", "paint_spec",
+    "pwht_temp", "pwht_hold", "insulation_spec",
+)
+
+
+class ExportDataset:
+    """
+    One exportable table.
+
+    columns: output name -> column expression, in default output order.
+    filters: query arg -> (column expression, kind), where kind is "str",
+             "int", "bool", "since", "until" or an Enum class.
+    joins:   (entity, onclause) outer-joined for the looked-up columns.
+    """
+
+    def __init__(self, name, entity, columns, filters, roles, joins=()):
+        self.name = name
+        self.entity = entity
+        self.columns = columns
+        self.filters = filters
+        self.roles = roles
+        self.joins = joins
+
+
+def _columns(entity, names):
+    return {name: getattr(entity, name) for name in names}
+
+
+DATASETS = {
+    "tickets": ExportDataset(
+        "tickets",
+        DraftingTicket,
+        {
+            **_columns(DraftingTicket, (
+                "id", "ticket_number", "status", "priority", "unit", "request_type",
+                "work_order", "moc", "description", "created_at", "due_date",
+                "status_changed_at", "revision",
+            )),
+            "review_engineer": _reviewer.c.username,
+            "assigned_to": _drafter.c.username,
+            "submitted_by": _submitter.c.username,
+            **_columns(DraftingTicket, SPEC_FIELDS),
+        },
+        {
+            "status": (DraftingTicket.status, "str"),
+            "unit": (DraftingTicket.unit, "str"),
+            "request_type": (DraftingTicket.request_type, "str"),
+            "priority": (DraftingTicket.priority, "int"),
+            "assigned_to_id": (DraftingTicket.assigned_to_id, "int"),
+            "review_engineer_id": (DraftingTicket.review_engineer_id, "int"),
+            "since": (DraftingTicket.created_at, "since"),
+            "until": (DraftingTicket.created_at, "until"),
+        },
+        roles=("admin",),
+        joins=(
+            (_reviewer, _reviewer.c.id == DraftingTicket.review_engineer_id),
+            (_drafter, _drafter.c.id == DraftingTicket.assigned_to_id),
+            (_submitter, _submitter.c.id == DraftingTicket.submitted_by_id),
+        ),
+    ),
+    "attachments": ExportDataset(
+        "attachments",
+        TicketAttachment,
+        {
+            "id": TicketAttachment.id,
+            "ticket_number": DraftingTicket.ticket_number,
+            **_columns(TicketAttachment, (
+                "filename", "category", "version", "is_latest", "uploaded_at",
+                "checksum", "file_size", "page_count", "file_path",
+            )),
+            "uploaded_by": _uploader.c.username,
+        },
+        {
+            "ticket_number": (DraftingTicket.ticket_number, "str"),
+            "category": (TicketAttachment.category, "str"),
+            "is_latest": (TicketAttachment.is_latest, "bool"),
+            "since": (TicketAttachment.uploaded_at, "since"),
+            "until": (TicketAttachment.uploaded_at, "until"),
+        },
+        roles=("admin",),
+        joins=(
+            (DraftingTicket, DraftingTicket.id == TicketAttachment.ticket_id),
+            (_uploader, _uploader.c.id == TicketAttachment.uploaded_by_id),
+        ),
+    ),
+    "documents": ExportDataset(
+        "documents",
+        DocumentMaster,
+        _columns(DocumentMaster, (
+            "id", "document_number", "title", "unit", "sheet_number", "discipline",
+            "responsible_engineer", "originating_department", "status", "sensitivity",
+            "compliance", "created_at", "effective_date", "review_due", "retired_at",
+            "retention_rule", "retention_expires_at",
+        )),
+        {
+            "unit": (DocumentMaster.unit, "str"),
+            "discipline": (DocumentMaster.discipline, "str"),
+            "status": (DocumentMaster.status, StatusCode),
+            "sensitivity": (DocumentMaster.sensitivity, SensitivityClass),
+            "since": (DocumentMaster.created_at, "since"),
+            "until": (DocumentMaster.created_at, "until"),
+        },
+        roles=("admin", "doc_control_admin"),
+    ),
+    "document_revisions": ExportDataset(
+        "document_revisions",
+        DocumentRevision,
+        {
+            "id": DocumentRevision.id,
+            "document_number": DocumentMaster.document_number,
+            **_columns(DocumentRevision, (
+                "revision_code", "file_key", "checksum", "file_size", "created_at",
+                "storage_tier", "comments",
+            )),
+            "uploaded_by": _uploader.c.username,
+        },
+        {
+            "document_number": (DocumentMaster.document_number, "str"),
+            "revision_code": (DocumentRevision.revision_code, RevisionCode),
+            "storage_tier": (DocumentRevision.storage_tier, "str"),
+            "since": (DocumentRevision.created_at, "since"),
+            "until": (DocumentRevision.created_at, "until"),
+        },
+        roles=("admin", "doc_control_admin"),
+        joins=(
+            (DocumentMaster, DocumentMaster.id == DocumentRevision.master_id),
+            (_uploader, _uploader.c.id == DocumentRevision.uploaded_by_id),
+        ),
+    ),
+}
+
+
+def get_dataset(name: str) -> ExportDataset:
+    """Raises LookupError for unknown dataset names."""
+    try:
+        return DATASETS[name]
+    except KeyError:
+        raise LookupError(f"Unknown dataset. Valid datasets: {', '.join(DATASETS)}")
+
+
+def parse_columns(dataset: ExportDataset, raw: str = None) -> list[str]:
+    """``?columns=a,b`` as a list (all columns when empty). Raises ValueError."""
+    if not raw or not raw.strip():
+        return list(dataset.columns)
+    names = [c.strip() for c in raw.split(",") if c.strip()]
+    unknown = [c for c in names if c not in dataset.columns]
+    if unknown:
+        raise ValueError(
+            f"Unknown column(s) for {dataset.name}: {', '.join(unknown)}. "
+            f"Valid columns: {', '.join(dataset.columns)}"
+        )
+    return list(dict.fromkeys(names))
+
+
+def _parse_filter(key: str, raw: str, kind):
+    if kind == "int":
+        if not raw.lstrip("-").isdigit():
+            raise ValueError(f"{key} must be an integer")
+        return int(raw)
+    if kind == "bool":
+        if raw.lower() not in ("true", "false", "1", "0"):
+            raise ValueError(f"{key} must be true or false")
+        return raw.lower() in ("true", "1")
+    if kind in ("since", "until"):
+        return _parse_datetime(raw, key)
+    if isinstance(kind, type) and issubclass(kind, Enum):
+        for member in kind:
+            if raw in (member.name, member.value):
+                return member
+        raise ValueError(f"{key} must be one of {', '.join(m.value for m in kind)}")
+    return raw
+
+
+def parse_export_filters(dataset: ExportDataset, args) -> dict:
+    """Build a filter dict from request args for ``dataset``. Raises ValueError."""
+    filters = {}
+    for key, (_, kind) in dataset.filters.items():
+        raw = (args.get(key) or "").strip()
+        if raw:
+            filters[key] = _parse_filter(key, raw, kind)
+    return filters
+
+
+def export_select(dataset: ExportDataset, columns: list[str], filters: dict):
+    """SELECT of ``columns`` (labelled by name) matching ``filters``, by primary key."""
+    stmt = select(*(dataset.columns[c].label(c) for c in columns)).select_from(dataset.entity)
+    for entity, onclause in dataset.joins:
+        stmt = stmt.outerjoin(entity, onclause)
+    for key, value in filters.items():
+        column, kind = dataset.filters[key]
+        if kind in ("since", "until") and not column.type.timezone:
+            value = value.replace(tzinfo=None)  # naive UTC columns
+        if kind == "since":
+            stmt = stmt.where(column >= value)
+        elif kind == "until":
+            stmt = stmt.where(column < value)
+        else:
+            stmt = stmt.where(column == value)
+    return stmt.order_by(dataset.entity.id)
@@ -1,24 +1,23 @@
 """
-Handles outbound email logic asynchronously using Python's threading,
-for seamless, non-blocking email delivery.
+Outbound email entry point.
+
+Messages are written to the ``outbound_emails`` outbox in the caller's
+database transaction and delivered after commit by the pooled workers in
+app.services.mail_delivery, which reuse SMTP connections and retry
+transient failures.
 """
 
-import threading
-import smtplib
-from email.message import EmailMessage
 from flask import current_app
-import logging
 
-logger = logging.getLogger(__name__)
+from app.services.mail_delivery import queue_email
 
 
 def send_email(subject, recipients, body, html=None, cc=None, attachments=None):
     """
-    Sends an email asynchronously without blocking the main thread.
+    Queue an email for delivery once the current transaction commits.
 
-    Reads SMTP settings from Flask config:
-      MAIL_SERVER, MAIL_PORT, MAIL_USE_TLS, MAIL_USERNAME,
-      MAIL_PASSWORD, MAIL_DEFAULT_SENDER.
+    Callers must commit the session (as they already do after the change
+    that triggers the email); a rollback discards the message too.
 
     Parameters:
       subject (str): Email subject.
@@ -28,65 +27,7 @@ def send_email(subject, recipients, body, html=None, cc=None, attachments=None):
       cc (list): CC addresses (optional).
       attachments (list): List of file paths to attach (optional).
     """
-    app = current_app._get_current_object()
-
-    smtp_server = app.config['MAIL_SERVER']
-    smtp_port = app.config['MAIL_PORT']
-    use_tls = app.config.get('MAIL_USE_TLS', False)
-    username = app.config.get('MAIL_USERNAME')
-    password = app.config.get('MAIL_PASSWORD')
-    sender = app.config.get('MAIL_DEFAULT_SENDER') or username
-
-    app.logger.info(
-        f"Queueing email: subject={subject!r}, sender={sender!r}, "
-        f"to={recipients}, cc={cc or []}, server={smtp_server}:{smtp_port}, TLS={use_tls}"
-    )
-
-    def _send():
-        try:
-            msg = EmailMessage()
-            msg['Subject'] = subject
-            msg['From'] = sender
-            msg['To'] = ', '.join(recipients)
-            if cc:
-                msg['Cc'] = ', '.join(cc)
-
-            # Set plain-text and optional HTML parts
-            msg.set_content(body or '')
-            if html:
-                msg.add_alternative(html, subtype='html')
-
-            # Attach files if provided
-            if attachments:
-                for path in attachments:
-                    try:
-                        with open(path, 'rb') as f:
-                            data = f.read()
-                        filename = path.replace('\\', '/').split('/')[-1]
-                        msg.add_attachment(
-                            data,
-                            maintype='application',
-                            subtype='octet-stream',
-                            filename=filename
-                        )
-                    except Exception as exc:
-                        app.logger.error(
-                            f"Attachment error ({path}): {exc}", exc_info=True)
-
-            # Send via SMTP
-            with smtplib.SMTP(smtp_server, smtp_port) as server:
-                server.ehlo()
-                if use_tls:
-                    server.starttls()
-                    server.ehlo()
-                if username and password:
-                    server.login(username, password)
-                server.send_message(msg)
-
-            app.logger.info(
-                f"Email sent successfully: subject={subject!r}, to={recipients}")
-        except Exception as exc:
-            app.logger.error(f"Failed to send email: {exc}", exc_info=True)
-
-    thread = threading.Thread(target=_send, daemon=True)
-    thread.start()
+    row = queue_email(subject, recipients, body, html=html, cc=cc, attachments=attachments)
+    current_app.logger.info(
+        f"Queueing email: subject={subject!r}, to={recipients}, cc={cc or []}")
+    return row
@@ -0,0 +1,213 @@
+# app/services/event_bus.py
+"""
+Pub/sub feeding the Server-Sent Events stream.
+
+``publish()`` hands a message to the backend, which delivers it to every
+matching ``Subscription`` in each process. The default backend delivers in
+process; set EVENT_BUS_URL to a redis URL to fan messages out across
+nodes through the EVENT_BUS_CHANNEL pub/sub channel (each node delivers
+what it receives to its own subscribers).
+
+A message is addressed to user ids and/or role names; with neither it is a
+broadcast. Each subscription has a bounded queue (SSE_QUEUE_SIZE); a slow
+client that overflows it loses the oldest messages and is flagged so the
+stream can tell it to resync.
+
+Each process also keeps its last SSE_BACKLOG messages, numbered, so
+clients without a stream can poll ``since()`` for what they missed. The
+cursor names the process; a cursor from another process (or one older
+than the backlog) gets a resync instead.
+"""
+
+import json
+import logging
+import queue
+import threading
+import uuid
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBackend:
+    """Deliver messages to this process's subscribers only."""
+
+    def __init__(self, deliver):
+        self.deliver = deliver
+
+    def start(self):
+        pass
+
+    def publish(self, message: dict):
+        self.deliver(message)
+
+
+class RedisBackend:
+    """Fan messages out to every node through a redis pub/sub channel."""
+
+    def __init__(self, url: str, channel: str, deliver):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.channel = channel
+        self.deliver = deliver
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Begin listening; only processes that serve streams need this."""
+        with self._lock:
+            if self._listener is None:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.channel: self._on_message})
+                self._listener = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def _on_message(self, raw):
+        try:
+            self.deliver(json.loads(raw["data"]))
+        except Exception:
+            logger.exception("Dropping malformed event bus message")
+
+    def publish(self, message: dict):
+        self.client.publish(self.channel, json.dumps(message))
+
+
+def addressed_to(message: dict, user_id: int, role: str = None) -> bool:
+    user_ids, roles = message.get("user_ids"), message.get("roles")
+    if user_ids is None and roles is None:
+        return True
+    return user_id in (user_ids or ()) or role in (roles or ())
+
+
+class Subscription:
+    """One client's bounded queue of pending messages."""
+
+    def __init__(self, bus, user_id: int, role: str, max_queued: int):
+        self.bus = bus
+        self.user_id = user_id
+        self.role = role
+        self.queue = queue.Queue(maxsize=max_queued)
+        self.overflowed = False
+
+    def wants(self, message: dict) -> bool:
+        return addressed_to(message, self.user_id, self.role)
+
+    def put(self, message: dict) -> bool:
+        """Queue a message; returns True if an older one had to be dropped."""
+        dropped = False
+        while True:
+            try:
+                self.queue.put_nowait(message)
+                return dropped
+            except queue.Full:
+                self.overflowed = dropped = True
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout: float) -> dict | None:
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.bus._remove(self)
+
+
+class EventBus:
+    def __init__(self):
+        self.max_queued = 100
+        self.backend = LocalBackend(self._deliver)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._token = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._recent = deque(maxlen=500)
+        self.published = 0
+        self.dropped = 0
+
+    def init_app(self, app):
+        self.max_queued = app.config.get("SSE_QUEUE_SIZE", self.max_queued)
+        self._recent = deque(self._recent, maxlen=app.config.get("SSE_BACKLOG", self._recent.maxlen))
+        url = app.config.get("EVENT_BUS_URL")
+        if url:
+            self.backend = RedisBackend(url, app.config.get("EVENT_BUS_CHANNEL", "nexus-events"),
+                                        self._deliver)
+        else:
+            self.backend = LocalBackend(self._deliver)
+
+    def subscribe(self, user_id: int, role: str = None, limit: int = None) -> Subscription | None:
+        """New subscription, or None if ``limit`` subscriptions are already open."""
+        self.backend.start()
+        subscription = Subscription(self, user_id, role, self.max_queued)
+        with self._lock:
+            if limit is not None and len(self._subscribers) >= limit:
+                return None
+            self._subscribers.add(subscription)
+        return subscription
+
+    def _remove(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event_type: str, data: dict, user_ids=None, roles=None) -> None:
+        """Send an event to the given users / roles (everyone if neither)."""
+        message = {
+            "id": uuid.uuid4().hex,
+            "type": event_type,
+            "data": data,
+            "user_ids": sorted(set(user_ids)) if user_ids is not None else None,
+            "roles": sorted(set(roles)) if roles is not None else None,
+        }
+        self.published += 1
+        try:
+            self.backend.publish(message)
+        except Exception:
+            # Live updates are best-effort; clients resync when they reopen lists.
+            logger.exception(f"Failed to publish {event_type} event")
+
+    def since(self, cursor: str, user_id: int, role: str = None) -> tuple[list[dict], str, bool]:
+        """
+        Messages for the user after ``cursor``, the cursor to poll with next,
+        and whether the client missed messages and must resync. An empty
+        cursor starts from now.
+        """
+        self.backend.start()
+        token, _, seq = (cursor or "").partition(":")
+        with self._lock:
+            current = f"{self._token}:{self._seq}"
+            if not cursor:
+                return [], current, False
+            if token != self._token or not seq.isdigit():
+                return [], current, True
+            after = int(seq)
+            oldest = self._recent[0][0] if self._recent else self._seq + 1
+            missed = after + 1 < oldest
+            messages = [m for n, m in self._recent
+                        if n > after and addressed_to(m, user_id, role)]
+        return messages, current, missed
+
+    def _deliver(self, message: dict):
+        with self._lock:
+            self._seq += 1
+            self._recent.append((self._seq, message))
+            targets = [s for s in self._subscribers if s.wants(message)]
+        for subscription in targets:
+            if subscription.put(message):
+                self.dropped += 1
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+event_bus = EventBus()
+
+
+def format_sse(message: dict) -> str:
+    """Encode a bus message as one SSE frame."""
+    return (f"id: {message['id']}\n"
+            f"event: {message['type']}\n"
+            f"data: {json.dumps(message['data'])}\n\n")
@@ -1,11 +1,18 @@
 # app/services/file_manager.py
 
 """
-Handles file saving, versioning, and cleanup for drafting tickets.
+Handles file saving, versioning, and cleanup for drafting tickets, and
+provisions each user's drive home folder when the user is created.
 """
 
+from pathlib import Path
+
 from werkzeug.utils import secure_filename
 from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.user import User
 from app.services.storage_adapter import LocalFSAdapter
 
 
@@ -36,3 +43,37 @@ def save_uploaded_file(file, ticket_number):
     key = adapter.save(prefix, file)
 
     return key
+
+
+def user_home_root() -> Path:
+    """Parent of the per-user home folders (USER_HOME_ROOT, else static/users)."""
+    root = current_app.config.get("USER_HOME_ROOT")
+    return Path(root) if root else Path(current_app.root_path) / "static" / "users"
+
+
+def provision_user_home(user_id: int) -> Path:
+    """Create users/<id> for the dashboard drive; safe to repeat."""
+    home = user_home_root() / str(user_id)
+    home.mkdir(parents=True, exist_ok=True)
+    return home
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_new_users(session, flush_context):
+    new_ids = [u.id for u in session.new if isinstance(u, User)]
+    if new_ids:
+        session.info.setdefault("new_user_homes", []).extend(new_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _provision_new_users(session):
+    for user_id in session.info.pop("new_user_homes", ()):
+        try:
+            provision_user_home(user_id)
+        except OSError:
+            current_app.logger.error(f"Failed to create home folder for user {user_id}", exc_info=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_new_users(session):
+    session.info.pop("new_user_homes", None)
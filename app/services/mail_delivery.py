@@ -0,0 +1,306 @@
+# app/services/mail_delivery.py
+"""
+Outbox-backed SMTP delivery.
+
+send_email() writes an OutboundEmail row in the caller's transaction; once
+that transaction commits, the dispatcher is woken. The server starts the
+workers at boot (run.py), so rows left queued, due for retry or stuck in
+"sending" across a restart are picked up without waiting for new mail.
+Short-lived processes (cron scripts) set MAIL_WORKERS = 0 and call
+``deliver_pending()`` before exiting instead, since daemon workers would
+die with them mid-send. A bounded pool of
+MAIL_WORKERS threads claims due rows in batches and sends them over a
+persistent SMTP connection per worker (one TLS handshake and login, reused
+until idle for MAIL_IDLE_TIMEOUT). Transient failures are retried with
+exponential backoff; permanent 5xx rejections fail immediately. Workers
+also poll every MAIL_POLL_INTERVAL seconds, so retries and rows queued by
+other processes are picked up, and rows left in "sending" by a crashed
+process are reclaimed after MAIL_SEND_TIMEOUT.
+"""
+
+import json
+import logging
+import smtplib
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+from sqlalchemy import event, select, update, func, or_, and_
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models.outbound_email import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPConnection:
+    """One reusable SMTP session built from the Flask mail config."""
+
+    def __init__(self, config, on_connect=None):
+        self.config = config
+        self.on_connect = on_connect
+        self._smtp = None
+        self._last_used = 0.0
+
+    def _open(self):
+        cfg = self.config
+        smtp = smtplib.SMTP(cfg["MAIL_SERVER"], cfg["MAIL_PORT"], timeout=30)
+        smtp.ehlo()
+        if cfg.get("MAIL_USE_TLS"):
+            smtp.starttls()
+            smtp.ehlo()
+        if cfg.get("MAIL_USERNAME") and cfg.get("MAIL_PASSWORD"):
+            smtp.login(cfg["MAIL_USERNAME"], cfg["MAIL_PASSWORD"])
+        self._smtp = smtp
+        if self.on_connect:
+            self.on_connect()
+
+    def send(self, msg: EmailMessage):
+        idle = time.monotonic() - self._last_used
+        if self._smtp is not None and idle > self.config.get("MAIL_IDLE_TIMEOUT", 60):
+            self.close()
+        if self._smtp is None:
+            self._open()
+        try:
+            self._smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Server dropped an idle session; reconnect once.
+            self._smtp = None
+            self._open()
+            self._smtp.send_message(msg)
+        self._last_used = time.monotonic()
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+
+def _is_permanent(exc: Exception) -> bool:
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(exc, smtplib.SMTPResponseException) and 500 <= exc.smtp_code < 600
+
+
+def build_message(row: OutboundEmail, sender: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg['Subject'] = row.subject
+    msg['From'] = sender
+    msg['To'] = ', '.join(json.loads(row.recipients))
+    if row.cc:
+        msg['Cc'] = ', '.join(json.loads(row.cc))
+
+    # Set plain-text and optional HTML parts
+    msg.set_content(row.body or '')
+    if row.html:
+        msg.add_alternative(row.html, subtype='html')
+
+    for path in json.loads(row.attachments or "[]"):
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as exc:
+            logger.error(f"Attachment error ({path}): {exc}")
+            continue
+        filename = path.replace('\\', '/').split('/')[-1]
+        msg.add_attachment(data, maintype='application',
+                           subtype='octet-stream', filename=filename)
+    return msg
+
+
+class MailDispatcher:
+    """Bounded pool of outbox delivery workers for one process."""
+
+    def __init__(self):
+        self.app = None
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self.counters = Counter()
+
+    def init_app(self, app):
+        self.app = app
+
+    # --- worker pool -----------------------------------------------------
+
+    def start(self):
+        """Top the pool up to MAIL_WORKERS threads (none when it is 0)."""
+        workers = self.app.config.get("MAIL_WORKERS", 2)
+        self._stopping.clear()
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            for n in range(len(self._threads), workers):
+                thread = threading.Thread(target=self._worker, name=f"nexus-mail-{n}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 10):
+        """Let the workers finish their current batch and exit."""
+        self._stopping.set()
+        self._wake.set()
+        with self._lock:
+            for thread in self._threads:
+                thread.join(timeout)
+            self._threads = [t for t in self._threads if t.is_alive()]
+
+    def wake(self):
+        if self.app is None or not self.app.config.get("MAIL_WORKERS", 2):
+            return
+        self.start()
+        self._wake.set()
+
+    def _worker(self):
+        conn = self.connection()
+        poll = self.app.config.get("MAIL_POLL_INTERVAL", 30)
+        while not self._stopping.is_set():
+            try:
+                with self.app.app_context():
+                    try:
+                        sent = self.deliver_batch(conn)
+                    finally:
+                        db.session.remove()
+            except Exception:
+                logger.exception("Mail worker batch failed")
+                sent = 0
+            if not sent and not self._stopping.is_set():
+                self._wake.wait(poll)
+                self._wake.clear()
+        conn.close()
+
+    # --- delivery --------------------------------------------------------
+
+    def connection(self) -> SMTPConnection:
+        return SMTPConnection(self.app.config, lambda: self._count("connections_opened"))
+
+    def _count(self, key, n=1):
+        with self._metrics_lock:
+            self.counters[key] += n
+
+    def _claim(self, now, limit) -> list[int]:
+        cfg = self.app.config
+        stale = now - timedelta(seconds=cfg.get("MAIL_SEND_TIMEOUT", 300))
+        candidates = db.session.execute(
+            select(OutboundEmail.id)
+            .where(or_(
+                and_(OutboundEmail.status == "queued", OutboundEmail.next_attempt_at <= now),
+                and_(OutboundEmail.status == "sending", OutboundEmail.claimed_at < stale),
+            ))
+            .order_by(OutboundEmail.next_attempt_at, OutboundEmail.id)
+            .limit(limit)
+        ).scalars().all()
+        claimed = []
+        for email_id in candidates:
+            won = db.session.execute(
+                update(OutboundEmail)
+                .where(OutboundEmail.id == email_id,
+                       or_(OutboundEmail.status == "queued",
+                           and_(OutboundEmail.status == "sending", OutboundEmail.claimed_at < stale)))
+                .values(status="sending", claimed_at=now)
+            ).rowcount
+            if won:
+                claimed.append(email_id)
+        db.session.commit()
+        return claimed
+
+    def deliver_batch(self, conn: SMTPConnection, batch_size: int = None) -> int:
+        """Claim and send one batch over ``conn``. Returns messages attempted."""
+        cfg = self.app.config
+        now = datetime.utcnow()
+        claimed = self._claim(now, batch_size or cfg.get("MAIL_BATCH_SIZE", 50))
+        if not claimed:
+            return 0
+        self._count("batches")
+        sender = cfg.get("MAIL_DEFAULT_SENDER") or cfg.get("MAIL_USERNAME")
+        for email_id in claimed:
+            row = db.session.get(OutboundEmail, email_id)
+            try:
+                conn.send(build_message(row, sender))
+            except Exception as exc:
+                conn.close()
+                row.attempts += 1
+                row.last_error = str(exc)
+                if _is_permanent(exc) or row.attempts >= cfg.get("MAIL_MAX_ATTEMPTS", 6):
+                    row.status = "failed"
+                    self._count("failed")
+                    logger.error(f"Email {row.id} failed permanently: {exc}")
+                else:
+                    row.status = "queued"
+                    row.next_attempt_at = now + timedelta(
+                        seconds=cfg.get("MAIL_RETRY_BASE", 60) * 2 ** (row.attempts - 1))
+                    self._count("retried")
+                    logger.warning(f"Email {row.id} attempt {row.attempts} failed: {exc}")
+            else:
+                row.status = "sent"
+                row.sent_at = datetime.utcnow()
+                row.attempts += 1
+                self._count("sent")
+            # Commit per message so a crash never re-sends delivered mail.
+            db.session.commit()
+        return len(claimed)
+
+    def deliver_pending(self) -> int:
+        """Drain every due message on the calling thread (scripts and tests)."""
+        conn = self.connection()
+        total = 0
+        try:
+            while True:
+                sent = self.deliver_batch(conn)
+                if not sent:
+                    return total
+                total += sent
+        finally:
+            conn.close()
+
+    def metrics(self) -> dict:
+        depth = dict(db.session.execute(
+            select(OutboundEmail.status, func.count()).group_by(OutboundEmail.status)
+        ).all())
+        with self._metrics_lock:
+            counters = dict(self.counters)
+        oldest = db.session.execute(
+            select(func.min(OutboundEmail.created_at)).where(OutboundEmail.status == "queued")
+        ).scalar()
+        return {
+            "counters": counters,
+            "outbox": depth,
+            "oldest_queued_at": oldest.isoformat() if oldest else None,
+            "workers": sum(t.is_alive() for t in self._threads),
+        }
+
+
+mail_dispatcher = MailDispatcher()
+
+
+def queue_email(subject, recipients, body, html=None, cc=None, attachments=None) -> OutboundEmail:
+    """Add a message to the outbox in the current session's transaction."""
+    row = OutboundEmail(
+        subject=subject,
+        recipients=json.dumps(list(recipients)),
+        cc=json.dumps(list(cc)) if cc else None,
+        body=body,
+        html=html,
+        attachments=json.dumps(list(attachments)) if attachments else None,
+    )
+    db.session.add(row)
+    db.session.info["outbox_pending"] = True
+    mail_dispatcher._count("queued")
+    return row
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session):
+    if session.info.pop("outbox_pending", False):
+        mail_dispatcher.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_wake(session):
+    session.info.pop("outbox_pending", None)
@@ -0,0 +1,92 @@
+# app/services/page_renderer.py
+"""
+Rasterizes document pages into Pillow images.
+
+Raster formats (TIFF, PNG, JPEG, multi-page TIFF) are decoded directly.
+PDFs are rasterized from their embedded page image, which covers scanned
+drawings; pages with only vector content are reported as unrenderable
+(None) because Pillow has no PDF interpreter.
+"""
+
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageSequence
+from PyPDF2 import PdfReader
+
+# Scans of E-size sheets exceed Pillow's default decompression-bomb limit.
+Image.MAX_IMAGE_PIXELS = 400_000_000
+
+RASTER_SUFFIXES = {".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".gif"}
+
+
+def is_renderable(path) -> bool:
+    suffix = Path(path).suffix.lower()
+    return suffix == ".pdf" or suffix in RASTER_SUFFIXES
+
+
+def _fit(img: Image.Image, max_dim: int, mode: str) -> Image.Image:
+    # JPEG can decode straight to a reduced size, which is much cheaper.
+    if img.format == "JPEG":
+        img.draft(mode, (max_dim, max_dim))
+    img = img.convert(mode)
+    if max_dim and max(img.size) > max_dim:
+        img.thumbnail((max_dim, max_dim), Image.LANCZOS)
+    return img
+
+
+def page_count(path) -> int:
+    path = Path(path)
+    if path.suffix.lower() == ".pdf":
+        return len(PdfReader(str(path)).pages)
+    with Image.open(path) as img:
+        return getattr(img, "n_frames", 1)
+
+
+def render_pages(path, max_dim: int = 2000, mode: str = "L"):
+    """
+    Yield one image (or None when a page cannot be rasterized) per page,
+    scaled so the longest side is at most ``max_dim`` pixels.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".pdf":
+        reader = PdfReader(str(path))
+        for page in reader.pages:
+            yield _render_pdf_page(page, max_dim, mode)
+        return
+    with Image.open(path) as img:
+        for frame in ImageSequence.Iterator(img):
+            yield _fit(frame.copy(), max_dim, mode)
+
+
+def render_page(path, page_number: int, max_dim: int = 2000, mode: str = "L"):
+    """Render a single 1-based page; returns None when unrenderable."""
+    path = Path(path)
+    if path.suffix.lower() == ".pdf":
+        reader = PdfReader(str(path))
+        if not 1 <= page_number <= len(reader.pages):
+            raise IndexError(f"Page {page_number} out of range")
+        return _render_pdf_page(reader.pages[page_number - 1], max_dim, mode)
+    with Image.open(path) as img:
+        if not 1 <= page_number <= getattr(img, "n_frames", 1):
+            raise IndexError(f"Page {page_number} out of range")
+        img.seek(page_number - 1)
+        return _fit(img.copy(), max_dim, mode)
+
+
+def _render_pdf_page(page, max_dim, mode):
+    try:
+        images = page.images
+    except Exception:
+        return None
+    if not images:
+        return None
+    # A scanned sheet is one full-page image; take the largest if there are several.
+    largest = max(images, key=lambda f: len(f.data))
+    try:
+        img = Image.open(BytesIO(largest.data))
+    except Exception:
+        return None
+    if page.rotation:
+        img = img.rotate(-page.rotation, expand=True)
+    return _fit(img, max_dim, mode)
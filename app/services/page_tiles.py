@@ -0,0 +1,210 @@
+# app/services/page_tiles.py
+"""
+Tiled page images for the review viewer.
+
+A page is rendered at zoom level N with its longest side
+PAGE_TILE_BASE_DIM * 2**N pixels (capped at PAGE_TILE_LEVELS levels) and
+cut into PAGE_TILE_SIZE square PNG tiles, so the browser only downloads the
+tiles in view instead of the whole drawing. Levels are rendered lazily, on
+first request, in a process pool (PAGE_TILE_WORKERS; 0 renders inline).
+Concurrent requests for the same level share one render.
+
+Tiles live on disk under PAGE_TILE_CACHE_DIR keyed by the source file's
+SHA-256, so a replaced file never serves stale tiles and identical files
+share them:
+
+    <checksum>/<page>/<level>/manifest.json, <x>_<y>.png
+
+When the cache grows past PAGE_TILE_CACHE_MB, the least recently used
+levels are evicted. Rendering uses page_renderer, so vector-only PDF pages
+are unrenderable and the viewer falls back to client-side rendering.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+from app.services.page_renderer import render_page
+
+logger = logging.getLogger(__name__)
+
+
+class PageUnrenderable(Exception):
+    """The page has no raster content the server can render."""
+
+
+def render_level(source: str, page: int, max_dim: int, tile_size: int, dest: str) -> dict:
+    """
+    Render one page level and write its tiles and manifest to ``dest``.
+    Runs in a pool worker, so it takes and returns plain values only.
+    """
+    image = render_page(source, page, max_dim, mode="L")
+    dest = Path(dest)
+    work = Path(tempfile.mkdtemp(prefix=".render-", dir=dest.parent))
+    try:
+        if image is None:
+            # Remembered so later requests don't retry the render.
+            manifest = {"unrenderable": True, "bytes": 0}
+        else:
+            width, height = image.size
+            cols, rows = -(-width // tile_size), -(-height // tile_size)
+            total = 0
+            for y in range(rows):
+                for x in range(cols):
+                    box = (x * tile_size, y * tile_size,
+                           min(width, (x + 1) * tile_size), min(height, (y + 1) * tile_size))
+                    tile = work / f"{x}_{y}.png"
+                    image.crop(box).save(tile, "PNG", optimize=True)
+                    total += tile.stat().st_size
+            manifest = {"width": width, "height": height, "tile_size": tile_size,
+                        "cols": cols, "rows": rows, "bytes": total}
+        (work / "manifest.json").write_text(json.dumps(manifest))
+        try:
+            os.replace(work, dest)  # publish the whole level at once
+        except OSError:
+            if not (dest / "manifest.json").exists():
+                raise
+            # Another process published the same level first.
+        return manifest
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+class PageTileCache:
+    def __init__(self):
+        self.root = None
+        self.tile_size = 512
+        self.base_dim = 1024
+        self.levels = 4
+        self.max_bytes = 2048 * 1024 * 1024
+        self.workers = 2
+        self._pool = None
+        self._pending = {}    # (checksum, page, level) -> Future
+        self._checksums = {}  # (path, mtime_ns, size) -> sha256
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        self.renders = 0
+        self.evictions = 0
+
+    def init_app(self, app):
+        self.root = Path(app.config["PAGE_TILE_CACHE_DIR"])
+        self.tile_size = app.config.get("PAGE_TILE_SIZE", self.tile_size)
+        self.base_dim = app.config.get("PAGE_TILE_BASE_DIM", self.base_dim)
+        self.levels = app.config.get("PAGE_TILE_LEVELS", self.levels)
+        self.max_bytes = app.config.get("PAGE_TILE_CACHE_MB", 2048) * 1024 * 1024
+        self.workers = app.config.get("PAGE_TILE_WORKERS", self.workers)
+
+    def level_dims(self) -> list[int]:
+        """Longest-side pixels of each zoom level, smallest first."""
+        return [self.base_dim * 2 ** n for n in range(self.levels)]
+
+    def checksum(self, path, known: str = None) -> str:
+        """SHA-256 of the file; ``known`` (e.g. TicketAttachment.checksum) skips hashing."""
+        if known:
+            return known
+        st = os.stat(path)
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if key in self._checksums:
+                return self._checksums[key]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        with self._lock:
+            self._checksums[key] = digest.hexdigest()
+        return self._checksums[key]
+
+    def _level_dir(self, checksum, page, level) -> Path:
+        return self.root / checksum / str(page) / str(level)
+
+    def _executor(self):
+        # Called with self._lock held.
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def level(self, source, page: int, level: int, checksum: str = None) -> dict:
+        """Manifest for one page level, rendering it if it isn't cached."""
+        manifest = self._manifest(source, page, level, checksum)
+        if manifest.get("unrenderable"):
+            raise PageUnrenderable(f"Page {page} has no raster content")
+        return manifest
+
+    def _manifest(self, source, page, level, checksum):
+        if not 0 <= level < self.levels:
+            raise IndexError(f"Zoom level {level} out of range")
+        checksum = self.checksum(source, checksum)
+        dest = self._level_dir(checksum, page, level)
+        manifest_path = dest / "manifest.json"
+        if manifest_path.exists():
+            os.utime(manifest_path)  # recency for eviction
+            return json.loads(manifest_path.read_text())
+
+        key = (checksum, page, level)
+        inline = self.workers <= 0
+        with self._lock:
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                args = (str(source), page, self.level_dims()[level], self.tile_size, str(dest))
+                future = Future() if inline else self._executor().submit(render_level, *args)
+                self._pending[key] = future
+        if owner:
+            if inline:
+                try:
+                    future.set_result(render_level(*args))
+                except Exception as e:
+                    future.set_exception(e)
+            future.add_done_callback(lambda f: self._finished(key))
+        return future.result()
+
+    def _finished(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+            self.renders += 1
+        try:
+            self.evict()
+        except OSError:
+            logger.exception("Page tile cache eviction failed")
+
+    def tile_path(self, source, page: int, level: int, x: int, y: int,
+                  checksum: str = None) -> Path:
+        """Path of one tile, rendering its level first if needed."""
+        manifest = self.level(source, page, level, checksum)
+        if not (0 <= x < manifest["cols"] and 0 <= y < manifest["rows"]):
+            raise IndexError(f"Tile {x},{y} out of range")
+        return self._level_dir(self.checksum(source, checksum), page, level) / f"{x}_{y}.png"
+
+    def evict(self) -> int:
+        """Drop least recently used levels until the cache fits. Returns levels removed."""
+        if self.root is None or not self.root.exists():
+            return 0
+        with self._evict_lock:
+            levels, total = [], 0
+            for manifest in self.root.glob("*/*/*/manifest.json"):
+                try:
+                    size = json.loads(manifest.read_text())["bytes"]
+                    levels.append((manifest.stat().st_mtime, size, manifest.parent))
+                except (OSError, ValueError, KeyError):
+                    continue
+                total += size
+            removed = 0
+            for _, size, level_dir in sorted(levels):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(level_dir, ignore_errors=True)
+                total -= size
+                removed += 1
+            self.evictions += removed
+            return removed
+
+
+page_tiles = PageTileCache()
@@ -0,0 +1,372 @@
+# app/services/review_annotations.py
+"""
+Engineer markups on review attachments, stored as per-page overlays.
+
+The review editor saves each page's shapes as JSON (one ReviewAnnotation
+row per attachment page) instead of exporting and re-uploading the whole
+drawing. Shapes use page-relative coordinates, 0-1 from the top-left of
+the page as displayed, so they are independent of the zoom they were drawn
+at:
+
+    {"type": "line" | "highlight" | "pen",
+     "points": [[x, y], ...],   # two points for line/highlight
+     "color": "rgba(r,g,b,a)",  # named and hex colours are accepted
+     "width": w}                # fraction of the displayed page width
+
+A flattened PDF is only produced when someone asks for an export: the
+``flatten_annotations`` job draws the overlays onto a copy of the source
+PDF and caches it in the review folder's ``exports/<attachment id>/``
+directory under a name derived from the source checksum and the overlays,
+so unchanged markups are never flattened twice and an edit simply yields a
+new export. A ``.pending`` marker next to
+the export keeps concurrent requests (from any web process) from queueing
+it twice; the job removes it when it finishes or fails, and a marker older
+than ANNOTATION_EXPORT_TIMEOUT (a crashed worker) is taken over.
+
+When the engineer requests a revision, ``publish_markups`` flattens every
+annotated review file and records the result as a "revision" TicketAttachment
+(one per source file, updated in place), so the drafter finds the marked-up
+drawing with the ticket's other files. Those rows are not review sources:
+markups are never layered onto a flattened copy.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from flask import current_app
+from PIL import ImageColor
+from PyPDF2 import PdfReader, PdfWriter, PageObject
+from PyPDF2.generic import (
+    DecodedStreamObject, DictionaryObject, FloatObject, NameObject
+)
+from sqlalchemy import select, delete
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.review_annotation import ReviewAnnotation
+from app.models.ticket_attachment import TicketAttachment
+from app.services.archive_index import archive_index
+from app.services.page_tiles import page_tiles
+from app.services.storage_adapter import LocalFSAdapter
+from app.services.task_queue import task, enqueue
+
+SHAPE_TYPES = ("line", "highlight", "pen")
+MAX_SHAPES_PER_PAGE = 500
+MAX_PEN_POINTS = 2000
+MAX_WIDTH = 0.1
+HIGHLIGHT_ALPHA = 0.5  # the editor paints highlights at half the colour's alpha
+
+_RGBA = re.compile(r"^rgba?\(\s*(\d{1,3})\s*,\s*(\d{1,3})\s*,\s*(\d{1,3})\s*(?:,\s*([\d.]+)\s*)?\)$")
+
+PENDING_SUFFIX = ".pending"  # marker next to an export while it is being flattened
+EXPORT_CATEGORY = "revision"  # TicketAttachment.category of published exports
+
+
+# --- validation ------------------------------------------------------------
+
+def _parse_color(value) -> tuple:
+    if not isinstance(value, str) or len(value) > 40:
+        raise ValueError("Invalid colour")
+    m = _RGBA.match(value.strip().lower())
+    if m:
+        r, g, b = (int(c) for c in m.groups()[:3])
+        a = float(m.group(4)) if m.group(4) is not None else 1.0
+        if max(r, g, b) > 255 or not 0 <= a <= 1:
+            raise ValueError("Invalid colour")
+        return r, g, b, a
+    r, g, b = ImageColor.getrgb(value)[:3]
+    return r, g, b, 1.0
+
+
+def _coord(value) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError("Coordinates must be numbers")
+    return round(min(1.0, max(0.0, float(value))), 4)
+
+
+def normalize_shapes(shapes) -> list[dict]:
+    """
+    Validate one page of shapes and return them in canonical form.
+    Raises ValueError describing the first bad shape.
+    """
+    if not isinstance(shapes, list):
+        raise ValueError("shapes must be a list")
+    if len(shapes) > MAX_SHAPES_PER_PAGE:
+        raise ValueError(f"At most {MAX_SHAPES_PER_PAGE} shapes per page")
+    clean = []
+    for shape in shapes:
+        if not isinstance(shape, dict) or shape.get("type") not in SHAPE_TYPES:
+            raise ValueError(f"Shape type must be one of {', '.join(SHAPE_TYPES)}")
+        points = shape.get("points")
+        if not isinstance(points, list) or not all(isinstance(p, (list, tuple)) and len(p) == 2
+                                                   for p in points):
+            raise ValueError("points must be a list of [x, y] pairs")
+        limit = MAX_PEN_POINTS if shape["type"] == "pen" else 2
+        if not 2 <= len(points) <= limit:
+            raise ValueError(f"A {shape['type']} needs 2 to {limit} points")
+        width = shape.get("width")
+        if isinstance(width, bool) or not isinstance(width, (int, float)) or not 0 < width <= MAX_WIDTH:
+            raise ValueError("width must be a page fraction up to 0.1")
+        r, g, b, a = _parse_color(shape.get("color"))
+        clean.append({
+            "type": shape["type"],
+            "points": [[_coord(x), _coord(y)] for x, y in points],
+            "color": f"rgba({r},{g},{b},{a:g})",
+            "width": round(float(width), 5),
+        })
+    return clean
+
+
+# --- storage ---------------------------------------------------------------
+
+def page_annotations(attachment_id: int) -> dict[int, list]:
+    """page_number -> shapes for every annotated page of an attachment."""
+    rows = db.session.execute(
+        select(ReviewAnnotation.page_number, ReviewAnnotation.shapes)
+        .where(ReviewAnnotation.attachment_id == attachment_id)
+        .order_by(ReviewAnnotation.page_number)
+    ).all()
+    return {page: shapes for page, shapes in rows}
+
+
+def save_page(attachment_id: int, page: int, shapes, user_id: int) -> list[dict]:
+    """
+    Replace one page's overlay (an empty list removes it) and commit.
+    Returns the stored shapes; raises ValueError on invalid input.
+    """
+    clean = normalize_shapes(shapes)
+    if not clean:
+        db.session.execute(delete(ReviewAnnotation).where(
+            ReviewAnnotation.attachment_id == attachment_id,
+            ReviewAnnotation.page_number == page))
+        db.session.commit()
+        return clean
+
+    for _ in range(2):
+        row = ReviewAnnotation.query.filter_by(attachment_id=attachment_id, page_number=page).first()
+        if row is None:
+            row = ReviewAnnotation(attachment_id=attachment_id, page_number=page)
+            db.session.add(row)
+        row.shapes = clean
+        row.updated_by_id = user_id
+        try:
+            db.session.commit()
+            return clean
+        except IntegrityError:
+            # Another request created the page first; update its row instead.
+            db.session.rollback()
+    raise RuntimeError(f"Could not save annotations for page {page}")
+
+
+# --- export ----------------------------------------------------------------
+
+def _source_path(attachment) -> Path:
+    path = LocalFSAdapter()._resolve(attachment.file_path)
+    if not path.is_file():
+        raise FileNotFoundError(f"Attachment file missing: {attachment.file_path}")
+    return path
+
+
+def export_key(attachment, overlays: dict = None) -> str:
+    """
+    Storage key of the flattened PDF for the attachment's current overlays,
+    e.g. ``drafting_tickets/<n>/review/exports/<id>/<stem>_ENGINEER_REVISIONS_<digest>.pdf``.
+    """
+    if overlays is None:
+        overlays = page_annotations(attachment.id)
+    source = page_tiles.checksum(_source_path(attachment), attachment.checksum)
+    canonical = json.dumps({"source": source, "pages": sorted(overlays.items())},
+                           sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha256(canonical.encode()).hexdigest()[:12]
+    stem = Path(attachment.file_path).stem
+    return f"{_export_dir(attachment)}/{stem}_ENGINEER_REVISIONS_{digest}.pdf"
+
+
+def _export_dir(attachment) -> str:
+    """Storage folder holding only this attachment's exports."""
+    return (Path(attachment.file_path).parent / "exports" / str(attachment.id)).as_posix()
+
+
+def published_export(attachment) -> TicketAttachment | None:
+    """The attachment row holding the last export published for ``attachment``."""
+    return TicketAttachment.query.filter(
+        TicketAttachment.ticket_id == attachment.ticket_id,
+        TicketAttachment.category == EXPORT_CATEGORY,
+        TicketAttachment.file_path.startswith(f"{_export_dir(attachment)}/", autoescape=True),
+    ).order_by(TicketAttachment.id).first()
+
+
+def _record_export(attachment, key: str, user_id: int) -> TicketAttachment:
+    """Point the source file's published export attachment at ``key`` and commit."""
+    path = LocalFSAdapter()._resolve(key)
+    row = published_export(attachment)
+    if row is None:
+        row = TicketAttachment(ticket_id=attachment.ticket_id, category=EXPORT_CATEGORY, version=0)
+        db.session.add(row)
+    if row.file_path != key:
+        row.version = (row.version or 0) + 1
+    row.file_path = key
+    row.filename = Path(key).name
+    row.uploaded_by_id = user_id
+    row.uploaded_at = datetime.utcnow()
+    row.is_latest = True
+    row.file_size = path.stat().st_size
+    row.page_count = attachment.page_count
+    db.session.commit()
+    return row
+
+
+def publish_markups(ticket_id: int, user_id: int) -> int:
+    """
+    Queue a published export of every annotated review file on a ticket.
+    Returns the number of files queued.
+    """
+    attachments = TicketAttachment.query.filter(
+        TicketAttachment.ticket_id == ticket_id,
+        TicketAttachment.category != EXPORT_CATEGORY,
+        TicketAttachment.id.in_(select(ReviewAnnotation.attachment_id)),
+    ).order_by(TicketAttachment.id).all()
+    for attachment in attachments:
+        enqueue(flatten_annotations, attachment.id, user_id)
+    return len(attachments)
+
+
+def request_export(attachment) -> str | None:
+    """
+    Key of the flattened PDF if it is cached (or was just built inline);
+    otherwise queue ``flatten_annotations`` and return None.
+    """
+    key = export_key(attachment)
+    path = LocalFSAdapter()._resolve(key)
+    if path.is_file():
+        return key
+    if _claim_export(path):
+        enqueue(flatten_annotations, attachment.id)
+    return key if path.is_file() else None
+
+
+def _pending_marker(path: Path) -> Path:
+    return path.with_name(path.name + PENDING_SUFFIX)
+
+
+def _claim_export(path: Path) -> bool:
+    """Create the export's pending marker; False while another request's is still fresh."""
+    marker = _pending_marker(path)
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.close(os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return True
+    except FileExistsError:
+        pass
+    timeout = current_app.config.get("ANNOTATION_EXPORT_TIMEOUT", 300)
+    try:
+        if time.time() - marker.stat().st_mtime < timeout:
+            return False
+        os.utime(marker)  # the job that made it died; take over
+    except FileNotFoundError:
+        pass  # finished meanwhile; queueing again finds the export and returns
+    return True
+
+
+def _page_to_user_space(page):
+    """Map display-relative (u, v) to PDF user space, honouring /Rotate and the crop box."""
+    box = page.cropbox
+    llx, lly = float(box.left), float(box.bottom)
+    w, h = float(box.width), float(box.height)
+    rotate = int(page.get("/Rotate", 0) or 0) % 360
+    if rotate == 90:
+        return (lambda u, v: (llx + v * w, lly + u * h)), h
+    if rotate == 180:
+        return (lambda u, v: (llx + (1 - u) * w, lly + v * h)), w
+    if rotate == 270:
+        return (lambda u, v: (llx + (1 - v) * w, lly + (1 - u) * h)), h
+    return (lambda u, v: (llx + u * w, lly + (1 - v) * h)), w
+
+
+def _overlay_page(page, shapes) -> PageObject:
+    """A blank page holding the shapes as stroked paths, ready to merge onto ``page``."""
+    to_pdf, display_width = _page_to_user_space(page)
+    states, ops = {}, []
+    for shape in shapes:
+        r, g, b, a = _parse_color(shape["color"])
+        if shape["type"] == "highlight":
+            a *= HIGHLIGHT_ALPHA
+        gs = states.setdefault(round(a, 3), f"/GSa{len(states)}")
+        ops.append(f"q {gs} gs {r / 255:.4f} {g / 255:.4f} {b / 255:.4f} RG "
+                   f"{shape['width'] * display_width:.3f} w 1 J 1 j")
+        for i, (u, v) in enumerate(shape["points"]):
+            x, y = to_pdf(u, v)
+            ops.append(f"{x:.3f} {y:.3f} {'m' if i == 0 else 'l'}")
+        ops.append("S Q")
+
+    overlay = PageObject.create_blank_page(width=page.mediabox.width, height=page.mediabox.height)
+    content = DecodedStreamObject()
+    content.set_data("\n".join(ops).encode())
+    overlay[NameObject("/Contents")] = content
+    overlay[NameObject("/Resources")] = DictionaryObject({
+        NameObject("/ExtGState"): DictionaryObject({
+            NameObject(name): DictionaryObject({
+                NameObject("/Type"): NameObject("/ExtGState"),
+                NameObject("/CA"): FloatObject(alpha),
+            })
+            for alpha, name in states.items()
+        })
+    })
+    return overlay
+
+
+def flatten(source: Path, overlays: dict, dest: Path) -> None:
+    """Write ``source`` with the overlays drawn on to ``dest`` (atomically)."""
+    reader = PdfReader(str(source))
+    writer = PdfWriter()
+    for number, page in enumerate(reader.pages, start=1):
+        shapes = overlays.get(number)
+        if shapes:
+            page.merge_page(_overlay_page(page, shapes))
+        writer.add_page(page)
+
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".flatten-", suffix=".pdf", dir=dest.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            writer.write(f)
+        os.replace(tmp, dest)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    archive_index.invalidate(str(dest))
+
+
+@task
+def flatten_annotations(attachment_id: int, publish_by: int = None) -> None:
+    """
+    Background job: build the cached export for an attachment's current
+    overlays; with ``publish_by`` also record it as a review attachment.
+    """
+    attachment = db.session.get(TicketAttachment, attachment_id)
+    if attachment is None:
+        return
+    overlays = page_annotations(attachment_id)
+    key = export_key(attachment, overlays)
+    storage = LocalFSAdapter()
+    dest = storage._resolve(key)
+    try:
+        if not dest.is_file():
+            flatten(_source_path(attachment), overlays, dest)
+        if publish_by is not None:
+            _record_export(attachment, key, publish_by)
+        # Only the newest and the published export per attachment are worth keeping;
+        # the folder holds nothing else but in-flight temp files and markers.
+        published = published_export(attachment)
+        keep = {dest, storage._resolve(published.file_path) if published else None}
+        for stale in dest.parent.iterdir():
+            if stale.suffix == ".pdf" and not stale.name.startswith(".") and stale not in keep:
+                stale.unlink(missing_ok=True)
+    finally:
+        _pending_marker(dest).unlink(missing_ok=True)
@@ -0,0 +1,100 @@
+# app/services/review_feed.py
+"""
+Review comment feed, unread counts and bulk mark-read.
+
+The feed is one SELECT over ``review_comments`` with the author's name and
+the reader's read flag joined in, filtered by an id cursor (``since``: the
+last comment id the client has) and optionally by PDF page. Unread counts
+are a single aggregate anti-join against ``review_comment_read_status``,
+and marking a ticket read is one INSERT ... SELECT. A reader's own
+comments always count as read.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import select, insert, func, and_, or_, exists, literal
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.review_comment import ReviewComment
+from app.models.review_comment_read_status import ReviewCommentReadStatus
+from app.models.ticket import DraftingTicket
+from app.models.user import User
+
+MAX_FEED = 500
+
+
+def _read_by(user_id):
+    return and_(ReviewCommentReadStatus.comment_id == ReviewComment.id,
+                ReviewCommentReadStatus.user_id == user_id)
+
+
+def comment_feed(ticket_id: int, user_id: int, since: int = None, page: int = None,
+                 limit: int = MAX_FEED) -> list[dict]:
+    """Comments on a ticket after ``since`` in posting order, for ``user_id``."""
+    stmt = (
+        select(ReviewComment.id, ReviewComment.ticket_id, ReviewComment.user_id,
+               ReviewComment.message, ReviewComment.page_number, ReviewComment.created_at,
+               User.actual_name.label("author_name"),
+               ReviewCommentReadStatus.id.label("read_id"))
+        .outerjoin(User, User.id == ReviewComment.user_id)
+        .outerjoin(ReviewCommentReadStatus, _read_by(user_id))
+        .where(ReviewComment.ticket_id == ticket_id)
+        .order_by(ReviewComment.id)
+        .limit(min(limit, MAX_FEED))
+    )
+    if since:
+        stmt = stmt.where(ReviewComment.id > since)
+    if page is not None:
+        stmt = stmt.where(ReviewComment.page_number == page)
+    return [
+        {
+            "id": r.id,
+            "ticket_id": r.ticket_id,
+            "user_id": r.user_id,
+            "message": r.message,
+            "page_number": r.page_number,
+            "created_at": r.created_at.isoformat(),
+            "author_name": r.author_name or "User",
+            "read": r.read_id is not None or r.user_id == user_id,
+        }
+        for r in db.session.execute(stmt)
+    ]
+
+
+def unread_counts(user_id: int) -> dict[str, int]:
+    """ticket_number -> unread comments on tickets the user reviews or drafts."""
+    rows = db.session.execute(
+        select(DraftingTicket.ticket_number, func.count(ReviewComment.id))
+        .join(ReviewComment, ReviewComment.ticket_id == DraftingTicket.id)
+        .where(or_(DraftingTicket.review_engineer_id == user_id,
+                   DraftingTicket.assigned_to_id == user_id),
+               ReviewComment.user_id != user_id,
+               ~exists().where(_read_by(user_id)))
+        .group_by(DraftingTicket.ticket_number)
+    ).all()
+    return dict(rows)
+
+
+def mark_read(ticket_id: int, user_id: int, upto: int = None) -> int:
+    """Mark the ticket's comments (through id ``upto``) read in one statement."""
+    now = datetime.utcnow()
+    source = (
+        select(ReviewComment.id, literal(user_id), literal(now))
+        .where(ReviewComment.ticket_id == ticket_id,
+               ReviewComment.user_id != user_id,
+               ~exists().where(_read_by(user_id)))
+    )
+    if upto:
+        source = source.where(ReviewComment.id <= upto)
+    stmt = insert(ReviewCommentReadStatus).from_select(["comment_id", "user_id", "read_at"], source)
+    for attempt in (1, 2):
+        try:
+            marked = db.session.execute(stmt).rowcount
+            db.session.commit()
+            return marked
+        except IntegrityError:
+            # A concurrent request marked some of the same comments; retry the rest.
+            db.session.rollback()
+            if attempt == 2:
+                raise
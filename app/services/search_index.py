@@ -0,0 +1,52 @@
+# app/services/search_index.py
+"""
+Tokenizers shared by the server-side search indexes.
+
+Trigrams follow the pg_trgm convention: each word is padded with two
+leading blanks and one trailing blank, so short prefixes ("63", "pum")
+still produce anchored trigrams that an index lookup can use.
+"""
+
+import re
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text) -> str:
+    """Lower-case and collapse anything that is not a letter or digit to a blank."""
+    if not text:
+        return ""
+    return _NON_ALNUM.sub(" ", str(text).lower()).strip()
+
+
+def compact(text) -> str:
+    """Normalized text with all separators removed ("6300-E-1" → "6300e1")."""
+    return normalize(text).replace(" ", "")
+
+
+def words(text) -> list[str]:
+    return normalize(text).split()
+
+
+def trigrams(text) -> set[str]:
+    """Indexed trigrams for a stored value (word-start and word-end anchored)."""
+    grams = set()
+    for word in words(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def query_trigrams(text) -> set[str]:
+    """
+    Trigrams for a typeahead query. The trailing pad is omitted so a word
+    that is still being typed matches as a prefix of the stored word, and
+    the single-letter "  x" gram is dropped once a word has two or more
+    letters since it matches nearly every row sharing that initial.
+    """
+    grams = set()
+    for word in words(text):
+        padded = f"  {word}"
+        start = 1 if len(word) > 1 else 0
+        grams.update(padded[i:i + 3] for i in range(start, len(padded) - 2))
+    return grams
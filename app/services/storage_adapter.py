@@ -8,6 +8,8 @@ from flask import current_app
 from werkzeug.utils import secure_filename
 from werkzeug.datastructures import FileStorage
 
+from app.services.archive_index import archive_index
+
 class StorageAdapter(ABC):
     """Abstract interface for file storage backends."""
 
@@ -39,17 +41,18 @@ class StorageAdapter(ABC):
 class LocalFSAdapter(StorageAdapter):
     """
     Local filesystem implementation.
-    Defaults to MEDIA_ROOT config; falls back to app/static/ if unset.
+    Uses an explicit base_path if given, else MEDIA_ROOT config; falls
+    back to app/static/ if neither is set.
     """
 
     def __init__(self, base_path: Path = None):
-        # 1) Try config.MEDIA_ROOT
         cfg = current_app.config.get('MEDIA_ROOT')
-        if cfg:
-            base = Path(cfg)
-        # 2) Or use explicit base_path
-        elif base_path:
+        # 1) Explicit base_path (e.g. cold storage root)
+        if base_path:
             base = Path(base_path)
+        # 2) Or config.MEDIA_ROOT
+        elif cfg:
+            base = Path(cfg)
         # 3) Fallback to static/
         else:
             base = Path(current_app.root_path) / 'static'
@@ -98,6 +101,7 @@ class LocalFSAdapter(StorageAdapter):
         filename = secure_filename(file.filename)
         dest = dir_path / filename
         file.save(dest)
+        archive_index.invalidate(str(dest))
 
         rel = Path(prefix.strip().lstrip('/')) / filename
         return rel.as_posix()
@@ -107,6 +111,7 @@ class LocalFSAdapter(StorageAdapter):
         parent = self._resolve(prefix)
         new_dir = parent / secure_filename(name)
         new_dir.mkdir(parents=True, exist_ok=False)
+        archive_index.invalidate(str(new_dir))
         return new_dir.relative_to(self.base_path).as_posix()
 
     def rename(self, old_path: str, new_name: str) -> str:
@@ -114,6 +119,8 @@ class LocalFSAdapter(StorageAdapter):
         src = self._resolve(old_path)
         dst = src.parent / secure_filename(new_name)
         src.rename(dst)
+        archive_index.invalidate(str(src))
+        archive_index.invalidate(str(dst))
         return dst.relative_to(self.base_path).as_posix()
 
     def move(self, old_path: str, dest_prefix: str) -> str:
@@ -124,6 +131,8 @@ class LocalFSAdapter(StorageAdapter):
             raise NotADirectoryError(f"Destination not a directory: {dest_prefix}")
         dst = dst_dir / src.name
         shutil.move(src, dst)
+        archive_index.invalidate(str(src))
+        archive_index.invalidate(str(dst))
         return dst.relative_to(self.base_path).as_posix()
 
     def delete(self, path: str) -> None:
@@ -133,3 +142,4 @@ class LocalFSAdapter(StorageAdapter):
             shutil.rmtree(target)
         else:
             target.unlink()
+        archive_index.invalidate(str(target))
@@ -0,0 +1,68 @@
+# app/services/task_queue.py
+"""
+Durable job dispatch with an in-process fallback.
+
+Functions decorated with ``@task`` are registered with Celery when
+CELERY_BROKER_URL is configured (start a worker with
+``celery -A celery_worker.celery worker``). Without a broker, ``enqueue``
+runs them on the in-process pool from app.services.background, delaying
+with a timer thread when a countdown is given.
+"""
+
+import threading
+
+from flask import current_app
+
+from app.extensions import db
+from app.services import background
+
+_registry = {}  # task name -> function
+
+
+def task(fn):
+    """Register ``fn`` as a queueable job."""
+    _registry[f"{fn.__module__}.{fn.__name__}"] = fn
+    return fn
+
+
+def init_app(app):
+    broker = app.config.get("CELERY_BROKER_URL")
+    if not broker:
+        return
+    from celery import Celery, Task
+
+    class AppContextTask(Task):
+        def __call__(self, *args, **kwargs):
+            with app.app_context():
+                try:
+                    return self.run(*args, **kwargs)
+                finally:
+                    db.session.remove()
+
+    celery = Celery(app.import_name, broker=broker,
+                    backend=app.config.get("CELERY_RESULT_BACKEND"),
+                    task_cls=AppContextTask)
+    celery.conf.update(task_acks_late=True, task_reject_on_worker_lost=True)
+    for name, fn in _registry.items():
+        celery.task(name=name)(fn)
+    app.extensions["celery"] = celery
+
+
+def enqueue(fn, *args, countdown: float = 0) -> None:
+    """Run a registered job on Celery if configured, else in-process."""
+    app = current_app._get_current_object()
+    celery = app.extensions.get("celery")
+    if celery is not None:
+        celery.tasks[f"{fn.__module__}.{fn.__name__}"].apply_async(args=args, countdown=countdown)
+        return
+    if not countdown or app.config.get("BACKGROUND_JOBS_EAGER"):
+        background.submit(fn, *args)
+        return
+
+    def _fire():
+        with app.app_context():
+            background.submit(fn, *args)
+
+    timer = threading.Timer(countdown, _fire)
+    timer.daemon = True
+    timer.start()
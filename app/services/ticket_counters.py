@@ -0,0 +1,187 @@
+# app/services/ticket_counters.py
+"""
+Incrementally maintained ticket counts for badges and queue tabs.
+
+``ticket_counters`` holds one row per (user_id, relation, status). A
+session ``after_flush`` hook turns every insert, delete or change of a
+ticket's status, assignee, review engineer, submitter or assigned_viewed
+flag into +1/-1 deltas and applies them with ``count = count + delta`` on
+the flush's own connection, so counters commit or roll back with the
+ticket. Reading a badge is a primary-key range read.
+
+Bulk ``query.update()`` calls and raw SQL bypass the hook; run
+``reconcile_ticket_counters()`` (scripts/reconcile_ticket_counters.py)
+nightly, or after such changes, to correct drift.
+"""
+
+from collections import Counter
+
+from sqlalchemy import event, inspect, select, update, insert, delete, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.ticket_counter import TicketCounter
+
+ALL_USERS = 0
+
+TRACKED = ("status", "assigned_to_id", "review_engineer_id", "submitted_by_id", "assigned_viewed")
+
+# relation -> ticket column holding the user
+RELATIONS = {
+    "assigned": "assigned_to_id",
+    "reviewing": "review_engineer_id",
+    "submitted": "submitted_by_id",
+}
+
+
+def counter_keys(values: dict):
+    """The (user_id, relation, status) rows one ticket state counts towards."""
+    status = values["status"] or ""
+    yield ALL_USERS, "all", status
+    for relation, column in RELATIONS.items():
+        if values[column]:
+            yield values[column], relation, status
+    if values["assigned_to_id"] and not values["assigned_viewed"]:
+        yield values["assigned_to_id"], "assigned_unviewed", status
+
+
+def _current(ticket) -> dict:
+    return {name: getattr(ticket, name) for name in TRACKED}
+
+
+def _previous(ticket) -> dict:
+    values = {}
+    for name in TRACKED:
+        history = inspect(ticket).attrs[name].history
+        if history.has_changes():
+            values[name] = history.deleted[0] if history.deleted else None
+        else:
+            values[name] = history.unchanged[0] if history.unchanged else None
+    return values
+
+
+def _tracked_changed(ticket) -> bool:
+    state = inspect(ticket)
+    return any(state.attrs[name].history.has_changes() for name in TRACKED)
+
+
+def apply_deltas(connection, deltas: Counter) -> None:
+    table = TicketCounter.__table__
+    # Sorted so concurrent transactions lock counter rows in the same order.
+    for (user_id, relation, status), delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        bump = (
+            update(table)
+            .where(table.c.user_id == user_id, table.c.relation == relation,
+                   table.c.status == status)
+            .values(count=table.c.count + delta)
+        )
+        if connection.execute(bump).rowcount:
+            continue
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(table).values(
+                    user_id=user_id, relation=relation, status=status, count=delta))
+        except IntegrityError:
+            # Another transaction created the row first.
+            connection.execute(bump)
+
+
+@event.listens_for(Session, "after_flush")
+def _count_ticket_changes(session, flush_context):
+    deltas = Counter()
+    for ticket in session.new:
+        if isinstance(ticket, DraftingTicket):
+            deltas.update(counter_keys(_current(ticket)))
+    for ticket in session.dirty:
+        if isinstance(ticket, DraftingTicket) and _tracked_changed(ticket):
+            deltas.subtract(counter_keys(_previous(ticket)))
+            deltas.update(counter_keys(_current(ticket)))
+    for ticket in session.deleted:
+        if isinstance(ticket, DraftingTicket):
+            deltas.subtract(counter_keys(_previous(ticket)))
+    if any(deltas.values()):
+        apply_deltas(session.connection(), deltas)
+
+
+# --- reads -----------------------------------------------------------------
+
+def ticket_counts(user_id: int, relation: str) -> dict[str, int]:
+    """status -> count for one user and relation (a primary-key prefix read)."""
+    rows = db.session.execute(
+        select(TicketCounter.status, TicketCounter.count)
+        .where(TicketCounter.user_id == user_id, TicketCounter.relation == relation)
+    ).all()
+    return {status: count for status, count in rows if count}
+
+
+def user_ticket_counts(user_id: int) -> dict[str, dict[str, int]]:
+    """relation -> status -> count for one user, from a single key-prefix read."""
+    counts = {relation: {} for relation in (*RELATIONS, "assigned_unviewed")}
+    for relation, status, count in db.session.execute(
+        select(TicketCounter.relation, TicketCounter.status, TicketCounter.count)
+        .where(TicketCounter.user_id == user_id)
+    ):
+        if count:
+            counts.setdefault(relation, {})[status] = count
+    return counts
+
+
+def status_totals() -> dict[str, int]:
+    """Platform-wide status -> count."""
+    return ticket_counts(ALL_USERS, "all")
+
+
+# --- reconciliation --------------------------------------------------------
+
+def _actual_counts() -> Counter:
+    status = func.coalesce(DraftingTicket.status, "")
+    actual = Counter()
+    for s, n in db.session.execute(
+        select(status, func.count()).group_by(status)
+    ):
+        actual[(ALL_USERS, "all", s)] = n
+    for relation, column in RELATIONS.items():
+        col = getattr(DraftingTicket, column)
+        for user_id, s, n in db.session.execute(
+            select(col, status, func.count()).where(col.isnot(None)).group_by(col, status)
+        ):
+            actual[(user_id, relation, s)] = n
+    unviewed = DraftingTicket.assigned_to_id
+    for user_id, s, n in db.session.execute(
+        select(unviewed, status, func.count())
+        .where(unviewed.isnot(None), DraftingTicket.assigned_viewed.isnot(True))
+        .group_by(unviewed, status)
+    ):
+        actual[(user_id, "assigned_unviewed", s)] = n
+    return actual
+
+
+def reconcile_ticket_counters() -> int:
+    """Recount from drafting_tickets and fix drifted rows. Returns rows corrected."""
+    table = TicketCounter.__table__
+    actual = _actual_counts()
+    stored = {
+        (r.user_id, r.relation, r.status): r.count
+        for r in db.session.execute(select(table))
+    }
+    corrected = 0
+    for key in set(actual) | set(stored):
+        want, have = actual.get(key, 0), stored.get(key)
+        if have == want or (have is None and want == 0):
+            continue
+        user_id, relation, status = key
+        pk = (table.c.user_id == user_id, table.c.relation == relation, table.c.status == status)
+        if want == 0:
+            db.session.execute(delete(table).where(*pk))
+        elif have is None:
+            db.session.execute(insert(table).values(
+                user_id=user_id, relation=relation, status=status, count=want))
+        else:
+            db.session.execute(update(table).where(*pk).values(count=want))
+        corrected += 1
+    db.session.commit()
+    return corrected
@@ -3,22 +3,98 @@
 Ticket creation, assignment, and state transitions.
 """
 
+import os
+import threading
 from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import select, insert, update
+from sqlalchemy.exc import IntegrityError
+
 from app.extensions import db
 from app.models.ticket import DraftingTicket
+from app.models.ticket_sequence import TicketSequence
 from app.models.user import User
+from app.services.ticket_events import record_event, SUBMITTED, ASSIGNED
+from app.services.user_directory import user_directory
+
+
+def ticket_prefix(now=None):
+    year = (now or datetime.now()).year % 100
+    return f"{year:02d}DDDC"
+
+
+class TicketNumberAllocator:
+    """
+    Hands out ticket numbers from the ticket_sequences counter table.
+
+    Each worker process reserves a block of TICKET_NUMBER_BLOCK numbers with
+    one atomic UPDATE ... RETURNING on its own connection and serves numbers
+    from memory until the block is used up, so ticket creation never reads
+    or retries. Unused numbers in a block are skipped if the process exits.
+    """
+
+    def __init__(self):
+        self._blocks = {}  # prefix -> (next number, end of block)
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._blocks.clear()
+
+    def _highest_issued(self, conn, prefix) -> int:
+        """Seed for a new counter row: highest number already used under prefix."""
+        numbers = conn.execute(
+            select(DraftingTicket.ticket_number)
+            .where(DraftingTicket.ticket_number.startswith(prefix))
+        ).scalars()
+        suffixes = [n[len(prefix):] for n in numbers]
+        return max((int(s) for s in suffixes if s.isdigit()), default=0)
+
+    def _reserve(self, prefix, size) -> int:
+        """Reserve ``size`` numbers and return the first one."""
+        table = TicketSequence.__table__
+        bump = (
+            update(table)
+            .where(table.c.prefix == prefix)
+            .values(next_value=table.c.next_value + size)
+            .returning(table.c.next_value)
+        )
+        with db.engine.begin() as conn:
+            end = conn.execute(bump).scalar()
+            if end is None:
+                start = self._highest_issued(conn, prefix) + 1
+                try:
+                    with conn.begin_nested():
+                        conn.execute(insert(table).values(prefix=prefix, next_value=start + size))
+                    return start
+                except IntegrityError:
+                    # Another process created the row first.
+                    end = conn.execute(bump).scalar()
+        return end - size
+
+    def next_number(self, prefix) -> int:
+        size = max(1, current_app.config.get("TICKET_NUMBER_BLOCK", 1))
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: blocks belong to the parent.
+                self._blocks.clear()
+                self._pid = os.getpid()
+            number, end = self._blocks.get(prefix, (0, 0))
+            if number >= end:
+                number = self._reserve(prefix, size)
+                end = number + size
+            self._blocks[prefix] = (number + 1, end)
+        return number
+
+
+ticket_numbers = TicketNumberAllocator()
 
 
-def generate_ticket_number():
-    year = datetime.now().year % 100
-    base = f"{year:02d}DDDC"
-    latest = DraftingTicket.query.order_by(DraftingTicket.id.desc()).first()
-    if latest:
-        latest_number = int(latest.ticket_number[-3:])
-        new_number = latest_number + 1
-    else:
-        new_number = 80  # Start from 25DDDC080
-    return f"{base}{new_number:03d}"
+def generate_ticket_number(now=None):
+    prefix = ticket_prefix(now)
+    return f"{prefix}{ticket_numbers.next_number(prefix):03d}"
 
 
 def create_ticket(data, submitted_by_id):
@@ -32,18 +108,21 @@ def create_ticket(data, submitted_by_id):
         project_engineer_id=data["project_engineer_id"]
     )
     db.session.add(ticket)
+    db.session.flush()
+    record_event(ticket, SUBMITTED, submitted_by_id)
     db.session.commit()
     return ticket
 
 
 def assign_drafter(ticket_id, drafter_id):
     ticket = DraftingTicket.query.get(ticket_id)
-    drafter = User.query.get(drafter_id)
+    drafter = user_directory.get(drafter_id)
 
     if not ticket or not drafter:
         return None
 
     ticket.assigned_to_id = drafter_id
     ticket.status = "in_progress"
+    record_event(ticket, ASSIGNED, drafter_id=drafter_id)
     db.session.commit()
     return ticket
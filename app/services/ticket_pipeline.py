@@ -0,0 +1,287 @@
+# app/services/ticket_pipeline.py
+"""
+Post-submission processing for drafting tickets.
+
+``submit_request`` only saves the ticket row and raw uploads, plans the
+pipeline steps in the same transaction, and queues ``process_ticket``
+after commit. The job then works through the ticket's pending steps:
+
+- per attachment: checksum, metadata (size / page count), preview
+- per ticket: notify (email the review engineer)
+
+Each step is claimed atomically, so a step never runs twice concurrently.
+Failed steps are retried with exponential backoff (PIPELINE_RETRY_BASE
+seconds, doubled per attempt) up to PIPELINE_MAX_ATTEMPTS, then marked
+failed. The task rows are the per-ticket processing status.
+
+A claim is a lease: a step left "running" for PIPELINE_STEP_LEASE seconds
+belongs to a worker that died, and goes back to pending as a failed
+attempt. A worker only records its result while it still holds the claim
+(same status and claim time); if the lease was taken over meanwhile, its
+work is rolled back, so a slow step's result (or email) is kept once. Retry timers (and in-process queues) don't survive a restart, so
+``sweep_pipeline()`` re-queues every ticket with due steps; the server runs
+it at boot and scripts/sweep_pipeline.py runs it from cron.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from flask import current_app
+from sqlalchemy import select, update, or_, case
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.ticket_attachment import TicketAttachment
+from app.models.ticket_processing_task import TicketProcessingTask
+from app.notifications.dispatch import notify_new_ticket
+from app.services.page_renderer import is_renderable, page_count, render_page
+from app.services.storage_adapter import LocalFSAdapter
+from app.services.task_queue import task, enqueue
+from app.services.user_directory import user_directory
+
+ATTACHMENT_STEPS = ("checksum", "metadata", "preview")
+TICKET_STEPS = ("notify",)
+
+
+def plan_ticket_processing(ticket, attachments) -> None:
+    """Add pending steps for a new ticket; call before the submit commit."""
+    for attachment in attachments:
+        for step in ATTACHMENT_STEPS:
+            db.session.add(TicketProcessingTask(ticket_id=ticket.id, attachment=attachment, step=step))
+    for step in TICKET_STEPS:
+        db.session.add(TicketProcessingTask(ticket_id=ticket.id, step=step))
+
+
+def start_ticket_processing(ticket_id: int) -> None:
+    """Queue the pipeline; call after the submit commit."""
+    enqueue(process_ticket, ticket_id)
+
+
+# --- steps -----------------------------------------------------------------
+
+def _attachment_path(attachment) -> Path:
+    path = LocalFSAdapter()._resolve(attachment.file_path)
+    if not path.is_file():
+        raise FileNotFoundError(f"Attachment file missing: {attachment.file_path}")
+    return path
+
+
+def _step_checksum(task):
+    digest = hashlib.sha256()
+    with _attachment_path(task.attachment).open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    task.attachment.checksum = digest.hexdigest()
+
+
+def _step_metadata(task):
+    path = _attachment_path(task.attachment)
+    task.attachment.file_size = path.stat().st_size
+    if is_renderable(path):
+        task.attachment.page_count = page_count(path)
+
+
+def _step_preview(task):
+    """First-page PNG thumbnail next to the ticket's submissions."""
+    attachment = task.attachment
+    path = _attachment_path(attachment)
+    if not is_renderable(path):
+        return
+    image = render_page(path, 1, current_app.config.get("PREVIEW_MAX_DIM", 400), mode="RGB")
+    if image is None:
+        return
+    ticket_number = db.session.get(DraftingTicket, task.ticket_id).ticket_number
+    key = f"drafting_tickets/{ticket_number}/previews/{attachment.id}.png"
+    dest = LocalFSAdapter()._resolve(key)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    image.save(dest, "PNG", optimize=True)
+    attachment.preview_path = key
+
+
+def _step_notify(task):
+    ticket = db.session.get(DraftingTicket, task.ticket_id)
+    engineer = user_directory.get(ticket.review_engineer_id)
+    if engineer is None:
+        raise LookupError(f"Review engineer {ticket.review_engineer_id} not found")
+    submitter = user_directory.get(ticket.submitted_by_id)
+    notify_new_ticket(ticket, engineer, submitter)
+
+
+STEP_HANDLERS = {
+    "checksum": _step_checksum,
+    "metadata": _step_metadata,
+    "preview": _step_preview,
+    "notify": _step_notify,
+}
+
+
+# --- runner ----------------------------------------------------------------
+
+def expire_leases(ticket_id: int = None, now: datetime = None) -> int:
+    """Return steps "running" longer than PIPELINE_STEP_LEASE to pending (or failed)."""
+    now = now or datetime.utcnow()
+    cfg = current_app.config
+    stale = now - timedelta(seconds=cfg.get("PIPELINE_STEP_LEASE", 600))
+    attempts = TicketProcessingTask.attempts + 1
+    stmt = (
+        update(TicketProcessingTask)
+        .where(TicketProcessingTask.status == "running", TicketProcessingTask.updated_at < stale)
+        .values(status=case((attempts >= cfg.get("PIPELINE_MAX_ATTEMPTS", 4), "failed"),
+                            else_="pending"),
+                attempts=attempts, next_attempt_at=None, updated_at=now,
+                last_error="Worker stopped before the step finished")
+    )
+    if ticket_id is not None:
+        stmt = stmt.where(TicketProcessingTask.ticket_id == ticket_id)
+    expired = db.session.execute(stmt).rowcount
+    db.session.commit()
+    if expired:
+        current_app.logger.warning(f"Reclaimed {expired} stalled pipeline steps")
+    return expired
+
+
+def _due(now: datetime):
+    return (TicketProcessingTask.status == "pending",
+            or_(TicketProcessingTask.next_attempt_at.is_(None),
+                TicketProcessingTask.next_attempt_at <= now))
+
+
+def _claim(task_id: int) -> datetime | None:
+    """Take a pending step; returns the claim time that fences its result."""
+    claimed_at = datetime.utcnow()
+    claimed = db.session.execute(
+        update(TicketProcessingTask)
+        .where(TicketProcessingTask.id == task_id, TicketProcessingTask.status == "pending")
+        .values(status="running", updated_at=claimed_at)
+    ).rowcount
+    db.session.commit()
+    return claimed_at if claimed else None
+
+
+def _finish(task_id: int, claimed_at: datetime, **values) -> bool:
+    """Record a step's result if this worker still holds the claim; commits or rolls back."""
+    held = db.session.execute(
+        update(TicketProcessingTask)
+        .where(TicketProcessingTask.id == task_id, TicketProcessingTask.status == "running",
+               TicketProcessingTask.updated_at == claimed_at)
+        .values(updated_at=datetime.utcnow(), **values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not held:
+        db.session.rollback()
+        current_app.logger.warning(f"Pipeline step {task_id} lost its lease; dropping its result")
+        return False
+    db.session.commit()
+    return True
+
+
+def _run_step(task_id: int, claimed_at: datetime) -> float | None:
+    """Run one claimed step; returns the retry delay in seconds if it failed retryably."""
+    task = db.session.get(TicketProcessingTask, task_id)
+    try:
+        STEP_HANDLERS[task.step](task)
+    except Exception as e:
+        db.session.rollback()
+        task = db.session.get(TicketProcessingTask, task_id)
+        attempts = task.attempts + 1
+        current_app.logger.warning(
+            f"Ticket {task.ticket_id} step {task.step} failed (attempt {attempts}): {e}")
+        if attempts >= current_app.config.get("PIPELINE_MAX_ATTEMPTS", 4):
+            status, delay, next_attempt_at = "failed", None, None
+        else:
+            delay = current_app.config.get("PIPELINE_RETRY_BASE", 30) * 2 ** (attempts - 1)
+            status, next_attempt_at = "pending", datetime.utcnow() + timedelta(seconds=delay)
+        if not _finish(task_id, claimed_at, status=status, attempts=attempts,
+                       last_error=str(e), next_attempt_at=next_attempt_at):
+            return None
+        return delay
+    _finish(task_id, claimed_at, status="done", last_error=None)
+    return None
+
+
+@task
+def process_ticket(ticket_id: int) -> None:
+    """Background job: run every due pending step for a ticket."""
+    now = datetime.utcnow()
+    expire_leases(ticket_id, now)
+    due = db.session.execute(
+        select(TicketProcessingTask.id)
+        .where(TicketProcessingTask.ticket_id == ticket_id, *_due(now))
+        .order_by(TicketProcessingTask.id)
+    ).scalars().all()
+    retry_in = None
+    for task_id in due:
+        claimed_at = _claim(task_id)
+        if claimed_at is None:
+            continue
+        delay = _run_step(task_id, claimed_at)
+        if delay is not None:
+            retry_in = delay if retry_in is None else min(retry_in, delay)
+    if retry_in is not None:
+        enqueue(process_ticket, ticket_id, countdown=retry_in)
+
+
+def sweep_pipeline(now: datetime = None, inline: bool = False) -> int:
+    """
+    Reclaim stalled steps and queue every ticket with due steps (or, with
+    ``inline``, process them on the calling thread). Returns tickets found.
+    """
+    now = now or datetime.utcnow()
+    expire_leases(now=now)
+    ticket_ids = db.session.execute(
+        select(TicketProcessingTask.ticket_id).where(*_due(now))
+        .distinct().order_by(TicketProcessingTask.ticket_id)
+    ).scalars().all()
+    for ticket_id in ticket_ids:
+        if inline:
+            process_ticket(ticket_id)
+        else:
+            enqueue(process_ticket, ticket_id)
+    return len(ticket_ids)
+
+
+def retry_failed_steps(ticket_id: int) -> int:
+    """Reset failed steps to pending and queue the pipeline. Returns steps reset."""
+    reset = db.session.execute(
+        update(TicketProcessingTask)
+        .where(TicketProcessingTask.ticket_id == ticket_id,
+               TicketProcessingTask.status == "failed")
+        .values(status="pending", attempts=0, next_attempt_at=None)
+    ).rowcount
+    db.session.commit()
+    if reset:
+        enqueue(process_ticket, ticket_id)
+    return reset
+
+
+def processing_status(ticket_id: int) -> dict:
+    """Overall state plus per-step detail for the status endpoint."""
+    rows = db.session.execute(
+        select(TicketProcessingTask, TicketAttachment.filename)
+        .outerjoin(TicketAttachment, TicketAttachment.id == TicketProcessingTask.attachment_id)
+        .where(TicketProcessingTask.ticket_id == ticket_id)
+        .order_by(TicketProcessingTask.id)
+    ).all()
+    statuses = {t.status for t, _ in rows}
+    if "failed" in statuses:
+        state = "failed"
+    elif statuses & {"pending", "running"}:
+        state = "processing"
+    else:
+        state = "done"
+    return {
+        "state": state,
+        "steps": [
+            {
+                "step": t.step,
+                "attachment_id": t.attachment_id,
+                "filename": filename,
+                "status": t.status,
+                "attempts": t.attempts,
+                "last_error": t.last_error,
+                "next_attempt_at": t.next_attempt_at.isoformat() if t.next_attempt_at else None,
+            }
+            for t, filename in rows
+        ],
+    }
@@ -0,0 +1,163 @@
+# app/services/ticket_queue.py
+"""
+Keyset-paginated, column-projected queries over the admin ticket queues.
+
+Each queue is a status predicate; pages are ordered by (sort key, id) in
+either direction and served by the composite ``drafting_tickets`` indexes
+declared on DraftingTicket. Only the columns the queue tables render are
+selected, so attachments are never loaded; their count comes from a
+correlated subquery on ``ticket_attachments.ticket_id``.
+
+ORM list views elsewhere use ``ticket_list_options()`` for the same
+projection with attachments fetched by one ``selectinload`` per page.
+Tab counts come from ``ticket_counters`` rather than a table scan.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import select, func, and_, or_
+from sqlalchemy.orm import aliased, load_only, selectinload, joinedload
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.ticket_attachment import TicketAttachment
+from app.models.user import User
+from app.services.ticket_counters import status_totals
+
+QUEUES = {
+    "new": DraftingTicket.status == "Pending",
+    "assigned": DraftingTicket.status.notin_(["Pending", "Completed"]),
+    "completed": DraftingTicket.status == "Completed",
+}
+
+SORT_KEYS = {
+    "created_at": DraftingTicket.created_at,
+    "priority": DraftingTicket.priority,
+}
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Ticket columns rendered by the ticket list templates (drafter, engineer,
+# requester modals and the review queue).
+LIST_COLUMNS = (
+    DraftingTicket.ticket_number, DraftingTicket.work_order, DraftingTicket.moc,
+    DraftingTicket.request_type, DraftingTicket.priority, DraftingTicket.status,
+    DraftingTicket.unit, DraftingTicket.description, DraftingTicket.created_at,
+    DraftingTicket.review_engineer_id,
+)
+
+
+def ticket_list_options(with_attachments: bool = True, with_reviewer: bool = False) -> list:
+    """
+    Loader options for ORM ticket list views: project the rendered columns
+    and fetch attachments for the whole page in one extra SELECT ... IN.
+    """
+    options = [load_only(*LIST_COLUMNS)]
+    if with_attachments:
+        options.append(selectinload(DraftingTicket.attachments))
+    if with_reviewer:
+        options.append(joinedload(DraftingTicket.review_engineer))
+    return options
+
+
+def encode_cursor(value, row_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if sort == "created_at":
+            value = datetime.fromisoformat(value)
+        else:
+            value = int(value)
+        return value, int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def queue_counts() -> dict[str, int]:
+    """Row counts for every queue, read from the platform-wide ticket counters."""
+    totals = status_totals()
+    new = totals.get("Pending", 0)
+    completed = totals.get("Completed", 0)
+    # "assigned" is every status but Pending / Completed; a NULL status
+    # matches no queue predicate.
+    assigned = sum(totals.values()) - new - completed - totals.get("", 0)
+    return {"new": new, "assigned": assigned, "completed": completed}
+
+
+def queue_page(queue: str, sort: str = "created_at", descending: bool = True,
+               limit: int = DEFAULT_PAGE_SIZE, cursor: str = None) -> tuple[list[dict], str | None]:
+    """
+    Return one page of a queue and the cursor for the next page (or None).
+    Raises ValueError for an unknown queue, sort key or malformed cursor.
+    """
+    if queue not in QUEUES:
+        raise ValueError(f"Unknown queue: {queue}")
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {sort}")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    sort_col = SORT_KEYS[sort]
+    assignee = aliased(User)
+    attachment_count = (
+        select(func.count(TicketAttachment.id))
+        .where(TicketAttachment.ticket_id == DraftingTicket.id)
+        .correlate(DraftingTicket)
+        .scalar_subquery()
+        .label("attachment_count")
+    )
+    stmt = (
+        select(
+            DraftingTicket.id, DraftingTicket.ticket_number, DraftingTicket.work_order,
+            DraftingTicket.moc, DraftingTicket.request_type, DraftingTicket.priority,
+            DraftingTicket.status, DraftingTicket.created_at, DraftingTicket.description,
+            assignee.actual_name.label("assigned_to"), attachment_count,
+        )
+        .outerjoin(assignee, assignee.id == DraftingTicket.assigned_to_id)
+        .where(QUEUES[queue])
+    )
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort)
+        if descending:
+            stmt = stmt.where(or_(sort_col < value, and_(sort_col == value, DraftingTicket.id < last_id)))
+        else:
+            stmt = stmt.where(or_(sort_col > value, and_(sort_col == value, DraftingTicket.id > last_id)))
+    order = (sort_col.desc(), DraftingTicket.id.desc()) if descending else (sort_col, DraftingTicket.id)
+    rows = db.session.execute(stmt.order_by(*order).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort), last.id)
+    tickets = [
+        {
+            "id": r.id,
+            "ticket_number": r.ticket_number,
+            "work_order": r.work_order or r.moc,
+            "request_type": r.request_type,
+            "priority": r.priority,
+            "status": r.status,
+            "created_at": r.created_at.isoformat() if r.created_at else None,
+            "description": r.description,
+            "assigned_to": r.assigned_to,
+            "attachment_count": r.attachment_count,
+        }
+        for r in rows
+    ]
+    return tickets, next_cursor
+
+
+def archive_ticket_numbers() -> list[str]:
+    """All ticket numbers in order, read from the ticket_number index."""
+    return db.session.execute(
+        select(DraftingTicket.ticket_number).order_by(DraftingTicket.ticket_number)
+    ).scalars().all()
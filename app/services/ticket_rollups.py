@@ -0,0 +1,201 @@
+# app/services/ticket_rollups.py
+"""
+Daily ticket rollups for the analytics charts.
+
+``ticket_daily_rollups`` holds one count per (creation day, unit, status,
+drafter, review engineer). Like app.services.ticket_counters, a session
+``after_flush`` hook turns every ticket insert, delete or change of those
+fields into +1/-1 deltas applied on the flush's own connection, so a
+ticket that is assigned, reviewed or completed weeks after it was created
+moves between its day's rows in the same transaction. Charts read a
+window of pre-aggregated rows whatever the size of the ticket history.
+
+Bulk ``query.update()`` calls and raw SQL bypass the hook; run
+``reconcile_daily_rollups()`` (scripts/reconcile_daily_rollups.py) nightly
+to correct drift in recent days, or with no window after a backfill.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta, date
+
+from sqlalchemy import event, inspect, select, update, insert, delete, func, and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models.enums import Role
+from app.models.ticket import DraftingTicket
+from app.models.ticket_counter import TicketCounter
+from app.models.ticket_daily_rollup import TicketDailyRollup
+from app.models.user import User
+
+TRACKED = ("created_at", "unit", "status", "assigned_to_id", "review_engineer_id")
+DIMENSIONS = ("unit", "status", "drafter_id", "engineer_id")
+
+
+def rollup_key(values: dict):
+    """The (day, unit, status, drafter_id, engineer_id) row a ticket state counts towards."""
+    created = values["created_at"]
+    if created is None:
+        return None
+    return (created.date(), values["unit"] or "", values["status"] or "",
+            values["assigned_to_id"] or 0, values["review_engineer_id"] or 0)
+
+
+def _current(ticket) -> dict:
+    return {name: getattr(ticket, name) for name in TRACKED}
+
+
+def _previous(ticket) -> dict:
+    values = {}
+    for name in TRACKED:
+        history = inspect(ticket).attrs[name].history
+        if history.has_changes():
+            values[name] = history.deleted[0] if history.deleted else None
+        else:
+            values[name] = history.unchanged[0] if history.unchanged else None
+    return values
+
+
+def _tracked_changed(ticket) -> bool:
+    state = inspect(ticket)
+    return any(state.attrs[name].history.has_changes() for name in TRACKED)
+
+
+def apply_deltas(connection, deltas: Counter) -> None:
+    table = TicketDailyRollup.__table__
+    # Sorted so concurrent transactions lock rollup rows in the same order.
+    for key, delta in sorted(deltas.items()):
+        if not delta or key is None:
+            continue
+        day, unit, status, drafter_id, engineer_id = key
+        bump = (
+            update(table)
+            .where(table.c.day == day, table.c.unit == unit, table.c.status == status,
+                   table.c.drafter_id == drafter_id, table.c.engineer_id == engineer_id)
+            .values(count=table.c.count + delta)
+        )
+        if connection.execute(bump).rowcount:
+            continue
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(table).values(
+                    day=day, unit=unit, status=status, drafter_id=drafter_id,
+                    engineer_id=engineer_id, count=delta))
+        except IntegrityError:
+            # Another transaction created the row first.
+            connection.execute(bump)
+
+
+@event.listens_for(Session, "after_flush")
+def _roll_up_ticket_changes(session, flush_context):
+    deltas = Counter()
+    for ticket in session.new:
+        if isinstance(ticket, DraftingTicket):
+            deltas[rollup_key(_current(ticket))] += 1
+    for ticket in session.dirty:
+        if isinstance(ticket, DraftingTicket) and _tracked_changed(ticket):
+            deltas[rollup_key(_previous(ticket))] -= 1
+            deltas[rollup_key(_current(ticket))] += 1
+    for ticket in session.deleted:
+        if isinstance(ticket, DraftingTicket):
+            deltas[rollup_key(_previous(ticket))] -= 1
+    if any(deltas.values()):
+        apply_deltas(session.connection(), deltas)
+
+
+# --- reads -----------------------------------------------------------------
+
+def _since(days: int) -> date:
+    return (datetime.utcnow() - timedelta(days=days - 1)).date()
+
+
+def daily_totals(days: int = 30) -> dict[date, int]:
+    """creation day -> tickets created that day, for the last ``days`` days."""
+    rows = db.session.execute(
+        select(TicketDailyRollup.day, func.sum(TicketDailyRollup.count))
+        .where(TicketDailyRollup.day >= _since(days))
+        .group_by(TicketDailyRollup.day)
+        .order_by(TicketDailyRollup.day)
+    ).all()
+    return {day: int(n) for day, n in rows if n}
+
+
+def daily_breakdown(days: int = 30, by: str = "status") -> list[dict]:
+    """Per-day counts split by one dimension (unit, status, drafter_id or engineer_id)."""
+    if by not in DIMENSIONS:
+        raise ValueError(f"by must be one of {', '.join(DIMENSIONS)}")
+    column = getattr(TicketDailyRollup, by)
+    rows = db.session.execute(
+        select(TicketDailyRollup.day, column, func.sum(TicketDailyRollup.count))
+        .where(TicketDailyRollup.day >= _since(days))
+        .group_by(TicketDailyRollup.day, column)
+        .order_by(TicketDailyRollup.day, column)
+    ).all()
+    return [{"date": day.isoformat(), by: value, "count": int(n)} for day, value, n in rows if n]
+
+
+def drafter_totals() -> list[tuple[str, int]]:
+    """(username, tickets assigned) per drafter, from the per-user ticket counters."""
+    return db.session.execute(
+        select(User.username, func.sum(TicketCounter.count))
+        .join(TicketCounter, and_(TicketCounter.user_id == User.id,
+                                  TicketCounter.relation == "assigned"))
+        .where(User.role == Role.DRAFTER)
+        .group_by(User.username)
+        .having(func.sum(TicketCounter.count) > 0)
+        .order_by(User.username)
+    ).all()
+
+
+# --- reconciliation --------------------------------------------------------
+
+def _actual_rollups(since: date = None) -> Counter:
+    day = func.date(DraftingTicket.created_at)
+    dims = (func.coalesce(DraftingTicket.unit, ""), func.coalesce(DraftingTicket.status, ""),
+            func.coalesce(DraftingTicket.assigned_to_id, 0),
+            func.coalesce(DraftingTicket.review_engineer_id, 0))
+    stmt = select(day, *dims, func.count()).where(DraftingTicket.created_at.isnot(None)).group_by(day, *dims)
+    if since is not None:
+        stmt = stmt.where(DraftingTicket.created_at >= datetime.combine(since, datetime.min.time()))
+    actual = Counter()
+    for d, *key, n in db.session.execute(stmt):
+        d = d if isinstance(d, date) else date.fromisoformat(str(d))
+        actual[(d, *key)] = n
+    return actual
+
+
+def reconcile_daily_rollups(days: int = None) -> int:
+    """
+    Recount the last ``days`` days (all history if None) from drafting_tickets
+    and fix drifted rows. Returns rows corrected.
+    """
+    table = TicketDailyRollup.__table__
+    since = _since(days) if days else None
+    actual = _actual_rollups(since)
+    stmt = select(table)
+    if since is not None:
+        stmt = stmt.where(table.c.day >= since)
+    stored = {
+        (r.day, r.unit, r.status, r.drafter_id, r.engineer_id): r.count
+        for r in db.session.execute(stmt)
+    }
+    corrected = 0
+    for key in set(actual) | set(stored):
+        want, have = actual.get(key, 0), stored.get(key)
+        if have == want or (have is None and want == 0):
+            continue
+        day, unit, status, drafter_id, engineer_id = key
+        pk = (table.c.day == day, table.c.unit == unit, table.c.status == status,
+              table.c.drafter_id == drafter_id, table.c.engineer_id == engineer_id)
+        if want == 0:
+            db.session.execute(delete(table).where(*pk))
+        elif have is None:
+            db.session.execute(insert(table).values(
+                day=day, unit=unit, status=status, drafter_id=drafter_id,
+                engineer_id=engineer_id, count=want))
+        else:
+            db.session.execute(update(table).where(*pk).values(count=want))
+        corrected += 1
+    db.session.commit()
+    return corrected
@@ -0,0 +1,243 @@
+# app/services/ticket_search.py
+"""
+Full-text search over DraftingTicket description and spec fields.
+
+Each ticket's words are stored in ``ticket_search_terms`` with a field
+weight (work order / MOC numbers rank above free-text description). The
+table is kept in sync by a session ``after_flush`` hook, the same way the
+document trigram index is; run ``rebuild_ticket_index()`` after bulk
+``query.update()`` calls, which bypass the hook.
+
+Queries match every word (AND); words of PREFIX_MIN letters or more also
+match as prefixes ("insul" → "insulation"). Hits are ranked by summed term
+weight, newest first on ties.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, inspect, select, delete, insert, func, case, and_, or_
+from sqlalchemy.orm import Session, aliased
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.ticket_search_term import TicketSearchTerm
+from app.models.user import User
+from app.services.search_index import words
+
+# Field → weight
+INDEXED_FIELDS = {
+    "work_order": 4,
+    "moc": 4,
+    "service": 2,
+    "pipe_spec": 2,
+    "paint_spec": 2,
+    "description": 1,
+}
+
+PREFIX_MIN = 3
+MAX_QUERY_WORDS = 8
+MAX_TERM_LENGTH = 50
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+def _ticket_terms(ticket) -> dict[str, int]:
+    """Term → summed field weight of its occurrences in one ticket."""
+    terms = Counter()
+    for field, weight in INDEXED_FIELDS.items():
+        for word in words(getattr(ticket, field, None)):
+            terms[word[:MAX_TERM_LENGTH]] += weight
+    return terms
+
+
+def index_tickets(connection, tickets) -> None:
+    """Replace the index rows for the given tickets."""
+    tickets = [t for t in tickets if t.id is not None]
+    if not tickets:
+        return
+    connection.execute(
+        delete(TicketSearchTerm)
+        .where(TicketSearchTerm.ticket_id.in_([t.id for t in tickets]))
+    )
+    rows = [
+        {"term": term, "ticket_id": t.id, "weight": weight}
+        for t in tickets
+        for term, weight in _ticket_terms(t).items()
+    ]
+    if rows:
+        connection.execute(insert(TicketSearchTerm), rows)
+
+
+def unindex_tickets(connection, ticket_ids) -> None:
+    if ticket_ids:
+        connection.execute(
+            delete(TicketSearchTerm)
+            .where(TicketSearchTerm.ticket_id.in_(list(ticket_ids)))
+        )
+
+
+def _indexed_fields_changed(ticket) -> bool:
+    state = inspect(ticket)
+    return any(state.attrs[f].history.has_changes() for f in INDEXED_FIELDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_ticket_search_index(session, flush_context):
+    changed = [
+        o for o in session.new if isinstance(o, DraftingTicket)
+    ] + [
+        o for o in session.dirty
+        if isinstance(o, DraftingTicket) and _indexed_fields_changed(o)
+    ]
+    removed = [o.id for o in session.deleted if isinstance(o, DraftingTicket)]
+    if not (changed or removed):
+        return
+    connection = session.connection()
+    index_tickets(connection, changed)
+    unindex_tickets(connection, removed)
+
+
+def rebuild_ticket_index(batch_size: int = 1000) -> int:
+    """Rebuild the whole term table from drafting_tickets. Returns tickets indexed."""
+    db.session.execute(delete(TicketSearchTerm))
+    count = 0
+    last_id = 0
+    while True:
+        batch = db.session.execute(
+            select(DraftingTicket).where(DraftingTicket.id > last_id)
+            .order_by(DraftingTicket.id).limit(batch_size)
+        ).scalars().all()
+        if not batch:
+            break
+        index_tickets(db.session.connection(), batch)
+        count += len(batch)
+        last_id = batch[-1].id
+        db.session.expunge_all()
+    db.session.commit()
+    return count
+
+
+# --- querying --------------------------------------------------------------
+
+def _parse_date(raw: str, field: str, end: bool = False) -> datetime:
+    """ISO date or datetime; a bare ``until`` date includes that whole day."""
+    raw = raw.strip()
+    try:
+        value = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid ISO-8601 date for '{field}': {raw}")
+    if end and len(raw) == 10:
+        value += timedelta(days=1)
+    # created_at is stored as naive UTC
+    return value.replace(tzinfo=None)
+
+
+def parse_ticket_filters(args) -> dict:
+    """
+    Build a filter dict from request args.
+    Supported keys: unit, status, engineer_id, since, until.
+    Raises ValueError for malformed values.
+    """
+    filters = {}
+    for key in ("unit", "status"):
+        value = (args.get(key) or "").strip()
+        if value:
+            filters[key] = value
+    engineer_id = (args.get("engineer_id") or "").strip()
+    if engineer_id:
+        if not engineer_id.isdigit():
+            raise ValueError("engineer_id must be an integer")
+        filters["engineer_id"] = int(engineer_id)
+    if args.get("since"):
+        filters["since"] = _parse_date(args["since"], "since")
+    if args.get("until"):
+        filters["until"] = _parse_date(args["until"], "until", end=True)
+    return filters
+
+
+def _query_words(query: str) -> list[str]:
+    """Distinct query words, dropping any word that is a prefix of another."""
+    found = list(dict.fromkeys(w[:MAX_TERM_LENGTH] for w in words(query)))[:MAX_QUERY_WORDS]
+    return [
+        w for w in found
+        if not any(o != w and o.startswith(w) and len(w) >= PREFIX_MIN for o in found)
+    ]
+
+
+def _term_match(word: str):
+    term = TicketSearchTerm.term
+    if len(word) < PREFIX_MIN:
+        return term == word
+    upper = word[:-1] + chr(ord(word[-1]) + 1)
+    return and_(term >= word, term < upper)
+
+
+def search_tickets(query: str, filters: dict = None, page: int = 1,
+                   per_page: int = DEFAULT_PAGE_SIZE) -> dict:
+    """Ranked, paginated ticket search. Returns results plus the total hit count."""
+    filters = filters or {}
+    page = max(1, page)
+    per_page = max(1, min(per_page, MAX_PAGE_SIZE))
+    qwords = _query_words(query)
+    if not qwords:
+        return {"results": [], "total": 0, "page": page, "per_page": per_page}
+
+    matches = [_term_match(w) for w in qwords]
+    word_index = case(*[(m, i) for i, m in enumerate(matches)])
+    postings = (
+        select(TicketSearchTerm.ticket_id, func.sum(TicketSearchTerm.weight).label("score"))
+        .where(or_(*matches))
+        .group_by(TicketSearchTerm.ticket_id)
+        .having(func.count(func.distinct(word_index)) == len(qwords))
+        .subquery()
+    )
+
+    criteria = []
+    if "unit" in filters:
+        criteria.append(DraftingTicket.unit == filters["unit"])
+    if "status" in filters:
+        criteria.append(DraftingTicket.status == filters["status"])
+    if "engineer_id" in filters:
+        criteria.append(DraftingTicket.review_engineer_id == filters["engineer_id"])
+    if "since" in filters:
+        criteria.append(DraftingTicket.created_at >= filters["since"])
+    if "until" in filters:
+        criteria.append(DraftingTicket.created_at < filters["until"])
+
+    engineer = aliased(User)
+    stmt = (
+        select(
+            DraftingTicket.id, DraftingTicket.ticket_number, DraftingTicket.status,
+            DraftingTicket.unit, DraftingTicket.priority, DraftingTicket.request_type,
+            DraftingTicket.created_at, DraftingTicket.description,
+            DraftingTicket.work_order, DraftingTicket.moc, DraftingTicket.service,
+            DraftingTicket.pipe_spec, DraftingTicket.paint_spec,
+            DraftingTicket.review_engineer_id,
+            engineer.actual_name.label("review_engineer"),
+            postings.c.score,
+        )
+        .join(postings, postings.c.ticket_id == DraftingTicket.id)
+        .outerjoin(engineer, engineer.id == DraftingTicket.review_engineer_id)
+        .where(*criteria)
+    )
+    total = db.session.execute(
+        select(func.count()).select_from(
+            select(DraftingTicket.id)
+            .join(postings, postings.c.ticket_id == DraftingTicket.id)
+            .where(*criteria)
+            .subquery()
+        )
+    ).scalar()
+    rows = db.session.execute(
+        stmt.order_by(postings.c.score.desc(), DraftingTicket.created_at.desc(),
+                      DraftingTicket.id.desc())
+        .limit(per_page).offset((page - 1) * per_page)
+    ).all()
+
+    results = []
+    for r in rows:
+        item = dict(r._mapping)
+        item["created_at"] = r.created_at.isoformat() if r.created_at else None
+        results.append(item)
+    return {"results": results, "total": total, "page": page, "per_page": per_page}
@@ -0,0 +1,262 @@
+# app/services/ticket_sla.py
+"""
+Status-transition history and SLA tracking for drafting tickets.
+
+A session ``before_flush`` hook appends a ``TicketStatusTransition`` for
+every ticket created or moved to a new status, whichever route or service
+made the change. The ticket keeps ``status_changed_at``, so each row's
+``seconds_in_previous`` is computed when the status changes and time in
+status is a sum over the ticket's rows plus the current stretch.
+
+SLA targets are hours per status (SLA_STATUS_HOURS). ``scan_sla_breaches()``
+uses the (status, status_changed_at) and due_date indexes to flag tickets
+newly past their status target or due date, and pushes a live event for
+each. The web server runs it every SLA_SCAN_INTERVAL seconds
+(``sla_scanner``, started by run.py), so the ``ticket.sla_breached`` events
+reach its streams on the default in-process bus. Each flag is claimed with
+a conditional UPDATE, so when several processes scan, exactly one of them
+announces a breach.
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from flask import current_app, has_request_context
+from flask_login import current_user
+from sqlalchemy import event, inspect, select, update, func, case
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.ticket_status_transition import TicketStatusTransition
+from app.notifications.live import TICKET_AUDIENCE, TICKET_ROLES
+from app.services.event_bus import event_bus
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATUS = "Completed"
+
+
+def sla_targets() -> dict[str, timedelta]:
+    return {status: timedelta(hours=hours)
+            for status, hours in current_app.config.get("SLA_STATUS_HOURS", {}).items()}
+
+
+def _actor_id():
+    if has_request_context() and current_user and current_user.is_authenticated:
+        return current_user.id
+    return None
+
+
+@event.listens_for(Session, "before_flush")
+def _record_status_transitions(session, flush_context, instances):
+    now = datetime.utcnow()
+    targets = None
+    for ticket in list(session.new):
+        if isinstance(ticket, DraftingTicket):
+            ticket.status_changed_at = now
+            session.add(TicketStatusTransition(
+                ticket=ticket, from_status=None, to_status=ticket.status,
+                changed_at=now, changed_by_id=_actor_id()))
+    for ticket in list(session.dirty):
+        if not isinstance(ticket, DraftingTicket):
+            continue
+        attrs = inspect(ticket).attrs
+        if attrs.due_date.history.has_changes():
+            ticket.due_breached_at = None  # re-evaluated by the next scan
+        status = attrs.status.history
+        if not status.has_changes():
+            continue
+        previous = status.deleted[0] if status.deleted else None
+        if previous == ticket.status:
+            continue
+        if targets is None:
+            targets = sla_targets()
+        entered = ticket.status_changed_at
+        seconds = int((now - entered).total_seconds()) if entered else None
+        target = targets.get(previous)
+        breached = ticket.sla_breached_at is not None or (
+            seconds is not None and target is not None and seconds > target.total_seconds())
+        session.add(TicketStatusTransition(
+            ticket=ticket, from_status=previous, to_status=ticket.status, changed_at=now,
+            changed_by_id=_actor_id(), seconds_in_previous=seconds, breached=breached))
+        ticket.status_changed_at = now
+        ticket.sla_breached_at = None
+
+
+# --- per-ticket ---------------------------------------------------------------
+
+def time_in_status(ticket, now: datetime = None) -> dict[str, int]:
+    """status -> total seconds the ticket has spent in it, including now."""
+    now = now or datetime.utcnow()
+    totals = dict(db.session.execute(
+        select(TicketStatusTransition.from_status,
+               func.sum(TicketStatusTransition.seconds_in_previous))
+        .where(TicketStatusTransition.ticket_id == ticket.id,
+               TicketStatusTransition.from_status.isnot(None))
+        .group_by(TicketStatusTransition.from_status)
+    ).all())
+    totals = {status: int(seconds or 0) for status, seconds in totals.items()}
+    if ticket.status_changed_at and ticket.status != CLOSED_STATUS:
+        current = int((now - ticket.status_changed_at).total_seconds())
+        totals[ticket.status] = totals.get(ticket.status, 0) + current
+    return totals
+
+
+def ticket_sla(ticket, now: datetime = None) -> dict:
+    """SLA state and status history for one ticket."""
+    now = now or datetime.utcnow()
+    target = sla_targets().get(ticket.status)
+    in_status = (int((now - ticket.status_changed_at).total_seconds())
+                 if ticket.status_changed_at else None)
+    transitions = db.session.execute(
+        select(TicketStatusTransition)
+        .where(TicketStatusTransition.ticket_id == ticket.id)
+        .order_by(TicketStatusTransition.changed_at, TicketStatusTransition.id)
+    ).scalars().all()
+    return {
+        "ticket_number": ticket.ticket_number,
+        "status": ticket.status,
+        "status_changed_at": ticket.status_changed_at.isoformat() if ticket.status_changed_at else None,
+        "seconds_in_status": in_status,
+        "target_seconds": int(target.total_seconds()) if target else None,
+        "breached": ticket.sla_breached_at is not None or bool(
+            target and in_status is not None and in_status > target.total_seconds()),
+        "due_date": ticket.due_date.isoformat() if ticket.due_date else None,
+        "overdue": bool(ticket.due_date and ticket.status != CLOSED_STATUS and ticket.due_date < now),
+        "time_in_status": time_in_status(ticket, now),
+        "transitions": [t.to_dict() for t in transitions],
+    }
+
+
+# --- aggregate ----------------------------------------------------------------
+
+def sla_summary(days: int = 30, now: datetime = None) -> dict:
+    """Per-status time and breach figures for the window, plus open breaches now."""
+    now = now or datetime.utcnow()
+    t = TicketStatusTransition
+    statuses = {}
+    for status, moves, avg_seconds, max_seconds, breaches in db.session.execute(
+        select(t.from_status, func.count(), func.avg(t.seconds_in_previous),
+               func.max(t.seconds_in_previous), func.sum(case((t.breached, 1), else_=0)))
+        .where(t.changed_at >= now - timedelta(days=days), t.from_status.isnot(None))
+        .group_by(t.from_status)
+    ):
+        statuses[status] = {
+            "transitions": moves,
+            "avg_hours": round(float(avg_seconds) / 3600, 2) if avg_seconds is not None else None,
+            "max_hours": round(max_seconds / 3600, 2) if max_seconds is not None else None,
+            "breaches": int(breaches or 0),
+            "breach_rate": round(int(breaches or 0) / moves, 3),
+        }
+    open_breached = {
+        status: db.session.scalar(
+            select(func.count()).select_from(DraftingTicket)
+            .where(DraftingTicket.status == status,
+                   DraftingTicket.status_changed_at < now - target))
+        for status, target in sla_targets().items()
+    }
+    overdue = db.session.scalar(
+        select(func.count()).select_from(DraftingTicket)
+        .where(DraftingTicket.due_date < now, DraftingTicket.status != CLOSED_STATUS))
+    return {"days": days, "statuses": statuses, "open_breached": open_breached, "overdue": overdue}
+
+
+# --- breach scan --------------------------------------------------------------
+
+def _claim(ids, column, now) -> list[int]:
+    """Flag each ticket unless another scan got there first; returns the ones we flagged."""
+    claimed = []
+    for ticket_id in ids:
+        won = db.session.execute(
+            update(DraftingTicket)
+            .where(DraftingTicket.id == ticket_id, getattr(DraftingTicket, column).is_(None))
+            .values({column: now}).execution_options(synchronize_session=False)
+        ).rowcount
+        if won:
+            claimed.append(ticket_id)
+    return claimed
+
+
+def scan_sla_breaches(now: datetime = None) -> dict:
+    """Flag tickets newly past their status target or due date. Returns counts."""
+    now = now or datetime.utcnow()
+    status_ids = []
+    for status, target in sla_targets().items():
+        status_ids += db.session.execute(
+            select(DraftingTicket.id)
+            .where(DraftingTicket.status == status,
+                   DraftingTicket.status_changed_at < now - target,
+                   DraftingTicket.sla_breached_at.is_(None))
+        ).scalars().all()
+    due_ids = db.session.execute(
+        select(DraftingTicket.id)
+        .where(DraftingTicket.due_date < now,
+               DraftingTicket.status != CLOSED_STATUS,
+               DraftingTicket.due_breached_at.is_(None))
+    ).scalars().all()
+    status_ids = _claim(status_ids, "sla_breached_at", now)
+    due_ids = _claim(due_ids, "due_breached_at", now)
+
+    breaches = [(i, "status") for i in status_ids] + [(i, "due") for i in due_ids]
+    rows = {}
+    if breaches:
+        rows = {r.id: r for r in db.session.execute(
+            select(DraftingTicket.id, DraftingTicket.ticket_number, DraftingTicket.status,
+                   *[getattr(DraftingTicket, a) for a in TICKET_AUDIENCE])
+            .where(DraftingTicket.id.in_({i for i, _ in breaches}))
+        )}
+    db.session.commit()
+
+    for ticket_id, kind in breaches:
+        row = rows[ticket_id]
+        logger.info(f"SLA breach ({kind}) on {row.ticket_number} in {row.status}")
+        event_bus.publish(
+            "ticket.sla_breached",
+            {"ticket_number": row.ticket_number, "status": row.status, "kind": kind},
+            user_ids=[getattr(row, a) for a in TICKET_AUDIENCE if getattr(row, a)],
+            roles=TICKET_ROLES)
+    return {"status": len(status_ids), "due": len(due_ids)}
+
+
+class SlaScanner:
+    """Runs scan_sla_breaches() every SLA_SCAN_INTERVAL seconds in the web process."""
+
+    def __init__(self):
+        self.app = None
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def init_app(self, app):
+        self.app = app
+
+    def start(self):
+        """Start the scan thread (not when SLA_SCAN_INTERVAL is 0)."""
+        if not self.app.config.get("SLA_SCAN_INTERVAL", 300):
+            return
+        self._stopping.clear()
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="nexus-sla", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        interval = self.app.config.get("SLA_SCAN_INTERVAL", 300)
+        while not self._stopping.is_set():
+            try:
+                with self.app.app_context():
+                    try:
+                        scan_sla_breaches()
+                    finally:
+                        db.session.remove()
+            except Exception:
+                logger.exception("SLA breach scan failed")
+            self._stopping.wait(interval)
+
+
+sla_scanner = SlaScanner()
@@ -0,0 +1,148 @@
+# app/services/user_directory.py
+"""
+Process-wide cache of user directory rows for hot lookup paths.
+
+Holds id → (username, actual_name, email, role, notification_frequency)
+for display and mail addressing only, with a TTL and LRU eviction, and
+prefetches misses in one query. Authentication never reads it: the
+Flask-Login loader looks the User up by primary key, so password,
+is_active and role changes apply on the next request.
+
+Users changed in this process are invalidated once their transaction
+commits; other processes converge within USER_CACHE_TTL seconds.
+"""
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models.user import User
+
+UserEntry = namedtuple("UserEntry", "id username actual_name email role notification_frequency")
+
+_MISSING = object()
+
+
+class UserDirectory:
+    """Thread-safe TTL + LRU cache of users table rows."""
+
+    def __init__(self, ttl: float = 300, max_size: int = 5000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._rows = OrderedDict()  # id -> (expires_at, row dict | _MISSING)
+        self._lock = threading.Lock()
+        self._generation = 0  # bumped by invalidate()
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        self.ttl = app.config.get("USER_CACHE_TTL", self.ttl)
+        self.max_size = app.config.get("USER_CACHE_SIZE", self.max_size)
+        self.invalidate()
+
+    # --- cache internals -------------------------------------------------
+
+    def _lookup(self, user_id, now):
+        entry = self._rows.get(user_id)
+        if entry is None:
+            return None
+        expires_at, row = entry
+        if expires_at < now:
+            del self._rows[user_id]
+            return None
+        self._rows.move_to_end(user_id)
+        return row
+
+    def _store(self, rows: dict, now):
+        expires_at = now + self.ttl
+        for user_id, row in rows.items():
+            self._rows[user_id] = (expires_at, row)
+            self._rows.move_to_end(user_id)
+        while len(self._rows) > self.max_size:
+            self._rows.popitem(last=False)
+
+    def _fetch(self, ids) -> dict:
+        table = User.__table__
+        result = db.session.execute(
+            select(*(table.c[name] for name in UserEntry._fields)).where(table.c.id.in_(ids))
+        )
+        rows = {row.id: dict(row._mapping) for row in result}
+        return {i: rows.get(i, _MISSING) for i in ids}
+
+    def _rows_for(self, ids) -> dict:
+        ids = {int(i) for i in ids if i is not None}
+        now = time.monotonic()
+        found, missing = {}, []
+        with self._lock:
+            for user_id in ids:
+                row = self._lookup(user_id, now)
+                if row is None:
+                    missing.append(user_id)
+                else:
+                    found[user_id] = row
+            self.hits += len(found)
+            self.misses += len(missing)
+            generation = self._generation
+        if missing:
+            fetched = self._fetch(missing)
+            with self._lock:
+                # An invalidation during the fetch may mean we read the old row.
+                if self._generation == generation:
+                    self._store(fetched, now)
+            found.update(fetched)
+        return {i: r for i, r in found.items() if r is not _MISSING}
+
+    # --- public API ------------------------------------------------------
+
+    def get(self, user_id) -> UserEntry | None:
+        if user_id is None:
+            return None
+        row = self._rows_for([user_id]).get(int(user_id))
+        return _entry(row) if row else None
+
+    def get_many(self, ids) -> dict[int, UserEntry]:
+        """Return entries for all known ids, loading every miss in one query."""
+        return {i: _entry(r) for i, r in self._rows_for(ids).items()}
+
+    prefetch = get_many
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._rows.clear()
+            else:
+                self._rows.pop(user_id, None)
+
+
+def _entry(row) -> UserEntry:
+    return UserEntry(row["id"], row["username"], row["actual_name"],
+                     row["email"], row["role"], row["notification_frequency"])
+
+
+user_directory = UserDirectory()
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _note_changed_user(mapper, connection, target):
+    """Remember the id; other sessions can still read the old row until commit."""
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_directory.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session):
+    session.info.pop("changed_user_ids", None)
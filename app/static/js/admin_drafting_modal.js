@@ -1,6 +1,157 @@
-import { bindTableSorting } from "/static/js/table_sort.js";
 import { openAssignModal } from "/static/js/assign_modal.js";
 
+// --- Ticket queue paging ---------------------------------------------------
+// Each queue table carries data-url / data-page-size; rows are fetched a page
+// at a time with a keyset cursor and sorted server-side.
+
+function cell(content, className = "px-4 py-3") {
+  const td = document.createElement("td");
+  td.className = className;
+  if (content instanceof Node) {
+    td.appendChild(content);
+  } else {
+    td.textContent = content;
+  }
+  return td;
+}
+
+function formatDate(iso) {
+  if (!iso) return "—";
+  return new Date(iso).toLocaleDateString("en-US", { month: "short", day: "2-digit", year: "numeric" });
+}
+
+function descriptionCell(text) {
+  const td = cell("", "px-4 py-3 relative group");
+  const short = document.createElement("div");
+  short.className = "truncate max-w-[200px]";
+  short.textContent = text || "";
+  const full = document.createElement("div");
+  full.className = "absolute z-20 left-0 top-full mt-1 w-96 p-2 bg-white border border-gray-300 shadow-lg rounded opacity-0 group-hover:opacity-100 transition-opacity pointer-events-none";
+  const p = document.createElement("p");
+  p.className = "text-gray-900 text-sm";
+  p.textContent = text || "";
+  full.appendChild(p);
+  td.append(short, full);
+  return td;
+}
+
+function filesCell(ticket) {
+  if (!ticket.attachment_count) {
+    const none = document.createElement("span");
+    none.className = "text-gray-400 text-sm";
+    none.textContent = "—";
+    return cell(none);
+  }
+  const details = document.createElement("details");
+  details.className = "transition";
+  const summary = document.createElement("summary");
+  summary.className = "cursor-pointer text-[var(--nexus-accent-green)] hover:underline";
+  summary.textContent = `View (${ticket.attachment_count})`;
+  const list = document.createElement("ul");
+  list.className = "mt-1 ml-4 list-disc text-xs text-gray-700";
+  details.append(summary, list);
+
+  // Attachments are only fetched the first time the list is opened.
+  details.addEventListener("toggle", () => {
+    if (!details.open || details.dataset.loaded) return;
+    details.dataset.loaded = "1";
+    fetch(`/drafting/admin/tickets/${ticket.id}/attachments`)
+      .then(response => response.json())
+      .then(data => {
+        data.attachments.forEach(file => {
+          const li = document.createElement("li");
+          const a = document.createElement("a");
+          a.href = file.url;
+          a.dataset.fileUrl = file.url;
+          a.className = "file-preview-link hover:underline";
+          a.textContent = file.name;
+          li.appendChild(a);
+          list.appendChild(li);
+        });
+      })
+      .catch(err => console.error("Error loading attachments:", err));
+  });
+  return cell(details);
+}
+
+function ticketRow(queue, ticket) {
+  const tr = document.createElement("tr");
+  tr.className = "border-b hover:bg-gray-50 transition";
+  tr.appendChild(cell(ticket.ticket_number, "px-4 py-3 font-semibold text-nexus-blue"));
+  tr.appendChild(cell(ticket.work_order || "—"));
+  const type = ticket.request_type || "";
+  tr.appendChild(cell(type.charAt(0).toUpperCase() + type.slice(1).toLowerCase()));
+  tr.appendChild(cell(ticket.priority));
+  if (queue === "assigned") {
+    tr.appendChild(cell(ticket.assigned_to || "—"));
+  }
+  tr.appendChild(cell(formatDate(ticket.created_at)));
+  tr.appendChild(descriptionCell(ticket.description));
+  tr.appendChild(filesCell(ticket));
+  if (queue === "new") {
+    const btn = document.createElement("button");
+    btn.className = "assign-btn px-3 py-1 bg-green-500 text-white rounded hover:bg-green-600 transition";
+    btn.dataset.ticketId = ticket.id;
+    btn.textContent = "Assign";
+    btn.addEventListener("click", () => openAssignModal(ticket.id));
+    tr.appendChild(cell(btn));
+  }
+  return tr;
+}
+
+function createQueue(table) {
+  const container = table.closest("[id^='content-']");
+  const tbody = table.querySelector("tbody");
+  const loadMore = container.querySelector(".queue-load-more");
+  const empty = container.querySelector(".queue-empty");
+  const state = { sort: "created_at", order: "desc", cursor: null, loading: false, loaded: false };
+
+  function load(reset = false) {
+    if (state.loading) return;
+    if (reset) {
+      state.cursor = null;
+      tbody.innerHTML = "";
+    }
+    state.loading = true;
+    const params = new URLSearchParams({
+      limit: table.dataset.pageSize,
+      sort: state.sort,
+      order: state.order,
+    });
+    if (state.cursor) params.set("cursor", state.cursor);
+
+    fetch(`${table.dataset.url}?${params}`)
+      .then(response => response.json())
+      .then(data => {
+        data.tickets.forEach(ticket => tbody.appendChild(ticketRow(table.dataset.queue, ticket)));
+        state.cursor = data.next_cursor;
+        state.loaded = true;
+        loadMore.classList.toggle("hidden", !data.next_cursor);
+        empty.classList.toggle("hidden", tbody.children.length > 0);
+        for (const [queue, count] of Object.entries(data.counts)) {
+          document.querySelectorAll(`[data-count="${queue}"]`).forEach(el => { el.textContent = count; });
+        }
+      })
+      .catch(err => console.error("Error loading ticket queue:", err))
+      .finally(() => { state.loading = false; });
+  }
+
+  loadMore.addEventListener("click", () => load());
+  table.querySelectorAll("th[data-sort]").forEach(th => {
+    th.addEventListener("click", () => {
+      if (state.sort === th.dataset.sort) {
+        state.order = state.order === "desc" ? "asc" : "desc";
+      } else {
+        state.sort = th.dataset.sort;
+        state.order = "desc";
+      }
+      load(true);
+    });
+  });
+
+  return { ensureLoaded: () => { if (!state.loaded) load(); } };
+}
+
 // Function to bind event listeners to the admin modal elements.
 export function bindAdminModalEvents() {
   const tabButtons = document.querySelectorAll('.tab-button');
@@ -11,6 +162,11 @@ export function bindAdminModalEvents() {
     "tab-analytics": "content-analytics"
   };
 
+  const queues = {};
+  document.querySelectorAll("table.ticket-queue").forEach(table => {
+    queues[table.closest("[id^='content-']").id] = createQueue(table);
+  });
+
   function setActiveTab(activeId) {
     tabButtons.forEach(btn => {
       btn.classList.toggle("active-tab", btn.id === activeId);
@@ -21,14 +177,9 @@ export function bindAdminModalEvents() {
         contentDiv.classList.toggle("hidden", tabId !== activeId);
       }
     }
-    // Bind sorting for the visible table if it exists.
-    if (activeId === "tab-new-tickets") {
-      bindTableSorting("admin-new-tickets-table");
-    } else if (activeId === "tab-assigned-tickets") {
-      bindTableSorting("admin-assigned-tickets-table");
-    } else if (activeId === "tab-completed-tickets") {
-      bindTableSorting("admin-completed-tickets-table");
-    }
+    // Each queue fetches its first page the first time its tab is shown.
+    const queue = queues[tabContentIds[activeId]];
+    if (queue) queue.ensureLoaded();
   }
 
   tabButtons.forEach(btn => {
@@ -45,18 +196,6 @@ export function bindAdminModalEvents() {
       document.getElementById("modal-root").innerHTML = "";
     });
   }
-
-  // Bind assign button events: when an "Assign" button is clicked, open the assign modal.
-  const assignButtons = document.querySelectorAll(".assign-btn");
-  assignButtons.forEach(btn => {
-    btn.addEventListener("click", function() {
-      const ticketId = this.getAttribute("data-ticket-id");
-      openAssignModal(ticketId);
-    });
-  });
-
-  // Bind table sorting on the active table.
-  bindTableSorting("admin-new-tickets-table");
 }
 
 // Function to open the admin drafting modal via AJAX.
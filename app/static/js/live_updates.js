@@ -0,0 +1,61 @@
+// static/js/live_updates.js
+
+/**
+ * Subscribes to the /events Server-Sent Events stream and applies live
+ * updates in place instead of re-fetching whole ticket lists.
+ *
+ * Every event is re-dispatched on window as a `nexus:<type>` CustomEvent
+ * (e.g. `nexus:ticket.updated`) so modal scripts can react to it.
+ * Elements marked `data-ticket-status="<ticket_number>"` get their text
+ * replaced on ticket.updated; the bell shows a dot for anything new.
+ *
+ * When the server is at its stream limit it answers 503, which closes the
+ * EventSource for good; we then poll `pollUrl` every `pollMs` (plus jitter)
+ * for the same events instead of reopening the stream.
+ */
+const EVENT_TYPES = ['ticket.created', 'ticket.updated', 'comment.created', 'checkout.changed', 'resync'];
+
+function markUnread() {
+  const dot = document.getElementById('notification-dot');
+  if (dot) dot.classList.remove('hidden');
+}
+
+function applyTicketUpdate(data) {
+  document
+    .querySelectorAll(`[data-ticket-status="${CSS.escape(data.ticket_number)}"]`)
+    .forEach((el) => { el.textContent = data.status; });
+}
+
+function handleEvent(type, data) {
+  if (type === 'ticket.updated') applyTicketUpdate(data);
+  if (type !== 'resync' && type !== 'checkout.changed') markUnread();
+  window.dispatchEvent(new CustomEvent(`nexus:${type}`, { detail: data }));
+}
+
+function pollForUpdates(pollUrl, pollMs, cursor = '') {
+  const next = (c) => setTimeout(() => pollForUpdates(pollUrl, pollMs, c), pollMs * (1 + Math.random() / 2));
+  fetch(`${pollUrl}?cursor=${encodeURIComponent(cursor)}`, { credentials: 'same-origin' })
+    .then((resp) => (resp.ok ? resp.json() : Promise.reject(resp.status)))
+    .then((body) => {
+      if (body.resync && cursor) handleEvent('resync', {});
+      body.events.forEach((evt) => handleEvent(evt.type, evt.data));
+      next(body.cursor);
+    })
+    .catch(() => next(cursor));
+}
+
+export function initLiveUpdates(url = '/events', pollUrl = '/events/poll', pollMs = 30000) {
+  if (!('EventSource' in window)) {
+    pollForUpdates(pollUrl, pollMs);
+    return null;
+  }
+  const source = new EventSource(url);
+  source.addEventListener('error', () => {
+    if (source.readyState !== EventSource.CLOSED) return;  // browser is reconnecting
+    pollForUpdates(pollUrl, pollMs);
+  });
+  EVENT_TYPES.forEach((type) => {
+    source.addEventListener(type, (evt) => handleEvent(type, JSON.parse(evt.data || '{}')));
+  });
+  return source;
+}
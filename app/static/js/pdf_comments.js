@@ -33,6 +33,7 @@ export class PdfCommentThread {
     this.currentUserId = currentUserId;
     this.comments = [];
     this.optimisticId = 0;
+    this.lastFetchedId = 0; // feed cursor: only newer comments are requested
 
     this._bindEvents();
     this.loadComments();
@@ -50,19 +51,23 @@ export class PdfCommentThread {
   }
 
   /**
-   * Loads comments from the backend and renders them.
+   * Loads comments newer than the last fetch, renders them and marks the
+   * thread read. Safe to call again to refresh.
    */
   async loadComments() {
     if (!this.ticketNumber) return;
     try {
       const resp = await fetch(
-        `/engineering/ticket/${this.ticketNumber}/comments`
+        `/engineering/ticket/${this.ticketNumber}/comments?since=${this.lastFetchedId}`
       );
       if (!resp.ok) throw new Error("Failed to load comments");
-      const comments = await resp.json();
-      this.comments = comments;
+      const fresh = await resp.json();
+      const known = new Set(this.comments.map((c) => c.id));
+      this.comments = this.comments.concat(fresh.filter((c) => !known.has(c.id)));
+      if (fresh.length) this.lastFetchedId = fresh[fresh.length - 1].id;
       this.renderComments();
-      this._dispatch("comments:loaded", { comments });
+      this._dispatch("comments:loaded", { comments: this.comments });
+      if (fresh.some((c) => !c.read)) this.markRead();
     } catch (err) {
       this.threadContainer.innerHTML =
         '<div class="text-red-500 text-sm text-center py-4">Failed to load comments.</div>';
@@ -84,9 +89,10 @@ export class PdfCommentThread {
     comments.forEach((c) => {
       this.threadContainer.appendChild(this._renderCommentItem(c));
     });
-    // Show badge if there are unread comments (future: integrate with backend)
-    this.badge?.classList.toggle("hidden", comments.length === 0);
-    this.badge && (this.badge.textContent = comments.length);
+    // Show badge if there are unread comments
+    const unread = comments.filter((c) => c.read === false).length;
+    this.badge?.classList.toggle("hidden", unread === 0);
+    this.badge && (this.badge.textContent = unread);
     // Auto-scroll to bottom
     this.threadContainer.scrollTop = this.threadContainer.scrollHeight;
   }
@@ -121,6 +127,30 @@ export class PdfCommentThread {
     return div;
   }
 
+  /**
+   * Marks everything fetched so far as read.
+   */
+  async markRead() {
+    const upto = this.lastFetchedId;
+    const resp = await fetch(
+      `/engineering/ticket/${this.ticketNumber}/comments/read`,
+      {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+          "X-Requested-With": "XMLHttpRequest",
+        },
+        body: JSON.stringify({ upto }),
+      }
+    );
+    if (!resp.ok) return;
+    this.comments.forEach((c) => {
+      if (typeof c.id === "number" && c.id <= upto) c.read = true;
+    });
+    this.renderComments();
+    this._dispatch("comments:read", { upto });
+  }
+
   /**
    * Posts a comment (optimistic UI).
    * @param {string} message
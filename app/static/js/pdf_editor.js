@@ -3,6 +3,7 @@ import { state } from "./pdf_editor_state.js";
 import * as utils from "./pdf_editor_utils.js";
 import * as render from "./pdf_editor_render.js";
 import * as interactions from "./pdf_editor_interactions.js";
+import { loadAnnotations } from "./pdf_editor_actions.js";
 
 export async function initPdfEditor(pdfUrl) {
   const e = state.elements;
@@ -36,6 +37,7 @@ export async function initPdfEditor(pdfUrl) {
   e.toolChestToggle = document.getElementById("toolChestToggle");
 
   // Load PDF document
+  state.filename = decodeURIComponent(pdfUrl.split("?")[0].split("/").pop());
   state.originalPdfBytes = await fetch(pdfUrl).then(r => r.arrayBuffer());
   state.pdfDoc = await pdfjsLib.getDocument({ data: state.originalPdfBytes }).promise;
   state.totalPages = state.pdfDoc.numPages;
@@ -57,6 +59,8 @@ export async function initPdfEditor(pdfUrl) {
   }
 
   // Wire up everything
+  await loadAnnotations();
+  render.redraw();
   utils.updateMarkupsState();
   interactions.setupTools();
   interactions.setupNavigationAndClear();
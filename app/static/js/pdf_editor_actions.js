@@ -1,6 +1,6 @@
 // static/js/pdf_editor_actions.js
 import { state } from "./pdf_editor_state.js";
-import { exportAnnotatedPdf } from "./pdf_export.js";
+import * as utils from "./pdf_editor_utils.js";
 
 export async function submitAction(action) {
   if (!state.ticketNumber) return;
@@ -17,7 +17,7 @@ export async function submitAction(action) {
 
   try {
     if (action === "revise" && state.hasMarkups) {
-      await saveAnnotatedPdf();
+      await saveAnnotations();
     }
     const resp = await fetch(url, {
       method,
@@ -37,22 +37,57 @@ export async function submitAction(action) {
   }
 }
 
-async function saveAnnotatedPdf() {
-  if (!state.originalPdfBytes || !state.ticketNumber) return;
-  const blob = await exportAnnotatedPdf(new Uint8Array(state.originalPdfBytes), state.markups);
-  const urlParts = window.location.pathname.split("/");
-  const filename = urlParts.pop() || "annotated.pdf";
-  const formData = new FormData();
-  formData.append("file", blob, filename);
-  formData.append("original_filename", filename);
+function annotationsUrl(suffix = "") {
+  return `/engineering/ticket/${state.ticketNumber}/annotations/${encodeURIComponent(state.filename)}${suffix}`;
+}
+
+// Markups are drawn in canvas pixels; the server stores them as fractions of the page.
+function toPageShape(m, w, h) {
+  const points = m.type === "pen" ? m.path.map(p => [p.x, p.y]) : [[m.x1, m.y1], [m.x2, m.y2]];
+  return {
+    type: m.type,
+    points: points.map(([x, y]) => [x / w, y / h]),
+    color: m.color,
+    width: m.width / w
+  };
+}
+
+function fromPageShape(s, w, h) {
+  const points = s.points.map(([x, y]) => ({ x: x * w, y: y * h }));
+  const m = { type: s.type, color: s.color, width: s.width * w };
+  if (s.type === "pen") return { ...m, path: points };
+  return { ...m, x1: points[0].x, y1: points[0].y, x2: points[1].x, y2: points[1].y };
+}
 
-  const resp = await fetch(`/engineering/ticket/${state.ticketNumber}/upload-annotated`, {
-    method: "POST",
-    body: formData,
-    headers: { "X-Requested-With": "XMLHttpRequest" }
+export async function loadAnnotations() {
+  if (!state.ticketNumber || !state.filename) return;
+  const resp = await fetch(annotationsUrl(), { headers: { "X-Requested-With": "XMLHttpRequest" } });
+  if (!resp.ok) return;
+  const { pages } = await resp.json();
+  const { width, height } = state.elements.annotCanvas;
+  Object.entries(pages).forEach(([page, shapes]) => {
+    state.markups[page] = shapes.map(s => fromPageShape(s, width, height));
+    state.savedPages.add(String(page));
   });
-  if (!resp.ok) {
-    alert("Failed to upload annotated PDF.");
-    throw new Error("Upload failed");
+  utils.updateMarkupsState();
+}
+
+async function saveAnnotations() {
+  if (!state.ticketNumber || !state.filename) return;
+  const { width, height } = state.elements.annotCanvas;
+  // Pages cleared since loading are saved empty, which removes them.
+  const pages = new Set([...Object.keys(state.markups), ...state.savedPages]);
+  for (const page of pages) {
+    const shapes = (state.markups[page] || []).map(m => toPageShape(m, width, height));
+    const resp = await fetch(annotationsUrl(`/${page}`), {
+      method: "PUT",
+      body: JSON.stringify({ shapes }),
+      headers: { "Content-Type": "application/json", "X-Requested-With": "XMLHttpRequest" }
+    });
+    if (!resp.ok) {
+      alert("Failed to save markups.");
+      throw new Error("Save failed");
+    }
+    if (shapes.length) state.savedPages.add(page); else state.savedPages.delete(page);
   }
 }
@@ -3,6 +3,7 @@ export const state = {
   // PDF.js document data
   pdfDoc: null,
   originalPdfBytes: null,
+  filename: null,
   // Pagination
   currentPage: 1,
   totalPages: 0,
@@ -32,6 +33,7 @@ export const state = {
   markups: {},
   selected: null,
   hasMarkups: false,
+  savedPages: new Set(),
   // Comment thread context
   ticketNumber: window.PDF_TICKET_NUMBER || null,
   currentUserId: window.CURRENT_USER_ID || null,
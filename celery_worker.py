@@ -0,0 +1,20 @@
+# celery_worker.py
+"""
+Celery worker entry point for queued background jobs.
+
+Requires CELERY_BROKER_URL (e.g. redis://localhost:6379/0). Start with:
+> celery -A celery_worker.celery worker --loglevel=info
+
+Without a broker configured, jobs run in-process in the web server.
+"""
+
+from dotenv import load_dotenv
+from app import create_app
+
+load_dotenv()
+
+app = create_app()
+celery = app.extensions.get("celery")
+
+if celery is None:
+    raise RuntimeError("CELERY_BROKER_URL is not set; background jobs run in-process.")
@@ -0,0 +1,37 @@
+"""ticket full-text search terms
+
+Revision ID: 2f7a9e4b1c53
+Revises: 9b31f6d2c0e8
+Create Date: 2026-10-19 15:31:08.772519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f7a9e4b1c53'
+down_revision: Union[str, None] = '9b31f6d2c0e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ticket_search_terms',
+    sa.Column('term', sa.String(length=50), nullable=False),
+    sa.Column('ticket_id', sa.Integer(), nullable=False),
+    sa.Column('weight', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('term', 'ticket_id'),
+    sqlite_with_rowid=False
+    )
+    op.create_index('ix_ticket_search_terms_ticket_id', 'ticket_search_terms', ['ticket_id'], unique=False)
+    # Existing tickets are indexed by scripts/rebuild_search_index.py
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ticket_search_terms_ticket_id', table_name='ticket_search_terms')
+    op.drop_table('ticket_search_terms')
@@ -0,0 +1,49 @@
+"""outbound email outbox
+
+Revision ID: 4e8c2b7d9f15
+Revises: b6e03d8f4a27
+Create Date: 2026-10-19 16:41:08.502117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e8c2b7d9f15'
+down_revision: Union[str, None] = 'b6e03d8f4a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbound_emails',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('subject', sa.String(length=255), nullable=False),
+    sa.Column('recipients', sa.Text(), nullable=False),
+    sa.Column('cc', sa.Text(), nullable=True),
+    sa.Column('body', sa.Text(), nullable=True),
+    sa.Column('html', sa.Text(), nullable=True),
+    sa.Column('attachments', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('claimed_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('outbound_emails', schema=None) as batch_op:
+        batch_op.create_index('ix_outbound_emails_due', ['status', 'next_attempt_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('outbound_emails', schema=None) as batch_op:
+        batch_op.drop_index('ix_outbound_emails_due')
+
+    op.drop_table('outbound_emails')
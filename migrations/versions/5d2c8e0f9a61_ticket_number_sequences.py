@@ -0,0 +1,33 @@
+"""ticket number sequences
+
+Revision ID: 5d2c8e0f9a61
+Revises: e4b7a1c9d352
+Create Date: 2026-10-19 14:02:55.318240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2c8e0f9a61'
+down_revision: Union[str, None] = 'e4b7a1c9d352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ticket_sequences',
+    sa.Column('prefix', sa.String(length=20), nullable=False),
+    sa.Column('next_value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('prefix')
+    )
+    # Rows are seeded on first use from the highest existing ticket number.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('ticket_sequences')
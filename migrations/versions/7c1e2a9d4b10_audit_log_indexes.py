@@ -0,0 +1,34 @@
+"""audit log composite indexes
+
+Revision ID: 7c1e2a9d4b10
+Revises: 351d410289e9
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e2a9d4b10'
+down_revision: Union[str, None] = '351d410289e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_audit_logs_entity_timestamp', 'audit_logs', ['entity_type', 'entity_id', 'timestamp', 'id'], unique=False)
+    op.create_index('ix_audit_logs_user_timestamp', 'audit_logs', ['user_id', 'timestamp', 'id'], unique=False)
+    op.create_index('ix_audit_logs_action_timestamp', 'audit_logs', ['action', 'timestamp', 'id'], unique=False)
+    op.create_index('ix_audit_logs_timestamp', 'audit_logs', ['timestamp', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_audit_logs_timestamp', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_action_timestamp', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_user_timestamp', table_name='audit_logs')
+    op.drop_index('ix_audit_logs_entity_timestamp', table_name='audit_logs')
@@ -0,0 +1,49 @@
+"""notification digests
+
+Revision ID: 8a5d3f1e6b72
+Revises: 4e8c2b7d9f15
+Create Date: 2026-10-19 17:26:44.910385
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a5d3f1e6b72'
+down_revision: Union[str, None] = '4e8c2b7d9f15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('notification_frequency', sa.Enum('IMMEDIATE', 'HOURLY', 'DAILY', name='notification_frequency_enum', native_enum=False), server_default='IMMEDIATE', nullable=False))
+
+    op.create_table('pending_notifications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(length=30), nullable=False),
+    sa.Column('ticket_number', sa.String(length=50), nullable=True),
+    sa.Column('subject', sa.String(length=255), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('deliver_after', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('pending_notifications', schema=None) as batch_op:
+        batch_op.create_index('ix_pending_notifications_due', ['deliver_after', 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('pending_notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_pending_notifications_due')
+
+    op.drop_table('pending_notifications')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('notification_frequency')
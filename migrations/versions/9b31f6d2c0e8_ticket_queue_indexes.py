@@ -0,0 +1,32 @@
+"""ticket queue indexes
+
+Revision ID: 9b31f6d2c0e8
+Revises: 5d2c8e0f9a61
+Create Date: 2026-10-19 14:47:12.604183
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b31f6d2c0e8'
+down_revision: Union[str, None] = '5d2c8e0f9a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_drafting_tickets_status_created', 'drafting_tickets', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_drafting_tickets_status_priority', 'drafting_tickets', ['status', 'priority', 'id'], unique=False)
+    op.create_index(op.f('ix_ticket_attachments_ticket_id'), 'ticket_attachments', ['ticket_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_ticket_attachments_ticket_id'), table_name='ticket_attachments')
+    op.drop_index('ix_drafting_tickets_status_priority', table_name='drafting_tickets')
+    op.drop_index('ix_drafting_tickets_status_created', table_name='drafting_tickets')
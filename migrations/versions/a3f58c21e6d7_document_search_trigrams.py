@@ -0,0 +1,63 @@
+"""document search trigram index and number key
+
+Revision ID: a3f58c21e6d7
+Revises: 7c1e2a9d4b10
+Create Date: 2026-10-19 10:02:17.530921
+
+"""
+from typing import Sequence, Union
+
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f58c21e6d7'
+down_revision: Union[str, None] = '7c1e2a9d4b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _compact(value):
+    return re.sub(r"[^a-z0-9]+", "", (value or "").lower())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('document_masters') as batch_op:
+        batch_op.add_column(sa.Column('number_key', sa.String(length=50), nullable=True))
+        batch_op.create_index(batch_op.f('ix_document_masters_number_key'), ['number_key'], unique=False)
+
+    masters = sa.table('document_masters',
+        sa.column('id', sa.UUID()),
+        sa.column('document_number', sa.String()),
+        sa.column('number_key', sa.String()),
+    )
+    conn = op.get_bind()
+    for row in conn.execute(sa.select(masters.c.id, masters.c.document_number)).all():
+        conn.execute(
+            masters.update()
+            .where(masters.c.id == row.id)
+            .values(number_key=_compact(row.document_number))
+        )
+
+    op.create_table('document_search_trigrams',
+    sa.Column('trigram', sa.String(length=3), nullable=False),
+    sa.Column('master_id', sa.UUID(), nullable=False),
+    sa.Column('weight', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('trigram', 'master_id'),
+    sqlite_with_rowid=False
+    )
+    op.create_index('ix_document_search_trigrams_master_id', 'document_search_trigrams', ['master_id'], unique=False)
+    # Existing masters are indexed by scripts/rebuild_search_index.py
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_document_search_trigrams_master_id', table_name='document_search_trigrams')
+    op.drop_table('document_search_trigrams')
+    with op.batch_alter_table('document_masters') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_document_masters_number_key'))
+        batch_op.drop_column('number_key')
@@ -0,0 +1,60 @@
+"""append-only ticket event log
+
+Revision ID: a63d9f2b8e17
+Revises: f2a8c6e1d594
+Create Date: 2026-10-19 23:02:18.664120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a63d9f2b8e17'
+down_revision: Union[str, None] = 'f2a8c6e1d594'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('drafting_tickets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('event_seq', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('revision', sa.Integer(), nullable=False, server_default='0'))
+
+    op.create_table('ticket_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ticket_id', sa.Integer(), nullable=False),
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=40), nullable=False),
+    sa.Column('actor_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.ForeignKeyConstraint(['actor_id'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['ticket_id'], ['drafting_tickets.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('ticket_id', 'seq', name='uq_ticket_events_ticket_seq')
+    )
+    with op.batch_alter_table('ticket_events', schema=None) as batch_op:
+        batch_op.create_index('ix_ticket_events_type_created', ['event_type', 'created_at'], unique=False)
+
+    # Start every existing ticket's log with its submission.
+    op.execute(
+        "INSERT INTO ticket_events (ticket_id, seq, event_type, actor_id, created_at, payload) "
+        "SELECT id, 1, 'submitted', submitted_by_id, COALESCE(created_at, CURRENT_TIMESTAMP), '{}' "
+        "FROM drafting_tickets"
+    )
+    op.execute("UPDATE drafting_tickets SET event_seq = 1")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('ticket_events', schema=None) as batch_op:
+        batch_op.drop_index('ix_ticket_events_type_created')
+
+    op.drop_table('ticket_events')
+    with op.batch_alter_table('drafting_tickets', schema=None) as batch_op:
+        batch_op.drop_column('revision')
+        batch_op.drop_column('event_seq')
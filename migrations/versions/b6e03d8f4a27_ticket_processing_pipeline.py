@@ -0,0 +1,55 @@
+"""ticket post-submission processing pipeline
+
+Revision ID: b6e03d8f4a27
+Revises: 2f7a9e4b1c53
+Create Date: 2026-10-19 16:20:44.158302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e03d8f4a27'
+down_revision: Union[str, None] = '2f7a9e4b1c53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ticket_processing_tasks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ticket_id', sa.Integer(), nullable=False),
+    sa.Column('attachment_id', sa.Integer(), nullable=True),
+    sa.Column('step', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['attachment_id'], ['ticket_attachments.id'], ),
+    sa.ForeignKeyConstraint(['ticket_id'], ['drafting_tickets.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ticket_processing_tasks_ticket_id'), 'ticket_processing_tasks', ['ticket_id'], unique=False)
+
+    with op.batch_alter_table('ticket_attachments') as batch_op:
+        batch_op.add_column(sa.Column('checksum', sa.String(length=128), nullable=True))
+        batch_op.add_column(sa.Column('file_size', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('page_count', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('preview_path', sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('ticket_attachments') as batch_op:
+        batch_op.drop_column('preview_path')
+        batch_op.drop_column('page_count')
+        batch_op.drop_column('file_size')
+        batch_op.drop_column('checksum')
+
+    op.drop_index(op.f('ix_ticket_processing_tasks_ticket_id'), table_name='ticket_processing_tasks')
+    op.drop_table('ticket_processing_tasks')
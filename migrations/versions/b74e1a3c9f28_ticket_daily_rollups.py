@@ -0,0 +1,45 @@
+"""ticket daily rollups
+
+Revision ID: b74e1a3c9f28
+Revises: a63d9f2b8e17
+Create Date: 2026-10-19 23:38:41.207593
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b74e1a3c9f28'
+down_revision: Union[str, None] = 'a63d9f2b8e17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ticket_daily_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('unit', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('drafter_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('engineer_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'unit', 'status', 'drafter_id', 'engineer_id')
+    )
+    # Seed from existing tickets; the flush hook keeps it current from here.
+    op.execute(
+        "INSERT INTO ticket_daily_rollups (day, unit, status, drafter_id, engineer_id, count) "
+        "SELECT date(created_at), COALESCE(unit, ''), COALESCE(status, ''), "
+        "COALESCE(assigned_to_id, 0), COALESCE(review_engineer_id, 0), COUNT(*) "
+        "FROM drafting_tickets WHERE created_at IS NOT NULL "
+        "GROUP BY date(created_at), COALESCE(unit, ''), COALESCE(status, ''), "
+        "COALESCE(assigned_to_id, 0), COALESCE(review_engineer_id, 0)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('ticket_daily_rollups')
@@ -0,0 +1,30 @@
+"""revision diff started_at
+
+Revision ID: c3f9a7d2e416
+Revises: b74e1a3c9f28
+Create Date: 2026-10-20 09:12:37.482915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f9a7d2e416'
+down_revision: Union[str, None] = 'b74e1a3c9f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('revision_diffs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('started_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('revision_diffs', schema=None) as batch_op:
+        batch_op.drop_column('started_at')
@@ -0,0 +1,55 @@
+"""ticket counters
+
+Revision ID: c47e9a2d5b18
+Revises: 8a5d3f1e6b72
+Create Date: 2026-10-19 19:08:31.264907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47e9a2d5b18'
+down_revision: Union[str, None] = '8a5d3f1e6b72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ticket_counters',
+    sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('relation', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'relation', 'status')
+    )
+    # Seed from existing tickets; scripts/reconcile_ticket_counters.py does the same later.
+    op.execute(
+        "INSERT INTO ticket_counters (user_id, relation, status, count) "
+        "SELECT 0, 'all', COALESCE(status, ''), COUNT(*) FROM drafting_tickets "
+        "GROUP BY COALESCE(status, '')"
+    )
+    for relation, column in (('assigned', 'assigned_to_id'),
+                             ('reviewing', 'review_engineer_id'),
+                             ('submitted', 'submitted_by_id')):
+        op.execute(
+            f"INSERT INTO ticket_counters (user_id, relation, status, count) "
+            f"SELECT {column}, '{relation}', COALESCE(status, ''), COUNT(*) FROM drafting_tickets "
+            f"WHERE {column} IS NOT NULL GROUP BY {column}, COALESCE(status, '')"
+        )
+    op.execute(
+        "INSERT INTO ticket_counters (user_id, relation, status, count) "
+        "SELECT assigned_to_id, 'assigned_unviewed', COALESCE(status, ''), COUNT(*) "
+        "FROM drafting_tickets WHERE assigned_to_id IS NOT NULL "
+        "AND (assigned_viewed IS NULL OR assigned_viewed = false) "
+        "GROUP BY assigned_to_id, COALESCE(status, '')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('ticket_counters')
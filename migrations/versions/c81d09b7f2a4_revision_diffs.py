@@ -0,0 +1,40 @@
+"""revision visual diff cache
+
+Revision ID: c81d09b7f2a4
+Revises: a3f58c21e6d7
+Create Date: 2026-10-19 11:26:53.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81d09b7f2a4'
+down_revision: Union[str, None] = 'a3f58c21e6d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('revision_diffs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('base_checksum', sa.String(length=128), nullable=False),
+    sa.Column('target_checksum', sa.String(length=128), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('result', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_revision_diffs_checksums', 'revision_diffs', ['base_checksum', 'target_checksum'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_revision_diffs_checksums', table_name='revision_diffs')
+    op.drop_table('revision_diffs')
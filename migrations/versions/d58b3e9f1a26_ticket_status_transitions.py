@@ -0,0 +1,62 @@
+"""ticket status transitions and sla
+
+Revision ID: d58b3e9f1a26
+Revises: c47e9a2d5b18
+Create Date: 2026-10-19 20:41:07.518224
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd58b3e9f1a26'
+down_revision: Union[str, None] = 'c47e9a2d5b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('drafting_tickets', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('status_changed_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('sla_breached_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('due_breached_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_drafting_tickets_status_changed', ['status', 'status_changed_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_drafting_tickets_due_date'), ['due_date'], unique=False)
+    # No history before this point: time in the current status counts from creation.
+    op.execute("UPDATE drafting_tickets SET status_changed_at = created_at")
+
+    op.create_table('ticket_status_transitions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ticket_id', sa.Integer(), nullable=False),
+    sa.Column('from_status', sa.String(length=50), nullable=True),
+    sa.Column('to_status', sa.String(length=50), nullable=True),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.Column('changed_by_id', sa.Integer(), nullable=True),
+    sa.Column('seconds_in_previous', sa.Integer(), nullable=True),
+    sa.Column('breached', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['changed_by_id'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['ticket_id'], ['drafting_tickets.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('ticket_status_transitions', schema=None) as batch_op:
+        batch_op.create_index('ix_ticket_status_transitions_ticket', ['ticket_id', 'changed_at'], unique=False)
+        batch_op.create_index('ix_ticket_status_transitions_from_status', ['from_status', 'changed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('ticket_status_transitions', schema=None) as batch_op:
+        batch_op.drop_index('ix_ticket_status_transitions_from_status')
+        batch_op.drop_index('ix_ticket_status_transitions_ticket')
+
+    op.drop_table('ticket_status_transitions')
+    with op.batch_alter_table('drafting_tickets', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_drafting_tickets_due_date'))
+        batch_op.drop_index('ix_drafting_tickets_status_changed')
+        batch_op.drop_column('due_breached_at')
+        batch_op.drop_column('sla_breached_at')
+        batch_op.drop_column('status_changed_at')
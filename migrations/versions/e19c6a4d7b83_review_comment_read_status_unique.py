@@ -0,0 +1,35 @@
+"""review comment read status unique per user
+
+Revision ID: e19c6a4d7b83
+Revises: d58b3e9f1a26
+Create Date: 2026-10-19 21:26:43.905118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e19c6a4d7b83'
+down_revision: Union[str, None] = 'd58b3e9f1a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the earliest read of each comment by each user.
+    op.execute(
+        "DELETE FROM review_comment_read_status WHERE id NOT IN ("
+        "SELECT MIN(id) FROM review_comment_read_status GROUP BY user_id, comment_id)"
+    )
+    with op.batch_alter_table('review_comment_read_status', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_review_comment_read_status_user_comment', ['user_id', 'comment_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('review_comment_read_status', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_review_comment_read_status_user_comment', type_='unique')
@@ -0,0 +1,43 @@
+"""document retention and review-due engine
+
+Revision ID: e4b7a1c9d352
+Revises: c81d09b7f2a4
+Create Date: 2026-10-19 13:08:41.217604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7a1c9d352'
+down_revision: Union[str, None] = 'c81d09b7f2a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('document_masters') as batch_op:
+        batch_op.add_column(sa.Column('retention_expires_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column('review_notified_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index('ix_document_masters_retention_due', ['retired_at', 'retention_expires_at', 'id'], unique=False)
+        batch_op.create_index('ix_document_masters_review_due', ['retired_at', 'review_notified_at', 'review_due', 'id'], unique=False)
+
+    with op.batch_alter_table('document_revisions') as batch_op:
+        batch_op.add_column(sa.Column('storage_tier', sa.String(length=20), nullable=False, server_default='hot'))
+    # Existing masters get retention_expires_at from scripts/run_retention.py --backfill
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('document_revisions') as batch_op:
+        batch_op.drop_column('storage_tier')
+
+    with op.batch_alter_table('document_masters') as batch_op:
+        batch_op.drop_index('ix_document_masters_review_due')
+        batch_op.drop_index('ix_document_masters_retention_due')
+        batch_op.drop_column('review_notified_at')
+        batch_op.drop_column('retention_expires_at')
@@ -0,0 +1,39 @@
+"""review annotations as per-page overlays
+
+Revision ID: f2a8c6e1d594
+Revises: e19c6a4d7b83
+Create Date: 2026-10-19 22:14:52.310847
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8c6e1d594'
+down_revision: Union[str, None] = 'e19c6a4d7b83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('review_annotations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('attachment_id', sa.Integer(), nullable=False),
+    sa.Column('page_number', sa.Integer(), nullable=False),
+    sa.Column('shapes', sa.JSON(), nullable=False),
+    sa.Column('updated_by_id', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['attachment_id'], ['ticket_attachments.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['updated_by_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('attachment_id', 'page_number', name='uq_review_annotations_attachment_page')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('review_annotations')
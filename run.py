@@ -15,6 +15,10 @@ import os
 from dotenv import load_dotenv
 import waitress
 from app import create_app
+from app.services.mail_delivery import mail_dispatcher
+from app.document_control.visual_diff import sweep_revision_diffs
+from app.services.ticket_pipeline import sweep_pipeline
+from app.services.ticket_sla import sla_scanner
 
 def main() -> None:
     """
@@ -26,18 +30,31 @@ def main() -> None:
     # Create the Flask app instance using the app factory
     app = create_app()
 
+    # Deliver mail left in the outbox by a previous run (and by cron scripts).
+    mail_dispatcher.start()
+    # Flag SLA breaches here, so their live events reach this server's streams.
+    sla_scanner.start()
+    # Resume ticket processing steps whose retry timers died with the last run,
+    # and revision diffs that were queued or running when it stopped.
+    with app.app_context():
+        sweep_pipeline()
+        sweep_revision_diffs()
+
     # --- DEBUG: Force host to 0.0.0.0 ---
     host = "0.0.0.0"
     port = int(os.getenv("PORT", 5000))
     threads = int(os.getenv("W_THREADS", 4))
+    # Live-update streams each hold a thread; give them their own on top.
+    stream_threads = app.config["SSE_MAX_STREAMS"]
     
     # Get the application environment
     environment = os.getenv('FLASK_ENV', 'development')
 
     print(f"Starting server in {environment} mode.")
     
-    print(f"Serving on http://{host}:{port} with {threads} threads.")
-    waitress.serve(app, host=host, port=port, threads=threads)
+    print(f"Serving on http://{host}:{port} with {threads} threads "
+          f"(+{stream_threads} for live-update streams).")
+    waitress.serve(app, host=host, port=port, threads=threads + stream_threads)
 
 if __name__ == "__main__":
     main()
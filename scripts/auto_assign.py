@@ -0,0 +1,26 @@
+# scripts/auto_assign.py
+# python scripts\auto_assign.py [--dry-run] [--limit N]
+# Schedule every few minutes (cron / Task Scheduler) to assign Pending tickets to drafters.
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.services.assignment_scheduler import assign_pending
+from app.services.mail_delivery import mail_dispatcher
+
+app = create_app()
+app.config["MAIL_WORKERS"] = 0  # deliver before exiting, not from daemon threads
+
+if __name__ == '__main__':
+    dry_run = '--dry-run' in sys.argv
+    limit = int(sys.argv[sys.argv.index('--limit') + 1]) if '--limit' in sys.argv else None
+    with app.app_context():
+        assignments = assign_pending(limit=limit, dry_run=dry_run)
+        for a in assignments:
+            print(f"[*] {a['ticket_number']} (P{a['priority']}, {a['unit'] or '-'}) -> "
+                  f"{a['drafter']} ({a['drafter_open']} open)")
+        verb = "Would assign" if dry_run else "Assigned"
+        print(f"[*] {verb} {len(assignments)} tickets.")
+        print(f"[*] Emails sent: {mail_dispatcher.deliver_pending()}")
@@ -0,0 +1,21 @@
+# scripts/provision_user_homes.py
+# python scripts\provision_user_homes.py
+# One-off: create drive home folders for users that predate provisioning at creation.
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.services.file_manager import provision_user_home
+
+app = create_app()
+
+if __name__ == '__main__':
+    with app.app_context():
+        user_ids = db.session.execute(db.select(User.id)).scalars().all()
+        for user_id in user_ids:
+            provision_user_home(user_id)
+        print(f"[*] Home folders present for {len(user_ids)} users.")
@@ -0,0 +1,19 @@
+# scripts/rebuild_search_index.py
+# python scripts\rebuild_search_index.py
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.document_control.search import rebuild_document_index
+from app.services.ticket_search import rebuild_ticket_index
+
+app = create_app()
+
+if __name__ == '__main__':
+    with app.app_context():
+        count = rebuild_document_index()
+        print(f"[*] Indexed {count} document masters.")
+        count = rebuild_ticket_index()
+        print(f"[*] Indexed {count} drafting tickets.")
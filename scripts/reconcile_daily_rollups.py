@@ -0,0 +1,20 @@
+# scripts/reconcile_daily_rollups.py
+# python scripts\reconcile_daily_rollups.py [days]
+# Schedule nightly (cron / Task Scheduler) to correct analytics rollup drift in
+# recent days; run without a window after bulk imports or raw SQL changes.
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.services.ticket_rollups import reconcile_daily_rollups
+
+app = create_app()
+
+if __name__ == '__main__':
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    with app.app_context():
+        corrected = reconcile_daily_rollups(days)
+        window = f"last {days} days" if days else "all history"
+        print(f"[*] Daily rollup rows corrected ({window}): {corrected}")
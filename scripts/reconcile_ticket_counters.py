@@ -0,0 +1,17 @@
+# scripts/reconcile_ticket_counters.py
+# python scripts\reconcile_ticket_counters.py
+# Schedule nightly (cron / Task Scheduler) to correct dashboard counter drift.
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.services.ticket_counters import reconcile_ticket_counters
+
+app = create_app()
+
+if __name__ == '__main__':
+    with app.app_context():
+        corrected = reconcile_ticket_counters()
+        print(f"[*] Ticket counters corrected: {corrected}")
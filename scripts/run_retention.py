@@ -0,0 +1,24 @@
+# scripts/run_retention.py
+# python scripts\run_retention.py [--backfill]
+# Schedule daily (cron / Task Scheduler) to send review notices and apply retention.
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.document_control.retention import run_retention_cycle, backfill_retention_expiry
+from app.services.mail_delivery import mail_dispatcher
+
+app = create_app()
+app.config["MAIL_WORKERS"] = 0  # deliver before exiting, not from daemon threads
+
+if __name__ == '__main__':
+    with app.app_context():
+        if '--backfill' in sys.argv:
+            count = backfill_retention_expiry()
+            print(f"[*] Computed retention expiry for {count} document masters.")
+        summary = run_retention_cycle()
+        print(f"[*] Review notices: {summary['review_notices']}, "
+              f"retired: {summary['retired']}, files archived: {summary['files_archived']}")
+        print(f"[*] Emails sent: {mail_dispatcher.deliver_pending()}")
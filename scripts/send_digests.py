@@ -0,0 +1,21 @@
+# scripts/send_digests.py
+# python scripts\send_digests.py
+# Schedule every 5-15 minutes (cron / Task Scheduler) to send due hourly and daily digests.
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.notifications.digest import send_due_digests
+from app.services.mail_delivery import mail_dispatcher
+
+app = create_app()
+app.config["MAIL_WORKERS"] = 0  # deliver before exiting, not from daemon threads
+
+if __name__ == '__main__':
+    with app.app_context():
+        summary = send_due_digests()
+        print(f"[*] Digests queued: {summary['digests']} "
+              f"({summary['notifications']} notifications)")
+        print(f"[*] Emails sent: {mail_dispatcher.deliver_pending()}")
@@ -0,0 +1,29 @@
+# scripts/sweep_pipeline.py
+# python scripts\sweep_pipeline.py
+# Schedule every few minutes (cron / Task Scheduler) to resume ticket processing
+# steps whose worker died or whose retry timer was lost in a restart, and
+# revision diffs left pending or abandoned mid-run.
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import create_app
+from app.document_control.visual_diff import sweep_revision_diffs
+from app.services.mail_delivery import mail_dispatcher
+from app.services.ticket_pipeline import sweep_pipeline
+
+app = create_app()
+app.config["MAIL_WORKERS"] = 0  # deliver before exiting, not from daemon threads
+
+if __name__ == '__main__':
+    with app.app_context():
+        # Without a Celery broker, in-process jobs would die with this script.
+        inline = not app.config.get("CELERY_BROKER_URL")
+        tickets = sweep_pipeline(inline=inline)
+        print(f"[*] Tickets with due processing steps: {tickets}"
+              f"{' (processed here)' if inline else ' (queued)'}")
+        diffs = sweep_revision_diffs(inline=inline)
+        print(f"[*] Revision diffs pending or abandoned: {diffs}"
+              f"{' (processed here)' if inline else ' (queued)'}")
+        print(f"[*] Emails sent: {mail_dispatcher.deliver_pending()}")
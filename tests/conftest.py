@@ -0,0 +1,91 @@
+# tests/conftest.py
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app import create_app
+from app.extensions import db
+from app.models.enums import Role
+from app.models.ticket import DraftingTicket
+from app.models.user import User
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    """Create a Flask app bound to an in-memory SQLite database."""
+    monkeypatch.setenv("FLASK_ENV", "testing")
+    app = create_app()
+    app.config["USER_HOME_ROOT"] = str(tmp_path / "users")
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """A test client for the app."""
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    """Factory creating a persisted user with the given role."""
+    def _make_user(username, role="viewer", password="secret"):
+        u = User(
+            username=username,
+            actual_name=username.title(),
+            email=f"{username}@example.com",
+            role=Role(role),
+        )
+        u.set_password(password)
+        db.session.add(u)
+        db.session.commit()
+        return u
+    return _make_user
+
+
+@pytest.fixture
+def people(make_user):
+    """The usual cast: a review engineer, a drafter, an admin and a requester."""
+    return SimpleNamespace(
+        engineer=make_user("engineer1", role="engineer"),
+        drafter=make_user("drafter1", role="drafter"),
+        admin=make_user("admin1", role="admin"),
+        requester=make_user("requester1"),
+    )
+
+
+@pytest.fixture
+def make_ticket(people):
+    """
+    Factory committing a Pending ticket reviewed by ``people.engineer``;
+    ``days_ago`` backdates created_at, other keywords set ticket fields.
+    """
+    def _make_ticket(number, days_ago=0, **fields):
+        fields = {"description": "Reroute", "request_type": "iso", "status": "Pending",
+                  "review_engineer_id": people.engineer.id, **fields}
+        if days_ago:
+            fields["created_at"] = datetime.utcnow() - timedelta(days=days_ago)
+        ticket = DraftingTicket(ticket_number=number, **fields)
+        db.session.add(ticket)
+        db.session.commit()
+        return ticket
+    return _make_ticket
+
+
+@pytest.fixture
+def login(client):
+    """Log a user in on the shared test client."""
+    def _login(user, password="secret"):
+        resp = client.post(
+            "/auth/login",
+            data={"username": user.username, "password": password},
+            follow_redirects=False,
+        )
+        assert resp.status_code == 302
+        return client
+    return _login
@@ -0,0 +1,69 @@
+# tests/test_archive_browser.py
+
+import os
+
+import pytest
+
+from app.services.archive_index import archive_index
+
+
+@pytest.fixture
+def archive(app, tmp_path):
+    """A ticket archive under a temporary app root."""
+    app.root_path = str(tmp_path)
+    base = tmp_path / "static" / "drafting_tickets" / "26DDDC001"
+    for folder in ("drafting", "revisions/rev1", "review"):
+        (base / folder).mkdir(parents=True)
+    (base / "drafting" / "iso.dwg").write_bytes(b"x" * 10)
+    (base / "revisions" / "rev1" / "iso.pdf").write_bytes(b"x" * 20)
+    return base
+
+
+@pytest.fixture
+def browser(client, login, make_user, archive):
+    login(make_user("drafter1", role="drafter"))
+    return client
+
+
+def _names(nodes):
+    return [n["name"] for n in nodes]
+
+
+def test_single_level_listing_is_unchanged(browser):
+    entries = browser.get("/drafting/archive/26DDDC001").get_json()
+    assert _names(entries) == ["drafting", "review", "revisions"]
+    assert all(e["type"] == "directory" and "children" not in e for e in entries)
+
+    files = browser.get("/drafting/archive/26DDDC001/drafting").get_json()
+    assert files[0]["path"] == "drafting/iso.dwg" and files[0]["size"] == 10
+
+
+def test_depth_returns_subtree(browser):
+    entries = browser.get("/drafting/archive/26DDDC001?depth=1").get_json()
+    revisions = entries[2]
+    assert _names(revisions["children"]) == ["rev1"]
+    assert "children" not in revisions["children"][0]  # depth limit
+
+    rev1 = browser.get("/drafting/archive/26DDDC001?depth=9").get_json()[2]["children"][0]
+    pdf = rev1["children"][0]
+    assert (pdf["path"], pdf["type"], pdf["size"]) == ("revisions/rev1/iso.pdf", "file", 20)
+
+
+def test_listing_cache_follows_directory_mtime(browser, archive):
+    browser.get("/drafting/archive/26DDDC001?depth=3")
+    misses = archive_index.misses
+    browser.get("/drafting/archive/26DDDC001?depth=3")
+    assert archive_index.misses == misses
+
+    (archive / "review" / "markup.pdf").write_bytes(b"pdf")
+    review = archive / "review"
+    st = review.stat()
+    os.utime(review, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))  # coarse-mtime filesystems
+    entries = browser.get("/drafting/archive/26DDDC001/review").get_json()
+    assert _names(entries) == ["markup.pdf"]
+    assert archive_index.misses == misses + 1
+
+
+def test_rejects_paths_outside_ticket(browser):
+    assert browser.get("/drafting/archive/26DDDC001/../../..").status_code == 400
+    assert browser.get("/drafting/archive/26DDDC001/drafting/iso.dwg").status_code == 400
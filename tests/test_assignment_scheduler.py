@@ -0,0 +1,113 @@
+# tests/test_assignment_scheduler.py
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models.outbound_email import OutboundEmail
+from app.models.ticket import DraftingTicket
+from app.services.assignment_scheduler import scheduler, plan, assign_pending
+
+
+@pytest.fixture
+def drafters(people, make_user):
+    return people.drafter, make_user("drafter2", role="drafter")
+
+
+def _numbers(entries):
+    return [e["ticket_number"] for e in entries]
+
+
+def test_queue_orders_by_priority_due_date_and_age(app, make_ticket):
+    soon = datetime.utcnow() + timedelta(days=1)
+    make_ticket("26DDDC001", priority=3)
+    make_ticket("26DDDC002", priority=1)
+    make_ticket("26DDDC003", priority=3, due_date=soon)
+    make_ticket("26DDDC004", priority=3, due_date=soon + timedelta(days=1))
+    assert _numbers(scheduler.queued()) == ["26DDDC002", "26DDDC003", "26DDDC004", "26DDDC001"]
+
+
+def test_queue_follows_committed_changes(app, make_ticket, drafters):
+    first = make_ticket("26DDDC001")
+    second = make_ticket("26DDDC002")
+    assert len(scheduler.queued()) == 2  # loaded; maintained incrementally from here
+
+    make_ticket("26DDDC003", priority=1)
+    second.priority = 2
+    first.assigned_to_id = drafters[0].id
+    first.status = "In Progress"
+    db.session.commit()
+    assert _numbers(scheduler.queued()) == ["26DDDC003", "26DDDC002"]
+
+    second.priority = 6
+    db.session.flush()
+    db.session.rollback()
+    assert _numbers(scheduler.queued()) == ["26DDDC003", "26DDDC002"]
+
+
+def test_plan_balances_load_and_prefers_unit_experience(app, make_ticket, drafters):
+    drafter1, drafter2 = drafters
+    make_ticket("26DDDA000", unit="U-100", status="In Progress", assigned_to_id=drafter1.id)
+    for n in range(1, 4):
+        make_ticket(f"26DDDA00{n}", unit="U-100", status="Completed", assigned_to_id=drafter1.id)
+    make_ticket("26DDDB001", unit="U-200", status="Completed", assigned_to_id=drafter2.id)
+    make_ticket("26DDDC001", priority=1, unit="U-100")
+    make_ticket("26DDDC002", priority=2, unit="U-300")
+
+    proposals = plan()
+    # Four U-100 tickets outweigh drafter1's open one; U-300 is new to both.
+    assert [(p["ticket_number"], p["drafter_id"]) for p in proposals] == [
+        ("26DDDC001", drafter1.id),
+        ("26DDDC002", drafter2.id),
+    ]
+    assert proposals[0]["unit_experience"] == 4
+
+
+def test_plan_respects_max_open(app, make_ticket, drafters):
+    app.config["ASSIGN_MAX_OPEN"] = 1
+    make_ticket("26DDDC001")
+    make_ticket("26DDDC002")
+    make_ticket("26DDDC003")
+    assert len(plan()) == 2
+    assert {p["drafter_id"] for p in plan()} == {d.id for d in drafters}
+
+
+def test_dry_run_changes_nothing(app, make_ticket):
+    make_ticket("26DDDC001")
+    assert len(assign_pending(dry_run=True)) == 1
+    assert DraftingTicket.query.one().assigned_to_id is None
+    assert OutboundEmail.query.count() == 0
+
+
+def test_assign_pending_assigns_and_notifies(app, make_ticket, drafters):
+    make_ticket("26DDDC001")
+    taken = make_ticket("26DDDC002")
+    proposals = plan()
+    assert len(proposals) == 2
+
+    # Another worker assigns one ticket after the plan was made.
+    DraftingTicket.query.filter_by(id=taken.id).update({"assigned_to_id": drafters[1].id})
+    db.session.commit()
+    assigned = assign_pending()
+    assert _numbers(assigned) == ["26DDDC001"]
+    ticket = DraftingTicket.query.filter_by(ticket_number="26DDDC001").one()
+    assert ticket.status == "In Progress" and ticket.assigned_to_id == assigned[0]["drafter_id"]
+    assert OutboundEmail.query.count() == 1
+    # The skipped ticket's stale queue entry was dropped too.
+    assert scheduler.queued() == []
+
+
+def test_assignment_routes_are_admin_only(client, login, people, make_ticket):
+    make_ticket("26DDDC001")
+    login(people.drafter)
+    assert client.get("/drafting/admin/assignments").status_code == 403
+    client.get("/auth/logout")
+
+    login(people.admin)
+    resp = client.get("/drafting/admin/assignments?limit=5")
+    assert resp.get_json()["dry_run"] is True
+    assert _numbers(resp.get_json()["assignments"]) == ["26DDDC001"]
+    assert client.post("/drafting/admin/assignments", json={"limit": "x"}).status_code == 400
+    resp = client.post("/drafting/admin/assignments", json={})
+    assert _numbers(resp.get_json()["assignments"]) == ["26DDDC001"]
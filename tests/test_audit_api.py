@@ -0,0 +1,87 @@
+# tests/test_audit_api.py
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.extensions import db
+from app.document_control.models import AuditLog
+
+
+@pytest.fixture
+def audit_rows(app, make_user):
+    """Seed audit rows for two users and two documents."""
+    alice = make_user("alice", role="admin")
+    bob = make_user("bob", role="drafter")
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(30):
+        db.session.add(AuditLog(
+            user_id=alice.id if i % 2 else bob.id,
+            action="checkout" if i % 3 else "checkin",
+            entity_type="DocumentRevision",
+            entity_id="doc-a" if i < 20 else "doc-b",
+            timestamp=base + timedelta(hours=i),
+            details=json.dumps({"n": i}),
+        ))
+    db.session.commit()
+    return alice, bob
+
+
+def test_search_requires_audit_role(client, login, audit_rows):
+    _, bob = audit_rows
+    login(bob)
+    assert client.get("/api/audit").status_code == 403
+
+
+def test_search_filters_and_keyset_pages(client, login, audit_rows):
+    alice, _ = audit_rows
+    login(alice)
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/api/audit?entity_type=DocumentRevision&entity_id=doc-a&limit=7"
+        if cursor:
+            url += f"&cursor={cursor}"
+        payload = client.get(url).get_json()
+        seen.extend(e["details"]["n"] for e in payload["entries"])
+        cursor = payload["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == list(range(19, -1, -1))
+
+
+def test_search_by_user_and_time_range(client, login, audit_rows):
+    alice, _ = audit_rows
+    login(alice)
+    resp = client.get(
+        f"/api/audit?user_id={alice.id}"
+        "&since=2026-01-01T10:00:00Z&until=2026-01-01T20:00:00Z"
+    )
+    numbers = [e["details"]["n"] for e in resp.get_json()["entries"]]
+    assert numbers == [19, 17, 15, 13, 11]
+
+
+def test_search_rejects_bad_filters(client, login, audit_rows):
+    alice, _ = audit_rows
+    login(alice)
+    assert client.get("/api/audit?since=yesterday").status_code == 400
+    assert client.get("/api/audit?entity_id=doc-a").status_code == 400
+    assert client.get("/api/audit?cursor=garbage").status_code == 400
+
+
+def test_export_streams_ndjson_and_csv(client, login, audit_rows):
+    alice, _ = audit_rows
+    login(alice)
+
+    resp = client.get("/api/audit/export?entity_type=DocumentRevision&entity_id=doc-b")
+    assert resp.mimetype == "application/x-ndjson"
+    lines = resp.get_data(as_text=True).splitlines()
+    assert [json.loads(l)["details"]["n"] for l in lines] == list(range(29, 19, -1))
+
+    resp = client.get("/api/audit/export?format=csv&action=checkin")
+    rows = resp.get_data(as_text=True).splitlines()
+    assert rows[0].startswith("id,timestamp,user_id,username,action")
+    assert len(rows) == 1 + 10
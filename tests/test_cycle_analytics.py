@@ -0,0 +1,68 @@
+# tests/test_cycle_analytics.py
+
+import pytest
+
+from app.extensions import db
+from app.models.ticket_status_transition import TicketStatusTransition
+from app.services.cycle_analytics import (
+    summarize, compute_cycle_metrics, cycle_metrics, clear_cache
+)
+from app.services.ticket_events import record_event, APPROVED, REVISION_REQUESTED
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def _stretch(ticket, from_status, hours):
+    db.session.add(TicketStatusTransition(ticket_id=ticket.id, from_status=from_status,
+                                          to_status="x", seconds_in_previous=int(hours * 3600)))
+
+
+def test_summarize_matches_linear_percentiles():
+    assert summarize([]) == {"count": 0, "mean": None, "p50": None, "p90": None}
+    assert summarize([4, 1, 3, 2]) == {"count": 4, "mean": 2.5, "p50": 2.5, "p90": 3.7}
+    assert summarize([7200], scale=3600)["p50"] == 2.0
+
+
+def test_cycle_metrics(app, people, make_ticket):
+    engineer = people.engineer
+    fast, slow = (make_ticket(n, status="Completed") for n in ("26DDDC001", "26DDDC002"))
+    for ticket, assign_h, review_h in ((fast, 2, 1), (slow, 10, 5)):
+        _stretch(ticket, "Pending", assign_h)
+        _stretch(ticket, "In-Review", review_h)
+    _stretch(slow, "In-Review", 3)  # second review round
+    record_event(fast, APPROVED, engineer.id)
+    record_event(slow, REVISION_REQUESTED, engineer.id)
+    record_event(slow, APPROVED, engineer.id)
+    db.session.commit()
+    make_ticket("26DDDC003", days_ago=40)
+    make_ticket("26DDDC004", days_ago=3)
+
+    app.config["CYCLE_ANALYTICS_BATCH"] = 1  # exercise batching
+    metrics = compute_cycle_metrics(days=28)
+    assert metrics["time_to_assign_hours"] == {"count": 2, "mean": 6.0, "p50": 6.0, "p90": 9.2}
+    assert metrics["time_in_review_hours"]["p50"] == 4.5  # 1h and 5h + 3h
+    assert metrics["revision_loops"]["distribution"] == {"0": 1, "1": 1}
+    assert metrics["revision_loops"]["max"] == 1
+
+    weeks = metrics["weekly_throughput"]
+    assert len(weeks) in (5, 6) and weeks[-1]["completed"] == 2
+    assert sum(w["completed"] for w in weeks) == 2
+    assert metrics["backlog"]["open"] == 2
+    assert metrics["backlog"]["buckets"] == {"<7d": 1, "7-30d": 0, "30-90d": 1, ">90d": 0}
+
+
+def test_results_are_cached(client, login, people, make_ticket):
+    cached = cycle_metrics(days=30)
+    make_ticket("26DDDC001")
+    assert cycle_metrics(days=30) is cached
+    clear_cache()
+    assert cycle_metrics(days=30)["backlog"]["open"] == 1
+
+    login(people.drafter)
+    data = client.get("/analytics/cycle?days=30").get_json()
+    assert data["days"] == 30 and data["backlog"]["open"] == 1
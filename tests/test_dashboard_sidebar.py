@@ -0,0 +1,72 @@
+# tests/test_dashboard_sidebar.py
+
+from pathlib import Path
+
+import pytest
+from flask import template_rendered
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.user import User
+from app.services.archive_index import archive_index
+from app.services.storage_adapter import LocalFSAdapter
+
+
+@pytest.fixture
+def rendered(app):
+    """Template contexts rendered during the test."""
+    contexts = []
+
+    def record(sender, template, context, **extra):
+        contexts.append(context)
+
+    template_rendered.connect(record, app)
+    yield contexts
+    template_rendered.disconnect(record, app)
+
+
+def test_home_folder_created_with_user(app, make_user):
+    user = make_user("drafter1", role="drafter")
+    assert (Path(app.config["USER_HOME_ROOT"]) / str(user.id)).is_dir()
+
+    ghost = User(username="ghost", actual_name="Ghost", email="ghost@example.com")
+    ghost.set_password("secret")
+    db.session.add(ghost)
+    db.session.flush()
+    ghost_id = ghost.id
+    db.session.rollback()
+    assert not (Path(app.config["USER_HOME_ROOT"]) / str(ghost_id)).exists()
+
+
+def test_drafter_dashboard_reads_archive_from_db(client, login, make_user, rendered):
+    engineer, drafter = make_user("engineer1", role="engineer"), make_user("drafter1", role="drafter")
+    for number in ("26DDDC002", "26DDDC001"):
+        db.session.add(DraftingTicket(ticket_number=number, description="Reroute",
+                                      request_type="iso", status="Pending",
+                                      review_engineer_id=engineer.id))
+    db.session.commit()
+
+    login(drafter)
+    assert client.get("/").status_code == 200
+    context = rendered[-1]
+    assert context["archive_tickets"] == ["26DDDC001", "26DDDC002"]
+    assert context["folder_list"][0] == f"users/{drafter.id}"
+    assert not {"js", "css", "img", "users"} & set(context["folder_list"])
+
+    client.get("/auth/logout")
+    login(engineer)
+    client.get("/")
+    assert rendered[-1]["archive_tickets"] == ["26DDDC001", "26DDDC002"]
+
+
+def test_storage_writes_invalidate_cached_listing(app, tmp_path):
+    root = tmp_path / "media"
+    adapter = LocalFSAdapter(root)
+    assert archive_index.listing(str(adapter.base_path)) == []
+
+    adapter.make_directory("", "drawings")
+    assert [e.name for e in archive_index.listing(str(adapter.base_path))] == ["drawings"]
+    adapter.rename("drawings", "isos")
+    assert [e.name for e in archive_index.listing(str(adapter.base_path))] == ["isos"]
+    adapter.delete("isos")
+    assert archive_index.listing(str(adapter.base_path)) == []
@@ -0,0 +1,86 @@
+# tests/test_data_export.py
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.document_control.models import DocumentMaster, DocumentRevision
+from app.extensions import db
+from app.models.ticket_attachment import TicketAttachment
+from app.services import streaming_export
+
+
+@pytest.fixture
+def tickets(make_ticket):
+    return [make_ticket(f"26DDDC00{n}", days_ago=days_ago, unit=unit, pipe_spec="A1A",
+                        description="Reroute, line 4\n")
+            for n, (unit, days_ago) in enumerate((("U100", 10), ("U200", 2), ("U100", 1)), start=1)]
+
+
+def _ndjson(resp):
+    return [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+
+
+def test_ticket_export_csv_and_ndjson(client, login, people, tickets, monkeypatch):
+    login(people.admin)
+    monkeypatch.setattr(streaming_export, "CHUNK_ROWS", 1)
+    resp = client.get("/analytics/export/tickets")
+    assert resp.mimetype == "text/csv" and resp.is_streamed
+    assert "attachment; filename=tickets_" in resp.headers["Content-Disposition"]
+    rows = list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+    assert [r["ticket_number"] for r in rows] == ["26DDDC001", "26DDDC002", "26DDDC003"]
+    assert rows[0]["description"] == "Reroute, line 4\n"
+    assert rows[0]["pipe_spec"] == "A1A" and rows[0]["review_engineer"] == "engineer1"
+    assert rows[0]["assigned_to"] == ""
+
+    resp = client.get("/analytics/export/tickets?format=ndjson&columns=ticket_number,unit"
+                      "&unit=U100&since=" + (datetime.utcnow() - timedelta(days=5)).isoformat())
+    assert resp.mimetype == "application/x-ndjson"
+    assert _ndjson(resp) == [{"ticket_number": "26DDDC003", "unit": "U100"}]
+
+
+def test_attachment_and_document_exports(client, login, people, tickets):
+    engineer, admin = people.engineer, people.admin
+    db.session.add_all([
+        TicketAttachment(ticket_id=tickets[0].id, file_path="a/1.pdf", filename="1.pdf",
+                         category="request", uploaded_by_id=engineer.id, is_latest=False),
+        TicketAttachment(ticket_id=tickets[1].id, file_path="a/2.pdf", filename="2.pdf",
+                         category="request", is_latest=True),
+    ])
+    master = DocumentMaster(document_number="6300-P-001", title="Sheet 1", unit="6300",
+                            sheet_number="1")
+    db.session.add(master)
+    db.session.flush()
+    db.session.add(DocumentRevision(master_id=master.id, file_key="d/1.pdf", checksum="x",
+                                    file_size=8, uploaded_by_id=admin.id))
+    db.session.commit()
+    login(admin)
+
+    rows = _ndjson(client.get("/analytics/export/attachments?format=ndjson&is_latest=false"
+                              "&columns=ticket_number,filename,uploaded_by"))
+    assert rows == [{"ticket_number": "26DDDC001", "filename": "1.pdf", "uploaded_by": "engineer1"}]
+
+    docs = _ndjson(client.get("/analytics/export/documents?format=ndjson&status=Draft"))
+    assert docs[0]["document_number"] == "6300-P-001" and docs[0]["status"] == "Draft"
+    assert docs[0]["id"] == str(master.id)
+    revisions = _ndjson(client.get("/analytics/export/document_revisions?format=ndjson"
+                                   "&columns=document_number,revision_code,uploaded_by"))
+    assert revisions == [{"document_number": "6300-P-001", "revision_code": "A", "uploaded_by": "admin1"}]
+
+
+def test_export_rejects_bad_requests(client, login, people, tickets):
+    engineer, admin = people.engineer, people.admin
+    login(admin)
+    assert client.get("/analytics/export/users").status_code == 404
+    assert client.get("/analytics/export/tickets?format=xlsx").status_code == 400
+    resp = client.get("/analytics/export/tickets?columns=ticket_number,password_hash")
+    assert resp.status_code == 400 and "password_hash" in resp.get_json()["error"]
+    assert client.get("/analytics/export/tickets?priority=high").status_code == 400
+    assert client.get("/analytics/export/documents?status=Approved").status_code == 400
+    client.get("/auth/logout")
+
+    login(engineer)
+    assert client.get("/analytics/export/tickets").status_code == 403
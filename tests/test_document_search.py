@@ -0,0 +1,64 @@
+# tests/test_document_search.py
+
+
+import pytest
+
+from app.extensions import db
+from app.document_control.models import DocumentMaster, DocumentSearchTrigram
+from app.document_control.search import rebuild_document_index
+
+
+def _master(number, title, unit="U1", **extra):
+    m = DocumentMaster(document_number=number, title=title, unit=unit,
+                       sheet_number="1", **extra)
+    db.session.add(m)
+    return m
+
+
+@pytest.fixture
+def documents(app):
+    _master("6300-E-1", "Crude Charge Pump Layout", unit="6300", discipline="Electrical")
+    _master("6300-E-12", "Crude Heater Single Line", unit="6300")
+    _master("6300-M-4", "Charge Pump Piping Iso", unit="6300",
+            responsible_engineer="Dana Whitfield")
+    _master("7100-P-9", "Flare Header Plan", unit="7100")
+    db.session.commit()
+
+
+def _numbers(client, q):
+    resp = client.get(f"/api/documents/search?q={q}")
+    assert resp.status_code == 200
+    return [r["document_number"] for r in resp.get_json()["results"]]
+
+
+def test_partial_document_number_ranks_prefix_first(client, login, make_user, documents):
+    login(make_user("searcher"))
+    assert _numbers(client, "6300-E-1")[:2] == ["6300-E-1", "6300-E-12"]
+    assert _numbers(client, "6300e")[:2] == ["6300-E-1", "6300-E-12"]
+
+
+def test_title_and_engineer_words(client, login, make_user, documents):
+    login(make_user("searcher"))
+    assert set(_numbers(client, "charge pum")) == {"6300-E-1", "6300-M-4"}
+    assert _numbers(client, "whitf") == ["6300-M-4"]
+
+
+def test_index_follows_updates_and_deletes(client, login, make_user, documents):
+    login(make_user("searcher"))
+    flare = DocumentMaster.query.filter_by(document_number="7100-P-9").one()
+    flare.title = "Relief Header Plan"
+    db.session.commit()
+    assert _numbers(client, "flare") == []
+    assert _numbers(client, "relief") == ["7100-P-9"]
+
+    db.session.delete(flare)
+    db.session.commit()
+    assert _numbers(client, "relief") == []
+    assert DocumentSearchTrigram.query.filter_by(master_id=flare.id).count() == 0
+
+
+def test_rebuild_matches_incremental_index(app, documents):
+    before = {(t.trigram, t.master_id, t.weight) for t in DocumentSearchTrigram.query}
+    assert rebuild_document_index(batch_size=3) == 4
+    after = {(t.trigram, t.master_id, t.weight) for t in DocumentSearchTrigram.query}
+    assert before == after
@@ -0,0 +1,162 @@
+# tests/test_live_events.py
+
+import json
+
+import pytest
+
+from app.extensions import db
+from app.models.review_comment import ReviewComment
+from app.models.ticket import DraftingTicket
+from app.services.event_bus import event_bus
+
+
+@pytest.fixture
+def subscribe(app):
+    subs = []
+
+    def _subscribe(user, role=None):
+        sub = event_bus.subscribe(user.id, role or user.role.value)
+        subs.append(sub)
+        return sub
+    yield _subscribe
+    for sub in subs:
+        sub.close()
+
+
+def _drain(sub):
+    messages = []
+    while (message := sub.get(timeout=0)) is not None:
+        messages.append(message)
+    return messages
+
+
+@pytest.fixture
+def ticket(make_user):
+    engineer = make_user("engineer1", role="engineer")
+    requester = make_user("requester1")
+    ticket = DraftingTicket(ticket_number="26DDDC001", description="Reroute", request_type="iso",
+                            status="Pending", review_engineer_id=engineer.id,
+                            submitted_by_id=requester.id)
+    db.session.add(ticket)
+    db.session.commit()
+    return ticket
+
+
+def test_bus_addresses_users_roles_and_broadcasts(make_user, subscribe):
+    drafter, admin = make_user("drafter1", role="drafter"), make_user("boss", role="admin")
+    drafter_sub, admin_sub = subscribe(drafter), subscribe(admin)
+
+    event_bus.publish("ticket.updated", {"n": 1}, user_ids=[drafter.id])
+    event_bus.publish("ticket.updated", {"n": 2}, user_ids=[], roles=["admin"])
+    event_bus.publish("checkout.changed", {"n": 3})
+
+    assert [m["data"]["n"] for m in _drain(drafter_sub)] == [1, 3]
+    assert [m["data"]["n"] for m in _drain(admin_sub)] == [2, 3]
+
+
+def test_slow_subscriber_drops_oldest_and_is_flagged(app, make_user, subscribe):
+    sub = subscribe(make_user("drafter1", role="drafter"))
+    for n in range(event_bus.max_queued + 5):
+        event_bus.publish("checkout.changed", {"n": n})
+    messages = _drain(sub)
+    assert sub.overflowed and len(messages) == event_bus.max_queued
+    assert messages[-1]["data"]["n"] == event_bus.max_queued + 4
+
+
+def test_status_change_published_after_commit_only(make_user, subscribe, ticket):
+    drafter = make_user("drafter1", role="drafter")
+    sub = subscribe(db.session.get(type(drafter), ticket.review_engineer_id))
+    outsider = subscribe(make_user("viewer1"))
+
+    ticket.status = "Revise"
+    db.session.flush()
+    db.session.rollback()
+    assert _drain(sub) == []
+
+    ticket.status = "In Progress"
+    ticket.assigned_to_id = drafter.id
+    db.session.commit()
+    (message,) = _drain(sub)
+    assert message["type"] == "ticket.updated"
+    assert message["data"] == {"ticket_number": "26DDDC001", "status": "In Progress",
+                               "previous_status": "Pending", "assigned_to_id": drafter.id}
+    assert drafter.id in message["user_ids"] and message["roles"] == ["admin"]
+    assert _drain(outsider) == []
+
+
+def test_new_comment_goes_to_others_on_the_ticket(subscribe, ticket):
+    engineer = db.session.get(type(ticket.review_engineer), ticket.review_engineer_id)
+    requester = db.session.get(type(engineer), ticket.submitted_by_id)
+    engineer_sub, requester_sub = subscribe(engineer), subscribe(requester)
+
+    db.session.add(ReviewComment(ticket_id=ticket.id, user_id=engineer.id, message="Check tie-in"))
+    db.session.commit()
+
+    assert _drain(engineer_sub) == []
+    (message,) = _drain(requester_sub)
+    assert message["type"] == "comment.created"
+    assert message["data"]["ticket_number"] == "26DDDC001"
+    assert message["data"]["message"] == "Check tie-in"
+
+
+def test_event_stream_endpoint(app, client, login, ticket):
+    app.config["SSE_HEARTBEAT"] = 1
+    requester = db.session.get(type(ticket.review_engineer), ticket.submitted_by_id)
+    login(requester)
+    resp = client.get("/events", buffered=False)
+    assert resp.mimetype == "text/event-stream"
+    frames = iter(resp.response)
+    assert next(frames).startswith(b"retry: 1000")
+
+    # The view releases the session, so reload the ticket.
+    ticket = db.session.get(DraftingTicket, ticket.id)
+    ticket.status = "Completed"
+    db.session.commit()
+    frame = next(frames).decode()
+    assert "event: ticket.updated" in frame
+    data = json.loads(frame.split("data: ", 1)[1])
+    assert data["status"] == "Completed"
+
+    assert next(frames) == b": keep-alive\n\n"
+    resp.close()
+    assert event_bus.subscriber_count == 0
+
+
+def test_streams_are_capped_per_process(app, client, login, subscribe, make_user):
+    app.config["SSE_MAX_STREAMS"] = 1
+    viewer = make_user("viewer1")
+    subscribe(make_user("drafter1", role="drafter"))
+    login(viewer)
+    resp = client.get("/events")
+    assert resp.status_code == 503 and resp.headers["Retry-After"] == "30"
+    assert event_bus.subscriber_count == 1
+
+
+def test_poll_returns_events_since_cursor(app, client, login, make_user):
+    drafter, viewer = make_user("drafter1", role="drafter"), make_user("viewer1")
+    login(drafter)
+    first = client.get("/events/poll").get_json()
+    assert first["events"] == [] and first["resync"] is False
+
+    event_bus.publish("ticket.updated", {"n": 1}, user_ids=[drafter.id])
+    event_bus.publish("ticket.updated", {"n": 2}, user_ids=[viewer.id])
+    event_bus.publish("checkout.changed", {"n": 3})
+    body = client.get(f"/events/poll?cursor={first['cursor']}").get_json()
+    assert [(e["type"], e["data"]["n"]) for e in body["events"]] == [
+        ("ticket.updated", 1), ("checkout.changed", 3)]
+    assert client.get(f"/events/poll?cursor={body['cursor']}").get_json()["events"] == []
+
+    # Cursors from another process, or older than the backlog, resync.
+    assert client.get("/events/poll?cursor=elsewhere:1").get_json()["resync"] is True
+    app.config["SSE_BACKLOG"] = 2
+    event_bus.init_app(app)
+    for n in range(3):
+        event_bus.publish("checkout.changed", {"n": n})
+    stale = client.get(f"/events/poll?cursor={body['cursor']}").get_json()
+    assert stale["resync"] is True and len(stale["events"]) == 2
+
+
+def test_only_dashboards_open_the_stream(client, login, make_user):
+    login(make_user("engineer1", role="engineer"))
+    assert b"initLiveUpdates" in client.get("/").data
+    assert b"initLiveUpdates" not in client.get("/analytics/").data
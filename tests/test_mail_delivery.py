@@ -0,0 +1,173 @@
+# tests/test_mail_delivery.py
+
+import socketserver
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models.outbound_email import OutboundEmail
+from app.services.email_service import send_email
+from app.services.mail_delivery import mail_dispatcher
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept messages; scripted DATA replies come from server.replies."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply("220 stub ESMTP")
+        rcpts = []
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            verb = line.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250 stub")
+            elif verb in ("MAIL", "RSET", "NOOP"):
+                rcpts = []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                rcpts.append(line.split(":", 1)[1].strip("<> "))
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 go ahead")
+                data = []
+                while (chunk := self.rfile.readline()) != b".\r\n":
+                    data.append(chunk)
+                if server.replies:
+                    self.reply(server.replies.pop(0))
+                else:
+                    server.messages.append((rcpts, b"".join(data)))
+                    self.reply("250 queued")
+            elif verb == "QUIT":
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("502 unsupported")
+
+
+@pytest.fixture
+def smtp_server(app):
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.connections, server.messages, server.replies = 0, [], []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    app.config.update(MAIL_SERVER="127.0.0.1", MAIL_PORT=server.server_address[1],
+                      MAIL_USE_TLS=False, MAIL_USERNAME=None, MAIL_PASSWORD=None,
+                      MAIL_DEFAULT_SENDER="portal@example.com")
+    mail_dispatcher.counters.clear()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_send_email_waits_for_commit(app, smtp_server):
+    send_email("Kept", ["a@example.com"], "body")
+    db.session.commit()
+    send_email("Dropped", ["b@example.com"], "body")
+    db.session.rollback()
+
+    assert mail_dispatcher.deliver_pending() == 1
+    assert [r for r, _ in smtp_server.messages] == [["a@example.com"]]
+
+
+def test_batch_reuses_one_connection(app, smtp_server):
+    for n in range(5):
+        send_email(f"Notice {n}", [f"user{n}@example.com"], "body", cc=["cc@example.com"])
+    db.session.commit()
+
+    assert mail_dispatcher.deliver_pending() == 5
+    assert len(smtp_server.messages) == 5
+    assert smtp_server.connections == 1
+    assert smtp_server.messages[0][0] == ["user0@example.com", "cc@example.com"]
+    assert db.session.query(OutboundEmail).filter_by(status="sent").count() == 5
+
+    metrics = mail_dispatcher.metrics()
+    assert metrics["counters"]["sent"] == 5
+    assert metrics["counters"]["connections_opened"] == 1
+    assert metrics["outbox"] == {"sent": 5}
+
+
+def test_transient_failure_backs_off_then_sends(app, smtp_server):
+    app.config.update(MAIL_RETRY_BASE=60)
+    smtp_server.replies = ["451 try later", "451 try later"]
+    row = send_email("Retry me", ["a@example.com"], "body")
+    db.session.commit()
+
+    before = datetime.utcnow()
+    mail_dispatcher.deliver_pending()
+    row = db.session.get(OutboundEmail, row.id)
+    assert (row.status, row.attempts) == ("queued", 1)
+    assert row.next_attempt_at >= before + timedelta(seconds=60)
+
+    # Second failure doubles the delay.
+    row.next_attempt_at = datetime.utcnow()
+    db.session.commit()
+    before = datetime.utcnow()
+    mail_dispatcher.deliver_pending()
+    row = db.session.get(OutboundEmail, row.id)
+    assert row.attempts == 2 and row.next_attempt_at >= before + timedelta(seconds=120)
+
+    row.next_attempt_at = datetime.utcnow()
+    db.session.commit()
+    mail_dispatcher.deliver_pending()
+    row = db.session.get(OutboundEmail, row.id)
+    assert (row.status, row.attempts) == ("sent", 3)
+    assert len(smtp_server.messages) == 1
+    assert mail_dispatcher.counters["retried"] == 2
+
+
+def test_permanent_failure_is_not_retried(app, smtp_server):
+    smtp_server.replies = ["550 mailbox unavailable"]
+    bad = send_email("Bounce", ["nobody@example.com"], "body")
+    good = send_email("Fine", ["a@example.com"], "body")
+    db.session.commit()
+
+    assert mail_dispatcher.deliver_pending() == 2
+    bad, good = db.session.get(OutboundEmail, bad.id), db.session.get(OutboundEmail, good.id)
+    assert bad.status == "failed" and "550" in bad.last_error
+    assert good.status == "sent"
+
+
+def test_stale_claim_is_reclaimed(app, smtp_server):
+    row = send_email("Stuck", ["a@example.com"], "body")
+    db.session.commit()
+    row.status = "sending"
+    row.claimed_at = datetime.utcnow() - timedelta(hours=1)
+    db.session.commit()
+
+    assert mail_dispatcher.deliver_pending() == 1
+    assert db.session.get(OutboundEmail, row.id).status == "sent"
+
+
+def test_workers_started_at_boot_send_existing_outbox(app, smtp_server):
+    send_email("Left over", ["a@example.com"], "body")
+    db.session.commit()  # MAIL_WORKERS = 0: nothing was woken, as in a cron script
+
+    app.config["MAIL_WORKERS"] = 1
+    mail_dispatcher.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not smtp_server.messages and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        mail_dispatcher.stop()
+    assert [r for r, _ in smtp_server.messages] == [["a@example.com"]]
+    assert mail_dispatcher.metrics()["workers"] == 0
+
+
+def test_mail_metrics_requires_admin(client, make_user, login):
+    login(make_user("viewer"))
+    assert client.get("/analytics/mail-metrics").status_code == 403
+    client.get("/auth/logout")
+    login(make_user("boss", role="admin"))
+    response = client.get("/analytics/mail-metrics")
+    assert response.status_code == 200 and "outbox" in response.get_json()
@@ -0,0 +1,108 @@
+# tests/test_notification_digest.py
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models.enums import NotificationFrequency
+from app.models.outbound_email import OutboundEmail
+from app.models.pending_notification import PendingNotification
+from app.notifications.digest import digest_window_end, send_due_digests
+from app.notifications.dispatch import notify_ticket_assignment, notify_engineer_review
+
+NOW = datetime(2026, 3, 2, 9, 20)
+
+
+@pytest.fixture
+def new_ticket(make_ticket, people):
+    def _make(number):
+        return make_ticket(number, priority=2, unit="Crude", submitted_by_id=people.requester.id)
+    return _make
+
+
+def _set_frequency(user, frequency):
+    user.notification_frequency = NotificationFrequency(frequency)
+    db.session.commit()
+
+
+def _outbox():
+    return db.session.query(OutboundEmail).order_by(OutboundEmail.id).all()
+
+
+def test_digest_windows(app):
+    assert digest_window_end(NotificationFrequency.HOURLY, NOW) == datetime(2026, 3, 2, 10, 0)
+    app.config["DIGEST_DAILY_HOUR"] = 13
+    assert digest_window_end(NotificationFrequency.DAILY, NOW) == datetime(2026, 3, 2, 13, 0)
+    assert digest_window_end(NotificationFrequency.DAILY, NOW.replace(hour=14)) == datetime(2026, 3, 3, 13, 0)
+
+
+def test_immediate_user_gets_one_email_per_notification(app, people, new_ticket):
+    notify_ticket_assignment(new_ticket("26DDDC001"), people.drafter)
+    db.session.commit()
+
+    (email,) = _outbox()
+    assert json.loads(email.recipients) == ["drafter1@example.com"]
+    assert "26DDDC001" in email.subject and "Request Type: iso" in email.body
+    assert db.session.query(PendingNotification).count() == 0
+
+
+def test_hourly_notifications_collapse_into_one_digest(app, people, new_ticket):
+    _set_frequency(people.drafter, "hourly")
+    for n in (1, 2, 3):
+        notify_ticket_assignment(new_ticket(f"26DDDC00{n}"), people.drafter)
+    db.session.commit()
+    assert _outbox() == []
+
+    window_end = db.session.query(PendingNotification.deliver_after).distinct().scalar()
+    assert send_due_digests(now=window_end - timedelta(seconds=1)) == {"digests": 0, "notifications": 0}
+    assert send_due_digests(now=window_end) == {"digests": 1, "notifications": 3}
+
+    (email,) = _outbox()
+    assert email.subject == "[Nexus Digest] 3 notifications on 3 tickets"
+    assert all(f"26DDDC00{n}" in email.body and f"26DDDC00{n}" in email.html for n in (1, 2, 3))
+    assert db.session.query(PendingNotification).count() == 0
+
+
+def test_single_pending_item_is_sent_as_written(app, people, new_ticket):
+    _set_frequency(people.drafter, "daily")
+    notify_ticket_assignment(new_ticket("26DDDC001"), people.drafter)
+    db.session.commit()
+
+    send_due_digests(now=datetime.utcnow() + timedelta(days=1))
+    (email,) = _outbox()
+    assert email.subject == "[Drafting Ticket Assigned] 26DDDC001"
+
+
+def test_mixed_preferences_split_recipients(app, people, new_ticket):
+    _set_frequency(people.requester, "daily")
+    ticket = new_ticket("26DDDC001")
+    notify_engineer_review(ticket, people.engineer)
+    db.session.commit()
+
+    (email,) = _outbox()
+    assert json.loads(email.recipients) == ["engineer1@example.com"] and email.cc is None
+    (held,) = db.session.query(PendingNotification).all()
+    assert (held.user_id, held.category) == (people.requester.id, "review")
+
+
+def test_assign_route_notifies_drafter(client, login, people, new_ticket):
+    ticket = new_ticket("26DDDC001")
+    login(people.admin)
+
+    resp = client.post("/drafting/assign", data={"ticket_id": ticket.id, "drafter_id": people.drafter.id})
+    assert resp.get_json() == {"success": True}
+    assert [json.loads(e.recipients) for e in _outbox()] == [["drafter1@example.com"]]
+
+
+def test_preference_endpoint(client, make_user, login):
+    user = make_user("drafter1", role="drafter")
+    login(user)
+    assert client.get("/auth/notifications").get_json()["frequency"] == "immediate"
+    assert client.post("/auth/notifications", json={"frequency": "weekly"}).status_code == 400
+
+    resp = client.post("/auth/notifications", json={"frequency": "hourly"})
+    assert resp.get_json()["frequency"] == "hourly"
+    db.session.expire_all()
+    assert db.session.get(type(user), user.id).notification_frequency is NotificationFrequency.HOURLY
@@ -0,0 +1,113 @@
+# tests/test_page_tiles.py
+
+import pytest
+from PIL import Image
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.ticket_attachment import TicketAttachment
+from app.services.page_tiles import page_tiles, PageUnrenderable
+
+
+@pytest.fixture
+def tiles(app, tmp_path):
+    app.config["MEDIA_ROOT"] = tmp_path / "media"
+    app.config["PAGE_TILE_CACHE_DIR"] = str(tmp_path / "tiles")
+    app.config["PAGE_TILE_BASE_DIM"] = 300
+    app.config["PAGE_TILE_SIZE"] = 256
+    page_tiles.init_app(app)
+    return page_tiles
+
+
+@pytest.fixture
+def scan(app, tiles, make_user):
+    """A 1200x600 single-page scan in a ticket's review folder."""
+    engineer = make_user("engineer1", role="engineer")
+    ticket = DraftingTicket(ticket_number="26DDDC001", description="Reroute", request_type="iso",
+                            status="In-Review", review_engineer_id=engineer.id)
+    db.session.add(ticket)
+    db.session.flush()
+    key = "drafting_tickets/26DDDC001/review/iso.png"
+    path = app.config["MEDIA_ROOT"] / key
+    path.parent.mkdir(parents=True)
+    Image.new("L", (1200, 600), 255).save(path)
+    db.session.add(TicketAttachment(ticket_id=ticket.id, file_path=key, filename="iso.png",
+                                    category="review"))
+    db.session.commit()
+    return engineer, path
+
+
+def test_levels_are_tiled_and_cached(tiles, scan):
+    _, path = scan
+    manifest = tiles.level(path, 1, 1)  # longest side 600
+    assert (manifest["width"], manifest["height"], manifest["cols"], manifest["rows"]) == (600, 300, 3, 2)
+    edge = tiles.tile_path(path, 1, 1, 2, 1)
+    assert Image.open(edge).size == (600 - 512, 300 - 256)
+
+    renders = tiles.renders
+    assert tiles.level(path, 1, 1) == manifest
+    assert tiles.renders == renders
+
+    with pytest.raises(IndexError):
+        tiles.tile_path(path, 1, 1, 3, 0)
+    with pytest.raises(IndexError):
+        tiles.level(path, 2, 0)
+
+
+def test_cache_keyed_by_checksum_and_evicted_by_size(tiles, scan):
+    _, path = scan
+    tiles.level(path, 1, 0)
+    first = tiles.root / tiles.checksum(path) / "1" / "0"
+    assert first.is_dir()
+
+    Image.new("L", (1200, 600), 0).save(path)  # replaced file -> new key
+    tiles.level(path, 1, 0)
+    assert len(list(tiles.root.iterdir())) == 2
+
+    tiles.max_bytes = 1
+    tiles.evict()
+    assert list(tiles.root.glob("*/*/*/manifest.json")) == []
+
+
+def test_unrenderable_pages_are_remembered(tiles, tmp_path):
+    from PyPDF2 import PdfWriter
+
+    pdf = tmp_path / "vector.pdf"
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    with pdf.open("wb") as f:
+        writer.write(f)
+    with pytest.raises(PageUnrenderable):
+        tiles.level(pdf, 1, 0)
+    renders = tiles.renders
+    with pytest.raises(PageUnrenderable):
+        tiles.level(pdf, 1, 0)
+    assert tiles.renders == renders
+
+
+def test_process_pool_render(tiles, scan):
+    _, path = scan
+    tiles.workers = 1
+    try:
+        assert tiles.level(path, 1, 0)["cols"] == 2
+    finally:
+        tiles.workers = 0
+        tiles._pool.shutdown()
+        tiles._pool = None
+
+
+def test_tile_routes(client, login, make_user, scan):
+    engineer, _ = scan
+    login(engineer)
+    base = "/engineering/ticket/26DDDC001/pages/iso.png"
+    info = client.get(base).get_json()
+    assert info["pages"] == 1 and info["levels"][0] == 300
+    assert client.get(f"{base}/1/0").get_json()["cols"] == 2
+    resp = client.get(f"{base}/1/0/1_0.png")
+    assert resp.status_code == 200 and resp.mimetype == "image/png"
+    assert client.get(f"{base}/1/0/5_5.png").status_code == 404
+    assert client.get(f"{base}/3/0").status_code == 404
+    client.get("/auth/logout")
+
+    login(make_user("engineer2", role="engineer"))
+    assert client.get(f"{base}/1/0/1_0.png").status_code == 403
@@ -0,0 +1,104 @@
+# tests/test_retention.py
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, text
+
+from app.extensions import db
+from app.document_control import retention
+from app.document_control.models import DocumentMaster, DocumentRevision, AuditLog
+
+
+@pytest.fixture
+def storage(app, tmp_path):
+    app.config["MEDIA_ROOT"] = tmp_path / "hot"
+    app.config["COLD_STORAGE_ROOT"] = tmp_path / "cold"
+    return tmp_path
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    outbox = []
+    monkeypatch.setattr(retention, "send_email",
+                        lambda subject, recipients, body: outbox.append((recipients, body)))
+    return outbox
+
+
+def _master(number, **kwargs):
+    master = DocumentMaster(document_number=number, title=f"Sheet {number}",
+                            unit="6300", sheet_number="1", **kwargs)
+    db.session.add(master)
+    return master
+
+
+def test_retention_rules_and_expiry_on_write(app):
+    assert retention.retention_period("permanent") is None
+    assert retention.retention_period("P1Y6M").months == 6
+    master = _master("6300-E-1", retention_rule="7 years",
+                     effective_date=datetime(2020, 3, 1))
+    _master("6300-E-2", retention_rule="Permanent")
+    db.session.commit()
+    assert master.retention_expires_at == datetime(2027, 3, 1)
+
+    master.retention_rule = "18m"
+    db.session.commit()
+    assert master.retention_expires_at == datetime(2021, 9, 1)
+    assert DocumentMaster.query.filter_by(document_number="6300-E-2").one().retention_expires_at is None
+
+
+def test_cycle_notifies_owners_and_retires_expired(app, make_user, storage, sent):
+    admin = make_user("admin1", role="admin")
+    make_user("engineer1", role="engineer")
+    now = datetime(2026, 10, 19)
+    due = _master("6300-E-1", responsible_engineer="Engineer1",
+                  review_due=now + timedelta(days=10))
+    _master("6300-E-2", review_due=now + timedelta(days=90))
+    expired = _master("6300-E-3", retention_rule="5 years",
+                      effective_date=datetime(2020, 1, 1))
+    kept = _master("6300-E-4", retention_rule="10 years",
+                   effective_date=datetime(2020, 1, 1))
+    db.session.flush()
+    (storage / "hot").mkdir()
+    (storage / "hot" / "e3.pdf").write_bytes(b"%PDF-1.4")
+    db.session.add(DocumentRevision(master_id=expired.id, file_key="e3.pdf", checksum="x",
+                                    file_size=8, uploaded_by_id=admin.id))
+    db.session.commit()
+
+    summary = retention.run_retention_cycle(now)
+    assert summary == {"review_notices": 1, "retired": 1, "files_archived": 1}
+    assert len(sent) == 1
+    assert sent[0][0] == ["engineer1@example.com"] and "6300-E-1" in sent[0][1]
+    assert due.review_notified_at is not None
+    assert expired.retired_at is not None and kept.retired_at is None
+
+    rev = DocumentRevision.query.filter_by(master_id=expired.id).one()
+    assert rev.storage_tier == retention.COLD_TIER
+    assert (storage / "cold" / "e3.pdf").read_bytes() == b"%PDF-1.4"
+    assert not (storage / "hot" / "e3.pdf").exists()
+    audit = AuditLog.query.filter_by(action="auto_retire").one()
+    assert audit.entity_id == str(expired.id) and audit.user_id == admin.id
+
+    # Nothing left to do; moving the review date re-arms the notice.
+    assert retention.run_retention_cycle(now) == {
+        "review_notices": 0, "retired": 0, "files_archived": 0}
+    due.review_due = now + timedelta(days=20)
+    db.session.commit()
+    assert due.review_notified_at is None
+    assert retention.notify_upcoming_reviews(now) == 1
+
+
+def test_scans_use_indexes(app):
+    now = datetime(2026, 10, 19)
+    for criteria, col in (
+        ((DocumentMaster.retired_at.is_(None), DocumentMaster.retention_expires_at <= now),
+         DocumentMaster.retention_expires_at),
+        ((DocumentMaster.retired_at.is_(None), DocumentMaster.review_notified_at.is_(None),
+          DocumentMaster.review_due <= now), DocumentMaster.review_due),
+    ):
+        stmt = (select(DocumentMaster.id).where(*criteria)
+                .order_by(col, DocumentMaster.id).limit(100))
+        compiled = stmt.compile(db.engine, compile_kwargs={"literal_binds": True})
+        plan = " ".join(row[-1] for row in db.session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+        assert "USING COVERING INDEX ix_document_masters_" in plan or "USING INDEX ix_document_masters_" in plan
+        assert "TEMP B-TREE" not in plan
@@ -0,0 +1,207 @@
+# tests/test_review_annotations.py
+
+import os
+
+import pytest
+from PyPDF2 import PdfReader, PdfWriter
+
+from app.extensions import db
+from app.models.review_annotation import ReviewAnnotation
+from app.models.ticket import DraftingTicket
+from app.models.ticket_attachment import TicketAttachment
+from app.services import review_annotations
+from app.services.review_annotations import (
+    normalize_shapes, save_page, page_annotations, export_key, flatten
+)
+from app.services.storage_adapter import LocalFSAdapter
+
+BASE = "/engineering/ticket/26DDDC001/annotations/iso.pdf"
+LINE = {"type": "line", "points": [[0.1, 0.2], [0.5, 0.2]], "color": "red", "width": 0.004}
+
+
+@pytest.fixture
+def review(app, tmp_path, make_user):
+    """A two-page PDF in a ticket's review folder."""
+    app.config["MEDIA_ROOT"] = tmp_path / "media"
+    engineer, drafter = make_user("engineer1", role="engineer"), make_user("drafter1", role="drafter")
+    ticket = DraftingTicket(ticket_number="26DDDC001", description="Reroute", request_type="iso",
+                            status="In-Review", review_engineer_id=engineer.id,
+                            assigned_to_id=drafter.id)
+    db.session.add(ticket)
+    db.session.flush()
+    key = "drafting_tickets/26DDDC001/review/iso.pdf"
+    path = app.config["MEDIA_ROOT"] / key
+    path.parent.mkdir(parents=True)
+    writer = PdfWriter()
+    writer.add_blank_page(width=612, height=792)
+    writer.add_blank_page(width=612, height=792)
+    writer.pages[1].rotate(90)
+    with path.open("wb") as f:
+        writer.write(f)
+    attachment = TicketAttachment(ticket_id=ticket.id, file_path=key, filename="iso.pdf",
+                                  category="review", page_count=2)
+    db.session.add(attachment)
+    db.session.commit()
+    return attachment, engineer, drafter
+
+
+def test_shapes_are_validated_and_canonical():
+    shapes = normalize_shapes([
+        LINE,
+        {"type": "highlight", "points": [[-0.2, 0.3], [0.123456, 1.4]],
+         "color": "rgba(255, 255, 0, 0.5)", "width": 0.01},
+    ])
+    assert shapes[0]["color"] == "rgba(255,0,0,1)"
+    assert shapes[1]["points"] == [[0.0, 0.3], [0.1235, 1.0]]
+
+    for bad in ({**LINE, "type": "cloud"}, {**LINE, "points": [[0, 0]]},
+                {**LINE, "width": 5}, {**LINE, "color": "url(evil)"},
+                {**LINE, "points": [["a", 0], [1, 1]]}):
+        with pytest.raises(ValueError):
+            normalize_shapes([bad])
+
+
+def test_save_replaces_and_clears_pages(review):
+    attachment, engineer, _ = review
+    save_page(attachment.id, 1, [LINE], engineer.id)
+    save_page(attachment.id, 1, [LINE, LINE], engineer.id)
+    save_page(attachment.id, 2, [LINE], engineer.id)
+    assert {p: len(s) for p, s in page_annotations(attachment.id).items()} == {1: 2, 2: 1}
+
+    save_page(attachment.id, 2, [], engineer.id)
+    assert list(page_annotations(attachment.id)) == [1]
+    assert ReviewAnnotation.query.count() == 1
+
+
+def test_flatten_draws_overlay_in_page_space(review, tmp_path):
+    attachment, engineer, _ = review
+    source = LocalFSAdapter()._resolve(attachment.file_path)
+    overlays = {1: normalize_shapes([LINE]), 2: normalize_shapes([LINE])}
+    dest = tmp_path / "out.pdf"
+    flatten(source, overlays, dest)
+
+    pages = PdfReader(str(dest)).pages
+    assert len(pages) == 2
+    upright = pages[0].get_contents().get_data().decode()
+    assert "61.2 633.6 m" in upright and "306 633.6 l" in upright
+    # Page 2 is shown rotated 90 degrees, so display x runs up the page.
+    rotated = pages[1].get_contents().get_data().decode()
+    assert "122.4 79.2 m" in rotated and "122.4 396 l" in rotated
+
+
+def test_export_key_follows_overlays(review):
+    attachment, engineer, _ = review
+    empty = export_key(attachment)
+    save_page(attachment.id, 1, [LINE], engineer.id)
+    marked = export_key(attachment)
+    assert marked != empty
+    assert marked.startswith(
+        f"drafting_tickets/26DDDC001/review/exports/{attachment.id}/iso_ENGINEER_REVISIONS_")
+    assert export_key(attachment) == marked
+
+
+def test_annotation_routes(app, client, login, make_user, review):
+    attachment, engineer, drafter = review
+    login(engineer)
+    resp = client.put(f"{BASE}/1", json={"shapes": [LINE]})
+    assert resp.get_json()["shapes"][0]["color"] == "rgba(255,0,0,1)"
+    assert client.put(f"{BASE}/3", json={"shapes": [LINE]}).status_code == 404
+    assert client.put(f"{BASE}/1", json={"shapes": "all"}).status_code == 400
+    assert client.get(BASE).get_json()["pages"] == {"1": page_annotations(attachment.id)[1]}
+
+    export = client.post(f"{BASE}/export").get_json()  # jobs run inline in tests
+    assert export["ready"] and export["filename"].startswith("iso_ENGINEER_REVISIONS_")
+    first = client.get(export["url"])
+    assert first.status_code == 200 and first.mimetype == "application/pdf"
+    exports = LocalFSAdapter()._resolve(f"drafting_tickets/26DDDC001/review/exports/{attachment.id}")
+    assert [p.name for p in exports.iterdir()] == [export["filename"]]
+
+    client.put(f"{BASE}/2", json={"shapes": [LINE]})
+    assert client.get(export["url"]).status_code == 404  # stale until re-exported
+    newer = client.post(f"{BASE}/export").get_json()
+    assert newer["filename"] != export["filename"]
+    assert [p.name for p in exports.iterdir()] == [newer["filename"]]
+    client.get("/auth/logout")
+
+    login(drafter)
+    assert client.get(BASE).status_code == 200
+    assert client.get(newer["url"]).status_code == 200
+    assert client.put(f"{BASE}/1", json={"shapes": []}).status_code == 403
+    client.get("/auth/logout")
+
+    login(make_user("outsider", role="drafter"))
+    assert client.get(BASE).status_code == 403
+    assert client.post(f"{BASE}/export").status_code == 403
+
+
+def test_revision_request_publishes_markups_for_drafter(client, login, review):
+    attachment, engineer, drafter = review
+    login(engineer)
+    client.put(f"{BASE}/1", json={"shapes": [LINE]})
+    assert client.post("/engineering/ticket/26DDDC001/request-revision").get_json()["success"]
+    published = TicketAttachment.query.filter(TicketAttachment.id != attachment.id).one()
+    assert published.category == "revision" and published.version == 1
+    assert published.file_path == export_key(attachment)
+    assert published.uploaded_by_id == engineer.id
+
+    # A later private export keeps the published file; the next request replaces it.
+    client.put(f"{BASE}/2", json={"shapes": [LINE]})
+    client.post(f"{BASE}/export")
+    assert LocalFSAdapter()._resolve(published.file_path).is_file()
+    client.post("/engineering/ticket/26DDDC001/request-revision")
+    republished = TicketAttachment.query.filter(TicketAttachment.id != attachment.id).one()
+    assert republished.version == 2 and republished.file_path == export_key(attachment)
+    exports = LocalFSAdapter()._resolve(f"drafting_tickets/26DDDC001/review/exports/{attachment.id}")
+    assert [p.name for p in exports.iterdir()] == [republished.filename]
+    client.get("/auth/logout")
+
+    login(drafter)
+    assert republished.filename.encode() in client.get("/drafting/drafter/tickets/modal").data
+    client.get("/auth/logout")
+
+    # The flattened copy is not a review source in its own right.
+    login(engineer)
+    export_url = f"/engineering/ticket/26DDDC001/annotations/{republished.filename}"
+    assert client.get(export_url).status_code == 404
+    assert client.put(f"{export_url}/1", json={"shapes": [LINE]}).status_code == 404
+    assert client.post(f"{export_url}/export").status_code == 404
+
+
+def test_exports_of_same_named_files_are_kept_apart(app, review):
+    attachment, engineer, _ = review
+    source = LocalFSAdapter()._resolve(attachment.file_path)
+    other_key = "drafting_tickets/26DDDC001/review/iso.PDF"
+    LocalFSAdapter()._resolve(other_key).write_bytes(source.read_bytes())
+    other = TicketAttachment(ticket_id=attachment.ticket_id, file_path=other_key,
+                             filename="iso.PDF", category="review", page_count=2)
+    db.session.add(other)
+    db.session.commit()
+
+    for row in (attachment, other):
+        save_page(row.id, 1, [LINE], engineer.id)
+        review_annotations.flatten_annotations(row.id)
+    for row in (attachment, other):
+        assert LocalFSAdapter()._resolve(export_key(row)).is_file()
+
+
+def test_failed_or_abandoned_exports_are_requeued(client, login, review, monkeypatch):
+    attachment, engineer, _ = review
+    login(engineer)
+    client.put(f"{BASE}/1", json={"shapes": [LINE]})
+
+    def broken(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(review_annotations, "flatten", broken)
+    assert client.post(f"{BASE}/export").status_code == 202
+    monkeypatch.undo()
+    assert client.post(f"{BASE}/export").get_json()["ready"]
+
+    # A fresh marker means another worker is on it; an old one is taken over.
+    client.put(f"{BASE}/2", json={"shapes": [LINE]})
+    marker = LocalFSAdapter()._resolve(export_key(attachment) + ".pending")
+    marker.touch()
+    assert client.post(f"{BASE}/export").status_code == 202
+    os.utime(marker, (0, 0))
+    assert client.post(f"{BASE}/export").get_json()["ready"]
+    assert not marker.exists()
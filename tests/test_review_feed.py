@@ -0,0 +1,90 @@
+# tests/test_review_feed.py
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.review_comment import ReviewComment
+from app.models.review_comment_read_status import ReviewCommentReadStatus
+from app.models.ticket import DraftingTicket
+from app.services.review_feed import comment_feed, unread_counts, mark_read
+
+
+@pytest.fixture
+def thread(make_user):
+    engineer, drafter = make_user("engineer1", role="engineer"), make_user("drafter1", role="drafter")
+    ticket = DraftingTicket(ticket_number="26DDDC001", description="Reroute", request_type="iso",
+                            status="In-Review", review_engineer_id=engineer.id,
+                            assigned_to_id=drafter.id)
+    db.session.add(ticket)
+    db.session.flush()
+    for page, message in ((1, "Check weld callout"), (2, "Missing BOM line"), (1, "Dimension off")):
+        db.session.add(ReviewComment(ticket_id=ticket.id, user_id=engineer.id,
+                                     message=message, page_number=page))
+    db.session.commit()
+    return ticket, engineer, drafter
+
+
+def _count_selects(app):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    return statements, lambda: event.remove(db.engine, "before_cursor_execute", record)
+
+
+def test_feed_filters_by_cursor_and_page_in_one_query(app, thread):
+    ticket, engineer, drafter = thread
+    ticket_id, drafter_id = ticket.id, drafter.id
+    db.session.expire_all()
+    statements, stop = _count_selects(app)
+    try:
+        feed = comment_feed(ticket_id, drafter_id)
+    finally:
+        stop()
+    assert len(statements) == 1
+    assert [c["author_name"] for c in feed] == ["Engineer1"] * 3
+    assert not any(c["read"] for c in feed)
+    assert all(c["read"] for c in comment_feed(ticket.id, engineer.id))  # own comments
+
+    assert [c["message"] for c in comment_feed(ticket.id, drafter.id, since=feed[0]["id"])] == [
+        "Missing BOM line", "Dimension off"]
+    assert [c["message"] for c in comment_feed(ticket.id, drafter.id, page=1)] == [
+        "Check weld callout", "Dimension off"]
+
+
+def test_mark_read_and_unread_counts(app, thread):
+    ticket, engineer, drafter = thread
+    assert unread_counts(drafter.id) == {"26DDDC001": 3}
+    assert unread_counts(engineer.id) == {}
+
+    first = comment_feed(ticket.id, drafter.id)[0]["id"]
+    assert mark_read(ticket.id, drafter.id, upto=first) == 1
+    assert unread_counts(drafter.id) == {"26DDDC001": 2}
+    assert mark_read(ticket.id, drafter.id) == 2
+    assert mark_read(ticket.id, drafter.id) == 0
+    assert unread_counts(drafter.id) == {}
+    assert ReviewCommentReadStatus.query.count() == 3
+
+
+def test_comment_routes(client, login, make_user, thread):
+    ticket, engineer, drafter = thread
+    login(drafter)
+    feed = client.get("/engineering/ticket/26DDDC001/comments").get_json()
+    assert len(feed) == 3 and feed[0]["author_name"] == "Engineer1"
+    assert client.get("/engineering/comments/unread").get_json() == {"26DDDC001": 3}
+
+    resp = client.post("/engineering/ticket/26DDDC001/comments/read", json={"upto": feed[1]["id"]})
+    assert resp.get_json()["marked"] == 2
+    newer = client.get(f"/engineering/ticket/26DDDC001/comments?since={feed[1]['id']}").get_json()
+    assert [(c["message"], c["read"]) for c in newer] == [("Dimension off", False)]
+    assert client.post("/engineering/ticket/26DDDC001/comments/read",
+                       json={"upto": "all"}).status_code == 400
+    client.get("/auth/logout")
+
+    login(make_user("outsider", role="drafter"))
+    assert client.get("/engineering/ticket/26DDDC001/comments").status_code == 403
+    assert client.post("/engineering/ticket/26DDDC001/comments/read").status_code == 403
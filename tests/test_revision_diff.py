@@ -0,0 +1,119 @@
+# tests/test_revision_diff.py
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from PIL import Image, ImageDraw
+
+from app.extensions import db
+from app.document_control.models import DocumentMaster, RevisionDiff
+from app.document_control.visual_diff import sweep_revision_diffs
+
+
+@pytest.fixture
+def media_root(app, tmp_path):
+    app.config["MEDIA_ROOT"] = tmp_path
+    return tmp_path
+
+
+def _sheet(path, cloud=None):
+    img = Image.new("L", (800, 600), 255)
+    draw = ImageDraw.Draw(img)
+    draw.line((50, 50, 750, 50), fill=0, width=3)
+    if cloud:
+        draw.rectangle(cloud, outline=0, width=4)
+    img.save(path)
+
+
+def test_new_revision_gets_page_diff(client, login, make_user, media_root):
+    login(make_user("drafter1", role="drafter"))
+    master = DocumentMaster(document_number="6300-E-1", title="Layout",
+                            unit="6300", sheet_number="1")
+    db.session.add(master)
+    db.session.commit()
+
+    _sheet(media_root / "rev_a.png")
+    _sheet(media_root / "rev_b.png", cloud=(400, 300, 600, 450))
+    url = f"/api/documents/{master.id}/revisions"
+    rev_a = client.post(url, json={"file_key": "rev_a.png"}).get_json()
+    rev_b = client.post(url, json={"file_key": "rev_b.png"}).get_json()
+    assert RevisionDiff.query.count() == 1
+
+    resp = client.get(f"{url}/{rev_b['revision_id']}/diff")
+    assert resp.status_code == 200
+    payload = resp.get_json()
+    assert payload["base_revision_id"] == rev_a["revision_id"]
+    assert payload["page_count"] == {"base": 1, "target": 1}
+
+    page = payload["pages"][0]
+    assert page["status"] == "changed"
+    assert len(page["regions"]) == 1
+    x0, y0, x1, y1 = page["regions"][0]
+    assert x0 <= 0.5 and y0 <= 0.5 and x1 >= 0.75 and y1 >= 0.75
+    assert x1 - x0 < 0.4 and y1 - y0 < 0.4
+
+
+def test_first_revision_has_nothing_to_compare(client, login, make_user, media_root):
+    login(make_user("drafter1", role="drafter"))
+    master = DocumentMaster(document_number="6300-E-2", title="Layout",
+                            unit="6300", sheet_number="1")
+    db.session.add(master)
+    db.session.commit()
+    _sheet(media_root / "only.png")
+    rev = client.post(f"/api/documents/{master.id}/revisions",
+                      json={"file_key": "only.png"}).get_json()
+    resp = client.get(f"/api/documents/{master.id}/revisions/{rev['revision_id']}/diff")
+    assert resp.status_code == 404
+
+
+def test_abandoned_running_diff_is_rerun(client, login, make_user, media_root):
+    login(make_user("drafter1", role="drafter"))
+    master = DocumentMaster(document_number="6300-E-3", title="Layout",
+                            unit="6300", sheet_number="1")
+    db.session.add(master)
+    db.session.commit()
+    _sheet(media_root / "rev_a.png")
+    _sheet(media_root / "rev_b.png", cloud=(400, 300, 600, 450))
+    url = f"/api/documents/{master.id}/revisions"
+    client.post(url, json={"file_key": "rev_a.png"})
+    rev_b = client.post(url, json={"file_key": "rev_b.png"}).get_json()
+    diff_url = f"{url}/{rev_b['revision_id']}/diff"
+
+    # The worker died mid-diff: fresh claims are left alone, old ones re-run.
+    diff = RevisionDiff.query.one()
+    diff.status, diff.result, diff.started_at = "running", None, datetime.now(timezone.utc)
+    db.session.commit()
+    assert client.get(diff_url).status_code == 202
+
+    diff = RevisionDiff.query.one()
+    diff.started_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db.session.commit()
+    assert client.get(diff_url).status_code == 200
+    assert RevisionDiff.query.one().status == "done"
+
+
+def test_sweep_requeues_pending_and_abandoned_diffs(client, login, make_user, media_root):
+    login(make_user("drafter1", role="drafter"))
+    master = DocumentMaster(document_number="6300-E-4", title="Layout",
+                            unit="6300", sheet_number="1")
+    db.session.add(master)
+    db.session.commit()
+    _sheet(media_root / "rev_a.png")
+    _sheet(media_root / "rev_b.png", cloud=(400, 300, 600, 450))
+    url = f"/api/documents/{master.id}/revisions"
+    client.post(url, json={"file_key": "rev_a.png"})
+    client.post(url, json={"file_key": "rev_b.png"})
+
+    # Queued before a restart, then lost with the in-process pool.
+    diff = RevisionDiff.query.one()
+    diff.status, diff.result = "pending", None
+    db.session.commit()
+    assert sweep_revision_diffs() == 1
+    assert RevisionDiff.query.one().status == "done"
+
+    diff = RevisionDiff.query.one()
+    diff.status, diff.started_at = "running", datetime.now(timezone.utc) - timedelta(hours=1)
+    db.session.commit()
+    assert sweep_revision_diffs() == 1
+    assert RevisionDiff.query.one().status == "done"
+    assert sweep_revision_diffs() == 0
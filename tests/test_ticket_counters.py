@@ -0,0 +1,73 @@
+# tests/test_ticket_counters.py
+
+import pytest
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.services.ticket_counters import (
+    ticket_counts, user_ticket_counts, status_totals, reconcile_ticket_counters
+)
+from app.services.ticket_queue import queue_counts
+
+
+@pytest.fixture
+def new_ticket(make_ticket, people):
+    def _make(number, status="Pending"):
+        return make_ticket(number, status=status, submitted_by_id=people.requester.id)
+    return _make
+
+
+def test_counters_follow_ticket_lifecycle(app, people, new_ticket):
+    engineer, drafter, requester = people.engineer, people.drafter, people.requester
+    first, second = new_ticket("26DDDC001"), new_ticket("26DDDC002")
+    assert status_totals() == {"Pending": 2}
+    assert ticket_counts(requester.id, "submitted") == {"Pending": 2}
+
+    first.assigned_to_id = drafter.id
+    first.status = "In Progress"
+    db.session.commit()
+    assert ticket_counts(drafter.id, "assigned") == {"In Progress": 1}
+    assert ticket_counts(drafter.id, "assigned_unviewed") == {"In Progress": 1}
+
+    first.assigned_viewed = True
+    first.status = "In-Review"
+    db.session.commit()
+    counts = user_ticket_counts(drafter.id)
+    assert counts["assigned"] == {"In-Review": 1} and counts["assigned_unviewed"] == {}
+    assert ticket_counts(engineer.id, "reviewing") == {"In-Review": 1, "Pending": 1}
+
+    db.session.delete(second)
+    db.session.commit()
+    assert status_totals() == {"In-Review": 1}
+    assert queue_counts() == {"new": 0, "assigned": 1, "completed": 0}
+    assert reconcile_ticket_counters() == 0
+
+
+def test_rolled_back_change_leaves_counters(app, new_ticket):
+    ticket = new_ticket("26DDDC001")
+    ticket.status = "Completed"
+    db.session.flush()
+    assert status_totals() == {"Completed": 1}
+    db.session.rollback()
+    assert status_totals() == {"Pending": 1}
+
+
+def test_reconcile_corrects_bulk_update_drift(app, people, new_ticket):
+    new_ticket("26DDDC001")
+    new_ticket("26DDDC002")
+    # Bulk updates bypass the flush hook.
+    DraftingTicket.query.update({"status": "Completed"})
+    db.session.commit()
+    assert status_totals() == {"Pending": 2}
+
+    assert reconcile_ticket_counters() > 0
+    assert status_totals() == {"Completed": 2}
+    assert ticket_counts(people.engineer.id, "reviewing") == {"Completed": 2}
+    assert reconcile_ticket_counters() == 0
+
+
+def test_requester_tile_shows_counter(client, login, people, new_ticket):
+    new_ticket("26DDDC001")
+    new_ticket("26DDDC002", status="Completed")
+    login(people.requester)
+    assert b"View Your Requests (2)" in client.get("/").data
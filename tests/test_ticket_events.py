@@ -0,0 +1,65 @@
+# tests/test_ticket_events.py
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.ticket_event import TicketEvent
+from app.services.ticket_events import (
+    record_event, timeline, revision_history, event_counts, APPROVED, REVISION_REQUESTED, COMMENTED
+)
+
+
+@pytest.fixture
+def ticket(people, make_ticket):
+    return make_ticket("26DDDC001", status="In-Review", assigned_to_id=people.drafter.id)
+
+
+def test_sequence_and_revision_numbers(ticket, people):
+    engineer = people.engineer
+    record_event(ticket, COMMENTED, engineer.id, page_number=1)
+    first = record_event(ticket, REVISION_REQUESTED, engineer.id)
+    second = record_event(ticket, APPROVED, engineer.id)
+    db.session.commit()
+
+    assert [e["seq"] for e in timeline(ticket.id)] == [1, 2, 3]
+    assert (first.payload["revision"], second.payload["revision"]) == (1, 2)
+    assert (ticket.event_seq, ticket.revision) == (3, 2)
+    assert [e["payload"]["revision"] for e in revision_history(ticket.id)] == [1, 2]
+    assert [e["event_type"] for e in timeline(ticket.id, after=2)] == [APPROVED]
+    assert timeline(ticket.id)[0]["actor_name"] == "Engineer1"
+
+
+def test_rolled_back_events_release_their_number(ticket, people):
+    record_event(ticket, COMMENTED, people.engineer.id)
+    db.session.rollback()
+    event = record_event(ticket, COMMENTED, people.engineer.id)
+    db.session.commit()
+    assert event.seq == 1 and TicketEvent.query.count() == 1
+
+
+def test_review_routes_number_revisions(client, login, ticket, people):
+    engineer, drafter, admin = people.engineer, people.drafter, people.admin
+    login(engineer)
+    assert client.post("/engineering/ticket/26DDDC001/request-revision").get_json()["success"]
+    client.post("/engineering/ticket/26DDDC001/comment", json={"message": "See page 2", "page_number": 2})
+    assert client.post("/engineering/ticket/26DDDC001/approve").get_json()["success"]
+
+    events = client.get("/engineering/ticket/26DDDC001/events").get_json()
+    assert [(e["event_type"], e["payload"].get("revision")) for e in events] == [
+        (REVISION_REQUESTED, 1), (COMMENTED, None), (APPROVED, 2)]
+    assert db.session.get(DraftingTicket, ticket.id).status == "Completed"
+    client.get("/auth/logout")
+
+    login(admin)
+    resp = client.post("/drafting/assign", data={"ticket_id": ticket.id, "drafter_id": drafter.id})
+    assert resp.get_json()["success"] is True
+    last = TicketEvent.query.order_by(TicketEvent.seq.desc()).first()
+    assert (last.seq, last.event_type, last.actor_id, last.payload) == (
+        4, "assigned", admin.id, {"drafter_id": drafter.id})
+    assert client.get("/engineering/ticket/26DDDC001/events").status_code == 403
+
+    now = datetime.utcnow()
+    assert event_counts(now - timedelta(hours=1), now + timedelta(hours=1), types=[APPROVED]) == {APPROVED: 1}
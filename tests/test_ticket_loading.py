@@ -0,0 +1,64 @@
+# tests/test_ticket_loading.py
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.ticket_attachment import TicketAttachment
+
+
+@pytest.fixture
+def ticket_selects(app):
+    """Record every SELECT touching the ticket tables."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and (
+            "drafting_tickets" in statement or "ticket_attachments" in statement
+        ):
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", _record)
+
+
+def _tickets(count, status, **kwargs):
+    for n in range(count):
+        ticket = DraftingTicket(ticket_number=f"26DDDC{n:03d}", status=status,
+                                description="Reroute line", request_type="iso", **kwargs)
+        db.session.add(ticket)
+        db.session.flush()
+        for name in ("request/a.pdf", "review/b.pdf"):
+            db.session.add(TicketAttachment(ticket_id=ticket.id, filename=name,
+                                            file_path=f"drafting_tickets/{ticket.ticket_number}/{name}",
+                                            category="request"))
+    db.session.commit()
+
+
+def test_plain_ticket_queries_do_not_join_attachments(app):
+    sql = str(DraftingTicket.query.filter_by(ticket_number="26DDDC001"))
+    assert "ticket_attachments" not in sql
+
+
+@pytest.mark.parametrize("count", [1, 12])
+def test_list_views_use_constant_queries(client, login, make_user, ticket_selects, count):
+    engineer = make_user("engineer1", role="engineer")
+    drafter = make_user("drafter1", role="drafter")
+    _tickets(count, "In-Review", review_engineer_id=engineer.id, assigned_to_id=drafter.id)
+
+    login(engineer)
+    ticket_selects.clear()
+    resp = client.get("/engineering/review")
+    assert resp.status_code == 200
+    assert resp.data.count(b'data-filename="b.pdf"') == count
+    # One ticket query plus one SELECT ... IN for all attachments.
+    assert len(ticket_selects) == 2
+    assert "JOIN ticket_attachments" not in ticket_selects[0]
+
+    client.get("/auth/logout")
+    login(drafter)
+    ticket_selects.clear()
+    assert client.get("/drafting/drafter/tickets/modal").status_code == 200
+    assert len(ticket_selects) == 2
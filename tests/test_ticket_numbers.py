@@ -0,0 +1,46 @@
+# tests/test_ticket_numbers.py
+
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.ticket_sequence import TicketSequence
+from app.services.ticket_manager import (
+    TicketNumberAllocator, generate_ticket_number, ticket_numbers
+)
+
+NOW = datetime(2026, 10, 19)
+
+
+@pytest.fixture(autouse=True)
+def fresh_allocator(app):
+    ticket_numbers.reset()
+    yield
+    ticket_numbers.reset()
+
+
+def test_counter_seeds_from_existing_tickets_and_resets_per_year(app):
+    db.session.add(DraftingTicket(ticket_number="26DDDC041", description="x",
+                                  request_type="iso", review_engineer_id=1))
+    db.session.commit()
+
+    assert generate_ticket_number(NOW) == "26DDDC042"
+    assert generate_ticket_number(NOW) == "26DDDC043"
+    assert generate_ticket_number(datetime(2027, 1, 2)) == "27DDDC001"
+
+
+def test_blocks_are_reserved_per_process(app):
+    app.config["TICKET_NUMBER_BLOCK"] = 3
+    db.session.add(TicketSequence(prefix="26DDDC", next_value=998))
+    db.session.commit()
+
+    numbers = [generate_ticket_number(NOW) for _ in range(3)]
+    assert numbers == ["26DDDC998", "26DDDC999", "26DDDC1000"]
+    assert db.session.get(TicketSequence, "26DDDC").next_value == 1001
+
+    # A second worker gets the next block, never an overlapping number.
+    other = TicketNumberAllocator()
+    assert other.next_number("26DDDC") == 1001
+    assert generate_ticket_number(NOW) == "26DDDC1004"
@@ -0,0 +1,127 @@
+# tests/test_ticket_pipeline.py
+
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+from PIL import Image
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.ticket_attachment import TicketAttachment
+from app.models.ticket_processing_task import TicketProcessingTask
+from app.services import ticket_pipeline
+from app.services.ticket_pipeline import plan_ticket_processing, start_ticket_processing
+
+UPLOAD_KEY = "drafting_tickets/26DDDC001/requesters_submissions/sheet.png"
+
+
+@pytest.fixture
+def notices(app, tmp_path, monkeypatch):
+    app.config["MEDIA_ROOT"] = tmp_path
+    sent = []
+    monkeypatch.setattr(ticket_pipeline, "notify_new_ticket",
+                        lambda ticket, engineer, submitter: sent.append(engineer.email))
+    return sent
+
+
+def _submit(make_user):
+    engineer = make_user("engineer1", role="engineer")
+    requester = make_user("requester1")
+    ticket = DraftingTicket(ticket_number="26DDDC001", description="Reroute", request_type="iso",
+                            status="Pending", review_engineer_id=engineer.id,
+                            submitted_by_id=requester.id)
+    db.session.add(ticket)
+    db.session.flush()
+    attachment = TicketAttachment(ticket_id=ticket.id, file_path=UPLOAD_KEY,
+                                  filename="sheet.png", category="request")
+    db.session.add(attachment)
+    plan_ticket_processing(ticket, [attachment])
+    db.session.commit()
+    return ticket, attachment, requester
+
+
+def _write_upload(root):
+    path = root / UPLOAD_KEY
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("L", (1200, 800), 200).save(path)
+    return path
+
+
+def test_pipeline_fills_metadata_and_notifies(app, make_user, notices, tmp_path):
+    path = _write_upload(tmp_path)
+    ticket, attachment, _ = _submit(make_user)
+    start_ticket_processing(ticket.id)
+
+    attachment = db.session.get(TicketAttachment, attachment.id)
+    assert attachment.checksum == hashlib.sha256(path.read_bytes()).hexdigest()
+    assert attachment.page_count == 1 and attachment.file_size == path.stat().st_size
+    with Image.open(tmp_path / attachment.preview_path) as preview:
+        assert max(preview.size) == 400
+    assert notices == ["engineer1@example.com"]
+    assert ticket_pipeline.processing_status(ticket.id)["state"] == "done"
+
+
+def test_failed_steps_retry_then_report(app, client, login, make_user, notices, tmp_path):
+    app.config.update(PIPELINE_RETRY_BASE=0, PIPELINE_MAX_ATTEMPTS=2)
+    ticket, _, requester = _submit(make_user)
+    start_ticket_processing(ticket.id)  # upload missing: every file step fails
+
+    login(requester)
+    status = client.get("/drafting/ticket/26DDDC001/processing").get_json()
+    assert status["state"] == "failed"
+    failed = [s for s in status["steps"] if s["status"] == "failed"]
+    assert {s["step"] for s in failed} == {"checksum", "metadata", "preview"}
+    assert all(s["attempts"] == 2 and "missing" in s["last_error"] for s in failed)
+    assert notices == ["engineer1@example.com"]
+
+    _write_upload(tmp_path)
+    assert ticket_pipeline.retry_failed_steps(ticket.id) == 3
+    assert ticket_pipeline.processing_status(ticket.id)["state"] == "done"
+
+
+def test_stalled_and_orphaned_steps_are_swept(app, make_user, notices, tmp_path):
+    app.config.update(PIPELINE_STEP_LEASE=60, PIPELINE_MAX_ATTEMPTS=2)
+    _write_upload(tmp_path)
+    ticket, _, _ = _submit(make_user)
+    steps = TicketProcessingTask.query.order_by(TicketProcessingTask.id).all()
+    # A worker died mid-checksum; the notify retry timer died with a restart.
+    steps[0].status, steps[0].updated_at = "running", datetime.utcnow() - timedelta(minutes=5)
+    steps[1].status, steps[1].updated_at = "running", datetime.utcnow()
+    steps[3].next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+
+    assert ticket_pipeline.sweep_pipeline() == 1
+    status = {s["step"]: s for s in ticket_pipeline.processing_status(ticket.id)["steps"]}
+    assert status["checksum"]["status"] == "done" and status["checksum"]["attempts"] == 1
+    assert status["metadata"]["status"] == "running"  # lease still held
+    assert status["preview"]["status"] == "done" and notices == ["engineer1@example.com"]
+
+    step = db.session.get(TicketProcessingTask, steps[1].id)
+    step.updated_at = datetime.utcnow() - timedelta(minutes=5)
+    step.attempts = 1
+    db.session.commit()
+    assert ticket_pipeline.expire_leases(ticket.id) == 1
+    assert db.session.get(TicketProcessingTask, steps[1].id).status == "failed"
+    assert ticket_pipeline.sweep_pipeline() == 0
+
+
+def test_step_that_lost_its_lease_drops_its_result(app, make_user, notices, tmp_path, monkeypatch):
+    app.config["PIPELINE_STEP_LEASE"] = 60
+    _write_upload(tmp_path)
+    ticket, attachment, _ = _submit(make_user)
+    checksum = ticket_pipeline.STEP_HANDLERS["checksum"]
+
+    def slow_checksum(task):
+        # Another worker reclaims the lease while this one is still hashing.
+        ticket_pipeline.expire_leases(now=datetime.utcnow() + timedelta(minutes=5))
+        checksum(task)
+
+    monkeypatch.setitem(ticket_pipeline.STEP_HANDLERS, "checksum", slow_checksum)
+    step = TicketProcessingTask.query.filter_by(step="checksum").one()
+    claimed_at = ticket_pipeline._claim(step.id)
+    assert ticket_pipeline._run_step(step.id, claimed_at) is None
+
+    step = db.session.get(TicketProcessingTask, step.id)
+    assert (step.status, step.attempts) == ("pending", 1)
+    assert db.session.get(TicketAttachment, attachment.id).checksum is None
@@ -0,0 +1,60 @@
+# tests/test_ticket_queue.py
+
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.ticket_attachment import TicketAttachment
+
+
+def _ticket(n, status, **kwargs):
+    ticket = DraftingTicket(ticket_number=f"26DDDC{n:03d}", status=status,
+                            description=f"Ticket {n}", request_type="iso",
+                            review_engineer_id=1,
+                            created_at=datetime(2026, 1, 1) + timedelta(days=n), **kwargs)
+    db.session.add(ticket)
+    return ticket
+
+
+def test_queue_pages_with_counts_and_cursor(client, login, make_user):
+    login(make_user("admin1", role="admin"))
+    for n in range(1, 6):
+        _ticket(n, "Completed", priority=n % 3)
+    first = _ticket(6, "Pending")
+    _ticket(7, "In Progress")
+    db.session.flush()
+    db.session.add(TicketAttachment(ticket_id=first.id, file_path="drafting_tickets/a/x.pdf",
+                                    filename="x.pdf", category="request"))
+    db.session.commit()
+
+    resp = client.get("/drafting/admin/tickets/queue/completed?limit=2")
+    data = resp.get_json()
+    assert resp.status_code == 200
+    assert data["counts"] == {"new": 1, "assigned": 1, "completed": 5}
+    assert [t["ticket_number"] for t in data["tickets"]] == ["26DDDC005", "26DDDC004"]
+
+    seen = [t["ticket_number"] for t in data["tickets"]]
+    cursor = data["next_cursor"]
+    while cursor:
+        data = client.get(f"/drafting/admin/tickets/queue/completed?limit=2&cursor={cursor}").get_json()
+        seen += [t["ticket_number"] for t in data["tickets"]]
+        cursor = data["next_cursor"]
+    assert seen == [f"26DDDC{n:03d}" for n in range(5, 0, -1)]
+
+    data = client.get("/drafting/admin/tickets/queue/completed?sort=priority&order=asc").get_json()
+    assert [t["priority"] for t in data["tickets"]] == [0, 1, 1, 2, 2]
+
+    new = client.get("/drafting/admin/tickets/queue/new").get_json()["tickets"]
+    assert new[0]["attachment_count"] == 1
+    files = client.get(f"/drafting/admin/tickets/{first.id}/attachments").get_json()
+    assert files["attachments"][0]["name"] == "x.pdf"
+
+
+def test_queue_rejects_bad_input_and_non_admins(client, login, make_user):
+    login(make_user("admin1", role="admin"))
+    assert client.get("/drafting/admin/tickets/queue/archived").status_code == 400
+    assert client.get("/drafting/admin/tickets/queue/new?cursor=zzz").status_code == 400
+
+    client.get("/auth/logout")
+    login(make_user("drafter1", role="drafter"))
+    assert client.get("/drafting/admin/tickets/queue/new").status_code == 403
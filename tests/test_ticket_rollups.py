@@ -0,0 +1,93 @@
+# tests/test_ticket_rollups.py
+
+from datetime import datetime, timedelta
+
+import pytest
+from flask import template_rendered
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.ticket_daily_rollup import TicketDailyRollup
+from app.services.analytics_engine import get_ticket_stats, get_drafter_performance
+from app.services.ticket_rollups import daily_totals, daily_breakdown, reconcile_daily_rollups
+
+
+@pytest.fixture
+def rendered(app):
+    """Template contexts rendered during the test."""
+    contexts = []
+
+    def record(sender, template, context, **extra):
+        contexts.append(context)
+
+    template_rendered.connect(record, app)
+    yield contexts
+    template_rendered.disconnect(record, app)
+
+
+@pytest.fixture
+def new_ticket(make_ticket):
+    def _make(number, unit="U100", **fields):
+        return make_ticket(number, unit=unit, **fields)
+    return _make
+
+
+def test_rollups_follow_late_updates(app, people, new_ticket):
+    drafter = people.drafter
+    old = new_ticket("26DDDC001", days_ago=10)
+    new_ticket("26DDDC002", unit="U200")
+    new_ticket("26DDDC003")
+    today = datetime.utcnow().date()
+    assert daily_totals(30) == {today - timedelta(days=10): 1, today: 2}
+    assert daily_totals(5) == {today: 2}
+
+    # Assigned and completed days later: the count moves within its creation day.
+    old.assigned_to_id = drafter.id
+    old.status = "Completed"
+    db.session.commit()
+    rows = TicketDailyRollup.query.filter(TicketDailyRollup.day == today - timedelta(days=10),
+                                         TicketDailyRollup.count > 0).all()
+    assert [(r.status, r.drafter_id, r.count) for r in rows] == [("Completed", drafter.id, 1)]
+
+    assert [(r["unit"], r["count"]) for r in daily_breakdown(30, "unit") if r["date"] == str(today)] == [
+        ("U100", 1), ("U200", 1)]
+    with pytest.raises(ValueError):
+        daily_breakdown(30, "priority")
+
+    db.session.delete(old)
+    db.session.commit()
+    assert daily_totals(30) == {today: 2}
+    assert reconcile_daily_rollups() == 0
+
+
+def test_reconcile_fixes_bulk_update_drift(app, new_ticket):
+    ticket = new_ticket("26DDDC001", days_ago=3)
+    DraftingTicket.query.filter_by(id=ticket.id).update({"status": "Completed"})
+    db.session.commit()
+    assert TicketDailyRollup.query.one().status == "Pending"
+
+    assert reconcile_daily_rollups(days=7) == 2
+    assert TicketDailyRollup.query.one().status == "Completed"
+    assert reconcile_daily_rollups(days=7) == 0
+
+
+def test_chart_reads_and_routes(client, login, people, new_ticket, rendered):
+    engineer, drafter, admin = people.engineer, people.drafter, people.admin
+    new_ticket("26DDDC001", days_ago=2).assigned_to_id = drafter.id
+    db.session.commit()
+    stats = get_ticket_stats(days=7)
+    assert len(stats) == 7 and [s["count"] for s in stats] == [0, 0, 0, 0, 1, 0, 0]
+    assert get_drafter_performance() == [{"drafter": "drafter1", "count": 1}]
+
+    login(admin)
+    assert client.get("/analytics/").status_code == 200
+    assert rendered[-1]["kpi"]["total_tickets"] == 1
+    assert sum(rendered[-1]["trend"]["values"]) == 1
+
+    data = client.get("/analytics/daily?days=7&by=drafter_id").get_json()
+    assert data["breakdown"] == [{"date": stats[4]["date"], "drafter_id": drafter.id, "count": 1}]
+    assert client.get("/analytics/daily?by=priority").status_code == 400
+    client.get("/auth/logout")
+
+    login(engineer)
+    assert client.get("/analytics/daily").status_code == 403
@@ -0,0 +1,65 @@
+# tests/test_ticket_search.py
+
+from datetime import datetime
+
+from app.extensions import db
+from app.models.ticket import DraftingTicket
+from app.models.ticket_search_term import TicketSearchTerm
+from app.services.ticket_search import search_tickets, rebuild_ticket_index
+
+
+def _ticket(number, description, created_at, **kwargs):
+    ticket = DraftingTicket(ticket_number=number, description=description,
+                            request_type="iso", review_engineer_id=1,
+                            created_at=created_at, **kwargs)
+    db.session.add(ticket)
+    return ticket
+
+
+def _numbers(result):
+    return [r["ticket_number"] for r in result["results"]]
+
+
+def test_search_ranks_and_filters(app):
+    _ticket("26DDDC001", "Reroute steam line around pump P-101", datetime(2026, 1, 5),
+            unit="6300", status="Completed", service="Steam", pipe_spec="A1")
+    _ticket("26DDDC002", "Add insulation to condensate header", datetime(2026, 2, 5),
+            unit="6300", status="Completed", work_order="WO-55812", insulation_spec="IH")
+    _ticket("26DDDC003", "Steam trap replacement per WO-55812", datetime(2026, 3, 5),
+            unit="7100", status="Pending")
+    db.session.commit()
+
+    assert _numbers(search_tickets("steam")) == ["26DDDC001", "26DDDC003"]
+    # The work-order field outranks a mention in the description.
+    assert _numbers(search_tickets("55812")) == ["26DDDC002", "26DDDC003"]
+    assert _numbers(search_tickets("insul header")) == ["26DDDC002"]
+    assert _numbers(search_tickets("steam pump")) == ["26DDDC001"]
+    assert _numbers(search_tickets("steam", {"unit": "7100"})) == ["26DDDC003"]
+    assert _numbers(search_tickets("steam", {"until": datetime(2026, 2, 1)})) == ["26DDDC001"]
+
+    page = search_tickets("steam", per_page=1, page=2)
+    assert page["total"] == 2 and _numbers(page) == ["26DDDC003"]
+
+
+def test_index_follows_edits_and_deletes(app):
+    ticket = _ticket("26DDDC001", "Relocate valve", datetime(2026, 1, 5))
+    db.session.commit()
+    ticket.description = "Relocate strainer"
+    db.session.commit()
+    assert _numbers(search_tickets("valve")) == []
+    assert _numbers(search_tickets("strainer")) == ["26DDDC001"]
+
+    assert rebuild_ticket_index() == 1
+    db.session.delete(db.session.get(DraftingTicket, ticket.id))
+    db.session.commit()
+    assert TicketSearchTerm.query.count() == 0
+
+
+def test_search_endpoint(client, login, make_user):
+    login(make_user("admin1", role="admin"))
+    _ticket("26DDDC001", "Paint spec update", datetime(2026, 1, 5), paint_spec="PS-4")
+    db.session.commit()
+    resp = client.get("/drafting/tickets/search?q=paint&since=2026-01-01")
+    assert resp.status_code == 200
+    assert resp.get_json()["results"][0]["ticket_number"] == "26DDDC001"
+    assert client.get("/drafting/tickets/search?q=paint&since=yesterday").status_code == 400
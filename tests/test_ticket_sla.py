@@ -0,0 +1,117 @@
+# tests/test_ticket_sla.py
+
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models.ticket_status_transition import TicketStatusTransition
+from app.services.event_bus import event_bus
+from app.services.ticket_sla import (
+    ticket_sla, time_in_status, sla_summary, scan_sla_breaches, sla_scanner
+)
+
+
+def _age(ticket, hours):
+    """Pretend the ticket entered its current status ``hours`` ago."""
+    ticket.status_changed_at = datetime.utcnow() - timedelta(hours=hours)
+    db.session.commit()
+
+
+def test_transitions_accumulate_time_in_status(app, make_ticket):
+    ticket = make_ticket("26DDDC001")
+    _age(ticket, 30)  # Pending target is 24h
+    ticket.status = "In Progress"
+    db.session.commit()
+    _age(ticket, 5)
+    ticket.status = "In-Review"
+    db.session.commit()
+
+    history = TicketStatusTransition.query.order_by(TicketStatusTransition.id).all()
+    assert [(t.from_status, t.to_status) for t in history] == [
+        (None, "Pending"), ("Pending", "In Progress"), ("In Progress", "In-Review")]
+    assert [t.breached for t in history] == [False, True, False]
+
+    totals = time_in_status(ticket)
+    assert totals["Pending"] // 3600 == 30 and totals["In Progress"] // 3600 == 5
+    assert totals["In-Review"] < 60
+
+    # Re-saving the same status is not a transition.
+    ticket.status = "In-Review"
+    db.session.commit()
+    assert TicketStatusTransition.query.count() == 3
+
+
+def test_route_status_change_records_actor(client, login, people, make_ticket):
+    drafter, admin = people.drafter, people.admin
+    ticket = make_ticket("26DDDC001")
+    login(admin)
+    resp = client.post("/drafting/assign",
+                       data={"ticket_id": ticket.id, "drafter_id": drafter.id})
+    assert resp.get_json()["success"] is True
+    last = TicketStatusTransition.query.order_by(TicketStatusTransition.id.desc()).first()
+    assert (last.to_status, last.changed_by_id) == ("In Progress", admin.id)
+
+
+def test_scan_flags_breaches_once(app, people, make_ticket):
+    engineer = people.engineer
+    late = make_ticket("26DDDC001")
+    _age(late, 25)
+    make_ticket("26DDDC002", due_date=datetime.utcnow() - timedelta(hours=1))
+    make_ticket("26DDDC003")
+
+    subscription = event_bus.subscribe(engineer.id)
+    try:
+        assert scan_sla_breaches() == {"status": 1, "due": 1}
+        kinds = {(m["data"]["ticket_number"], m["data"]["kind"])
+                 for m in iter(lambda: subscription.get(0.1), None)}
+        assert kinds == {("26DDDC001", "status"), ("26DDDC002", "due")}
+    finally:
+        subscription.close()
+    assert scan_sla_breaches() == {"status": 0, "due": 0}
+
+    db.session.refresh(late)
+    assert ticket_sla(late)["breached"] is True
+    late.status = "In Progress"
+    db.session.commit()
+    assert late.sla_breached_at is None
+    assert TicketStatusTransition.query.filter_by(ticket_id=late.id).all()[-1].breached
+
+
+def test_web_process_scanner_publishes_breaches(app, people, make_ticket):
+    _age(make_ticket("26DDDC001"), 25)
+    app.config["SLA_SCAN_INTERVAL"] = 60
+    subscription = event_bus.subscribe(people.engineer.id)
+    sla_scanner.start()
+    try:
+        message = subscription.get(5)
+    finally:
+        sla_scanner.stop()
+        subscription.close()
+    assert message["type"] == "ticket.sla_breached"
+    assert message["data"] == {"ticket_number": "26DDDC001", "status": "Pending", "kind": "status"}
+
+
+def test_summary_and_ticket_api(client, login, people, make_ticket):
+    engineer, admin = people.engineer, people.admin
+    ticket = make_ticket("26DDDC001", due_date=datetime.utcnow() - timedelta(days=1))
+    _age(ticket, 30)
+    ticket.status = "In Progress"
+    db.session.commit()
+
+    summary = sla_summary()
+    assert summary["statuses"]["Pending"]["breaches"] == 1
+    assert summary["overdue"] == 1 and summary["open_breached"]["In Progress"] == 0
+
+    login(people.requester)
+    assert client.get("/analytics/sla/26DDDC001").status_code == 403
+    assert client.get("/analytics/sla").status_code == 403
+    client.get("/auth/logout")
+
+    login(engineer)
+    data = client.get("/analytics/sla/26DDDC001").get_json()
+    assert data["status"] == "In Progress" and data["overdue"] is True
+    assert [t["to_status"] for t in data["transitions"]] == ["Pending", "In Progress"]
+    assert client.get("/analytics/sla/26XXXX999").status_code == 404
+    client.get("/auth/logout")
+
+    login(admin)
+    assert client.get("/analytics/sla?days=7").get_json()["statuses"]["Pending"]["transitions"] == 1
@@ -0,0 +1,114 @@
+# tests/test_user_directory.py
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.enums import Role
+from app.models.user import User
+from app.services import user_directory as directory_module
+from app.services.user_directory import UserDirectory, user_directory
+
+
+@pytest.fixture
+def user_selects(app):
+    """Record every SELECT against the users table."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", _record)
+
+
+def test_bulk_prefetch_uses_one_query(make_user, user_selects):
+    ids = [make_user(f"user{i}").id for i in range(5)]
+    user_directory.invalidate()
+    user_selects.clear()
+
+    entries = user_directory.get_many(ids + [999])
+    assert sorted(entries) == sorted(ids)
+    assert len(user_selects) == 1
+
+    assert user_directory.get(ids[0]).username == "user0"
+    assert user_directory.get(999) is None
+    assert len(user_selects) == 1
+
+
+def test_user_update_invalidates_entry(make_user):
+    u = make_user("renamed")
+    assert user_directory.get(u.id).actual_name == "Renamed"
+    u.actual_name = "New Name"
+    db.session.commit()
+    assert user_directory.get(u.id).actual_name == "New Name"
+
+
+def test_ttl_and_lru_eviction(app, make_user, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(directory_module.time, "monotonic", lambda: clock[0])
+    cache = UserDirectory(ttl=10, max_size=2)
+    a, b, c = (make_user(n) for n in ("a1", "b1", "c1"))
+
+    cache.get_many([a.id, b.id])
+    cache.get(c.id)  # evicts a (least recently used)
+    misses = cache.misses
+    cache.get(b.id)
+    assert cache.misses == misses
+    cache.get(a.id)
+    assert cache.misses == misses + 1
+
+    clock[0] += 11
+    cache.get(a.id)
+    assert cache.misses == misses + 2
+
+
+def test_invalidation_waits_for_commit(make_user):
+    u = make_user("renamed")
+    user_directory.get(u.id)
+    u.actual_name = "New Name"
+    db.session.flush()
+    user_directory.get(u.id)  # a reader re-caching before commit
+    db.session.commit()
+    assert user_directory.get(u.id).actual_name == "New Name"
+
+    u.actual_name = "Rolled Back"
+    db.session.flush()
+    db.session.rollback()
+    assert user_directory.get(u.id).actual_name == "New Name"
+
+
+def test_fetch_racing_an_invalidation_is_not_stored(make_user, monkeypatch):
+    u = make_user("renamed")
+    fetch = user_directory._fetch
+
+    def racing_fetch(ids):
+        rows = fetch(ids)
+        user_directory.invalidate(u.id)
+        return rows
+
+    monkeypatch.setattr(user_directory, "_fetch", racing_fetch)
+    user_directory.get(u.id)
+    monkeypatch.undo()
+    misses = user_directory.misses
+    user_directory.get(u.id)
+    assert user_directory.misses == misses + 1
+
+
+def test_cache_holds_directory_fields_only(make_user):
+    u = make_user("viewer1")
+    user_directory.get(u.id)
+    (_, row), = [v for k, v in user_directory._rows.items() if k == u.id]
+    assert set(row) == set(directory_module.UserEntry._fields)
+
+
+def test_role_and_active_changes_apply_on_next_request(client, login, make_user):
+    admin = make_user("admin1", role="admin")
+    login(admin)
+    assert client.get("/analytics/export/tickets").status_code == 200
+
+    db.session.execute(User.__table__.update().values(role=Role.ENGINEER))
+    db.session.commit()
+    assert client.get("/analytics/export/tickets").status_code == 403